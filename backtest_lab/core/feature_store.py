@@ -0,0 +1,253 @@
+"""
+Per-(symbol, day) feature store for the backtest_lab research tools.
+
+The tools under `tools/` each re-read `data/stocks/*_minute.csv` and recompute the
+same daily numbers. `FeatureStore.build()` computes them once, one process per
+symbol, into one wide table:
+
+    symbol, date, bars, open, high, low, close, volume, prev_close, gap_pct,
+    range_pct, move_pct, is_mover, realized_vol_pct,
+    orb{5,15,30}_high/low/range_pct/break_up/break_down,
+    B1..B4_open/high/low/close   (the master_intraday_extractor buckets)
+
+Storage is one columnar file per symbol under `data/feature_store/` (Parquet when
+pyarrow or fastparquet is installed, otherwise one .npz array per column), plus
+`manifest.json` recording each source CSV's mtime/size and last day. A rebuild
+only touches symbols whose CSV changed, and for those only recomputes days from
+the last stored day on.
+
+    store = FeatureStore()
+    store.build()
+    days = store.load(columns=['range_pct', 'orb15_break_up'], start='2025-01-01')
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import time as dt_time
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = "backtest_lab/data/stocks/"
+STORE_DIR = "backtest_lab/data/feature_store/"
+
+SESSION_START = dt_time(9, 15)
+ORB_WINDOWS = (5, 15, 30)
+BUCKETS = {
+    'B1': (dt_time(9, 15), dt_time(10, 30)),
+    'B2': (dt_time(10, 30), dt_time(12, 0)),
+    'B3': (dt_time(12, 0), dt_time(13, 30)),
+    'B4': (dt_time(13, 30), dt_time(15, 30)),
+}
+MOVER_PCT = 1.0
+
+
+def _parquet_engine():
+    for module in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(module)
+            return module
+        except ImportError:
+            continue
+    return None
+
+
+def day_features(df: pd.DataFrame, prev_close: float = np.nan) -> pd.DataFrame:
+    """
+    Daily feature rows for one symbol's minute bars (columns date, open, high, low,
+    close[, volume]). `prev_close` is the close before the first day in `df`.
+    """
+    df = df.sort_values('date')
+    day = df['date'].dt.normalize()
+    minutes = (df['date'].dt.hour * 60 + df['date'].dt.minute).to_numpy()
+    if 'volume' not in df:
+        df = df.assign(volume=0.0)
+
+    g = df.groupby(day)
+    out = pd.DataFrame({
+        'bars': g.size(),
+        'open': g['open'].first(),
+        'high': g['high'].max(),
+        'low': g['low'].min(),
+        'close': g['close'].last(),
+        'volume': g['volume'].sum(),
+    })
+    out['prev_close'] = out['close'].shift(1)
+    out.iloc[0, out.columns.get_loc('prev_close')] = prev_close
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out['gap_pct'] = (out['open'] - out['prev_close']) / out['prev_close'] * 100
+        out['range_pct'] = (out['high'] - out['low']) / out['low'] * 100
+        out['move_pct'] = (out['close'] - out['open']) / out['open'] * 100
+    out['is_mover'] = out['range_pct'] > MOVER_PCT
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ret = np.log(df['close'] / df.groupby(day)['close'].shift(1))
+    out['realized_vol_pct'] = np.sqrt((log_ret ** 2).groupby(day).sum()) * 100
+
+    start = SESSION_START.hour * 60 + SESSION_START.minute
+    for window in ORB_WINDOWS:
+        in_orb = (minutes >= start) & (minutes < start + window)
+        orb = df[in_orb].groupby(day[in_orb]).agg(high=('high', 'max'), low=('low', 'min')).reindex(out.index)
+        post = df[~in_orb & (minutes >= start)]
+        post = post.groupby(day[post.index]).agg(high=('high', 'max'), low=('low', 'min')).reindex(out.index)
+        p = f"orb{window}"
+        out[f"{p}_high"], out[f"{p}_low"] = orb['high'], orb['low']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[f"{p}_range_pct"] = (orb['high'] - orb['low']) / orb['low'] * 100
+        out[f"{p}_break_up"] = (post['high'] > orb['high']).to_numpy()
+        out[f"{p}_break_down"] = (post['low'] < orb['low']).to_numpy()
+
+    for name, (lo, hi) in BUCKETS.items():
+        mask = (minutes >= lo.hour * 60 + lo.minute) & (minutes < hi.hour * 60 + hi.minute)
+        sub = df[mask].groupby(day[mask])
+        bucket = pd.DataFrame({'open': sub['open'].first(), 'high': sub['high'].max(),
+                               'low': sub['low'].min(), 'close': sub['close'].last()}).reindex(out.index)
+        for col in ('open', 'high', 'low', 'close'):
+            out[f"{name}_{col}"] = bucket[col]
+
+    out.index.name = 'date'
+    return out.reset_index()
+
+
+def _read_minutes(path: str, since=None) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    if since is not None:
+        df = df[df['date'] >= since]
+    return df
+
+
+def _symbol_job(args):
+    """Worker: (symbol, csv path, first day to compute or None, close before it) -> feature rows."""
+    symbol, path, since, prev_close = args
+    df = _read_minutes(path, pd.Timestamp(since) if since else None)
+    if df.empty:
+        return symbol, None
+    rows = day_features(df, np.nan if prev_close is None else prev_close)
+    rows.insert(0, 'symbol', symbol)
+    return symbol, rows
+
+
+class FeatureStore:
+    """Builds, updates and queries the per-(symbol, day) feature table. See the module docstring."""
+
+    def __init__(self, store_dir: str = STORE_DIR, data_dir: str = DATA_DIR, fmt: str = None):
+        self.store_dir = store_dir
+        self.data_dir = data_dir
+        self.engine = _parquet_engine()
+        self.fmt = fmt or ('parquet' if self.engine else 'npz')
+        self.manifest_path = os.path.join(store_dir, 'manifest.json')
+        self.manifest = self._read_manifest()
+
+    # ---- storage
+    def _read_manifest(self) -> dict:
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {}
+
+    def _path(self, symbol: str) -> str:
+        return os.path.join(self.store_dir, f"{symbol}.{self.fmt}")
+
+    def _write(self, symbol: str, table: pd.DataFrame):
+        path = self._path(symbol)
+        tmp = path + '.tmp'
+        if self.fmt == 'parquet':
+            table.to_parquet(tmp, engine=self.engine, index=False)
+        else:
+            cols = {}
+            for c in table.columns:
+                values = table[c].to_numpy('datetime64[ns]') if c == 'date' else table[c].to_numpy()
+                cols[c] = values.astype(str) if values.dtype == object else values
+            with open(tmp, 'wb') as f:
+                np.savez(f, __columns__=np.array(list(table.columns)), **cols)
+        os.replace(tmp, path)
+
+    def _read(self, symbol: str, columns=None) -> pd.DataFrame:
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        if self.fmt == 'parquet':
+            return pd.read_parquet(path, engine=self.engine, columns=columns)
+        with np.load(path) as data:
+            names = [str(c) for c in data['__columns__']]
+            return pd.DataFrame({c: data[c] for c in names if columns is None or c in columns})
+
+    # ---- build
+    def _plan(self, symbols=None, full=False):
+        files = sorted(f for f in os.listdir(self.data_dir) if f.endswith("_minute.csv"))
+        jobs = []
+        for f in files:
+            symbol = f.replace("_minute.csv", "")
+            if symbols and symbol not in symbols:
+                continue
+            path = os.path.join(self.data_dir, f)
+            st = os.stat(path)
+            entry = self.manifest.get(symbol)
+            stamp = [st.st_mtime_ns, st.st_size]
+            if not full and entry and entry.get('source') == stamp and os.path.exists(self._path(symbol)):
+                continue
+            if not full and entry and entry.get('last_day') and os.path.exists(self._path(symbol)):
+                # The last stored day may have been partial; recompute from it with the close before it
+                jobs.append((symbol, path, entry['last_day'], entry.get('prev_close', np.nan), stamp))
+            else:
+                jobs.append((symbol, path, None, np.nan, stamp))
+        return jobs
+
+    def build(self, symbols=None, workers: int = None, full: bool = False) -> dict:
+        """Compute features for new or changed symbols/days. Returns {symbol: rows written}."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        jobs = self._plan(symbols, full)
+        if not jobs:
+            print("🏁 Feature store is up to date.")
+            return {}
+        print(f"🚀 Feature store: {len(jobs)} symbols to update ({self.fmt})")
+
+        stamps = {job[0]: (job[2], job[4]) for job in jobs}
+        args = [job[:4] for job in jobs]
+        if workers == 1 or len(jobs) == 1:
+            results = list(map(_symbol_job, args))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_symbol_job, args))
+
+        written = {}
+        for symbol, rows in results:
+            if rows is None:
+                continue
+            since, stamp = stamps[symbol]
+            if since:
+                kept = self._read(symbol)
+                rows = pd.concat([kept[kept['date'] < pd.Timestamp(since)], rows], ignore_index=True)
+            self._write(symbol, rows)
+            last = rows.iloc[-1]
+            self.manifest[symbol] = {
+                'source': stamp,
+                'last_day': str(last['date'].date()),
+                'prev_close': None if pd.isna(last['prev_close']) else float(last['prev_close']),
+                'days': len(rows),
+            }
+            written[symbol] = len(rows)
+            print(f"✅ {symbol}: {len(rows)} days")
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        return written
+
+    # ---- query
+    def symbols(self) -> list:
+        return sorted(self.manifest)
+
+    def load(self, symbols=None, columns=None, start=None, end=None) -> pd.DataFrame:
+        """The feature table, optionally narrowed to symbols, columns and a date range."""
+        wanted = None if columns is None else ['symbol', 'date'] + [c for c in columns if c not in ('symbol', 'date')]
+        frames = [self._read(s, wanted) for s in (symbols or self.symbols())]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=wanted or ['symbol', 'date'])
+        table = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            table = table[table['date'] >= pd.Timestamp(start)]
+        if end is not None:
+            table = table[table['date'] <= pd.Timestamp(end)]
+        return table.reset_index(drop=True)
@@ -18,7 +18,7 @@ class MassOptimizer:
         self.returns_series = None
         self.timestamps = None
 
-    def precalculate_scores(self, days=250):
+    def precalculate_scores(self, days=250, production_filters=False, token='NIFTY'):
         from .loader import DataLoader
         loader = DataLoader(self.csv_path)
         df = loader.load_data(days=days)
@@ -30,6 +30,11 @@ class MassOptimizer:
         # Returns for PnL
         self.returns_series = np.diff(closes, prepend=closes[0])
         
+        if production_filters:
+            self.score_matrix = self._production_score_matrix(df, token)
+            self._finalize_matrix(df)
+            return
+
         print("⚡ Pre-calculating Score Matrix (F1-F7)...")
 
         # F1: ORB (9:15-9:30)
@@ -73,7 +78,34 @@ class MassOptimizer:
         f7 = np.where((atr/atr_avg) > 1.10, 0.10, np.where((atr/atr_avg) < 0.75, -0.10, 0.0))
         
         self.score_matrix = np.nan_to_num(np.column_stack([np.zeros_like(closes), f2, f3, f4, f5, f6, f7]))
-        self.price_series = closes
+        self._finalize_matrix(df)
+
+    def _production_score_matrix(self, df, token):
+        """F1-F7 scores from the live filters' series mode (same math as Orbiter, one pass)."""
+        from filters.entry import (f1_orb, f2_price_above_5ema, f3_5ema_above_9ema, f4_supertrend,
+                                   f5_ema_scope, f6_ema_gap, f7_atr_relative)
+
+        print("⚡ Pre-calculating Score Matrix (F1-F7) via production series filters...")
+        series = {
+            'open': df['open'].values.astype(float),
+            'high': df['high'].values.astype(float),
+            'low': df['low'].values.astype(float),
+            'close': df['close'].values.astype(float),
+            'timestamp': df['date'].values.astype('datetime64[m]'),
+        }
+        columns = [
+            f1_orb.orb_filter_series(series, token=token)['score'],
+            f2_price_above_5ema.price_above_5ema_filter_series(series)['score'],
+            f3_5ema_above_9ema.ema5_above_9ema_filter_series(series)['score'],
+            f4_supertrend.supertrend_filter_series(series)['score'],
+            f5_ema_scope.ema_scope_filter_series(series)['score'],
+            f6_ema_gap.ema_gap_expansion_filter_series(series)['score'],
+            f7_atr_relative.atr_momentum_filter_series(series)['score'],
+        ]
+        return np.nan_to_num(np.column_stack(columns))
+
+    def _finalize_matrix(self, df):
+        self.price_series = df['close'].values
         self.timestamps = df['date']
         
         # Fast Window Mask
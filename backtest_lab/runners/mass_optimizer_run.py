@@ -28,6 +28,8 @@ def main():
     parser = argparse.ArgumentParser(description='Orbiter Mass Optimizer')
     parser.add_argument('--csv', required=True)
     parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--production-filters', action='store_true',
+                        help='Score with the live Orbiter filters (series mode) instead of the legacy F1-F7 copies')
     args = parser.parse_args()
 
     # 1. Generate the Grid (19,000+ scenarios in memory)
@@ -38,7 +40,7 @@ def main():
 
     # 2. Setup Mass Engine & Pre-calculate
     optimizer = MassOptimizer(args.csv)
-    optimizer.precalculate_scores(days=args.days)
+    optimizer.precalculate_scores(days=args.days, production_filters=args.production_filters)
 
     # 3. Execute Grid Search
     print("\n" + "="*20 + " RUNNING GRID SEARCH " + "="*20)
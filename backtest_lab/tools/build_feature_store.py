@@ -0,0 +1,23 @@
+import argparse
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+from backtest_lab.core.feature_store import FeatureStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build/refresh the per-day feature store from the minute CSVs")
+    parser.add_argument('--symbols', nargs='*', help="Only these symbols (default: every *_minute.csv)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--full', action='store_true', help="Recompute every day instead of only new ones")
+    args = parser.parse_args()
+
+    store = FeatureStore()
+    written = store.build(symbols=args.symbols, workers=args.workers, full=args.full)
+    print(f"\n✨ Feature store: {len(written)} symbols updated, {len(store.symbols())} total in {store.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
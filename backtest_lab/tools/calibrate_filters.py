@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+from backtest_lab.core.feature_store import FeatureStore
+from orbiter.utils.calibration import Calibrator
+
+# Known by 09:30 (ORB close), so usable as entry filters for the rest of the day
+DEFAULT_FEATURES = ['gap_pct', 'orb5_range_pct', 'orb15_range_pct', 'orb30_range_pct']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep filter thresholds over the feature store and emit filters.json parameters")
+    parser.add_argument('--outcome', default='is_mover', help="Boolean feature-store column to predict")
+    parser.add_argument('--features', nargs='*', default=DEFAULT_FEATURES)
+    parser.add_argument('--returns', default=None, help="Column averaged for expectancy (e.g. move_pct)")
+    parser.add_argument('--symbols', nargs='*')
+    parser.add_argument('--folds', type=int, default=4)
+    parser.add_argument('--min-signals', type=int, default=50)
+    parser.add_argument('--out', default="backtest_lab/data/calibrated_filters.json")
+    args = parser.parse_args()
+
+    store = FeatureStore()
+    store.build()
+    columns = args.features + [args.outcome] + ([args.returns] if args.returns else [])
+    days = store.load(symbols=args.symbols, columns=columns).sort_values('date', kind='mergesort')
+    print(f"🚀 Calibrating {len(args.features)} features on {len(days)} symbol-days ({args.outcome})")
+
+    calibrator = Calibrator(days[args.features], days[args.outcome].astype(bool),
+                            returns=days[args.returns] if args.returns else None,
+                            folds=args.folds, min_signals=args.min_signals)
+    table = calibrator.sweep(operators=('<', '>', 'abs<'))
+    print(f"\n🏆 TOP 15 of {len(table)} threshold rules:")
+    print(table.head(15).to_string(index=False))
+
+    print("\n🧪 Walk-forward (best on earlier folds, scored on the next):")
+    print(calibrator.walk_forward().to_string(index=False))
+
+    # Best rule per feature that also held up in every fold
+    robust = table[table['wf_signals_min'] >= args.min_signals // args.folds].sort_values('wf_precision_min', ascending=False)
+    filters = calibrator.to_filters(robust.head(len(args.features) * 3))
+    with open(args.out, 'w') as f:
+        json.dump(filters, f, indent=2)
+    print(f"\n✨ filters.json parameters saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,14 @@ import pandas as pd
 import numpy as np
 import talib
 import os
+import sys
 from datetime import datetime, timedelta
 
+# Same pairs kernel as the live PairsEngine
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+from orbiter.utils.pairs import pair_series
+
 def audit_today_session(data_dir):
     print(f"🕵️ Hindsight Audit: 17:00 - 21:00 IST Today")
     
@@ -28,22 +34,19 @@ def audit_today_session(data_dir):
         b = df_b.loc[today_start:today_end]
         
         combined = pd.DataFrame({'A': a['Close'], 'B': b['Close']}).ffill().dropna()
-        combined['ratio'] = combined['A'] / combined['B']
-        combined['mean'] = combined['ratio'].rolling(60).mean()
-        combined['std'] = combined['ratio'].rolling(60).std()
-        combined['zscore'] = (combined['ratio'] - combined['mean']) / combined['std']
+        stats = pair_series(combined['A'].to_numpy(), combined['B'].to_numpy(), window=60, min_bars=20)
+        for col, values in stats.items():
+            combined[col] = values
         
         print(f"{'Time (UTC)':<20} | {'Signal Type':<20} | {'Metric':<10}")
         print("-" * 55)
         
-        for i in range(1, len(combined)):
-            t = combined.index[i]
-            z = combined['zscore'].iloc[i]
-            
+        signals = combined[(combined['zscore'] < -2.0) | (combined['zscore'] > 2.0)]
+        for t, z, hr, hl in zip(signals.index, signals['zscore'], signals['hedge_ratio'], signals['half_life']):
             if z < -2.0:
-                print(f"{str(t):<20} | 🟢 BUY {ticker_a} / SELL {ticker_b} | Z:{z:.2f}")
-            elif z > 2.0:
-                print(f"{str(t):<20} | 🔴 SELL {ticker_a} / BUY {ticker_b} | Z:{z:.2f}")
+                print(f"{str(t):<20} | 🟢 BUY {ticker_a} / SELL {ticker_b} | Z:{z:.2f} β:{hr:.3f} HL:{hl:.0f}m")
+            else:
+                print(f"{str(t):<20} | 🔴 SELL {ticker_a} / BUY {ticker_b} | Z:{z:.2f} β:{hr:.3f} HL:{hl:.0f}m")
 
     # Gold vs Silver
     scan_pair("GC", "SI")
@@ -1,25 +1,64 @@
 #!/usr/bin/env python3
 
 import argparse
+import json
+import os
+import re
+import shlex
 import subprocess
 import sys
 
-def monitor_logs(host, user, password, log_file_path, patterns):
-    """Connects to a remote host via SSH and searches for specified patterns in a log file."""
+STATE_MARKER = "__MONITOR_STATE__"
+
+
+def load_state(state_file, host, log_file_path):
+    """Byte offset and inode from the previous run for this host/log, or (0, None)."""
+    try:
+        with open(state_file, 'r') as f:
+            state = json.load(f).get(f"{host}:{log_file_path}", {})
+        return state.get("offset", 0), state.get("inode")
+    except (OSError, ValueError):
+        return 0, None
+
+
+def save_state(state_file, host, log_file_path, offset, inode):
     try:
-        # Construct the grep command for multiple patterns
-        # We use | as a separator for grep -E, but need to escape it for the remote shell
-        # Also need to handle patterns that might contain special characters.
-        # For simplicity, let's assume patterns are basic regex for now.
-        # If patterns themselves contain spaces or quotes, this will need more robust escaping.
-        escaped_patterns = [p.replace("'", "'''") for p in patterns] # Basic escaping for single quotes
-        grep_pattern = "|".join(escaped_patterns)
-
-        # Construct the full remote command
-        # Using bash -c to execute the command string remotely
-        # Using cat and grep to search the file.
-        # Redirecting stderr to stdout (2>&1) to capture all output.
-        remote_command = f"cat {log_file_path} | grep -E '{grep_pattern}' 2>&1"
+        with open(state_file, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data[f"{host}:{log_file_path}"] = {"offset": offset, "inode": inode}
+    with open(state_file, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def build_remote_command(log_file_path, grep_pattern, offset, inode):
+    """Remote shell that greps only the bytes appended since `offset`.
+
+    Prints a state line first (inode, size, start offset). If the inode changed or the
+    file shrank (rotation/truncation), the scan restarts from byte 0.
+    """
+    path = shlex.quote(log_file_path)
+    return (
+        f"f={path}; set -- $(stat -c '%i %s' \"$f\"); ino=$1; size=$2; [ -n \"$ino\" ] || exit 2; off={int(offset)}; "
+        f"if [ \"$ino\" != {shlex.quote(str(inode or ''))} ] || [ \"$size\" -lt \"$off\" ]; then off=0; fi; "
+        f"echo \"{STATE_MARKER} $ino $size $off\"; "
+        f"tail -c +$((off + 1)) \"$f\" | head -c $((size - off)) | grep -E {shlex.quote(grep_pattern)}; "
+        f"exit 0"
+    )
+
+
+def monitor_logs(host, user, password, log_file_path, patterns, state_file=None, from_start=False):
+    """Connects to a remote host via SSH and searches for specified patterns in a log file.
+
+    Only bytes appended since the previous run are read (offset kept in `state_file`).
+    All patterns are combined into one grep -E alternation; matches are counted per pattern.
+    """
+    try:
+        offset, inode = (0, None) if from_start or not state_file else load_state(state_file, host, log_file_path)
+        start_offset = offset
+        grep_pattern = "|".join(f"({p})" for p in patterns)
+        remote_command = build_remote_command(log_file_path, grep_pattern, offset, inode)
 
         # Construct the sshpass command
         ssh_command = [
@@ -28,27 +67,43 @@ def monitor_logs(host, user, password, log_file_path, patterns):
             "ssh",
             "-o", "StrictHostKeyChecking=no",
             f"{user}@{host}",
-            "bash", "-c", remote_command
+            "bash", "-c", shlex.quote(remote_command)
         ]
 
-        print(f"[INFO] Running command: {' '.join(ssh_command)}", file=sys.stderr)
+        print(f"[INFO] Scanning {log_file_path} on {host} from byte {offset}", file=sys.stderr)
 
         # Execute the command
         result = subprocess.run(ssh_command, capture_output=True, text=True, check=False)
 
-        if result.returncode == 0:
-            if result.stdout:
-                print("--- Found Matches ---")
-                print(result.stdout)
-                print("---")
-            else:
-                print("No matches found.")
-        elif result.returncode == 1: # grep returns 1 if no lines were selected
-            print("No matches found.")
-        else:
+        if result.returncode != 0:
             print(f"Error executing command. Exit code: {result.returncode}", file=sys.stderr)
             print(f"Stderr: {result.stderr}", file=sys.stderr)
             print(f"Stdout: {result.stdout}", file=sys.stderr)
+            return
+
+        lines = result.stdout.splitlines()
+        matches = []
+        for line in lines:
+            if line.startswith(STATE_MARKER):
+                _, inode, size, start = line.split()
+                offset = int(size)
+                if int(start) == 0 and start_offset:
+                    print("[INFO] Log rotated or truncated; rescanned from the top", file=sys.stderr)
+            else:
+                matches.append(line)
+
+        if matches:
+            compiled = {p: re.compile(p) for p in patterns}
+            counts = {p: sum(1 for m in matches if rx.search(m)) for p, rx in compiled.items()}
+            print("--- Found Matches ---")
+            print("\n".join(matches))
+            print("---")
+            print("Counts: " + ", ".join(f"{p}={n}" for p, n in counts.items()))
+        else:
+            print("No matches found.")
+
+        if state_file:
+            save_state(state_file, host, log_file_path, offset, inode)
 
     except FileNotFoundError:
         print("Error: 'sshpass' command not found. Please ensure it is installed.", file=sys.stderr)
@@ -63,8 +118,12 @@ if __name__ == "__main__":
     parser.add_argument("--user", required=True, help="SSH username (e.g., pi).")
     parser.add_argument("--password", required=True, help="SSH password.")
     parser.add_argument("--log-file-path", required=True, help="Absolute path to the log file on the remote server.")
-    parser.add_argument("--patterns", required=True, nargs='+', help="List of regex patterns to search for (e.g., "SIM-FUTURE" "INFO.*Score").")
+    parser.add_argument("--patterns", required=True, nargs='+', help="List of regex patterns to search for (e.g., 'SIM-FUTURE' 'INFO.*Score').")
+    parser.add_argument("--state-file", default=os.path.expanduser("~/.log_monitor_offsets.json"),
+                        help="Where byte offsets are kept between runs (only new bytes are scanned).")
+    parser.add_argument("--from-start", action="store_true", help="Ignore the saved offset and scan the whole file.")
 
     args = parser.parse_args()
 
-    monitor_logs(args.host, args.user, args.password, args.log_file_path, args.patterns)
+    monitor_logs(args.host, args.user, args.password, args.log_file_path, args.patterns,
+                 state_file=args.state_file, from_start=args.from_start)
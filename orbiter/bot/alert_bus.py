@@ -0,0 +1,396 @@
+# orbiter/bot/alert_bus.py
+"""
+Alert Bus - one Telegram sender behind a bounded in-memory queue.
+
+Producers (`alert()` calls, `AlertLogHandler` on the ORBITER logger) enqueue and
+return at once; a single worker thread groups, rate-limits and sends.
+
+- Grouping: alerts share a fingerprint (exception type + raising location, or
+  level + logging call site). The first of a group goes out at once; repeats
+  inside `window` seconds are counted and sent as one digest when it closes.
+- Rate limits: a token bucket per channel. While a channel is limited its queued
+  messages are coalesced into one message when the next token frees up.
+- Backoff: a failed send stays at the head of the channel and is retried after
+  `base_backoff * 2**failures` (capped), or the server's retry_after.
+- Backpressure: past `max_queue` unsent alerts new ones are dropped and counted.
+"""
+
+import html
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("ORBITER")
+
+LEVEL_EMOJI = {'CRITICAL': '🔴', 'ERROR': '🚨', 'WARNING': '⚠️', 'INFO': '🔔'}
+MAX_MESSAGE_CHARS = 3500  # Telegram caps a message at 4096
+
+
+class AlertSendError(Exception):
+    """Transport failure; `retry_after` (seconds) when the server asked for a pause."""
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# -------------------------------------------------------------- transports
+class TelegramTransport:
+    """sendMessage to the bot/chat in cred.yml. Raises AlertSendError on any non-200."""
+
+    name = 'telegram'
+
+    def __init__(self, timeout: float = 10.0):
+        self.timeout = timeout
+
+    def send(self, text: str):
+        import requests
+        from orbiter.utils.telegram_notifier import get_creds
+
+        token, chat_id = get_creds()
+        if not token or not chat_id:
+            raise AlertSendError("Telegram token or chat id missing in cred.yml")
+        try:
+            response = requests.post(f"https://api.telegram.org/bot{token}/sendMessage",
+                                     data={'chat_id': chat_id, 'text': text, 'parse_mode': 'HTML'},
+                                     timeout=self.timeout)
+        except requests.RequestException as e:
+            raise AlertSendError(str(e))
+        if response.status_code != 200:
+            retry_after = None
+            try:
+                retry_after = response.json().get('parameters', {}).get('retry_after')
+            except ValueError:
+                pass
+            raise AlertSendError(f"Telegram API {response.status_code}: {response.text[:200]}", retry_after)
+
+
+class LocalTransport:
+    """Offline stand-in (tests, dry runs, no cred.yml): keeps what would have been sent."""
+
+    name = 'local'
+
+    def __init__(self, failures: int = 0, retry_after: float = None):
+        self.sent: List[str] = []
+        self.failures = failures
+        self.retry_after = retry_after
+        self.attempts = 0
+
+    def send(self, text: str):
+        self.attempts += 1
+        if self.failures > 0:
+            self.failures -= 1
+            raise AlertSendError("HTTP 429 Too Many Requests", self.retry_after)
+        self.sent.append(text)
+
+
+# ---------------------------------------------------------------- helpers
+_NUMBERS = re.compile(r"\d+(\.\d+)?")
+
+
+def fingerprint_of(exc: BaseException = None, location: str = None, message: str = None, level: str = 'ERROR') -> str:
+    """Group key: exception type + innermost frame, else level + location, else the message with numbers masked."""
+    if exc is not None:
+        frames = traceback.extract_tb(exc.__traceback__) if exc.__traceback__ else []
+        where = f"{os.path.basename(frames[-1].filename)}:{frames[-1].lineno}" if frames else (location or '?')
+        return f"{type(exc).__name__}@{where}"
+    if location:
+        return f"{level}@{location}"
+    return f"{level}:{_NUMBERS.sub('#', message or '')[:120]}"
+
+
+class _Alert:
+    __slots__ = ('ts', 'level', 'message', 'fingerprint', 'channels')
+
+    def __init__(self, ts, level, message, fingerprint, channels):
+        self.ts, self.level, self.message, self.fingerprint, self.channels = ts, level, message, fingerprint, channels
+
+
+class _Group:
+    __slots__ = ('opened', 'suppressed', 'last')
+
+    def __init__(self, opened):
+        self.opened, self.suppressed, self.last = opened, 0, None
+
+
+class _Channel:
+    """Outbox + token bucket + backoff for one transport."""
+
+    def __init__(self, transport, rate_per_minute: float, burst: int, max_outbox: int, now: float):
+        self.transport = transport
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = now
+        self.outbox: Deque[str] = deque()
+        self.max_outbox = max_outbox
+        self.failures = 0
+        self.blocked_until = 0.0
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def next_ready(self, now: float) -> float:
+        """Seconds until this channel can send again (0 when it can now)."""
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1 and self.rate > 0:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+
+# -------------------------------------------------------------------- bus
+class AlertBus:
+    """
+    Non-blocking alert sender. See the module docstring.
+
+    Flow:
+        alert()/AlertLogHandler → _queue (bounded) → worker: pump()
+        pump: group by fingerprint → channel outboxes → send (token bucket, backoff)
+    """
+
+    _instance: 'AlertBus | None' = None
+
+    def __init__(self, transports: List[Any] = None, window: float = 60.0, rate_per_minute: float = 20.0,
+                 burst: int = 5, max_queue: int = 1000, max_outbox: int = 200, base_backoff: float = 2.0,
+                 max_backoff: float = 300.0, clock: Callable[[], float] = time.monotonic, autostart: bool = True):
+        self.window = window
+        self.max_queue = max_queue
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        now = clock()
+        transports = transports if transports is not None else [TelegramTransport()]
+        self.channels: Dict[str, _Channel] = {t.name: _Channel(t, rate_per_minute, burst, max_outbox, now)
+                                              for t in transports}
+
+        self._queue: Deque[_Alert] = deque()
+        self._groups: Dict[str, _Group] = {}
+        self._closing = False  # flush(): send pending digests without waiting out their window
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._received = 0
+        self._dropped = 0
+        self._suppressed = 0
+        self._digests = 0
+        self._failed_sends = 0
+
+        if autostart:
+            self.start()
+
+    @classmethod
+    def get_instance(cls) -> 'AlertBus':
+        """Process-wide bus. Uses LocalTransport when ORBITER_ALERTS_BACKEND=local or cred.yml has no bot."""
+        if cls._instance is None:
+            from orbiter.utils.telegram_notifier import get_creds
+            if os.environ.get("ORBITER_ALERTS_BACKEND", "").lower() == "local" or not all(get_creds()):
+                logger.warning("⚠️ AlertBus: using local transport (no Telegram credentials)")
+                cls._instance = cls(transports=[LocalTransport()])
+            else:
+                cls._instance = cls()
+        return cls._instance
+
+    # -------------------------------------------------------------- producers
+    def alert(self, message: str, level: str = 'ERROR', fingerprint: str = None, exc: BaseException = None,
+              location: str = None, channels: List[str] = None) -> bool:
+        """Queue one alert. Never blocks on the network; returns False when the queue is full."""
+        fp = fingerprint or fingerprint_of(exc, location, message, level)
+        if exc is not None:
+            message = f"{message}\n{type(exc).__name__}: {exc}"
+        item = _Alert(self._clock(), level.upper(), str(message), fp, channels)
+        with self._cond:
+            self._received += 1
+            if len(self._queue) >= self.max_queue:
+                self._dropped += 1
+                return False
+            self._queue.append(item)
+            self._cond.notify()
+        return True
+
+    # -------------------------------------------------------------- lifecycle
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="AlertBus", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Close every open group and block until the outboxes are empty (or timeout)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._closing = any(g.suppressed for g in self._groups.values())
+            self._cond.notify_all()
+            while self._queue or self._busy or self._closing or any(c.outbox for c in self.channels.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return False
+                self._cond.wait(min(remaining, 0.1))
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def is_worker_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "received": self._received,
+            "dropped": self._dropped,
+            "suppressed": self._suppressed,
+            "digests": self._digests,
+            "open_groups": len(self._groups),
+            "failed_sends": self._failed_sends,
+            "channels": {name: {"sent": c.sent, "pending": len(c.outbox), "coalesced": c.coalesced,
+                                "dropped": c.dropped, "failures": c.failures}
+                         for name, c in self.channels.items()},
+        }
+
+    # -------------------------------------------------------------- worker
+    def _worker(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                self._busy = True
+            try:
+                wait = self.pump()
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+                    if self._running and not self._queue:
+                        self._cond.wait(wait)
+
+    def pump(self, now: float = None) -> float:
+        """One worker pass: group new alerts, close due windows, send. Returns seconds until the next due item."""
+        now = self._clock() if now is None else now
+        with self._cond:
+            batch, self._queue = self._queue, deque()
+            for item in batch:
+                self._ingest(item, now)
+            self._close_windows(now)
+        return self._send_ready(now)
+
+    def _ingest(self, item: _Alert, now: float):
+        group = self._groups.get(item.fingerprint)
+        if group is None:
+            self._groups[item.fingerprint] = _Group(now)
+            self._route(item, self._format(item))
+        else:
+            group.suppressed += 1
+            group.last = item
+            self._suppressed += 1
+
+    def _close_windows(self, now: float):
+        closing, self._closing = self._closing, False
+        for fp, group in list(self._groups.items()):
+            if now - group.opened < self.window and not (closing and group.suppressed):
+                continue
+            if group.suppressed:
+                # A loop that keeps firing gets one digest per window
+                self._route(group.last, self._format(group.last, repeats=group.suppressed, since=now - group.opened))
+                self._digests += 1
+                self._groups[fp] = _Group(now)
+            else:
+                del self._groups[fp]
+
+    def _route(self, item: _Alert, text: str):
+        for name in (item.channels or self.channels):
+            channel = self.channels.get(name)
+            if channel is None:
+                continue
+            if len(channel.outbox) >= channel.max_outbox:
+                channel.outbox.popleft()
+                channel.dropped += 1
+            channel.outbox.append(text)
+
+    def _send_ready(self, now: float) -> float:
+        wait = self.window
+        for channel in self.channels.values():
+            channel.refill(now)
+            while channel.outbox and channel.next_ready(now) == 0:
+                with self._cond:
+                    text, taken = self._coalesce(channel)
+                try:
+                    channel.transport.send(text)
+                except Exception as e:
+                    with self._cond:
+                        channel.outbox.extendleft(reversed(taken))
+                    channel.failures += 1
+                    self._failed_sends += 1
+                    delay = getattr(e, 'retry_after', None) or self.base_backoff * 2 ** (channel.failures - 1)
+                    channel.blocked_until = now + min(self.max_backoff, delay)
+                    # Not an ERROR: this handler would pick it up and feed the outage back into the bus
+                    logger.warning(f"⚠️ AlertBus {channel.transport.name} send failed ({e}); retry in {channel.blocked_until - now:.0f}s")
+                    break
+                channel.tokens -= 1
+                channel.failures = 0
+                channel.sent += 1
+            if channel.outbox:
+                wait = min(wait, channel.next_ready(now))
+        for group in self._groups.values():
+            wait = min(wait, max(0.0, group.opened + self.window - now))
+        return max(wait, 0.01)
+
+    @staticmethod
+    def _coalesce(channel: _Channel):
+        """Pop one message, or as many queued ones as fit in a single message."""
+        taken = [channel.outbox.popleft()]
+        size = len(taken[0])
+        while channel.outbox and size + len(channel.outbox[0]) + 2 <= MAX_MESSAGE_CHARS:
+            size += len(channel.outbox[0]) + 2
+            taken.append(channel.outbox.popleft())
+        if len(taken) > 1:
+            channel.coalesced += len(taken) - 1
+        return "\n\n".join(taken), taken
+
+    @staticmethod
+    def _format(item: _Alert, repeats: int = 0, since: float = 0.0) -> str:
+        text = html.escape(item.message[:1000])
+        head = f"{LEVEL_EMOJI.get(item.level, '🔔')} <b>{item.level}</b>"
+        if repeats:
+            return f"🔁 <b>x{repeats}</b> in {since:.0f}s · {head}\n<code>{text}</code>"
+        return f"{head}\n<code>{text}</code>"
+
+
+# ----------------------------------------------------------- logging bridge
+class AlertLogHandler(logging.Handler):
+    """Forwards ERROR+ records to the bus, fingerprinted by exception and call site."""
+
+    def __init__(self, bus: AlertBus, level: int = logging.ERROR):
+        super().__init__(level)
+        self.bus = bus
+
+    def emit(self, record: logging.LogRecord):
+        if self.bus.is_worker_thread() or getattr(record, 'no_alert', False):
+            return
+        try:
+            location = f"{os.path.basename(record.pathname)}:{record.lineno}"
+            exc = record.exc_info[1] if record.exc_info else None
+            self.bus.alert(record.getMessage(), level=record.levelname, exc=exc, location=location)
+        except Exception:
+            self.handleError(record)
+
+
+def alert(message: str, level: str = 'ERROR', **kwargs) -> bool:
+    """Queue an alert on the process-wide bus."""
+    return AlertBus.get_instance().alert(message, level=level, **kwargs)
@@ -1,10 +1,14 @@
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 import os
 import json
 import math
 
+from orbiter.utils.lazy_import import lazy_import
+
+# gspread + google-auth cost ~80ms to import; only pay it when a sheet is actually opened
+gspread = lazy_import("gspread")
+Credentials = lazy_import("google.oauth2.service_account", "Credentials")
+
 SCOPE = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
 
 TRADE_LOG_HEADER = [
@@ -65,6 +69,14 @@ def _get_or_create_worksheet(book, title):
         return book.add_worksheet(title=title, rows="1000", cols="20")
 
 
+def _open_book(sheet_name="trade_log"):
+    """Authorize and open a workbook. Each call re-authorizes; SheetsSink keeps one open instead."""
+    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
+    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
+    client = gspread.authorize(creds)
+    return client.open(sheet_name)
+
+
 def _parse_value(raw):
     if raw is None:
         return None
@@ -178,19 +190,25 @@ def seed_runtime_config(sheet_name, config_tab, symbols_tab, default_config, sym
             rows.append([symbol, token, "TRUE"])
         symbols_sheet.append_rows(rows)
 
-def log_buy_signals(buy_signals):
+def log_buy_signals(buy_signals, book=None):
     """Log ONLY 45pt+ BUY trades to Google Sheets with symbol and company name"""
     if not buy_signals:
         return
 
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, "trade_log")
     _ensure_header(sheet, TRADE_LOG_HEADER)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
 
+    rows = build_buy_signal_rows(buy_signals, timestamp)
+    if rows:
+        sheet.append_rows(rows)
+
+    print(f"✅ {len(buy_signals)} BUY signals → Google Sheets @ {timestamp}")
+
+
+def build_buy_signal_rows(buy_signals, timestamp):
+    """TRADE_LOG_HEADER rows for BUY signals."""
     rows = []
     for signal in buy_signals:
         # ✅ Match new TRADE_LOG_HEADER
@@ -238,26 +256,28 @@ def log_buy_signals(buy_signals):
             f"₹{signal.get('spl_trade', 0):.2f}"
         ]
         rows.append(row)
-    
-    if rows:
-        sheet.append_rows(rows)
-
-    print(f"✅ {len(buy_signals)} BUY signals → Google Sheets @ {timestamp}")
+    return rows
 
 
-def log_square_off(square_offs):
+def log_square_off(square_offs, book=None):
     """Log square-off events to Google Sheets"""
     if not square_offs:
         return
 
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, "trade_log")
     _ensure_header(sheet, TRADE_LOG_HEADER)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
 
+    rows = build_square_off_rows(square_offs, timestamp)
+    if rows:
+        sheet.append_rows(rows)
+
+    print(f"✅ {len(square_offs)} SQUARE-OFF(s) → Google Sheets @ {timestamp}")
+
+
+def build_square_off_rows(square_offs, timestamp):
+    """TRADE_LOG_HEADER rows for square-off events."""
     rows = []
     for so in square_offs:
         # ✅ Calculate Realized PnL: (Entry Spread) - (Exit Spread)
@@ -315,14 +335,10 @@ def log_square_off(square_offs):
             ""
         ]
         rows.append(row)
-    
-    if rows:
-        sheet.append_rows(rows)
-
-    print(f"✅ {len(square_offs)} SQUARE-OFF(s) → Google Sheets @ {timestamp}")
+    return rows
 
 
-def log_scan_metrics(metrics, tab_name="scan_metrics"):
+def log_scan_metrics(metrics, tab_name="scan_metrics", book=None):
     """Log per-scan symbol metrics (ORB/EMA) to Google Sheets."""
     if not metrics:
         return
@@ -331,10 +347,7 @@ def log_scan_metrics(metrics, tab_name="scan_metrics"):
     logger = logging.getLogger("ORBITER")
     logger.trace(f"[sheets.log_scan_metrics] - Received {len(metrics)} metrics for tab {tab_name}")
 
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, tab_name)
     _ensure_header(sheet, SCAN_METRICS_HEADER)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
@@ -469,23 +482,24 @@ def log_scan_metrics(metrics, tab_name="scan_metrics"):
     print(f"✅ {len(metrics)} scan metrics → Google Sheets [{tab_name}] @ {timestamp}")
 
 
-def update_active_positions(active_data):
+def update_active_positions(active_data, book=None):
     """Rewrite the 'active_positions' sheet with real-time data"""
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, "active_positions")
     
     # Always reset header
     sheet.clear()
     sheet.insert_row(POSITIONS_HEADER, 1)
     
-    if not active_data:
-        return
+    rows = build_active_position_rows(active_data)
+    if rows:
+        sheet.append_rows(rows, value_input_option='USER_ENTERED')
+
 
+def build_active_position_rows(active_data):
+    """POSITIONS_HEADER rows for the active positions snapshot."""
     rows = []
-    for item in active_data:
+    for item in active_data or []:
         row = [
             item.get('entry_time'),
             item.get('token'),
@@ -504,16 +518,11 @@ def update_active_positions(active_data):
             f"₹{item.get('total_margin', 0):.2f}"
         ]
         rows.append(row)
-    
-    if rows:
-        sheet.append_rows(rows, value_input_option='USER_ENTERED')
+    return rows
 
-def update_engine_state(state_json_str):
+def update_engine_state(state_json_str, book=None):
     """Store the entire engine state as a cloud snapshot for handover"""
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, "engine_state")
     
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
@@ -521,13 +530,10 @@ def update_engine_state(state_json_str):
     sheet.update("A1:B1", [[timestamp, state_json_str]])
     print(f"☁️ Engine State uploaded to Google Sheets @ {timestamp}")
 
-def get_engine_state():
+def get_engine_state(book=None):
     """Download the latest engine state from the cloud snapshot"""
     try:
-        creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-        creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-        client = gspread.authorize(creds)
-        book = client.open("trade_log")
+        book = book or _open_book()
         sheet = _get_or_create_worksheet(book, "engine_state")
         
         data = sheet.get("B1")
@@ -540,10 +546,7 @@ def get_engine_state():
 def register_instance(instance_id):
     """Mark this instance as the Master in the cloud to prevent conflicts"""
     try:
-        creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-        creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-        client = gspread.authorize(creds)
-        book = client.open("trade_log")
+        book = _open_book()
         sheet = _get_or_create_worksheet(book, "instance_lock")
         
         timestamp = datetime.now().timestamp()
@@ -555,10 +558,7 @@ def register_instance(instance_id):
 def get_master_instance():
     """Check which instance is currently the Master in the cloud"""
     try:
-        creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-        creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-        client = gspread.authorize(creds)
-        book = client.open("trade_log")
+        book = _open_book()
         sheet = _get_or_create_worksheet(book, "instance_lock")
         
         data = sheet.get("A1:B1")
@@ -571,18 +571,24 @@ def get_master_instance():
 
 
 
-def log_closed_positions(closed_data):
+def log_closed_positions(closed_data, book=None):
     """Append to 'closed_positions' and update overall PnL summary"""
     if not closed_data:
         return
 
-    creds_path = os.path.join(os.path.dirname(__file__), "credentials.json")
-    creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-    client = gspread.authorize(creds)
-    book = client.open("trade_log")
+    book = book or _open_book()
     sheet = _get_or_create_worksheet(book, "closed_positions")
     _ensure_header(sheet, CLOSED_POSITIONS_HEADER)
     
+    rows = build_closed_position_rows(closed_data)
+    if rows:
+        sheet.append_rows(rows, value_input_option='USER_ENTERED')
+        
+    print(f"✅ {len(closed_data)} positions logged to closed_positions")
+
+
+def build_closed_position_rows(closed_data):
+    """CLOSED_POSITIONS_HEADER rows for closed positions."""
     rows = []
     for so in closed_data:
         strategy = so.get('strategy', '').upper()
@@ -621,9 +627,5 @@ def log_closed_positions(closed_data):
             so.get('expiry')
         ]
         rows.append(row)
-    
-    if rows:
-        sheet.append_rows(rows, value_input_option='USER_ENTERED')
-        
-    print(f"✅ {len(closed_data)} positions logged to closed_positions")
+    return rows
 
@@ -0,0 +1,374 @@
+# orbiter/bot/sheets_sink.py
+"""
+Sheets Sink - one authorized Google Sheets client behind a background queue.
+
+Producers (engine loop, executor, ReportingService) enqueue and return at once;
+a single worker thread owns the workbook and does every network call.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.bot import sheets
+
+logger = logging.getLogger("ORBITER")
+
+
+# ---------------------------------------------------------------- backends
+class GoogleSheetsBook:
+    """gspread workbook authorized once; worksheet handles are cached until an error resets them."""
+
+    def __init__(self, sheet_name: str = "trade_log"):
+        self.sheet_name = sheet_name
+        self._book = None
+        self._worksheets: Dict[str, Any] = {}
+
+    def _open(self):
+        if self._book is None:
+            self._book = sheets._open_book(self.sheet_name)
+            logger.info(f"☁️ SheetsSink: authorized and opened '{self.sheet_name}'")
+        return self._book
+
+    def worksheet(self, title: str):
+        ws = self._worksheets.get(title)
+        if ws is None:
+            ws = self._worksheets[title] = self._open().worksheet(title)
+        return ws
+
+    def add_worksheet(self, title: str, rows: str = "1000", cols: str = "20"):
+        ws = self._worksheets[title] = self._open().add_worksheet(title=title, rows=rows, cols=cols)
+        return ws
+
+    def reset(self):
+        """Drop the client and handles; the next call re-authorizes (expired token, deleted tab)."""
+        self._book = None
+        self._worksheets.clear()
+
+
+_A1_RE = re.compile(r"^([A-Z]+)(\d+)")
+
+
+def _a1_start(a1: str):
+    """'C5' / 'C5:F5' → zero-based (row, col)."""
+    m = _A1_RE.match(a1.upper())
+    if not m:
+        raise ValueError(f"Unsupported range: {a1}")
+    col = 0
+    for ch in m.group(1):
+        col = col * 26 + (ord(ch) - ord('A') + 1)
+    return int(m.group(2)) - 1, col - 1
+
+
+class LocalWorksheet:
+    """In-memory worksheet with the subset of the gspread API that sheets.py uses."""
+
+    def __init__(self, title: str):
+        self.title = title
+        self.rows: List[List[Any]] = []
+
+    def row_values(self, index: int):
+        return list(self.rows[index - 1]) if 0 < index <= len(self.rows) else []
+
+    def insert_row(self, values, index: int = 1):
+        self.rows.insert(index - 1, list(values))
+
+    def append_rows(self, rows, value_input_option=None):
+        self.rows.extend(list(r) for r in rows)
+
+    def clear(self):
+        self.rows = []
+
+    def update(self, range_name: str, values):
+        r0, c0 = _a1_start(range_name)
+        for i, vals in enumerate(values):
+            while len(self.rows) <= r0 + i:
+                self.rows.append([])
+            row = self.rows[r0 + i]
+            while len(row) < c0 + len(vals):
+                row.append("")
+            row[c0:c0 + len(vals)] = list(vals)
+
+    def batch_update(self, updates):
+        for upd in updates:
+            self.update(upd['range'], upd['values'])
+
+    def get_all_values(self):
+        return [list(r) for r in self.rows]
+
+    def get(self, range_name: str):
+        r0, c0 = _a1_start(range_name)
+        if r0 >= len(self.rows):
+            return []
+        return [self.rows[r0][c0:]]
+
+
+class LocalBook:
+    """Offline stand-in for a gspread workbook (tests, dry runs, no credentials.json)."""
+
+    def __init__(self):
+        self.worksheets: Dict[str, LocalWorksheet] = {}
+
+    def worksheet(self, title: str):
+        if title not in self.worksheets:
+            raise KeyError(f"WorksheetNotFound: {title}")
+        return self.worksheets[title]
+
+    def add_worksheet(self, title: str, rows: str = "1000", cols: str = "20"):
+        return self.worksheets.setdefault(title, LocalWorksheet(title))
+
+    def reset(self):
+        pass
+
+
+# -------------------------------------------------------------------- sink
+class SheetsSink:
+    """
+    Non-blocking Google Sheets writer.
+
+    - Appends (trade_log, closed_positions) are batched per tab into one `append_rows`.
+    - Snapshots (active_positions, engine_state) are latest-wins: a newer one replaces the queued one.
+    - Scan metrics are merged per tab by token, so a backlog turns into one upsert.
+    - Failed writes are retried `max_retries` times with exponential backoff, re-opening the book.
+    - Backpressure: past `max_pending_rows` queued append rows, the oldest are dropped and counted.
+    """
+
+    _instance: 'SheetsSink | None' = None
+
+    def __init__(self, book=None, flush_interval: float = 1.0, max_pending_rows: int = 5000,
+                 max_retries: int = 3, retry_backoff: float = 1.0, autostart: bool = True):
+        self.book = book if book is not None else GoogleSheetsBook()
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._pending: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._pending_rows = 0
+        self._cond = threading.Condition()
+        self._busy = False
+        self._running = False
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._writes = 0
+        self._rows_written = 0
+        self._coalesced = 0
+        self._retries = 0
+        self._failed = 0
+        self._dropped_rows = 0
+
+        if autostart:
+            self.start()
+
+    @classmethod
+    def get_instance(cls) -> 'SheetsSink':
+        """Process-wide sink. Uses the local backend when ORBITER_SHEETS_BACKEND=local or credentials are missing."""
+        if cls._instance is None:
+            creds_path = os.path.join(os.path.dirname(sheets.__file__), "credentials.json")
+            if os.environ.get("ORBITER_SHEETS_BACKEND", "").lower() == "local" or not os.path.exists(creds_path):
+                logger.warning("⚠️ SheetsSink: using local in-memory backend (no Google Sheets credentials)")
+                cls._instance = cls(book=LocalBook())
+            else:
+                cls._instance = cls()
+        return cls._instance
+
+    # -------------------------------------------------------------- producers
+    def log_buy_signals(self, buy_signals):
+        if buy_signals:
+            rows = sheets.build_buy_signal_rows(buy_signals, self._timestamp())
+            self._append("trade_log", sheets.TRADE_LOG_HEADER, rows)
+
+    def log_square_off(self, square_offs):
+        if square_offs:
+            rows = sheets.build_square_off_rows(square_offs, self._timestamp())
+            self._append("trade_log", sheets.TRADE_LOG_HEADER, rows)
+
+    def log_closed_positions(self, closed_data):
+        if closed_data:
+            rows = sheets.build_closed_position_rows(closed_data)
+            self._append("closed_positions", sheets.CLOSED_POSITIONS_HEADER, rows, 'USER_ENTERED')
+
+    def update_active_positions(self, active_data):
+        data = list(active_data or [])
+        self._latest(('snapshot', 'active_positions'), lambda book: sheets.update_active_positions(data, book=book))
+
+    def update_engine_state(self, state_json_str):
+        self._latest(('snapshot', 'engine_state'), lambda book: sheets.update_engine_state(state_json_str, book=book))
+
+    def log_scan_metrics(self, metrics, tab_name: str = "scan_metrics"):
+        if not metrics:
+            return
+        with self._cond:
+            key = ('metrics', tab_name)
+            op = self._pending.get(key)
+            if op is None:
+                op = self._pending[key] = {'type': 'metrics', 'tab': tab_name, 'items': OrderedDict()}
+            else:
+                self._coalesced += 1
+            for item in metrics:
+                op['items'][item.get('token')] = item
+            self._cond.notify()
+
+    def clear_sheet(self, tab_name: str, header: List[str] = None):
+        """Clear a tab (and re-write its header). Queued scan metrics for the tab are superseded."""
+        with self._cond:
+            if self._pending.pop(('metrics', tab_name), None) is not None:
+                self._coalesced += 1
+            self._pending.pop(('clear', tab_name), None)
+            self._pending[('clear', tab_name)] = {'type': 'clear', 'tab': tab_name, 'header': header}
+            self._cond.notify()
+
+    # ------------------------------------------------------------------ reads
+    def get_engine_state(self):
+        """Synchronous read (startup/handover only) through the persistent book."""
+        return sheets.get_engine_state(book=self.book)
+
+    # -------------------------------------------------------------- lifecycle
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="SheetsSink", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything queued so far is written (or timeout). Returns True if drained."""
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending_ops": len(self._pending),
+            "pending_rows": self._pending_rows,
+            "writes": self._writes,
+            "rows_written": self._rows_written,
+            "coalesced": self._coalesced,
+            "retries": self._retries,
+            "failed": self._failed,
+            "dropped_rows": self._dropped_rows
+        }
+
+    # -------------------------------------------------------------- internals
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S IST")
+
+    def _append(self, tab: str, header: List[str], rows: List[list], value_input_option: str = None):
+        if not rows:
+            return
+        with self._cond:
+            key = ('append', tab, value_input_option)
+            op = self._pending.get(key)
+            if op is None:
+                op = self._pending[key] = {'type': 'append', 'tab': tab, 'header': header,
+                                           'vio': value_input_option, 'rows': []}
+            op['rows'].extend(rows)
+            self._pending_rows += len(rows)
+            self._shed_rows()
+            self._cond.notify()
+
+    def _shed_rows(self):
+        """Drop the oldest queued append rows beyond max_pending_rows (called under the lock)."""
+        excess = self._pending_rows - self.max_pending_rows
+        if excess <= 0:
+            return
+        if self._dropped_rows == 0:
+            logger.warning(f"⚠️ SheetsSink backlog over {self.max_pending_rows} rows; dropping oldest")
+        for op in self._pending.values():
+            if excess <= 0:
+                break
+            if op['type'] == 'append' and op['rows']:
+                n = min(excess, len(op['rows']))
+                del op['rows'][:n]
+                excess -= n
+                self._pending_rows -= n
+                self._dropped_rows += n
+
+    def _latest(self, key: tuple, write: Callable):
+        with self._cond:
+            if key in self._pending:
+                self._coalesced += 1
+            self._pending[key] = {'type': 'call', 'write': write}
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running and not self._pending:
+                    return
+                batch, self._pending = self._pending, OrderedDict()
+                self._pending_rows = 0
+                self._busy = True
+            try:
+                for op in batch.values():
+                    self._write(op)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+            if self._running and self.flush_interval > 0:
+                # Let producers accumulate a batch before the next round-trip
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+
+    def _write(self, op: Dict[str, Any]):
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._apply(op)
+                self._writes += 1
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self._failed += 1
+                    logger.error(f"❌ SheetsSink write failed after {attempt + 1} attempts ({op['type']}): {e}")
+                    return
+                self._retries += 1
+                logger.warning(f"⚠️ SheetsSink write error ({op['type']}), retry {attempt + 1}: {e}")
+                self.book.reset()
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _apply(self, op: Dict[str, Any]):
+        kind = op['type']
+        if kind == 'call':
+            op['write'](self.book)
+        elif kind == 'append':
+            if not op['rows']:
+                return
+            sheet = sheets._get_or_create_worksheet(self.book, op['tab'])
+            sheets._ensure_header(sheet, op['header'])
+            if op['vio']:
+                sheet.append_rows(op['rows'], value_input_option=op['vio'])
+            else:
+                sheet.append_rows(op['rows'])
+            self._rows_written += len(op['rows'])
+        elif kind == 'metrics':
+            sheets.log_scan_metrics(list(op['items'].values()), tab_name=op['tab'], book=self.book)
+        elif kind == 'clear':
+            sheet = sheets._get_or_create_worksheet(self.book, op['tab'])
+            sheet.clear()
+            if op['header']:
+                sheet.insert_row(op['header'], 1)
@@ -236,7 +236,12 @@ class SummaryManager:
                 try:
                     spot_token_id = self.broker.master.SYMBOL_TO_TOKEN.get(clean_name.upper())
                     if spot_token_id and not spot_token_id.startswith('NFO') and not spot_token_id.startswith('MCX'):
-                        quote = self.broker.api.get_quotes(exchange='NSE', token=spot_token_id)
+                        # Quote cache serves live websocket quotes without REST load during market hours
+                        quotes = getattr(self.broker, 'quotes', None)
+                        if quotes is not None:
+                            quote = quotes.get_quote('NSE', token=spot_token_id, max_age=60)
+                        else:
+                            quote = self.broker.api.get_quotes(exchange='NSE', token=spot_token_id)
                         if quote:
                             ltp_spot = float(quote.get('lp') or 0)
                             baseline_price = float(quote.get('c') or 0)
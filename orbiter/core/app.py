@@ -1,14 +1,18 @@
 # orbiter/core/app.py
 
+import contextlib
 import logging
 import time
 import traceback
 import threading
+from typing import Callable
 from orbiter.core.app_builder import AppBuilder
 from orbiter.core.engine.builder.engine_factory import EngineFactory
 from orbiter.core.reporting_service import ReportingService
+from orbiter.core.regime_service import RegimeService
 from orbiter.core.auth_service import AuthService
 from orbiter.core.ancillary_service import AncillaryServiceManager
+from orbiter.bot.alert_bus import AlertBus, AlertLogHandler
 
 logger = logging.getLogger("ORBITER")
 
@@ -22,13 +26,29 @@ class OrbiterApp:
         self.logged_in = False
         self._services = AncillaryServiceManager(self)
         self._services.register(ReportingService(self))
+        self._services.register(RegimeService(self))
+        self._alert_handler = None
 
-    def start(self):
+    def start(self, phase: Callable = None, on_ready: Callable = None):
+        """prepare() (timed by `phase(name)` when given), then `on_ready()`, then the main loop."""
+        with (phase("OrbiterApp.prepare (setup, services)") if phase else contextlib.nullcontext()):
+            self.prepare()
+        if on_ready is not None:
+            on_ready()
+        self.run()
+
+    def prepare(self):
+        """Everything `start` does before the main loop: alerts, setup, background services."""
         logger.info(self.ctx.constants.get('constants', 'app_started_msg', "🚀 Machine Started"))
+        # ERROR+ log records become grouped, rate-limited Telegram alerts
+        self._alert_handler = AlertLogHandler(AlertBus.get_instance())
+        logger.addHandler(self._alert_handler)
         # Run initial setup before entering main loop
         self.setup()
+        # Warm the proxy fallback cache in the background before the first scan
+        from orbiter.utils.fallback_data import FallbackDataProvider
+        FallbackDataProvider.get_instance()
         self._services.start_all()
-        self.run()
 
     def run(self):
         logger.debug("Entering main application loop.")
@@ -57,6 +77,9 @@ class OrbiterApp:
         self._services.stop_all()
         if hasattr(self.ctx, 'engine') and self.ctx.engine and hasattr(self.ctx.engine, 'shutdown'):
             self.ctx.engine.shutdown("User initiated stop")
+        if self._alert_handler:
+            logger.removeHandler(self._alert_handler)
+            self._alert_handler.bus.stop()
 
     def setup(self):
         logger.debug("Setting up engine.")
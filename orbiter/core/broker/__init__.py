@@ -10,6 +10,9 @@ to the broker's trading API. It composes several specialized managers:
 - margin: MarginCalculator - Margin calculations
 - executor: OrderExecutor - Order placement (paper or live)
 - conn.tick_handler: TickHandler - Real-time tick data management
+- quotes: QuoteCache - Websocket-fed quotes with coalesced REST fallback
+- orders: OrderStore - Order/position state fed by the order-update stream
+- fills: FillSimulator - Tick-driven paper fills (None unless execution_policy.paper_fills.enabled)
 
 Usage:
     from orbiter.core.broker import BrokerClient
@@ -83,7 +86,9 @@ class BrokerClient:
         # Margin calculations
         config = self._load_config('broker_config')
         cache_path = config.get('span_cache_path') if config else None
-        self.margin = MarginCalculator(self.master, cache_path)
+        from orbiter.utils.data_manager import DataManager
+        risk_params_path = DataManager.get_path(project_root, 'optional_files', 'risk_parameters')
+        self.margin = MarginCalculator(self.master, cache_path, risk_params_path)
         
         # Tick data management
         from orbiter.core.broker.tick_handler import TickHandler
@@ -91,9 +96,37 @@ class BrokerClient:
             self.conn.api, self.master, project_root, self.segment_name
         )
         
+        # Shared quote cache (fed by the tick handler, REST on miss)
+        from orbiter.core.broker.quote_cache import QuoteCache
+        self.quotes = QuoteCache(
+            self.conn.api, self.master,
+            subscribe=getattr(self.conn, 'subscribe', None),
+            is_live=lambda: getattr(self.conn, 'socket_opened', False)
+        )
+        self.conn.tick_handler.quote_cache = self.quotes
+        self.conn.tick_handler.register_tick_callback(self.quotes.on_tick)
+        
+        # Order/position store (order-update websocket, REST reconciliation for live trading)
+        from orbiter.core.broker.order_store import OrderStore
+        self.orders = OrderStore(self.conn.api, self.master)
+        if hasattr(self.conn, 'register_order_callback'):
+            self.conn.register_order_callback(self.orders.on_order_update)
+        if real_broker_trade:
+            self.orders.start()
+        
         # Execution policy
         exch_config = self._load_config('exchange_config')
         policy = exch_config.get(self.segment_name, {}).get('execution_policy', {})
+        self.margin.source = policy.get('margin_source', 'broker')
+        
+        # Tick-driven paper fills (latency, spread crossing, partial fills, MTM)
+        self.fills = None
+        paper_fills = policy.get('paper_fills') or {}
+        if not real_broker_trade and paper_fills.get('enabled'):
+            from orbiter.core.broker.fill_simulator import FillSimulator
+            self.fills = FillSimulator.from_policy(paper_fills, self.conn.api, self.quotes, self.master)
+            self.conn.tick_handler.register_tick_callback(self.fills.on_tick)
+            self.fills.register_order_callback(self.orders.on_order_update)
         
         # Order executor (paper or live)
         from orbiter.core.broker.executor import create_executor
@@ -104,7 +137,11 @@ class BrokerClient:
             real_broker_trade=self.real_broker_trade,
             execution_policy=policy,
             project_root=project_root,
-            segment_name=self.segment_name
+            segment_name=self.segment_name,
+            quote_cache=self.quotes,
+            order_store=self.orders,
+            fill_simulator=self.fills,
+            margin=self.margin
         )
         
         logger.info(f"[BrokerClient] Initialized for {segment_name} (real_trade={real_broker_trade})")
@@ -29,7 +29,8 @@ class BrokerOrderExecutor:
     """Real broker trading executor - composes Future and Options executors."""
     
     def __init__(self, api, master=None, resolver=None, execution_policy: Dict = None, 
-                 project_root: str = None, segment_name: str = None):
+                 project_root: str = None, segment_name: str = None, quote_cache=None,
+                 order_store=None, margin=None):
         self.api = api
         self.master = master
         self.resolver = resolver
@@ -45,6 +46,20 @@ class BrokerOrderExecutor:
         self._options_executor = BrokerOptionsOrderExecutor(
             api, master, resolver, execution_policy, project_root, segment_name
         )
+        self._future_executor.quote_cache = quote_cache
+        self._options_executor.quote_cache = quote_cache
+        self._options_executor.dispatcher.order_store = order_store # fill-gated spread phases
+        self._options_executor.margin = margin # local incremental margin gate for spreads
+        
+        # Adaptive LMT pricing from live depth instead of lp + fixed slippage buffer
+        self.chaser = None
+        limit_chase = self.policy.get('limit_chase') or {}
+        if limit_chase.get('enabled'):
+            from orbiter.core.broker.limit_chaser import LimitChaser
+            self.chaser = LimitChaser.from_policy(limit_chase, api, quote_cache, order_store)
+            self._future_executor.chaser = self.chaser
+            self._options_executor.chaser = self.chaser
+            self._options_executor.dispatcher.place_fn = self.chaser.place_leg
         
         self.logger.info("[BROKER] BrokerOrderExecutor initialized for live trading")
     
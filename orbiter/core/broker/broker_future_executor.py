@@ -28,12 +28,22 @@ class BrokerFutureOrderExecutor(FutureOrderExecutor):
 
         price_type, order_price = self._get_execution_params(tsym, price_type)
 
+        if price_type == 'LMT' and self.chaser is not None:
+            order = dict(buy_or_sell=side, product_type=product_type, exchange=exch, tradingsymbol=tsym,
+                         quantity=lot, discloseqty=0, price_type='LMT', price=0, trigger_price=None,
+                         retention='DAY', remarks=f'orb_future_{side_name}')
+            chase = self.chaser.execute(order, token=details.get('token'))
+            self.logger.info(f"chase_call side={side} exch={exch} sym={tsym} qty={lot} result={chase}")
+            if not chase.get('ok'):
+                # Not COMPLETE: no partial position is left behind
+                self.chaser.unwind(order, chase)
+                return {'ok': False, 'reason': f"future_order_failed: {chase.get('reason')}", 'resp': chase.get('resp'),
+                        'chase': chase}
+            return {**details, 'ok': True, 'resp': chase['resp'], 'side': side, 'chase': chase}
+
         if price_type == 'LMT':
             try:
-                q = self.api.get_quotes(exchange=exch, token=details.get('token'))
-                if not q or not q.get('lp'):
-                    q = self.api.get_quotes(exchange=exch, token=tsym)
-                order_price = float(q.get('lp', 0))
+                order_price = self._quote_ltp(exch, details.get('token'), tsym)
                 
                 if order_price == 0:
                     return {'ok': False, 'reason': f"limit_price_fetch_failed for {tsym}"}
@@ -4,6 +4,7 @@ Broker Options Order Executor - real broker option trading.
 """
 
 from typing import Dict
+from orbiter.core.broker.multi_leg import MultiLegDispatcher
 from orbiter.core.broker.options_executor import OptionsOrderExecutor
 
 
@@ -13,6 +14,8 @@ class BrokerOptionsOrderExecutor(OptionsOrderExecutor):
     def __init__(self, api, master=None, resolver=None, execution_policy: Dict = None, 
                  project_root: str = None, segment_name: str = None):
         super().__init__(api, master, resolver, execution_policy, project_root, segment_name, paper_trade=False)
+        self.dispatcher = MultiLegDispatcher(api)
+        self.margin = None # MarginCalculator; spreads are gated on local incremental margin when it can price them
         self.logger.info("[BROKER_OPTIONS] BrokerOptionsOrderExecutor initialized")
     
     def place_option_order(self, option_details: Dict, side: str, execute: bool, product_type: str, price_type: str) -> Dict:
@@ -28,12 +31,24 @@ class BrokerOptionsOrderExecutor(OptionsOrderExecutor):
 
         price_type, order_price = self._get_execution_params(tsym, price_type)
 
+        if price_type == 'LMT' and self.chaser is not None:
+            order = dict(buy_or_sell=side, product_type=product_type, exchange=exch, tradingsymbol=tsym,
+                         quantity=lot, discloseqty=0, price_type='LMT', price=0, trigger_price=None,
+                         retention='DAY', remarks=f'orb_option_{side_name}')
+            chase = self.chaser.execute(order, token=option_details.get('token'))
+            self.logger.info(f"chase_call side={side} exch={exch} sym={tsym} qty={lot} result={chase}")
+            if not chase.get('ok'):
+                # Not COMPLETE: no partial position is left behind
+                self.chaser.unwind(order, chase)
+                return {'ok': False, 'reason': f"option_order_failed: {chase.get('reason')}", 'resp': chase.get('resp'),
+                        'chase': chase}
+            result = {**option_details, 'ok': True, 'resp': chase['resp'], 'side': side, 'chase': chase}
+            self.record_order(result)
+            return result
+
         if price_type == 'LMT':
             try:
-                q = self.api.get_quotes(exchange=exch, token=option_details.get('token'))
-                if not q or not q.get('lp'):
-                    q = self.api.get_quotes(exchange=exch, token=tsym)
-                order_price = float(q.get('lp', 0))
+                order_price = self._quote_ltp(exch, option_details.get('token'), tsym)
                 
                 if order_price == 0:
                     return {'ok': False, 'reason': f"limit_price_fetch_failed for {tsym}"}
@@ -76,20 +91,21 @@ class BrokerOptionsOrderExecutor(OptionsOrderExecutor):
             self.logger.info(f"sim_spread side={side} atm={atm_sym} hedge={hedge_sym} qty={lot} product={product_type}")
             return {**spread, 'dry_run': True}
 
+        blocked = self._spread_margin_block({**spread, 'lot_size': lot})
+        if blocked:
+            return blocked
+
         price_type, atm_price = self._get_execution_params(atm_sym, price_type)
         _, hedge_price = self._get_execution_params(hedge_sym, price_type)
 
-        if price_type == 'LMT':
+        if price_type == 'LMT' and self.chaser is None:
             try:
-                h_q = self.api.get_quotes(exchange=exch, token=spread.get('hedge_token'))
-                if not h_q or not h_q.get('lp'):
-                    h_q = self.api.get_quotes(exchange=exch, token=hedge_sym)
-                hedge_price = float(h_q.get('lp', 0))
-
-                a_q = self.api.get_quotes(exchange=exch, token=spread.get('atm_token'))
-                if not a_q or not a_q.get('lp'):
-                    a_q = self.api.get_quotes(exchange=exch, token=atm_sym)
-                atm_price = float(a_q.get('lp', 0))
+                if self.quote_cache is not None:
+                    # Both legs in one batch; websocket-fed legs cost no round-trip
+                    self.quote_cache.get_quotes([(exch, spread.get('hedge_token'), hedge_sym),
+                                                 (exch, spread.get('atm_token'), atm_sym)])
+                hedge_price = self._quote_ltp(exch, spread.get('hedge_token'), hedge_sym)
+                atm_price = self._quote_ltp(exch, spread.get('atm_token'), atm_sym)
                 
                 if atm_price == 0 or hedge_price == 0:
                     return {'ok': False, 'reason': f"limit_price_fetch_failed: atm={atm_price}, hedge={hedge_price}"}
@@ -100,26 +116,57 @@ class BrokerOptionsOrderExecutor(OptionsOrderExecutor):
             except Exception as e:
                 return {'ok': False, 'reason': f"limit_price_error: {e}"}
 
-        h_res = self.api.place_order(buy_or_sell='B', product_type=product_type, exchange=exch, tradingsymbol=hedge_sym,
-                                    quantity=lot, discloseqty=0, price_type=price_type, price=hedge_price, trigger_price=None,
-                                    retention='DAY', remarks=f'orb_{side.lower()}_hedge')
-        self.logger.info(f"order_call side=B exch={exch} sym={hedge_sym} qty={lot} resp={h_res}")
-
-        if not h_res or h_res.get('stat') != 'Ok':
-             return {'ok': False, 'reason': f"hedge_leg_failed: {h_res.get('emsg') if h_res else 'No response'}", 'resp': h_res}
-
-        a_res = self.api.place_order(buy_or_sell='S', product_type=product_type, exchange=exch, tradingsymbol=atm_sym,
-                                    quantity=lot, discloseqty=0, price_type=price_type, price=atm_price, trigger_price=None,
-                                    retention='DAY', remarks=f'orb_{side.lower()}_atm')
-        self.logger.info(f"order_call side=S exch={exch} sym={atm_sym} qty={lot} resp={a_res}")
-
-        if not a_res or a_res.get('stat') != 'Ok':
-             return {'ok': False, 'reason': f"atm_leg_failed: {a_res.get('emsg') if a_res else 'No response'}", 'resp': a_res, 'hedge_order_id': h_res.get('norenordno')}
+        # Hedge first (margin benefit), then ATM; a failed ATM leg unwinds the hedge
+        # With a LimitChaser the dispatcher's place_fn prices LMT legs from live depth
+        hedge_leg = {'name': 'hedge', 'token': spread.get('hedge_token'), 'order': dict(
+            buy_or_sell='B', product_type=product_type, exchange=exch, tradingsymbol=hedge_sym, quantity=lot,
+            discloseqty=0, price_type=price_type, price=hedge_price, trigger_price=None, retention='DAY',
+            remarks=f'orb_{side.lower()}_hedge')}
+        atm_leg = {'name': 'atm', 'token': spread.get('atm_token'), 'order': dict(
+            buy_or_sell='S', product_type=product_type, exchange=exch, tradingsymbol=atm_sym, quantity=lot,
+            discloseqty=0, price_type=price_type, price=atm_price, trigger_price=None, retention='DAY',
+            remarks=f'orb_{side.lower()}_atm')}
+        dispatch = self.dispatcher.execute(
+            [[hedge_leg], [atm_leg]],
+            gate=self.policy.get('spread_phase_gate', 'ack'),
+            rollback=self.policy.get('rollback_partial_spreads', True),
+            timeout=self.policy.get('spread_phase_timeout_seconds', 5.0)
+        )
+        legs = {leg['name']: leg for leg in dispatch['legs']}
+        h_res = legs['hedge']['resp']
+        a_res = legs['atm']['resp'] if 'atm' in legs else None
+
+        if not legs['hedge']['ok'] or (dispatch['failed_phase'] == 1):
+             return {'ok': False, 'reason': f"hedge_leg_failed: {legs['hedge']['reason']}", 'resp': h_res,
+                     'rolled_back': dispatch['rolled_back']}
+
+        if not dispatch['ok']:
+             return {'ok': False, 'reason': f"atm_leg_failed: {legs['atm']['reason']}", 'resp': a_res,
+                     'hedge_order_id': h_res.get('norenordno'), 'rolled_back': dispatch['rolled_back']}
 
         result = {**spread, 'ok': True, 'atm_resp': a_res, 'hedge_resp': h_res}
         self.record_order(result)
         return result
     
+    def _spread_margin_block(self, spread: Dict) -> Dict:
+        """Block result when the spread's incremental margin over the held portfolio exceeds what is available."""
+        if self.margin is None or self.margin.portfolio_margin is None:
+            return None
+        try:
+            limits = self.api.get_limits()
+        except Exception as e:
+            self.logger.warning(f"margin_check limits unavailable: {e}")
+            return None
+        if not limits or limits.get('stat') != 'Ok':
+            return None
+        available = float(limits.get('cash', 0)) + float(limits.get('collateral', 0)) - float(limits.get('marginused', 0))
+        check = self.margin.check_spread(spread, available)
+        if not check.get('ok') or check['allowed']:
+            return None
+        self.logger.warning(f"margin_block atm={spread['atm_symbol']} hedge={spread['hedge_symbol']} "
+                            f"required={check['required']} available={available}")
+        return {'ok': False, 'reason': 'margin_blocked', 'margin': check}
+
     def _get_execution_params(self, tsym: str, requested_price_type: str) -> tuple:
         """Resolves price_type and initial order_price based on policy."""
         price_type = requested_price_type
@@ -58,6 +58,7 @@ class ConnectionManager:
         self._should_reconnect = True
         self._symbols_to_subscribe = []
         self._on_tick_callback = None
+        self._order_callbacks = []
         self._pending_reconnect = False
         self.tick_handler = None
         
@@ -244,6 +245,8 @@ class ConnectionManager:
             self.socket_opened = True
             self._reconnect_attempts = 0
             logger.info("🚀 WEBSOCKET LIVE!")
+            if getattr(self.tick_handler, 'backfill', None):
+                self.tick_handler.backfill.on_reconnect()
             formatted_symbols = []
             for s in symbols:
                 if isinstance(s, dict):
@@ -265,15 +268,39 @@ class ConnectionManager:
         def on_close():
             logger.warning(f"🔌 WebSocket closed. Attempting reconnect...")
             self.socket_opened = False
+            if getattr(self.tick_handler, 'backfill', None):
+                self.tick_handler.backfill.mark_disconnect()
             self._schedule_reconnect()
         
         self.api.start_websocket(
             subscribe_callback=on_tick,
             socket_open_callback=on_open,
             socket_close_callback=on_close,
-            order_update_callback=lambda x: print("📋 ORDER:", x)
+            order_update_callback=self._on_order_update
         )
 
+    def register_order_callback(self, callback):
+        """callback(message) for every order update from the websocket."""
+        self._order_callbacks.append(callback)
+
+    def _on_order_update(self, message):
+        print("📋 ORDER:", message)
+        for callback in self._order_callbacks:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"Order update callback error: {e}")
+
+    def subscribe(self, keys: List[str]):
+        """Add 'EXCH|token' keys to the live feed; they are re-subscribed on reconnect."""
+        new_keys = [k for k in keys if k not in self._symbols_to_subscribe]
+        if not new_keys:
+            return
+        self._symbols_to_subscribe.extend(new_keys)
+        if self.socket_opened:
+            logger.debug(f"Subscribing to: {new_keys}")
+            self.api.subscribe(new_keys, feed_type='d')
+
     def _schedule_reconnect(self):
         if not self._should_reconnect:
             return
@@ -310,3 +337,5 @@ class ConnectionManager:
         if self.socket_opened:
             self.api.close_websocket()
             print("🔌 Connection closed")
+        if getattr(self.tick_handler, 'ingest', None):
+            self.tick_handler.ingest.stop()
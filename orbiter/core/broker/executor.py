@@ -8,11 +8,15 @@ from orbiter.core.engine.action.interfaces import OrderExecutorInterface
 
 
 def create_executor(api, master=None, resolver=None, real_broker_trade: bool = False, 
-                    execution_policy: Dict = None, project_root: str = None, segment_name: str = None) -> OrderExecutorInterface:
+                    execution_policy: Dict = None, project_root: str = None, segment_name: str = None,
+                    quote_cache=None, order_store=None, fill_simulator=None,
+                    margin=None) -> OrderExecutorInterface:
     """Factory function to create the appropriate executor."""
     if real_broker_trade:
         from orbiter.core.broker.broker_executor import BrokerOrderExecutor
-        return BrokerOrderExecutor(api, master, resolver, execution_policy, project_root, segment_name)
+        return BrokerOrderExecutor(api, master, resolver, execution_policy, project_root, segment_name,
+                                   quote_cache=quote_cache, order_store=order_store, margin=margin)
     else:
         from orbiter.core.broker.paper_executor import PaperOrderExecutor
-        return PaperOrderExecutor(api, master, resolver, execution_policy, project_root, segment_name)
+        return PaperOrderExecutor(api, master, resolver, execution_policy, project_root, segment_name,
+                                  fill_simulator=fill_simulator, margin=margin)
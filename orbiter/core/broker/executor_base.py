@@ -37,6 +37,21 @@ class BaseOrderExecutor(ABC):
         self.paper_trade = paper_trade
         self.logger = _create_logger(project_root, segment_name)
         self.order_manager = OrderManager(project_root, segment_name, paper_trade)
+        self.quote_cache = None # Set by BrokerClient; None falls back to direct REST quotes
+        self.chaser = None # LimitChaser when execution_policy.limit_chase is enabled
+    
+    def _quote_ltp(self, exch: str, token: str, tsym: str) -> float:
+        """LTP for an order leg: shared quote cache first, REST by token then tradingsymbol otherwise."""
+        if self.quote_cache is not None:
+            ltp = self.quote_cache.get_ltp(exch, token=token, tsym=tsym)
+            if not ltp and token and tsym:
+                # Token unknown to the broker (stale master): let the API resolve the tradingsymbol
+                ltp = self.quote_cache.get_ltp(exch, token=tsym)
+            return ltp or 0.0
+        q = self.api.get_quotes(exchange=exch, token=token)
+        if not q or not q.get('lp'):
+            q = self.api.get_quotes(exchange=exch, token=tsym)
+        return float(q.get('lp', 0))
     
     def record_order(self, order_result: Dict):
         """Record an order in the order manager."""
@@ -0,0 +1,283 @@
+# orbiter/core/broker/feed_simulator.py
+"""
+Feed Simulator - a local stand-in for the NorenApi websocket.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("ORBITER")
+
+
+class RandomWalkSource:
+    """Seeded random-walk LTP per 'EXCH|token'."""
+
+    def __init__(self, base_prices: Dict[str, float], volatility: float = 0.0005, seed: int = 7):
+        self._prices = dict(base_prices)
+        self.volatility = volatility
+        self._rng = random.Random(seed)
+
+    def next_price(self, key: str) -> float:
+        price = self._prices.get(key) or 100.0
+        price = max(0.05, price * (1 + self._rng.gauss(0, self.volatility)))
+        self._prices[key] = price
+        return price
+
+
+class RecordedSource:
+    """Replays recorded prices per 'EXCH|token', looping at the end."""
+
+    def __init__(self, prices: Dict[str, List[float]]):
+        self._prices = {k: v for k, v in prices.items() if v}
+        self._pos = {k: 0 for k in self._prices}
+
+    @classmethod
+    def from_replay_file(cls, path: str) -> 'RecordedSource':
+        """MockBrokerClient replay format: {symbol: {exchange, token, candles: [{intc, ...}]}}."""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        prices = {}
+        for info in data.values():
+            if isinstance(info, dict) and info.get('candles'):
+                key = f"{info.get('exchange', 'NSE')}|{info.get('token', '')}"
+                prices[key] = [float(c['intc']) for c in info['candles'] if c.get('intc')]
+        return cls(prices)
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._prices)
+
+    def next_price(self, key: str) -> float:
+        series = self._prices.get(key)
+        if not series:
+            return 100.0
+        i = self._pos[key]
+        self._pos[key] = (i + 1) % len(series)
+        return series[i]
+
+
+class SimulatedFeedApi:
+    """
+    Generates Shoonya-shaped market data at a target message rate.
+
+    Flow:
+        start_websocket(callbacks) → feed thread → socket_open_callback
+                                          ↓
+        subscribe(['NFO|123', ...]) → round-robin over subscribed keys
+                                          ↓
+        subscribe_callback({'t','e','tk','lp','h','l','v','ft'}) at `rate` msgs/s
+
+    The first message per token is a 'dk' acknowledgement, later ones are 'df'
+    updates, as on the real depth feed. Messages are emitted in paced batches,
+    so one callback slower than the rate shows up as `behind` in the stats
+    rather than as sleep drift. Each message carries `sim_ts` (perf_counter at
+    send) unless `stamp=False`, for tick-to-decision latency downstream.
+
+    Fault injection:
+    - `inject_disconnect()` drops the socket: the close callback fires and the
+      stream stops until `start_websocket` is called again (ConnectionManager's
+      reconnect does that). Subscriptions are lost, as on a real new socket.
+    - `burst(n)` emits n extra messages as fast as the callback takes them.
+    - `disconnect_every` / `burst_every` schedule both from the feed thread.
+
+    Anything else (REST calls such as get_time_price_series) is delegated to
+    `rest_api` when one is given.
+    """
+
+    def __init__(self, source=None, rate: float = 5000, rest_api=None, stamp: bool = True,
+                 batch_seconds: float = 0.005, disconnect_every: float = 0, burst_every: float = 0,
+                 burst_size: int = 0, seed: int = 7, clock: Callable[[], float] = time.perf_counter):
+        self.source = source or RandomWalkSource({}, seed=seed)
+        self.rate = float(rate)
+        self.rest_api = rest_api
+        self.stamp = stamp
+        self.batch_seconds = batch_seconds
+        self.disconnect_every = disconnect_every
+        self.burst_every = burst_every
+        self.burst_size = burst_size
+        self._clock = clock
+        self._rng = random.Random(seed)
+
+        self._callbacks: Dict[str, Optional[Callable]] = {}
+        self._keys: List[str] = []
+        self._day: Dict[str, List[float]] = {} # key -> [high, low, volume]
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._connected = False
+        self._drop_requested = False
+        self._pending_burst = 0
+
+        self._sent = 0
+        self._sessions = 0
+        self._disconnects = 0
+        self._bursts = 0
+        self._burst_messages = 0
+        self._active_seconds = 0.0
+        self._session_started: Optional[float] = None
+        self._behind = 0
+
+    def __getattr__(self, name):
+        rest_api = self.__dict__.get('rest_api')
+        if rest_api is None:
+            raise AttributeError(name)
+        return getattr(rest_api, name)
+
+    # ------------------------------------------------------------- websocket
+    def start_websocket(self, subscribe_callback=None, socket_open_callback=None, socket_close_callback=None,
+                        order_update_callback=None, **kwargs):
+        previous = self._thread
+        if previous and previous.is_alive() and previous is not threading.current_thread():
+            self._connected = False
+            previous.join(2.0)
+        self._callbacks = {'tick': subscribe_callback, 'open': socket_open_callback,
+                           'close': socket_close_callback, 'order': order_update_callback}
+        with self._lock:
+            self._keys = []
+        self._drop_requested = False
+        self._connected = True
+        self._sessions += 1
+        self._thread = threading.Thread(target=self._run, name=f"SimFeed-{self._sessions}", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, instrument, feed_type='t'):
+        keys = [instrument] if isinstance(instrument, str) else list(instrument)
+        with self._lock:
+            known = set(self._keys)
+            self._keys = self._keys + [k for k in keys if k not in known]
+
+    def unsubscribe(self, instrument, feed_type='t'):
+        keys = {instrument} if isinstance(instrument, str) else set(instrument)
+        with self._lock:
+            self._keys = [k for k in self._keys if k not in keys]
+
+    def subscribe_orders(self):
+        pass
+
+    def close_websocket(self):
+        self._connected = False
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(2.0)
+
+    # ------------------------------------------------------- fault injection
+    def inject_disconnect(self):
+        """Drop the socket from the feed thread (close callback fires there, like the real client)."""
+        self._drop_requested = True
+
+    def burst(self, messages: int):
+        self._pending_burst += int(messages)
+        self._bursts += 1
+        self._burst_messages += int(messages)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    # ------------------------------------------------------------ feed thread
+    def _run(self):
+        on_open = self._callbacks.get('open')
+        if on_open:
+            on_open()
+        started = self._session_started = self._clock()
+        next_disconnect = started + self.disconnect_every if self.disconnect_every > 0 else None
+        next_burst = started + self.burst_every if self.burst_every > 0 else None
+        emitted = 0
+        max_batch = max(1, int(self.rate * self.batch_seconds * 4))
+        now = started
+        while self._connected:
+            now = self._clock()
+            if self._drop_requested or (next_disconnect is not None and now >= next_disconnect):
+                self._drop()
+                break
+            if next_burst is not None and now >= next_burst:
+                self.burst(self.burst_size)
+                next_burst += self.burst_every
+
+            if not self._keys:
+                # Nothing subscribed yet: don't build a backlog to flush on the first subscribe
+                self._active_seconds += now - started
+                started = self._session_started = now
+                emitted = 0
+                time.sleep(self.batch_seconds)
+                continue
+            due = min(int((now - started) * self.rate) - emitted, max_batch)
+            extra = min(self._pending_burst, max_batch)
+            if due <= 0 and extra <= 0:
+                time.sleep(self.batch_seconds)
+                continue
+            if due > 0:
+                emitted += self._emit(due)
+            if extra > 0:
+                self._pending_burst -= extra
+                self._emit(extra)
+            self._behind = max(0, int((self._clock() - started) * self.rate) - emitted)
+        self._active_seconds += max(0.0, now - started)
+        self._session_started = None
+
+    def _drop(self):
+        self._connected = False
+        self._drop_requested = False
+        self._disconnects += 1
+        logger.info(f"🔌 [SimFeed] Injected disconnect #{self._disconnects}")
+        on_close = self._callbacks.get('close')
+        if on_close:
+            on_close()
+
+    def _emit(self, count: int) -> int:
+        on_tick = self._callbacks.get('tick')
+        keys = self._keys
+        if not on_tick or not keys:
+            return 0
+        ft = str(int(time.time()))
+        n_keys = len(keys)
+        offset = self._sent
+        for i in range(count):
+            if not self._connected:
+                return i
+            on_tick(self._message(keys[(offset + i) % n_keys], ft))
+            self._sent += 1
+        return count
+
+    def _message(self, key: str, ft: str) -> Dict[str, Any]:
+        ex, tk = key.split('|', 1)
+        lp = self.source.next_price(key)
+        day = self._day.get(key)
+        if day is None:
+            day = self._day[key] = [lp, lp, 0]
+            kind = 'dk'
+        else:
+            kind = 'df'
+            if lp > day[0]:
+                day[0] = lp
+            if lp < day[1]:
+                day[1] = lp
+        day[2] += self._rng.randint(1, 500)
+        msg = {'t': kind, 'e': ex, 'tk': tk, 'lp': f"{lp:.2f}", 'h': f"{day[0]:.2f}",
+               'l': f"{day[1]:.2f}", 'v': str(day[2]), 'ft': ft}
+        if self.stamp:
+            msg['sim_ts'] = self._clock()
+        return msg
+
+    # ------------------------------------------------------------------ stats
+    def get_stats(self) -> Dict[str, Any]:
+        active = self._active_seconds
+        session_started = self._session_started
+        if session_started is not None:
+            active += self._clock() - session_started
+        return {
+            "connected": self._connected,
+            "subscribed": len(self._keys),
+            "target_rate": self.rate,
+            "sent": self._sent,
+            "sessions": self._sessions,
+            "disconnects": self._disconnects,
+            "bursts": self._bursts,
+            "burst_messages": self._burst_messages,
+            "behind": self._behind,
+            "active_seconds": round(active, 3),
+            "achieved_rate": round(self._sent / active, 1) if active > 0 else None,
+        }
@@ -0,0 +1,432 @@
+# orbiter/core/broker/fill_simulator.py
+"""
+Fill Simulator - a paper exchange fed by the live tick stream.
+"""
+
+import logging
+import random
+import statistics
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+ACTIVE_STATUSES = frozenset({'PENDING', 'OPEN'})
+
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(pct * (len(samples) - 1)))]
+
+
+class FillSimulator:
+    """
+    Paper order entry with Noren-shaped responses; fills come from ticks.
+
+    Flow:
+        place_order(...) → PENDING, reaches the exchange after latency_ms (± jitter)
+                                          ↓
+        on_tick(symbol, tick) for that instrument → arrival checks (reject_rate,
+        price band) → OPEN → fill against the book:
+          - MKT and marketable LMT cross the spread: buy at the ask (sp1), sell
+            at the bid (bp1), limited by the touch quantity (sq1/bq1) when the
+            feed has depth. Without depth the book is lp ± half_spread_pct.
+          - Resting LMT fills at its limit only when the market trades through
+            it (buy: lp < limit, sell: lp > limit), for `participation` of the
+            volume traded since the previous tick. Fills are in whole lots, so
+            thin ticks accumulate until a lot is available.
+        → fillshares / avgprc updates until COMPLETE.
+
+    Every status change is sent to the registered order callbacks as a Noren
+    order-update row (norenordno, tsym, exch, token, trantype, qty, prc,
+    status, fillshares, avgprc, flprc, rejreason), so OrderStore consumes it
+    like the live websocket. Positions are marked to market on every tick.
+
+    Slippage is measured against the reference price when the order was
+    placed (lp, or mid when there is depth), in bps, positive = paid.
+    Anything else (get_quotes, span_calculator, ...) is delegated to `api`.
+    """
+
+    def __init__(self, api=None, quote_cache=None, master=None, latency_ms: float = 50.0,
+                 latency_jitter_ms: float = 20.0, half_spread_pct: float = 0.05, participation: float = 0.25,
+                 reject_rate: float = 0.0, price_band_pct: float = 20.0, seed: int = 7,
+                 clock: Callable[[], float] = time.time):
+        self.api = api
+        self.quote_cache = quote_cache
+        self.master = master
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.half_spread_pct = half_spread_pct
+        self.participation = participation
+        self.reject_rate = reject_rate
+        self.price_band_pct = price_band_pct
+        self._clock = clock
+        self._rng = random.Random(seed)
+
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._working: Dict[str, List[str]] = {} # key -> active order ids, in arrival order
+        self._books: Dict[str, Dict[str, float]] = {}
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._callbacks: List[Callable] = []
+        self._lock = threading.RLock()
+        self._seq = 0
+
+        self._fills = 0
+        self._partial_fills = 0
+        self._latency: List[float] = []
+        self._slippage_bps: List[float] = []
+        self._slippage_value = 0.0
+
+    @classmethod
+    def from_policy(cls, config: Dict[str, Any], api=None, quote_cache=None, master=None) -> 'FillSimulator':
+        """Build from the execution policy's `paper_fills` block (unknown keys are ignored)."""
+        keys = ('latency_ms', 'latency_jitter_ms', 'half_spread_pct', 'participation', 'reject_rate',
+                'price_band_pct', 'seed')
+        return cls(api, quote_cache, master, **{k: config[k] for k in keys if k in config})
+
+    def __getattr__(self, name):
+        api = self.__dict__.get('api')
+        if api is None:
+            raise AttributeError(name)
+        return getattr(api, name)
+
+    def register_order_callback(self, callback: Callable):
+        """callback(order_row) on every order status / fill change."""
+        self._callbacks.append(callback)
+
+    # ----------------------------------------------------------- order entry
+    def place_order(self, buy_or_sell, product_type, exchange, tradingsymbol, quantity, discloseqty=0,
+                    price_type='MKT', price=0.0, trigger_price=None, retention='DAY', remarks=None, **kwargs):
+        side = 'B' if str(buy_or_sell).upper() in ('B', 'BUY') else 'S'
+        qty = int(safe_float(quantity))
+        prctyp = str(price_type or 'MKT').upper()
+        limit = safe_float(price)
+        if qty <= 0:
+            return {'stat': 'Not_Ok', 'emsg': 'Invalid quantity'}
+        if prctyp == 'LMT' and limit <= 0:
+            return {'stat': 'Not_Ok', 'emsg': 'Invalid limit price'}
+        if prctyp not in ('MKT', 'LMT'):
+            return {'stat': 'Not_Ok', 'emsg': f'Unsupported price type {prctyp}'}
+
+        key = self._key(exchange, tradingsymbol)
+        now = self._clock()
+        latency = max(0.0, self._rng.gauss(self.latency_ms, self.latency_jitter_ms)) / 1000.0 \
+            if self.latency_jitter_ms else self.latency_ms / 1000.0
+        seed = self._seed_quote(key) # may be a REST round trip: never under the lock
+        with self._lock:
+            self._seq += 1
+            order_id = f"SIM{self._seq:08d}"
+            book = self._book(key, seed)
+            order = {
+                'norenordno': order_id, 'tsym': tradingsymbol, 'exch': exchange,
+                'token': key.split('|', 1)[1], 'trantype': side, 'prd': product_type,
+                'prctyp': prctyp, 'prc': limit, 'qty': qty, 'fillshares': 0, 'avgprc': 0.0,
+                'status': 'PENDING', 'remarks': remarks, 'ret': retention,
+                '_key': key, '_submitted': now, '_arrival': now + latency,
+                '_ref': self._reference(book), '_credit': 0.0, '_lot': self._lot(key),
+            }
+            self._orders[order_id] = order
+            self._working.setdefault(key, []).append(order_id)
+            updates = [self._row(order)]
+            if latency == 0 and book:
+                updates += self._match(key, book, traded=None, now=now, trade=False)
+        self._publish(updates)
+        return {'stat': 'Ok', 'norenordno': order_id, 'request_time': time.strftime('%H:%M:%S %d-%m-%Y')}
+
+    def cancel_order(self, orderno):
+        with self._lock:
+            order = self._orders.get(str(orderno))
+            if not order or order['status'] not in ACTIVE_STATUSES:
+                return {'stat': 'Not_Ok', 'emsg': 'Order not open'}
+            order['status'] = 'CANCELED'
+            self._retire(order)
+            row = self._row(order)
+        self._publish([row])
+        return {'stat': 'Ok', 'result': str(orderno)}
+
+    def modify_order(self, orderno, exchange=None, tradingsymbol=None, newquantity=None, newprice_type=None,
+                     newprice=0.0, newtrigger_price=None, **kwargs):
+        """Reprice / resize a working order; it matches on the next tick (or at once when latency is 0)."""
+        with self._lock:
+            order = self._orders.get(str(orderno))
+            if not order or order['status'] not in ACTIVE_STATUSES:
+                return {'stat': 'Not_Ok', 'emsg': 'Order not open'}
+            prctyp = str(newprice_type or order['prctyp']).upper()
+            if prctyp == 'LMT' and safe_float(newprice) <= 0:
+                return {'stat': 'Not_Ok', 'emsg': 'Invalid limit price'}
+            if newquantity is not None:
+                order['qty'] = max(order['fillshares'], int(safe_float(newquantity)))
+            order['prctyp'], order['prc'] = prctyp, safe_float(newprice) if prctyp == 'LMT' else 0.0
+            updates = [self._row(order)]
+            book = self._books.get(order['_key'])
+            if self.latency_ms == 0 and book:
+                updates += self._match(order['_key'], book, traded=None, now=self._clock(), trade=False)
+        self._publish(updates)
+        return {'stat': 'Ok', 'result': str(orderno)}
+
+    # ------------------------------------------------------------- tick feed
+    def on_tick(self, symbol: str, tick_data: Dict[str, Any]):
+        """TickHandler callback: refresh the book, mark positions, match working orders."""
+        key = f"{tick_data.get('exchange')}|{tick_data.get('token')}"
+        lp = safe_float(tick_data.get('lp') or tick_data.get('ltp'))
+        if lp <= 0:
+            return
+        now = self._clock()
+        with self._lock:
+            book = self._books.get(key)
+            if book is None:
+                book = self._books[key] = {}
+            traded = None
+            volume = tick_data.get('v')
+            if volume is not None:
+                volume = safe_float(volume)
+                if 'v' in book:
+                    traded = max(0.0, volume - book['v'])
+                book['v'] = volume
+            book['lp'] = lp
+            for field in ('bp1', 'sp1', 'bq1', 'sq1'):
+                value = safe_float(tick_data.get(field))
+                if value > 0:
+                    book[field] = value
+
+            pos = self._positions.get(key)
+            if pos is not None:
+                pos['lp'] = lp
+            updates = self._match(key, book, traded, now) if self._working.get(key) else []
+        self._publish(updates)
+
+    def flush(self):
+        """Match every working order against the last known book (end of a run, or no ticks coming)."""
+        now = self._clock()
+        updates = []
+        with self._lock:
+            for key in list(self._working):
+                book = self._books.get(key)
+                if book:
+                    updates += self._match(key, book, traded=None, now=now, trade=False)
+        self._publish(updates)
+
+    # -------------------------------------------------------------- matching
+    def _match(self, key: str, book: Dict[str, float], traded: Optional[float], now: float,
+               trade: bool = True) -> List[Dict[str, Any]]:
+        """Fill working orders of `key`; trade=False (no new print) only crosses marketable orders."""
+        updates = []
+        bid, ask = self._touch(book)
+        depth = {'B': book.get('sq1'), 'S': book.get('bq1')}
+        volume = traded * self.participation if traded is not None else None
+        lp = book['lp']
+        for order_id in list(self._working.get(key, ())):
+            order = self._orders[order_id]
+            if order['status'] == 'PENDING':
+                if now < order['_arrival']:
+                    continue
+                reason = self._arrival_reject(order, lp)
+                if reason:
+                    order['status'] = 'REJECTED'
+                    order['rejreason'] = reason
+                    self._retire(order)
+                    updates.append(self._row(order))
+                    continue
+                order['status'] = 'OPEN'
+                updates.append(self._row(order))
+
+            buy = order['trantype'] == 'B'
+            touch = ask if buy else bid
+            limit = order['prc']
+            marketable = order['prctyp'] == 'MKT' or (touch <= limit if buy else touch >= limit)
+            if marketable:
+                price = touch if order['prctyp'] == 'MKT' else (min(touch, limit) if buy else max(touch, limit))
+                available = depth[order['trantype']]
+            elif trade and ((lp < limit) if buy else (lp > limit)):
+                price = limit
+                available = None
+                if volume is not None:
+                    order['_credit'] += volume
+                    available = order['_credit']
+            else:
+                continue
+
+            remaining = order['qty'] - order['fillshares']
+            qty = remaining if available is None else min(remaining, int(available // order['_lot']) * order['_lot'])
+            if qty <= 0:
+                continue
+            if marketable and available is not None:
+                depth[order['trantype']] = available - qty
+            elif not marketable and available is not None:
+                order['_credit'] -= qty
+            self._fill(order, qty, price, now)
+            updates.append(self._row(order))
+        return updates
+
+    def _arrival_reject(self, order: Dict[str, Any], lp: float) -> Optional[str]:
+        if self.reject_rate and self._rng.random() < self.reject_rate:
+            return 'RMS: simulated rejection'
+        if order['prctyp'] == 'LMT' and self.price_band_pct and lp > 0:
+            if abs(order['prc'] - lp) / lp * 100 > self.price_band_pct:
+                return 'Price outside the day\'s price band'
+        return None
+
+    def _fill(self, order: Dict[str, Any], qty: int, price: float, now: float):
+        filled = order['fillshares']
+        order['avgprc'] = (order['avgprc'] * filled + price * qty) / (filled + qty)
+        order['fillshares'] = filled + qty
+        order['flprc'] = price
+        order['flqty'] = qty
+        self._fills += 1
+        if '_first_fill' not in order:
+            order['_first_fill'] = now
+            self._latency.append(now - order['_submitted'])
+        if order['fillshares'] >= order['qty']:
+            order['status'] = 'COMPLETE'
+            self._retire(order)
+            ref = order['_ref']
+            if ref:
+                sign = 1 if order['trantype'] == 'B' else -1
+                self._slippage_bps.append(sign * (order['avgprc'] - ref) / ref * 10000)
+                self._slippage_value += sign * (order['avgprc'] - ref) * order['qty']
+        else:
+            self._partial_fills += 1
+        self._apply_position(order, qty, price)
+
+    def _apply_position(self, order: Dict[str, Any], qty: int, price: float):
+        key = order['_key']
+        pos = self._positions.get(key)
+        if pos is None:
+            pos = self._positions[key] = {'tsym': order['tsym'], 'exch': order['exch'], 'token': order['token'],
+                                          'netqty': 0, 'avgprc': 0.0, 'realized': 0.0,
+                                          'lp': self._books.get(key, {}).get('lp', price)}
+        signed = qty if order['trantype'] == 'B' else -qty
+        net, avg = pos['netqty'], pos['avgprc']
+        if net and (net > 0) != (signed > 0):
+            closed = min(abs(net), abs(signed))
+            pos['realized'] += closed * (price - avg) * (1 if net > 0 else -1)
+        new_net = net + signed
+        if new_net == 0:
+            avg = 0.0
+        elif net == 0 or (net > 0) != (new_net > 0):
+            avg = price # opened or flipped
+        elif abs(new_net) > abs(net):
+            avg = (avg * abs(net) + price * abs(signed)) / abs(new_net)
+        pos['netqty'], pos['avgprc'] = new_net, avg
+
+    def _retire(self, order: Dict[str, Any]):
+        working = self._working.get(order['_key'])
+        if working and order['norenordno'] in working:
+            working.remove(order['norenordno'])
+            if not working:
+                del self._working[order['_key']]
+
+    # --------------------------------------------------------------- helpers
+    def _key(self, exchange: str, tsym: str) -> str:
+        if self.quote_cache is not None:
+            # Subscribes the instrument so its ticks reach on_tick
+            key = self.quote_cache.watch(exchange, tsym=tsym)
+            if key:
+                return key
+        token = self.master.SYMBOL_TO_TOKEN.get(tsym) if self.master is not None else None
+        return f"{exchange}|{token or tsym}"
+
+    def _lot(self, key: str) -> int:
+        if self.master is not None:
+            lot = getattr(self.master, 'TOKEN_TO_LOTSIZE', {}).get(key.split('|', 1)[1])
+            if lot:
+                return max(1, int(safe_float(lot)))
+        return 1
+
+    def _seed_quote(self, key: str) -> Optional[Dict[str, Any]]:
+        """Quote-cache quote for a key no tick has reached yet (a cache miss goes out over REST)."""
+        if self.quote_cache is None or key in self._books:
+            return None
+        ex, tk = key.split('|', 1)
+        return self.quote_cache.get_quote(ex, token=tk) if tk.isdigit() else None
+
+    def _book(self, key: str, seed: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+        """Known book for key, seeded from `seed` (see _seed_quote) when no tick has arrived yet."""
+        book = self._books.get(key)
+        if book is None and seed:
+            lp = safe_float(seed.get('lp') or seed.get('ltp'))
+            if lp > 0:
+                book = self._books[key] = {'lp': lp}
+                for field in ('bp1', 'sp1', 'bq1', 'sq1'):
+                    if safe_float(seed.get(field)) > 0:
+                        book[field] = safe_float(seed[field])
+        return book or {}
+
+    def _touch(self, book: Dict[str, float]):
+        lp = book['lp']
+        half = lp * self.half_spread_pct / 100.0
+        bid = book.get('bp1') or lp - half
+        ask = book.get('sp1') or lp + half
+        return bid, ask
+
+    def _reference(self, book: Dict[str, float]) -> float:
+        if not book:
+            return 0.0
+        if book.get('bp1') and book.get('sp1'):
+            return (book['bp1'] + book['sp1']) / 2
+        return book['lp']
+
+    @staticmethod
+    def _row(order: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in order.items() if not k.startswith('_')}
+
+    def _publish(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            for callback in self._callbacks:
+                try:
+                    callback(row)
+                except Exception as e:
+                    logger.error(f"[FillSimulator] order callback error: {e}")
+
+    # ----------------------------------------------------------------- reads
+    def single_order_history(self, orderno):
+        order = self._orders.get(str(orderno))
+        return [self._row(order)] if order else None
+
+    def get_order(self, orderno) -> Optional[Dict[str, Any]]:
+        order = self._orders.get(str(orderno))
+        return self._row(order) if order else None
+
+    def get_order_book(self):
+        with self._lock:
+            return [self._row(o) for o in self._orders.values()]
+
+    def get_positions(self):
+        """Positions in the broker's row format, marked to the last tick."""
+        with self._lock:
+            rows = []
+            for pos in self._positions.values():
+                urmtom = (pos['lp'] - pos['avgprc']) * pos['netqty'] if pos['netqty'] else 0.0
+                rows.append({'exch': pos['exch'], 'token': pos['token'], 'tsym': pos['tsym'],
+                             'netqty': pos['netqty'], 'netavgprc': round(pos['avgprc'], 2), 'lp': pos['lp'],
+                             'rpnl': round(pos['realized'], 2), 'urmtom': round(urmtom, 2)})
+            return rows
+
+    def get_total_pnl(self) -> float:
+        return round(sum(p['rpnl'] + p['urmtom'] for p in self.get_positions()), 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses: Dict[str, int] = {}
+            for order in self._orders.values():
+                statuses[order['status']] = statuses.get(order['status'], 0) + 1
+            latency = list(self._latency)
+            slippage = list(self._slippage_bps)
+            slippage_value = self._slippage_value
+        return {
+            "orders": sum(statuses.values()),
+            "statuses": statuses,
+            "fills": self._fills,
+            "partial_fills": self._partial_fills,
+            "fill_latency_ms_p50": round(statistics.median(latency) * 1000, 1) if latency else None,
+            "fill_latency_ms_p95": round(_percentile(latency, 0.95) * 1000, 1) if latency else None,
+            "slippage_bps_mean": round(statistics.mean(slippage), 2) if slippage else None,
+            "slippage_bps_p95": round(_percentile(slippage, 0.95), 2) if slippage else None,
+            "slippage_value": round(slippage_value, 2),
+            "total_pnl": self.get_total_pnl(),
+        }
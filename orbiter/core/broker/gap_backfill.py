@@ -0,0 +1,201 @@
+# orbiter/core/broker/gap_backfill.py
+"""
+Gap Backfill - repairs SYMBOLDICT candles after a websocket outage.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger("ORBITER")
+
+IST = pytz.timezone('Asia/Kolkata')
+
+
+def bar_epoch(candle: Dict[str, Any]) -> Optional[float]:
+    """Bar start as epoch seconds, from 'ssboe' or the broker's 'dd-mm-YYYY HH:MM:SS' IST time."""
+    try:
+        ssboe = int(float(candle.get('ssboe') or 0))
+        if ssboe > 0:
+            return float(ssboe)
+    except (TypeError, ValueError):
+        pass
+    try:
+        dt = datetime.strptime(str(candle.get('time')), "%d-%m-%Y %H:%M:%S")
+        return IST.localize(dt).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def merge_candles(existing: List[Dict[str, Any]], fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Union by bar start (fresh bars win), oldest first. Bars without a timestamp are dropped."""
+    by_ts = {}
+    for candle in existing:
+        ts = bar_epoch(candle)
+        if ts is not None:
+            by_ts[ts] = candle
+    for candle in fresh:
+        ts = bar_epoch(candle)
+        if ts is not None:
+            by_ts[ts] = candle
+    return [by_ts[ts] for ts in sorted(by_ts)]
+
+
+class GapBackfill:
+    """
+    Targeted candle repair after a reconnect.
+
+    Flow:
+        socket close → mark_disconnect()            (outage start)
+        socket open  → on_reconnect()               (outage end) → find_gaps
+                                              ↓
+                  get_time_price_series(outage start bar .. reconnect) per primed symbol
+                  (thread pool, rate-limited) → merge_candles → SYMBOLDICT
+
+    Live ticks only update the last bar, so the bar list says nothing about what
+    was missed; the recorded outage window does. Outages shorter than
+    `min_gap_seconds` are ignored. Engine ticks `wait()` while a run is active.
+    """
+
+    def __init__(self, tick_handler, max_workers: int = 4, max_rps: float = 8.0, min_gap_seconds: float = 30.0):
+        self.tick_handler = tick_handler
+        self.max_workers = max_workers
+        self.min_interval = 1.0 / max_rps if max_rps > 0 else 0.0
+        self.min_gap_seconds = min_gap_seconds
+
+        self._disconnected_at: Optional[float] = None
+        self._done = threading.Event()
+        self._done.set()
+        self._rate_lock = threading.Lock()
+        self._next_call = 0.0
+
+        self._runs = 0
+        self._requests = 0
+        self._bars_merged = 0
+        self._failures = 0
+        self._last_run: Dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return not self._done.is_set()
+
+    def mark_disconnect(self, ts: float = None):
+        if self._disconnected_at is None:
+            self._disconnected_at = ts or time.time()
+
+    def on_reconnect(self) -> bool:
+        """Start a background backfill if the socket was down. Returns True if one was started."""
+        if self._disconnected_at is None or self.running:
+            return False
+        start, end = self._disconnected_at, time.time()
+        self._disconnected_at = None
+        if end - start <= self.min_gap_seconds:
+            logger.debug(f"Websocket back after {end - start:.0f}s, no backfill needed")
+            return False
+        logger.info(f"🩹 Websocket back after {end - start:.0f}s, backfilling the outage...")
+        self._done.clear()
+        threading.Thread(target=self._run_bg, args=(start, end), name="GapBackfill", daemon=True).start()
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _run_bg(self, start: float, end: float):
+        try:
+            self.run(start, end)
+        except Exception as e:
+            logger.error(f"❌ Gap backfill failed: {e}")
+        finally:
+            self._done.set()
+
+    def find_gaps(self, start: float, end: float) -> List[Tuple[str, float]]:
+        """[(key, fetch_from)] for primed 'EXCH|token' entries, fetch_from = start of the bar the outage began in."""
+        if end - start <= self.min_gap_seconds:
+            return []
+        bar_seconds = self._interval() * 60
+        fetch_from = float(start - start % bar_seconds)
+        gaps, seen = [], set()
+        for key, data in list(self.tick_handler.SYMBOLDICT.items()):
+            if id(data) in seen or '|' not in key or not key.split('|', 1)[1].isdigit():
+                continue
+            seen.add(id(data))
+            if data.get('candles'):
+                gaps.append((key, fetch_from))
+        return gaps
+
+    def run(self, start: float, end: float = None) -> Dict[str, Any]:
+        """Backfill the outage [start, end] for every primed symbol (blocking)."""
+        end = end or time.time()
+        gaps = self.find_gaps(start, end)
+        self._runs += 1
+        started = time.monotonic()
+        merged = 0
+        if gaps:
+            workers = min(self.max_workers, len(gaps))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+                merged = sum(pool.map(lambda gap: self._backfill_one(gap[0], gap[1], end), gaps))
+        self._last_run = {
+            "symbols": len(gaps), "bars": merged, "window": [start, end],
+            "seconds": round(time.monotonic() - started, 3)
+        }
+        if gaps:
+            logger.info(f"🩹 Backfilled {merged} bars for {len(gaps)} symbols in {self._last_run['seconds']}s")
+        return self._last_run
+
+    def _backfill_one(self, key: str, start: float, end: float) -> int:
+        exch, token = key.split('|', 1)
+        self._throttle()
+        self._requests += 1
+        try:
+            res = self.tick_handler.api.get_time_price_series(
+                exchange=exch, token=token, starttime=start, endtime=end, interval=self._interval()
+            )
+        except Exception as e:
+            self._failures += 1
+            logger.warning(f"⚠️ Backfill request failed for {key}: {e}")
+            return 0
+        if not res or not isinstance(res, list):
+            return 0
+
+        data = self.tick_handler.SYMBOLDICT.get(key)
+        if data is None:
+            return 0
+        candles = data.get('candles')
+        if candles is None:
+            data['candles'] = candles = []
+        before = len(candles)
+        # In place, so a tick being applied concurrently keeps working on the live list
+        candles[:] = merge_candles(candles, res)
+        added = len(candles) - before
+        self._bars_merged += max(added, 0)
+        logger.debug(f"Backfill {key}: {len(res)} bars fetched, {added} new")
+        return max(added, 0)
+
+    def _interval(self) -> int:
+        return int(getattr(self.tick_handler, '_priming_interval', 5) or 5)
+
+    def _throttle(self):
+        """Space requests `min_interval` apart across all workers."""
+        if self.min_interval <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_call)
+            self._next_call = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "runs": self._runs,
+            "requests": self._requests,
+            "bars_merged": self._bars_merged,
+            "failures": self._failures,
+            "last_run": dict(self._last_run)
+        }
@@ -0,0 +1,258 @@
+# orbiter/core/broker/limit_chaser.py
+"""
+Limit Chaser - adaptive LMT pricing from live best bid/ask with a reprice loop.
+"""
+
+import logging
+import math
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.core.broker.order_store import ACTIVE_STATUSES, FINAL_STATUSES
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+
+class LimitChaser:
+    """
+    Works one LMT order until it fills or runs out of chase room.
+
+    Flow:
+        quote (QuoteCache, fed by the depth feed: bp1/sp1) → arrival = mid
+                                          ↓
+        place LMT at bid + aggression x (ask - bid)   (sell: ask - aggression x (ask - bid))
+                                          ↓
+        every reprice_interval_ms: filled? → done
+            else fresh quote, aggression += aggression_step (up to max_aggression),
+            modify_order if the price moved, never past arrival ± max_chase_pct
+                                          ↓
+        after max_reprices: 'cancel' (default), 'market' (convert to MKT) or 'leave'
+
+    Only a COMPLETE order is ok. Anything else may still carry a partial fill
+    (`filled_qty`); callers back it out with `unwind()`, the dispatcher's
+    rollback does the same for `place_leg`.
+
+    aggression 0 joins the passive side, 0.5 is mid, 1 crosses at the touch.
+    Fills are read from the OrderStore when one is given (no REST), otherwise
+    from `single_order_history`. Cost is reported against the arrival mid in bps,
+    positive = paid.
+    """
+
+    def __init__(self, api, quote_cache=None, order_store=None, aggression: float = 0.5,
+                 aggression_step: float = 0.25, max_aggression: float = 1.0, reprice_interval_ms: float = 250,
+                 max_reprices: int = 8, max_chase_pct: float = 1.0, tick_size: float = 0.05,
+                 on_exhausted: str = 'cancel', sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.api = api
+        self.quote_cache = quote_cache
+        self.order_store = order_store
+        self.aggression = aggression
+        self.aggression_step = aggression_step
+        self.max_aggression = max_aggression
+        self.reprice_interval = reprice_interval_ms / 1000.0
+        self.max_reprices = max_reprices
+        self.max_chase_pct = max_chase_pct
+        self.tick_size = tick_size
+        self.on_exhausted = on_exhausted
+        self._sleep = sleep
+        self._clock = clock
+
+        self._orders = 0
+        self._filled = 0
+        self._reprices: List[int] = []
+        self._cost_bps: List[float] = []
+
+    @classmethod
+    def from_policy(cls, config: Dict[str, Any], api, quote_cache=None, order_store=None) -> 'LimitChaser':
+        """Build from the execution policy's `limit_chase` block (unknown keys are ignored)."""
+        keys = ('aggression', 'aggression_step', 'max_aggression', 'reprice_interval_ms', 'max_reprices',
+                'max_chase_pct', 'tick_size', 'on_exhausted')
+        return cls(api, quote_cache, order_store, **{k: config[k] for k in keys if k in config})
+
+    # -------------------------------------------------------------- execution
+    def execute(self, order: Dict[str, Any], token: str = None) -> Dict[str, Any]:
+        """Chase `order` (place_order kwargs). Returns ok/status/order_id/filled_qty/avg_price/cost_bps/..."""
+        started = self._clock()
+        exch, tsym = order.get('exchange', 'NFO'), order.get('tradingsymbol')
+        buy = str(order.get('buy_or_sell')).upper() in ('B', 'BUY')
+        qty = int(safe_float(order.get('quantity')))
+
+        book = self._quote(exch, token, tsym)
+        if not book:
+            return {'ok': False, 'reason': f"limit_price_fetch_failed for {tsym}"}
+        arrival = book['mid']
+        room = arrival * self.max_chase_pct / 100.0
+        cap = arrival + room if buy else arrival - room
+        aggression = self.aggression
+        price = self._price(book, buy, aggression, cap)
+
+        self._orders += 1
+        resp = self.api.place_order(**dict(order, price_type='LMT', price=price))
+        if not resp or resp.get('stat') != 'Ok':
+            return {'ok': False, 'reason': 'order_failed', 'resp': resp, 'arrival_price': arrival}
+        order_id = str(resp.get('norenordno'))
+        logger.info(f"🎯 Chase {tsym} {'B' if buy else 'S'} {qty} @ {price} (arrival {arrival:.2f}, cap {cap:.2f})")
+
+        reprices = 0
+        state = {}
+        while True:
+            state = self._wait(order_id, self.reprice_interval)
+            if state.get('status') in FINAL_STATUSES:
+                break
+            if reprices >= self.max_reprices:
+                state = self._exhausted(order_id, exch, tsym, qty) or state
+                break
+            book = self._quote(exch, token, tsym) or book
+            aggression = min(self.max_aggression, aggression + self.aggression_step)
+            new_price = self._price(book, buy, aggression, cap)
+            reprices += 1
+            if new_price == price:
+                continue
+            mod = self.api.modify_order(orderno=order_id, exchange=exch, tradingsymbol=tsym, newquantity=qty,
+                                        newprice_type='LMT', newprice=new_price)
+            if mod and mod.get('stat') == 'Ok':
+                price = new_price
+            else:
+                # Usually the order filled or was cancelled between the check and the modify
+                logger.debug(f"[LimitChaser] modify {order_id} -> {new_price} refused: {mod}")
+
+        return self._result(order_id, resp, state, qty, buy, arrival, reprices, started)
+
+    def place_leg(self, leg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """MultiLegDispatcher place_fn: LMT legs are chased, anything else is placed as is."""
+        order = leg['order']
+        if str(order.get('price_type', '')).upper() != 'LMT':
+            return self.api.place_order(**order)
+        res = self.execute(order, token=leg.get('token'))
+        if res.get('order_id') and not res['ok']:
+            self._cancel_rest(res, order)
+        if not res.get('order_id'):
+            return res.get('resp') or {'stat': 'Not_Ok', 'emsg': res.get('reason')}
+        if res['status'] == 'COMPLETE':
+            return {'stat': 'Ok', 'norenordno': res['order_id'], 'filled': True, 'filled_qty': res['filled_qty'],
+                    'avgprc': res['avg_price'], 'cost_bps': res['cost_bps']}
+        # Not (fully) filled: fail the leg, reporting what did fill so rollback can reverse it
+        return {'stat': 'Not_Ok', 'emsg': res['reason'], 'norenordno': res['order_id'],
+                'filled_qty': res['filled_qty']}
+
+    def unwind(self, order: Dict[str, Any], res: Dict[str, Any]) -> Dict[str, Any]:
+        """Back out of a chase that did not complete: cancel the working rest, reverse the filled part at MKT."""
+        if not res.get('order_id') or res.get('status') == 'COMPLETE':
+            return res
+        self._cancel_rest(res, order)
+        filled = int(res.get('filled_qty') or 0)
+        res['unwound_qty'] = 0
+        if filled:
+            buy = str(order.get('buy_or_sell')).upper() in ('B', 'BUY')
+            resp = self.api.place_order(**dict(order, buy_or_sell='S' if buy else 'B', quantity=filled,
+                                               price_type='MKT', price=0, remarks='chase_unwind'))
+            if resp and resp.get('stat') == 'Ok':
+                res['unwound_qty'] = filled
+            logger.warning(f"↩️ Chase {order.get('tradingsymbol')}: reversed partial fill {filled} "
+                           f"({'ok' if res['unwound_qty'] else f'FAILED: {resp}'})")
+        return res
+
+    # -------------------------------------------------------------- internals
+    def _cancel_rest(self, res: Dict[str, Any], order: Dict[str, Any]):
+        """Cancel an order left working (on_exhausted='leave') and take its final fill into `res`."""
+        if res.get('status') not in ACTIVE_STATUSES:
+            return
+        self.api.cancel_order(orderno=res['order_id'])
+        state = self._exhausted_state(res['order_id'])
+        filled = int(safe_float(state.get('fillshares', 0)))
+        if state.get('status') == 'COMPLETE' and not filled:
+            filled = int(safe_float(order.get('quantity')))
+        res['status'] = str(state.get('status', '')).upper() or res['status']
+        res['filled_qty'] = max(int(res.get('filled_qty') or 0), filled)
+
+    def _exhausted_state(self, order_id: str) -> Dict[str, Any]:
+        # One more interval for the final status (and fill quantity) to arrive
+        state = self._wait(order_id, self.reprice_interval)
+        return state if state.get('status') in FINAL_STATUSES else self._wait(order_id, self.reprice_interval)
+
+    def _quote(self, exch: str, token: Optional[str], tsym: str) -> Optional[Dict[str, float]]:
+        if self.quote_cache is not None:
+            self.quote_cache.watch(exch, token=token, tsym=tsym) # depth arrives by websocket from here on
+            quote = self.quote_cache.get_quote(exch, token=token, tsym=tsym)
+        else:
+            quote = self.api.get_quotes(exchange=exch, token=token or tsym)
+        if not quote:
+            return None
+        lp = safe_float(quote.get('lp') or quote.get('ltp'))
+        bid, ask = safe_float(quote.get('bp1')), safe_float(quote.get('sp1'))
+        if bid <= 0 or ask <= 0 or ask < bid:
+            if lp <= 0:
+                return None
+            bid = ask = lp
+        return {'bid': bid, 'ask': ask, 'mid': (bid + ask) / 2.0, 'lp': lp}
+
+    def _price(self, book: Dict[str, float], buy: bool, aggression: float, cap: float) -> float:
+        width = book['ask'] - book['bid']
+        raw = book['bid'] + aggression * width if buy else book['ask'] - aggression * width
+        ticks = raw / self.tick_size
+        # Round toward the passive side; the next step is one reprice away
+        price = (math.floor(ticks + 1e-9) if buy else math.ceil(ticks - 1e-9)) * self.tick_size
+        if buy:
+            price = min(price, math.floor(cap / self.tick_size + 1e-9) * self.tick_size)
+        else:
+            price = max(price, math.ceil(cap / self.tick_size - 1e-9) * self.tick_size)
+        return round(max(price, self.tick_size), 2)
+
+    def _wait(self, order_id: str, timeout: float) -> Dict[str, Any]:
+        if self.order_store is not None:
+            order = self.order_store.wait_for_fill(order_id, timeout)
+            return order or self.order_store.get_order(order_id) or {}
+        self._sleep(timeout)
+        return self._history(order_id)
+
+    def _history(self, order_id: str) -> Dict[str, Any]:
+        try:
+            rows = self.api.single_order_history(orderno=order_id)
+        except Exception as e:
+            logger.debug(f"[LimitChaser] order history failed for {order_id}: {e}")
+            return {}
+        return rows[0] if isinstance(rows, list) and rows else {}
+
+    def _exhausted(self, order_id: str, exch: str, tsym: str, qty: int) -> Dict[str, Any]:
+        if self.on_exhausted == 'leave':
+            return {}
+        if self.on_exhausted == 'market':
+            self.api.modify_order(orderno=order_id, exchange=exch, tradingsymbol=tsym, newquantity=qty,
+                                  newprice_type='MKT', newprice=0.0)
+        else:
+            self.api.cancel_order(orderno=order_id)
+        return self._exhausted_state(order_id)
+
+    def _result(self, order_id, resp, state, qty, buy, arrival, reprices, started) -> Dict[str, Any]:
+        status = str(state.get('status', '')).upper() or 'OPEN'
+        filled = int(safe_float(state.get('fillshares', 0)))
+        if status == 'COMPLETE' and not filled:
+            filled = qty
+        avg = safe_float(state.get('avgprc') or state.get('flprc'))
+        cost_bps = None
+        if filled and avg and arrival:
+            cost_bps = round((1 if buy else -1) * (avg - arrival) / arrival * 10000, 2)
+            self._cost_bps.append(cost_bps)
+        self._reprices.append(reprices)
+        if status == 'COMPLETE':
+            self._filled += 1
+        reason = None if status == 'COMPLETE' else (
+            state.get('rejreason') or ('chase_limit_reached' if status in FINAL_STATUSES else 'working'))
+        return {
+            'ok': status == 'COMPLETE', 'status': status, 'order_id': order_id,
+            'resp': resp, 'filled_qty': filled, 'avg_price': avg, 'arrival_price': round(arrival, 2),
+            'cost_bps': cost_bps, 'reprices': reprices, 'reason': reason,
+            'elapsed_ms': round((self._clock() - started) * 1000, 1),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        cost = list(self._cost_bps)
+        return {
+            "orders": self._orders,
+            "filled": self._filled,
+            "avg_reprices": round(statistics.mean(self._reprices), 2) if self._reprices else 0.0,
+            "cost_bps_mean": round(statistics.mean(cost), 2) if cost else None,
+            "cost_bps_max": round(max(cost), 2) if cost else None,
+        }
@@ -22,6 +22,11 @@ class LTPManager:
         """Get option LTP by trading symbol."""
         self.logger.debug(f"[LTPManager] Getting option LTP for: {tsym}")
         
+        # Indexed lookup in the shared quote cache (websocket first, coalesced REST on miss)
+        quote_cache = getattr(self.tick_handler, 'quote_cache', None)
+        if quote_cache is not None:
+            return quote_cache.get_ltp(tsym=tsym)
+        
         if segment_name == 'mcx':
             for k, v in self.tick_handler.SYMBOLDICT.items():
                 if v.get('symbol') == tsym:
@@ -0,0 +1,195 @@
+# orbiter/core/broker/multi_leg.py
+"""
+Multi-Leg Dispatcher - phased, concurrent placement of option structures.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.core.broker.order_store import ACTIVE_STATUSES
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+
+class MultiLegDispatcher:
+    """
+    Places a structure as ordered phases of legs.
+
+    Flow:
+        phase 1 legs ──(concurrent place_order)──> acks ──gate──> phase 2 legs ... ──> done
+                                                         │
+                                   reject / gate timeout └──> rollback every placed leg
+
+    Gates:
+        'ack'  - next phase as soon as every leg of this phase is accepted.
+        'fill' - next phase once every leg is COMPLETE in the OrderStore (`wait_for_fill`),
+                 bounded by `phase_timeout`. Without an OrderStore this degrades to 'ack'.
+
+    A leg is {'name': str, 'order': place_order kwargs}. `place_fn(leg)` returns the broker
+    response ({'stat', 'norenordno'}); a response with `filled: True` (e.g. simulated) skips
+    the fill wait. Rollback cancels what is still working and reverses what has filled
+    (`reverse_fn(leg, qty)`, default an opposite-side MKT order).
+    """
+
+    def __init__(self, api=None, order_store=None, place_fn: Callable = None, reverse_fn: Callable = None,
+                 max_workers: int = 4, phase_timeout: float = 5.0):
+        self.api = api
+        self.order_store = order_store
+        self.place_fn = place_fn or self._place_order
+        self.reverse_fn = reverse_fn or self._reverse_order
+        self.max_workers = max_workers
+        self.phase_timeout = phase_timeout
+
+        self._structures = 0
+        self._rollbacks = 0
+        self._ack_ms: List[float] = []
+        self._fill_ms: List[float] = []
+
+    def execute(self, phases: List[List[Dict[str, Any]]], gate: str = 'fill', rollback: bool = True,
+                timeout: float = None) -> Dict[str, Any]:
+        """Run the phases in order. Returns {'ok', 'legs', 'elapsed_ms', 'failed_phase', 'reason', 'rolled_back'}."""
+        timeout = self.phase_timeout if timeout is None else timeout
+        started = time.monotonic()
+        self._structures += 1
+        placed: List[Dict[str, Any]] = []
+        all_legs: List[Dict[str, Any]] = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="leg") as pool:
+            for phase_no, phase in enumerate(phases, 1):
+                results = list(pool.map(self._dispatch, phase))
+                all_legs.extend(results)
+                # A failed leg that still filled some quantity (e.g. a chased LMT) is unwound too
+                placed.extend(r for r in results if r['ok'] or r.get('filled_qty'))
+
+                failed = [r for r in results if not r['ok']]
+                if not failed and gate == 'fill':
+                    failed = self._await_fills(results, timeout)
+                if failed:
+                    reason = "; ".join(f"{r['name']}: {r['reason']}" for r in failed)
+                    logger.warning(f"⚠️ Multi-leg phase {phase_no} failed ({reason})")
+                    rolled_back = self.rollback(placed) if rollback else []
+                    return {
+                        'ok': False, 'legs': all_legs, 'failed_phase': phase_no, 'reason': reason,
+                        'rolled_back': rolled_back, 'elapsed_ms': self._ms(started)
+                    }
+
+        elapsed = self._ms(started)
+        logger.info(f"✅ Multi-leg: {len(all_legs)} legs in {len(phases)} phases, {elapsed:.0f}ms")
+        return {'ok': True, 'legs': all_legs, 'failed_phase': None, 'reason': None,
+                'rolled_back': [], 'elapsed_ms': elapsed}
+
+    def rollback(self, placed: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Cancel working legs and reverse filled quantity, newest leg first."""
+        self._rollbacks += 1
+        actions = []
+        for res in reversed(placed):
+            order = res['leg'].get('order', {})
+            qty = int(safe_float(order.get('quantity', 0)))
+            filled = qty if res.get('filled') else None
+            known = self.order_store.get_order(res['order_id']) if (self.order_store and res['order_id']) else None
+            if known is not None:
+                filled = int(safe_float(known.get('fillshares', 0)))
+                if known.get('status') == 'COMPLETE' and not filled:
+                    filled = qty
+            reported = res.get('filled_qty') is not None and not res.get('filled')
+            if reported:
+                # The placer worked the order to a final state and reported its fill
+                filled = int(safe_float(res['filled_qty']))
+
+            if (res['order_id'] and not res.get('filled') and not reported
+                    and (known is None or known.get('status') in ACTIVE_STATUSES)):
+                cancelled = self._cancel(res['order_id'])
+                actions.append({'name': res['name'], 'action': 'cancel', 'ok': cancelled})
+                if known is None:
+                    # No order-update stream: a failed cancel means the order already filled
+                    filled = 0 if cancelled else qty
+
+            if filled:
+                try:
+                    resp = self.reverse_fn(res['leg'], filled)
+                    ok = bool(resp) and resp.get('stat') == 'Ok'
+                except Exception as e:
+                    resp, ok = str(e), False
+                actions.append({'name': res['name'], 'action': 'reverse', 'qty': filled, 'ok': ok, 'resp': resp})
+                logger.warning(f"↩️ Rollback {res['name']}: reversed {filled} ({'ok' if ok else 'FAILED'})")
+        return actions
+
+    def get_stats(self) -> Dict[str, Any]:
+        def avg(values):
+            return round(sum(values) / len(values), 1) if values else 0.0
+        return {
+            "structures": self._structures,
+            "rollbacks": self._rollbacks,
+            "legs": len(self._ack_ms),
+            "avg_ack_ms": avg(self._ack_ms),
+            "max_ack_ms": round(max(self._ack_ms), 1) if self._ack_ms else 0.0,
+            "avg_fill_ms": avg(self._fill_ms)
+        }
+
+    # -------------------------------------------------------------- internals
+    @staticmethod
+    def _ms(since: float) -> float:
+        return (time.monotonic() - since) * 1000.0
+
+    def _place_order(self, leg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.api.place_order(**leg['order'])
+
+    def _reverse_order(self, leg: Dict[str, Any], quantity: int) -> Optional[Dict[str, Any]]:
+        order = leg['order']
+        return self.api.place_order(**dict(order, buy_or_sell='S' if order.get('buy_or_sell') == 'B' else 'B',
+                                           quantity=quantity, price_type='MKT', price=0,
+                                           remarks=f"rollback_{leg.get('name')}"))
+
+    def _dispatch(self, leg: Dict[str, Any]) -> Dict[str, Any]:
+        sent = time.monotonic()
+        try:
+            resp = self.place_fn(leg)
+        except Exception as e:
+            resp = {'stat': 'Not_Ok', 'emsg': str(e)}
+        ack_ms = self._ms(sent)
+        self._ack_ms.append(ack_ms)
+        ok = bool(resp) and resp.get('stat') == 'Ok'
+        name = leg.get('name', leg.get('order', {}).get('tradingsymbol'))
+        logger.info(f"order_call leg={name} ok={ok} ack={ack_ms:.0f}ms resp={resp}")
+        return {
+            'name': name, 'leg': leg, 'ok': ok, 'resp': resp, 'sent_at': sent,
+            'order_id': resp.get('norenordno') if resp else None, 'filled': bool(resp and resp.get('filled')),
+            'filled_qty': resp.get('filled_qty') if resp else None,
+            'ack_ms': ack_ms, 'fill_ms': None,
+            'reason': None if ok else (resp.get('emsg') if resp else 'No response')
+        }
+
+    def _await_fills(self, results: List[Dict[str, Any]], timeout: float) -> List[Dict[str, Any]]:
+        """Wait for every leg of a phase to fill. Returns the legs that did not."""
+        if self.order_store is None:
+            return []
+        deadline = time.monotonic() + timeout
+        failed = []
+        for res in results:
+            if res['filled'] or not res['order_id']:
+                continue
+            order = self.order_store.wait_for_fill(res['order_id'], max(0.0, deadline - time.monotonic()))
+            if order is None:
+                res['reason'] = f"not filled within {timeout}s"
+                failed.append(res)
+            elif order.get('status') != 'COMPLETE':
+                res['reason'] = f"{order.get('status')}: {order.get('rejreason', '')}".strip(': ')
+                failed.append(res)
+            else:
+                res['filled'] = True
+                res['fill_ms'] = self._ms(res['sent_at'])
+                self._fill_ms.append(res['fill_ms'])
+        return failed
+
+    def _cancel(self, order_id: str) -> bool:
+        if self.api is None or not hasattr(self.api, 'cancel_order'):
+            return False
+        try:
+            resp = self.api.cancel_order(orderno=order_id)
+            return bool(resp) and resp.get('stat') == 'Ok'
+        except Exception as e:
+            logger.error(f"Rollback cancel failed for {order_id}: {e}")
+            return False
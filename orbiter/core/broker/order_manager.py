@@ -8,6 +8,8 @@ import os
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from orbiter.utils.journal import StateJournal
+
 
 class OrderManager:
     """Manages order book and order history for trading."""
@@ -18,6 +20,12 @@ class OrderManager:
         self.paper_trade = paper_trade
         self._orders: List[Dict] = []
         self._positions: List[Dict] = []
+        self._journal: Optional[StateJournal] = None
+        self.fill_simulator = None # FillSimulator in paper mode: order status and P&L from simulated fills
+        if project_root:
+            # Own file: paper_positions.json belongs to StateManager
+            self._journal = StateJournal(os.path.join(project_root, 'orbiter', 'data', 'paper_order_positions.json'),
+                                         ts_key='updated', stamp=lambda: datetime.now().isoformat(), indent=2)
         
         if paper_trade:
             self._load_paper_positions()
@@ -26,6 +34,13 @@ class OrderManager:
         """Load paper positions from disk."""
         if not self.project_root:
             return
+        try:
+            data = self._journal.load()
+            if data is not None:
+                self._positions = list((data.get('positions') or {}).values())
+                return
+        except Exception as e:
+            print(f"Error loading paper order positions: {e}")
         path = os.path.join(self.project_root, 'orbiter', 'data', 'paper_positions.json')
         if os.path.exists(path):
             try:
@@ -52,14 +67,11 @@ class OrderManager:
                 self._positions = []
     
     def _save_paper_positions(self):
-        """Save paper positions to disk."""
+        """Save paper positions to disk (journals only the positions that changed)."""
         if not self.project_root:
             return
-        path = os.path.join(self.project_root, 'orbiter', 'data', 'paper_positions.json')
-        os.makedirs(os.path.dirname(path), exist_ok=True)
         try:
-            with open(path, 'w') as f:
-                json.dump(self._positions, f, indent=2)
+            self._journal.save({'positions': {str(p.get('symbol')): p for p in self._positions}})
         except:
             pass
     
@@ -74,10 +86,12 @@ class OrderManager:
             'side': order_result.get('side'),
             'quantity': order_result.get('lot_size') or order_result.get('quantity'),
             'status': 'FILLED' if order_result.get('ok') else 'REJECTED',
+            'order_ids': self._order_ids(order_result),
             'timestamp': datetime.now().isoformat(),
             'paper_trade': self.paper_trade,
             'details': order_result
         }
+        self._refresh_status(order)
         self._orders.append(order)
         
         # Update positions for paper trading
@@ -109,8 +123,38 @@ class OrderManager:
         
         self._save_paper_positions()
     
+    @staticmethod
+    def _order_ids(order_result: Dict) -> List[str]:
+        """Broker order numbers of every leg in an executor result."""
+        ids = []
+        for key in ('resp', 'hedge_resp', 'atm_resp'):
+            resp = order_result.get(key)
+            if isinstance(resp, dict) and resp.get('norenordno'):
+                ids.append(str(resp['norenordno']))
+        return ids
+    
+    def _refresh_status(self, order: Dict):
+        """Status from the fill simulator: REJECTED if any leg was, FILLED once all legs are COMPLETE."""
+        if self.fill_simulator is None or not order.get('order_ids') or order['status'] == 'REJECTED':
+            return
+        legs = [self.fill_simulator.get_order(oid) for oid in order['order_ids']]
+        statuses = {leg['status'] for leg in legs if leg}
+        if not statuses:
+            return
+        if statuses & {'REJECTED', 'CANCELED'}:
+            order['status'] = 'REJECTED'
+        elif statuses == {'COMPLETE'}:
+            order['status'] = 'FILLED'
+        elif any(leg and leg.get('fillshares') for leg in legs):
+            order['status'] = 'PARTIAL'
+        else:
+            order['status'] = 'PENDING'
+    
     def get_order_history(self) -> List[Dict]:
         """Get order history."""
+        for order in self._orders:
+            if order['status'] in ('PENDING', 'PARTIAL'):
+                self._refresh_status(order)
         return self._orders
     
     def get_positions(self) -> List[Dict]:
@@ -119,7 +163,9 @@ class OrderManager:
     
     def get_total_pnl(self) -> float:
         """Calculate total P&L from paper positions."""
-        # This would need price data to calculate properly
+        if self.fill_simulator is not None:
+            return self.fill_simulator.get_total_pnl()
+        # Without simulated fills there is no price data to mark against
         return 0.0
     
     def clear_positions(self):
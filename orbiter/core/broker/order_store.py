@@ -0,0 +1,242 @@
+# orbiter/core/broker/order_store.py
+"""
+Order Store - order and position state driven by the order-update websocket.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+ACTIVE_STATUSES = frozenset({'OPEN', 'PENDING', 'TRIGGER_PENDING'})
+FINAL_STATUSES = frozenset({'COMPLETE', 'REJECTED', 'CANCELED', 'CANCELLED'})
+# An order for the same token + side in any of these states counts as "already traded"
+DUPLICATE_STATUSES = ACTIVE_STATUSES | {'COMPLETE'}
+
+
+class OrderStore:
+    """
+    Local order book and net positions.
+
+    - `on_order_update`: order-update websocket callback. Orders are indexed by
+      (token, side, status) and positions by token, so duplicate/open-order
+      checks are dictionary lookups instead of an order-book download.
+    - `wait_for_fill`: blocks until an order reaches a final status.
+    - `reconcile`: REST order book + positions, run every `reconcile_interval`
+      seconds once `start()` is called, and on demand via `refresh(max_age)`.
+    """
+
+    def __init__(self, api=None, master=None, reconcile_interval: float = 60.0):
+        self.api = api
+        self.master = master
+        self.reconcile_interval = reconcile_interval
+
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[Tuple[str, str, str], Set[str]] = {}
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._final_events: Dict[str, threading.Event] = {}
+        self._listeners: List[Callable] = []
+        self._lock = threading.RLock()
+
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_reconcile = 0.0
+
+        self._updates = 0
+        self._reconciles = 0
+        self._rest_calls = 0
+
+    # ------------------------------------------------------------------ feed
+    def on_order_update(self, msg: Dict[str, Any]):
+        """Handle an order update from the websocket (also used to replay REST order-book rows)."""
+        order_id = str(msg.get('norenordno') or msg.get('order_id') or '')
+        if not order_id:
+            return
+        with self._lock:
+            prev = self._orders.get(order_id)
+            order = dict(prev) if prev else {}
+            order.update(msg)
+            order['norenordno'] = order_id
+            order['token'] = self._token_of(order)
+            order['status'] = str(order.get('status', '')).upper()
+            self._reindex(order_id, prev, order)
+            self._orders[order_id] = order
+            self._apply_fill(prev, order)
+            self._updates += 1
+
+            if order['status'] in FINAL_STATUSES:
+                self._event(order_id).set()
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(order)
+            except Exception as e:
+                logger.error(f"[OrderStore] listener error: {e}")
+
+    def add_listener(self, callback: Callable):
+        """callback(order) after every applied update."""
+        self._listeners.append(callback)
+
+    # ----------------------------------------------------------------- reads
+    def has_order(self, token: str, side: str, statuses: Iterable[str] = DUPLICATE_STATUSES) -> bool:
+        """True if an order for token + side ('B'/'S') exists in one of `statuses`."""
+        token, side = str(token), self._side(side)
+        return any(self._index.get((token, side, status)) for status in statuses)
+
+    def open_orders(self, token: str = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [o for o in self._orders.values()
+                    if o['status'] in ACTIVE_STATUSES and (token is None or o['token'] == str(token))]
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return self._orders.get(str(order_id))
+
+    def get_orders(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._orders.values())
+
+    def get_position(self, token: str) -> Optional[Dict[str, Any]]:
+        return self._positions.get(str(token))
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Open positions in the broker's row format (exch, token, tsym, netqty, avgprc, ...)."""
+        with self._lock:
+            return [dict(p) for p in self._positions.values() if int(safe_float(p.get('netqty', 0))) != 0]
+
+    def wait_for_fill(self, order_id: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Block until the order is COMPLETE/REJECTED/CANCELED. Returns the order, or None on timeout."""
+        with self._lock:
+            event = self._event(str(order_id))
+        if not event.wait(timeout):
+            return None
+        return self._orders.get(str(order_id))
+
+    # ------------------------------------------------------------- reconcile
+    def reconcile(self) -> bool:
+        """Rebuild from the REST order book and positions. Returns False if either call failed."""
+        if self.api is None:
+            return False
+        ok = True
+        try:
+            self._rest_calls += 1
+            book = self.api.get_order_book()
+            if isinstance(book, list):
+                for row in book:
+                    if isinstance(row, dict):
+                        self.on_order_update(row)
+            elif not (isinstance(book, dict) and 'no data' in str(book.get('emsg', '')).lower()):
+                ok = False
+        except Exception as e:
+            logger.warning(f"[OrderStore] order book reconcile failed: {e}")
+            ok = False
+
+        try:
+            self._rest_calls += 1
+            rows = self.api.get_positions()
+            if isinstance(rows, list):
+                with self._lock:
+                    # Broker positions are authoritative; fills replayed above must not double count
+                    self._positions = {str(r.get('token')): dict(r) for r in rows if isinstance(r, dict) and r.get('token')}
+            elif not (isinstance(rows, dict) and 'no data' in str(rows.get('emsg', '')).lower()):
+                ok = False
+        except Exception as e:
+            logger.warning(f"[OrderStore] positions reconcile failed: {e}")
+            ok = False
+
+        self._last_reconcile = time.monotonic()
+        self._reconciles += 1
+        return ok
+
+    def refresh(self, max_age: float) -> bool:
+        """Reconcile only if the last one is older than `max_age` seconds."""
+        if time.monotonic() - self._last_reconcile <= max_age and self._reconciles:
+            return True
+        return self.reconcile()
+
+    def start(self):
+        if self._running.is_set() or self.reconcile_interval <= 0:
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run_loop, name="OrderStore", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running.clear()
+
+    def _run_loop(self):
+        while self._running.is_set():
+            self.reconcile()
+            time.sleep(self.reconcile_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "orders": len(self._orders),
+            "open_orders": sum(len(ids) for (_, _, status), ids in self._index.items() if status in ACTIVE_STATUSES),
+            "positions": len(self.get_positions()),
+            "updates": self._updates,
+            "reconciles": self._reconciles,
+            "rest_calls": self._rest_calls
+        }
+
+    # -------------------------------------------------------------- internals
+    @staticmethod
+    def _side(side: str) -> str:
+        side = str(side or '').upper()
+        return 'B' if side in ('B', 'BUY') else 'S' if side in ('S', 'SELL') else side
+
+    def _token_of(self, order: Dict[str, Any]) -> str:
+        token = order.get('token') or order.get('tk')
+        if not token and self.master is not None:
+            token = self.master.SYMBOL_TO_TOKEN.get(order.get('tsym'))
+        return str(token or order.get('tsym') or '')
+
+    def _event(self, order_id: str) -> threading.Event:
+        event = self._final_events.get(order_id)
+        if event is None:
+            event = self._final_events[order_id] = threading.Event()
+        return event
+
+    def _reindex(self, order_id: str, prev: Optional[Dict[str, Any]], order: Dict[str, Any]):
+        if prev:
+            old_key = (prev['token'], self._side(prev.get('trantype')), prev['status'])
+            ids = self._index.get(old_key)
+            if ids:
+                ids.discard(order_id)
+                if not ids:
+                    del self._index[old_key]
+        key = (order['token'], self._side(order.get('trantype')), order['status'])
+        self._index.setdefault(key, set()).add(order_id)
+
+    def _apply_fill(self, prev: Optional[Dict[str, Any]], order: Dict[str, Any]):
+        """Move the net position by the newly filled quantity of this update."""
+        filled = int(safe_float(order.get('fillshares', 0)))
+        if not filled and order['status'] == 'COMPLETE':
+            filled = int(safe_float(order.get('qty', 0)))
+        before = int(safe_float(prev.get('_filled', 0))) if prev else 0
+        order['_filled'] = max(filled, before)
+        delta = filled - before
+        if delta <= 0:
+            return
+
+        sign = 1 if self._side(order.get('trantype')) == 'B' else -1
+        price = safe_float(order.get('flprc') or order.get('avgprc') or order.get('prc'))
+        pos = self._positions.get(order['token'])
+        if pos is None:
+            pos = self._positions[order['token']] = {
+                'exch': order.get('exch'), 'token': order['token'], 'tsym': order.get('tsym'),
+                'prd': order.get('prd'), 'netqty': 0, 'avgprc': 0.0
+            }
+        net = int(safe_float(pos.get('netqty', 0)))
+        new_net = net + sign * delta
+        avg = safe_float(pos.get('avgprc', 0))
+        if net == 0 or (new_net != 0 and (net > 0) != (new_net > 0)):
+            avg = price # opened or flipped
+        elif abs(new_net) > abs(net):
+            avg = (avg * abs(net) + price * delta) / abs(new_net)
+        pos['netqty'] = new_net
+        pos['avgprc'] = avg
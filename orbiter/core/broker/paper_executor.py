@@ -29,7 +29,9 @@ class PaperOrderExecutor:
     """Paper trading executor with margin checks - composes Future and Options executors."""
     
     def __init__(self, api, master=None, resolver=None, execution_policy: Dict = None, 
-                 project_root: str = None, segment_name: str = None):
+                 project_root: str = None, segment_name: str = None, fill_simulator=None, margin=None):
+        # Orders go to the tick-driven FillSimulator when one is given (it delegates quotes etc. to api)
+        api = fill_simulator or api
         self.api = api
         self.master = master
         self.resolver = resolver
@@ -45,6 +47,19 @@ class PaperOrderExecutor:
         self._options_executor = PaperOptionsOrderExecutor(
             api, master, resolver, execution_policy, project_root, segment_name
         )
+        self.fill_simulator = fill_simulator
+        self._future_executor.order_manager.fill_simulator = fill_simulator
+        self._options_executor.order_manager.fill_simulator = fill_simulator
+        self._options_executor._executor.margin_calculator = margin # spreads sized on local incremental margin
+        
+        # Adaptive LMT pricing needs a book to price from and fills to wait for: the fill simulator
+        self.chaser = None
+        limit_chase = self.policy.get('limit_chase') or {}
+        if fill_simulator is not None and limit_chase.get('enabled'):
+            from orbiter.core.broker.limit_chaser import LimitChaser
+            self.chaser = LimitChaser.from_policy(limit_chase, fill_simulator, fill_simulator.quote_cache)
+            self._future_executor._executor.chaser = self.chaser
+            self._options_executor._executor.chaser = self.chaser
         
         self.logger.info("[PAPER] PaperOrderExecutor initialized with margin checks")
     
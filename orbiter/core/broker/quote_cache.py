@@ -0,0 +1,215 @@
+# orbiter/core/broker/quote_cache.py
+"""
+Quote Cache - shared, websocket-fed quotes with a coalesced REST fallback.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+QUOTE_FIELDS = ('lp', 'ltp', 'c', 'o', 'h', 'l', 'v', 'ap', 'pc', 'oi', 'bp1', 'sp1', 'bq1', 'sq1')
+
+
+class QuoteCache:
+    """
+    One quote store for the whole process, indexed by 'EXCH|token' and tradingsymbol.
+
+    - `on_tick`: TickHandler callback. Subscribed instruments stay fresh for as
+      long as the websocket is live, so reads cost no API calls.
+    - `get_quote` / `get_ltp`: cache hit if fresh, else one REST `get_quotes`.
+      Concurrent misses for the same key share that request (single-flight).
+      `max_age` bounds any cached quote; without it, websocket quotes are fresh
+      while the feed is live and REST quotes for `ttl_seconds`.
+    - `get_quotes`: several legs at once; misses are fetched in parallel.
+    - `watch`: subscribe legs we hold or are about to trade, ahead of the order.
+    """
+
+    def __init__(self, api, master=None, subscribe: Callable = None, is_live: Callable = None,
+                 ttl_seconds: float = 2.0, max_workers: int = 4, fetch_timeout: float = 5.0):
+        self.api = api
+        self.master = master
+        self.subscribe = subscribe
+        self.is_live = is_live or (lambda: False)
+        self.ttl_seconds = ttl_seconds
+        self.fetch_timeout = fetch_timeout
+
+        self._quotes: Dict[str, Tuple[float, str, Dict[str, Any]]] = {} # key -> (ts, source, quote)
+        self._tsym_index: Dict[str, str] = {}
+        self._indexed_rows = 0
+        self._watched = set()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quotes")
+
+        self._hits = 0
+        self._rest_calls = 0
+        self._coalesced = 0
+
+    # ------------------------------------------------------------------ feed
+    def on_tick(self, symbol: str, tick_data: Dict[str, Any]):
+        """Handle incoming tick from WebSocket (registered with TickHandler)."""
+        key = f"{tick_data.get('exchange')}|{tick_data.get('token')}"
+        quote = {k: tick_data[k] for k in QUOTE_FIELDS if k in tick_data}
+        self._store(key, quote, 'ws')
+        tsym = tick_data.get('symbol')
+        if tsym and '|' not in str(tsym):
+            self._tsym_index.setdefault(tsym, key)
+
+    def watch(self, exchange: str, token: str = None, tsym: str = None):
+        """Add an instrument to the websocket feed so later reads are cache hits."""
+        key = self._key(exchange, token, tsym)
+        if not key or key in self._watched:
+            return key
+        if tsym:
+            self._tsym_index.setdefault(tsym, key)
+        self._watched.add(key)
+        if self.subscribe and key.split('|')[-1].isdigit():
+            try:
+                self.subscribe([key])
+            except Exception as e:
+                logger.warning(f"[QuoteCache] subscribe failed for {key}: {e}")
+        return key
+
+    # ----------------------------------------------------------------- reads
+    def get_quote(self, exchange: str = None, token: str = None, tsym: str = None,
+                  max_age: float = None) -> Optional[Dict[str, Any]]:
+        """Quote dict for a token or tradingsymbol, or None if unavailable."""
+        key = self._key(exchange, token, tsym)
+        if not key:
+            return None
+        cached = self._cached(key, max_age)
+        if cached is not None:
+            self._hits += 1
+            return cached
+        return self._fetch(key)
+
+    def get_ltp(self, exchange: str = None, token: str = None, tsym: str = None,
+                max_age: float = None) -> Optional[float]:
+        quote = self.get_quote(exchange, token, tsym, max_age)
+        if not quote:
+            return None
+        ltp = safe_float(quote.get('lp') or quote.get('ltp'))
+        return ltp if ltp > 0 else None
+
+    def get_quotes(self, legs: List[Tuple[str, Optional[str], Optional[str]]],
+                   max_age: float = None) -> List[Optional[Dict[str, Any]]]:
+        """Batch of (exchange, token, tsym). Cache hits return at once; misses go out together."""
+        keys = [self._key(*leg) for leg in legs]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        pending = {}
+        for i, key in enumerate(keys):
+            if not key:
+                continue
+            cached = self._cached(key, max_age)
+            if cached is not None:
+                self._hits += 1
+                results[i] = cached
+            elif key not in pending:
+                pending[key] = self._pool.submit(self._fetch, key)
+        for i, key in enumerate(keys):
+            if key in pending:
+                try:
+                    results[i] = pending[key].result(timeout=self.fetch_timeout)
+                except Exception as e:
+                    logger.warning(f"[QuoteCache] batch fetch failed for {key}: {e}")
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "quotes": len(self._quotes),
+            "watched": len(self._watched),
+            "hits": self._hits,
+            "rest_calls": self._rest_calls,
+            "coalesced": self._coalesced
+        }
+
+    # -------------------------------------------------------------- internals
+    def _key(self, exchange: str = None, token: str = None, tsym: str = None) -> Optional[str]:
+        if token:
+            token = str(token)
+            if '|' in token:
+                return token
+            return f"{exchange or 'NSE'}|{token}"
+        if not tsym:
+            return None
+        key = self._tsym_index.get(tsym)
+        if key:
+            return key
+        self._index_master()
+        key = self._tsym_index.get(tsym)
+        if key:
+            return key
+        master_token = self.master.SYMBOL_TO_TOKEN.get(tsym) if self.master is not None else None
+        if master_token and exchange:
+            return f"{exchange}|{master_token}"
+        # Last resort, as the order path always did: let the API resolve the tradingsymbol
+        return f"{exchange}|{tsym}" if exchange else None
+
+    def _index_master(self):
+        """Index DERIVATIVE_OPTIONS by tradingsymbol once, instead of scanning per lookup."""
+        rows = getattr(self.master, 'DERIVATIVE_OPTIONS', None) or []
+        if len(rows) == self._indexed_rows:
+            return
+        for row in rows:
+            tsym, token, exch = row.get('tradingsymbol'), row.get('token'), row.get('exchange')
+            if tsym and token and exch:
+                self._tsym_index.setdefault(tsym, f"{exch}|{token}")
+        self._indexed_rows = len(rows)
+
+    def _store(self, key: str, quote: Dict[str, Any], source: str):
+        with self._lock:
+            entry = self._quotes.get(key)
+            if entry is not None and source == 'ws':
+                # Touchline ticks are deltas; keep fields this tick did not carry
+                merged = dict(entry[2])
+                merged.update(quote)
+                quote = merged
+            self._quotes[key] = (time.monotonic(), source, quote)
+
+    def _cached(self, key: str, max_age: float = None) -> Optional[Dict[str, Any]]:
+        entry = self._quotes.get(key)
+        if entry is None:
+            return None
+        ts, source, quote = entry
+        age = time.monotonic() - ts
+        if max_age is not None:
+            # An explicit bound holds for websocket quotes too (an illiquid leg may not have ticked for minutes)
+            return quote if age <= max_age else None
+        if source == 'ws' and self.is_live():
+            return quote
+        return quote if age <= self.ttl_seconds else None
+
+    def _fetch(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = Future()
+        if not leader:
+            self._coalesced += 1
+            try:
+                return call.result(timeout=self.fetch_timeout)
+            except Exception:
+                return None
+
+        quote = None
+        try:
+            exch, token = key.split('|', 1)
+            self._rest_calls += 1
+            res = self.api.get_quotes(exchange=exch, token=token)
+            if res and (res.get('lp') or res.get('ltp')):
+                quote = {k: res[k] for k in QUOTE_FIELDS if k in res}
+                self._store(key, quote, 'rest')
+        except Exception as e:
+            logger.warning(f"[QuoteCache] get_quotes failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.set_result(quote)
+        return quote
@@ -9,10 +9,29 @@ import re
 import logging
 from typing import Dict, List, Any, Callable
 from orbiter.core.broker.ltp_manager import LTPManager
+from orbiter.core.broker.tick_ingest import TickIngest
+from orbiter.core.broker.gap_backfill import GapBackfill
+
+_SHORT_SYMBOL_RE = re.compile(r'\d{2}[A-Z]{3}\d{2}(FC|F)?$')
+
+
+class _TokenRecord:
+    """Per-token constants resolved on the first tick: SYMBOLDICT keys, symbol, company name."""
+    __slots__ = ('key', 'symbol', 'company_name', 'alias_keys')
+
+    def __init__(self, key: str, symbol: str, company_name: str, alias_keys: List[str]):
+        self.key = key
+        self.symbol = symbol
+        self.company_name = company_name
+        self.alias_keys = alias_keys
 
 
 class TickHandler:
     """Manages live tick feed from websocket."""
+
+    # Websocket messages are applied on token-sharded workers; 0 applies them inline on the socket thread
+    INGEST_SHARDS = 4
+    INGEST_CAPACITY = 10000
     
     def __init__(self, api, master, project_root: str, segment_name: str):
         self.api = api
@@ -23,6 +42,9 @@ class TickHandler:
         
         self.SYMBOLDICT: Dict[str, Dict[str, Any]] = {}
         self._tick_callbacks: List[Callable] = []
+        self._records: Dict[str, _TokenRecord] = {}
+        self.ingest: TickIngest = None
+        self.backfill = GapBackfill(self)
         
         self.ltp_manager = LTPManager(self)
     
@@ -91,55 +113,87 @@ class TickHandler:
             else:
                 resolved_symbols.append(s)
         
-        def _tick_handler(msg, tk, ex):
-            key = f"{ex}|{tk}"
-            sym = self.get_symbol(tk, exchange=ex)
-            
-            existing_data = self.SYMBOLDICT.get(key, {})
-            existing_candles = existing_data.get('candles', [])
-            
-            if not existing_candles:
-                pseudo_candle = {
-                    'stat': 'Ok',
-                    'time': msg.get('t', '00-00-0000 00:00:00'),
-                    'into': msg['lp'], 'inth': msg.get('h', msg['lp']),
-                    'intl': msg.get('l', msg['lp']), 'intc': msg['lp'],
-                    'v': msg.get('v', '0'), 'ssboe': msg.get('ssboe', '0')
-                }
-                existing_candles = [pseudo_candle]
-            else:
-                existing_candles[-1]['intc'] = msg['lp']
-                if float(msg.get('h', 0)) > float(existing_candles[-1]['inth']):
-                    existing_candles[-1]['inth'] = msg['h']
-                if float(msg.get('l', 0)) < float(existing_candles[-1]['intl']) and float(msg.get('l', 0)) > 0:
-                    existing_candles[-1]['intl'] = msg['l']
-            
-            tick_data = {
-                **msg, 'symbol': sym, 't': sym, 'company_name': self.get_company_name(tk, exchange=ex),
-                'token': tk, 'exchange': ex, 'ltp': float(msg['lp']),
-                'high': float(msg.get('h', 0)), 'low': float(msg.get('l', 0)), 'volume': int(msg.get('v', 0)),
-                'candles': existing_candles
-            }
-            
-            self.SYMBOLDICT[key] = tick_data
-            
-            full_symbol = sym.split('|')[-1] if '|' in sym else sym
-            if f"{ex}|{full_symbol}" != key:
-                self.SYMBOLDICT[f"{ex}|{full_symbol}"] = tick_data
-            
-            short_symbol = re.sub(r'\d{2}[A-Z]{3}\d{2}(FC|F)?$', '', full_symbol)
-            if short_symbol != full_symbol and f"{ex}|{short_symbol}" != key:
-                self.SYMBOLDICT[f"{ex}|{short_symbol}"] = tick_data
-            
-            for callback in self._tick_callbacks:
-                try:
-                    callback(sym, tick_data)
-                except Exception as e:
-                    self.logger.error(f"Tick callback error: {e}")
+        if self.INGEST_SHARDS > 0:
+            if self.ingest is None:
+                self.ingest = TickIngest(self._apply_tick, num_shards=self.INGEST_SHARDS, capacity=self.INGEST_CAPACITY)
+                self.ingest.start()
+            on_message = self.ingest.submit
+        else:
+            on_message = self._apply_tick
         
-        connection.start_live_feed(resolved_symbols, _tick_handler)
+        connection.start_live_feed(resolved_symbols, on_message)
         self.logger.info(f"[TickHandler] Live feed started for {len(symbols)} symbols.")
     
+    def _record(self, tk, ex) -> _TokenRecord:
+        key = f"{ex}|{tk}"
+        rec = self._records.get(key)
+        if rec is not None:
+            return rec
+        
+        sym = self.get_symbol(tk, exchange=ex)
+        aliases = []
+        full_symbol = sym.split('|')[-1] if '|' in sym else sym
+        if f"{ex}|{full_symbol}" != key:
+            aliases.append(f"{ex}|{full_symbol}")
+        short_symbol = _SHORT_SYMBOL_RE.sub('', full_symbol)
+        if short_symbol != full_symbol and f"{ex}|{short_symbol}" != key:
+            aliases.append(f"{ex}|{short_symbol}")
+        
+        rec = _TokenRecord(key, sym, self.get_company_name(tk, exchange=ex), aliases)
+        if sym != key:
+            # Unmapped tokens are resolved again on the next tick, in case the master loads later
+            self._records[key] = rec
+        return rec
+    
+    def _apply_tick(self, msg, tk, ex):
+        """Merge one websocket message into SYMBOLDICT and fan it out to the tick callbacks."""
+        rec = self._record(tk, ex)
+        lp = msg['lp']
+        ltp = float(lp)
+        high = float(msg.get('h', 0))
+        low = float(msg.get('l', 0))
+        
+        existing_data = self.SYMBOLDICT.get(rec.key)
+        existing_candles = existing_data.get('candles', []) if existing_data else []
+        
+        if not existing_candles:
+            pseudo_candle = {
+                'stat': 'Ok',
+                'time': msg.get('t', '00-00-0000 00:00:00'),
+                'into': lp, 'inth': msg.get('h', lp),
+                'intl': msg.get('l', lp), 'intc': lp,
+                'v': msg.get('v', '0'), 'ssboe': msg.get('ssboe', '0')
+            }
+            existing_candles = [pseudo_candle]
+        else:
+            last = existing_candles[-1]
+            last['intc'] = lp
+            if high > float(last['inth']):
+                last['inth'] = msg['h']
+            if 0 < low < float(last['intl']):
+                last['intl'] = msg['l']
+        
+        tick_data = {
+            **msg, 'symbol': rec.symbol, 't': rec.symbol, 'company_name': rec.company_name,
+            'token': tk, 'exchange': ex, 'ltp': ltp,
+            'high': high, 'low': low, 'volume': int(msg.get('v', 0)),
+            'candles': existing_candles
+        }
+        
+        self.SYMBOLDICT[rec.key] = tick_data
+        for alias in rec.alias_keys:
+            self.SYMBOLDICT[alias] = tick_data
+        
+        for callback in self._tick_callbacks:
+            try:
+                callback(rec.symbol, tick_data)
+            except Exception as e:
+                self.logger.error(f"Tick callback error: {e}")
+    
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """Queue depth, drops and ingest lag of the websocket ingest layer."""
+        return self.ingest.get_stats() if self.ingest else {}
+    
     def prime_candles(self, symbols: List[Any], lookback_mins: int = 300):
         """Prime SYMBOLDICT with historical candles from broker API."""
         self.logger.debug(f"[TickHandler] Priming {len(symbols)} symbols with last {lookback_mins} minutes data.")
@@ -0,0 +1,135 @@
+# orbiter/core/broker/tick_ingest.py
+"""
+Tick Ingest - decouples the websocket receive thread from tick processing.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("ORBITER")
+
+
+class _Shard:
+    __slots__ = ('index', 'queue', 'wake', 'thread', 'processed', 'dropped', 'busy',
+                 'last_lag', 'max_lag', 'avg_lag')
+
+    def __init__(self, index: int, capacity: int):
+        self.index = index
+        self.queue = deque(maxlen=capacity)
+        self.wake = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.processed = 0
+        self.dropped = 0
+        self.busy = False
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.avg_lag = 0.0
+
+
+class TickIngest:
+    """
+    Bounded, token-sharded tick queue.
+
+    Flow:
+        WS receive thread → submit(msg, tk, ex) → ring buffer of shard hash(tk) % N
+                                                          ↓
+                                          shard worker → apply(msg, tk, ex)
+
+    `submit` only appends to a deque, so the socket reader never waits on parsing
+    or tick callbacks. All ticks of a token go to the same shard, which keeps
+    per-token order. A full ring buffer drops its oldest tick (counted in stats).
+    """
+
+    def __init__(self, apply: Callable, num_shards: int = 4, capacity: int = 10000, name: str = "tick-ingest"):
+        self.apply = apply
+        self.name = name
+        self.capacity = capacity
+        self._shards: List[_Shard] = [_Shard(i, capacity) for i in range(max(1, num_shards))]
+        self._running = False
+        self._submitted = 0
+
+    # -------------------------------------------------------------- lifecycle
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        for shard in self._shards:
+            shard.thread = threading.Thread(target=self._worker, args=(shard,),
+                                            name=f"{self.name}-{shard.index}", daemon=True)
+            shard.thread.start()
+        logger.debug(f"[TickIngest] Started {len(self._shards)} shards (capacity {self.capacity} each)")
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        for shard in self._shards:
+            shard.wake.set()
+        for shard in self._shards:
+            if shard.thread:
+                shard.thread.join(timeout)
+
+    # ---------------------------------------------------------------- producer
+    def submit(self, msg: Dict[str, Any], tk: str, ex: str):
+        """Websocket callback: enqueue and return."""
+        shard = self._shards[hash(tk) % len(self._shards)]
+        if len(shard.queue) >= self.capacity:
+            shard.dropped += 1
+            if shard.dropped == 1 or shard.dropped % 1000 == 0:
+                logger.warning(f"⚠️ TickIngest shard {shard.index} full, dropped {shard.dropped} ticks")
+        shard.queue.append((time.monotonic(), msg, tk, ex))
+        self._submitted += 1
+        shard.wake.set()
+
+    # ------------------------------------------------------------------ worker
+    def _worker(self, shard: _Shard):
+        queue = shard.queue
+        while True:
+            shard.wake.clear()
+            shard.busy = bool(queue)
+            while queue:
+                try:
+                    enqueued_at, msg, tk, ex = queue.popleft()
+                except IndexError:
+                    break
+                lag = time.monotonic() - enqueued_at
+                shard.last_lag = lag
+                if lag > shard.max_lag:
+                    shard.max_lag = lag
+                shard.avg_lag += (lag - shard.avg_lag) * 0.05
+                try:
+                    self.apply(msg, tk, ex)
+                except Exception as e:
+                    logger.error(f"[TickIngest] apply error for {ex}|{tk}: {e}")
+                shard.processed += 1
+            shard.busy = False
+            if not self._running:
+                return
+            shard.wake.wait(0.5)
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued tick has been applied. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while any(s.queue or s.busy for s in self._shards):
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    # ------------------------------------------------------------------- stats
+    def depth(self) -> int:
+        return sum(len(s.queue) for s in self._shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "shards": len(self._shards),
+            "queue_depth": self.depth(),
+            "max_shard_depth": max(len(s.queue) for s in self._shards),
+            "submitted": self._submitted,
+            "processed": sum(s.processed for s in self._shards),
+            "dropped": sum(s.dropped for s in self._shards),
+            "lag_ms_last": round(max(s.last_lag for s in self._shards) * 1000, 3),
+            "lag_ms_avg": round(max(s.avg_lag for s in self._shards) * 1000, 3),
+            "lag_ms_max": round(max(s.max_lag for s in self._shards) * 1000, 3)
+        }
@@ -1,6 +1,7 @@
 # orbiter/core/engine/action/executor.py
 
 import logging
+import threading
 import time
 from typing import Dict, Any
 from orbiter.utils.constants_manager import ConstantsManager
@@ -9,6 +10,7 @@ from orbiter.utils.schema_manager import SchemaManager
 from .executors.equity import EquityActionExecutor, EquitySimulationExecutor
 from .executors.options import OptionActionExecutor, OptionSimulationExecutor
 from .executors.futures import FutureActionExecutor, FutureSimulationExecutor
+from orbiter.core.engine.runtime.exit_monitor import position_legs
 
 logger = logging.getLogger("ORBITER")
 
@@ -58,6 +60,8 @@ class ActionExecutor:
         # Deduplication: track recently placed orders (symbol + side -> timestamp)
         self._recent_orders: Dict[str, float] = {}
         self._order_ttl_seconds = 60  # Orders valid for 60 seconds
+        self._exiting = set()  # position keys with a square-off in flight (ExitMonitor vs engine scan)
+        self._exit_lock = threading.Lock()
 
     @classmethod
     def set_frozen(cls, frozen: bool):
@@ -160,17 +164,83 @@ class ActionExecutor:
         """Action: Sends an alert message via the configured notifier."""
         msg = params.get('message', '🔔 System Alert')
         logger.info(f"ALARM: {msg}")
-        # Integration with telegram_notifier could go here
-        return True
+        # Queued on the AlertBus worker; the trading thread never waits on Telegram
+        from orbiter.bot.alert_bus import alert
+        return alert(msg, level=params.get('level', 'INFO'), fingerprint=params.get('fingerprint'))
 
     def square_off_all(self, **params: Dict):
         """Action: Closes all open positions."""
-        logger.info(f"🧹 Squaring off all positions. Reason: {params.get('reason', 'Generic')}")
-        # Simplified: Loop through active positions and fire market orders
-        for pos in self.state.active_positions:
-            self.place_order(
-                symbol=pos['symbol'], 
-                side='S' if pos['qty'] > 0 else 'B', 
-                qty=abs(pos['qty']),
-                remark="SQUARE_OFF"
-            )
+        reason = params.get('reason', 'Generic')
+        logger.info(f"🧹 Squaring off all positions. Reason: {reason}")
+        for key in list(self.state.active_positions.keys()):
+            self.square_off_position(key, reason=reason)
+
+    def square_off_position(self, key: str, reason: str = "SQUARE_OFF", **params: Dict):
+        """
+        Action: Closes one active position (every leg) at market.
+        Bypasses the entry guards in place_order (dedup / already-in-positions),
+        which would otherwise block the exit of an open position.
+        """
+        position = self.state.active_positions.get(key)
+        with self._exit_lock:
+            if position is None or key in self._exiting:
+                return None
+            self._exiting.add(key)
+
+        # An explicit paper=False on the position wins over the config default
+        paper = position['paper'] if position.get('paper') is not None else self.state.config.get('paper_trade', True)
+        product_type = position.get('product') or self.state.config.get('OPTION_PRODUCT_TYPE', 'I')
+        done = set(position.get('exited_legs', []))
+        results, failed = [], None
+        try:
+            # Legs come short-first, so a spread buys back the short strike before selling the hedge
+            for leg in position_legs(key, position, getattr(self.state.client, 'master', None)):
+                if not leg['tsym'] or leg['qty'] <= 0 or leg['tsym'] in done:
+                    continue
+                side = 'B' if leg['sign'] < 0 else 'S'
+                if paper:
+                    logger.info(f"🔬 SIM-EXIT: {side} {leg['tsym']} | QTY: {leg['qty']} | {reason}")
+                    results.append({"stat": "Ok", "simulated": True, "tsym": leg['tsym']})
+                    continue
+                logger.info(f"⚡ EXIT: {side} {leg['tsym']} | QTY: {leg['qty']} | {reason}")
+                try:
+                    res = self.state.client.conn.api.place_order(
+                        buy_or_sell=side,
+                        product_type=product_type,
+                        exchange=leg['exchange'],
+                        tradingsymbol=leg['tsym'],
+                        quantity=leg['qty'],
+                        discloseqty=0,
+                        price_type='MKT',
+                        price=0,
+                        retention='DAY',
+                        remarks=params.get('remark', 'SQUARE_OFF')
+                    )
+                except Exception as e:
+                    res = {'stat': 'Not_Ok', 'emsg': str(e)}
+                results.append(res)
+                if not res or res.get('stat') != 'Ok':
+                    # Stop here: selling the hedge after a failed buy-back would leave a naked short
+                    failed = (leg['tsym'], (res or {}).get('emsg', 'no response'))
+                    break
+                done.add(leg['tsym'])
+
+            if failed:
+                # Keep the position (and which legs already went out) so the next exit attempt finishes it
+                position['exited_legs'] = sorted(done)
+                logger.error(f"❌ Square-off of {key} failed on {failed[0]}: {failed[1]} | position kept ({reason})")
+                return results
+
+            self.state.active_positions.pop(key, None)
+            self.state.exit_history[key] = {
+                'symbol': position.get('symbol'),
+                'reason': reason,
+                'pnl_rs': position.get('pnl_rs', 0.0),
+                'exit_time': time.time()
+            }
+            if paper and hasattr(self.state, 'save_paper_positions'):
+                self.state.save_paper_positions()
+            return results
+        finally:
+            with self._exit_lock:
+                self._exiting.discard(key)
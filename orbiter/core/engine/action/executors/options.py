@@ -42,6 +42,11 @@ class OptionActionExecutor(BaseActionExecutor):
             
         tsym = res['tradingsymbol']
         exch = res['exchange']
+        
+        # Put the leg on the websocket now so pricing and exit checks read the quote cache
+        quotes = getattr(self.state.client, 'quotes', None)
+        if quotes is not None:
+            quotes.watch(exch, res.get('token'), tsym)
         qty = res['lot_size'] * int(params.get('qty_multiplier', 1))
         
         # Check paper trade mode
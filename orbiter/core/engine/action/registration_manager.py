@@ -164,10 +164,24 @@ class RegistrationManager:
         self.action_manager.action_registry['trade.log_square_off'] = lambda **kwargs: self._handle_nop('trade.log_square_off')
         self.action_manager.action_registry['trade.format_alert_message'] = lambda **kwargs: self._handle_nop('trade.format_alert_message')
         self.action_manager.action_registry['trade.send_telegram_alert'] = self.engine.action_logic.send_alert
+        self.action_manager.action_registry['trade.open_pair'] = self._open_pair
+        self.action_manager.action_registry['regime.apply_profile'] = self._apply_regime_profile
         self.action_manager.action_registry['trade.log_alert'] = lambda **kwargs: self._handle_nop('trade.log_alert')
         
         logger.debug("Individual handlers registered for multi-handler events")
     
+    def _open_pair(self, **kwargs):
+        """trade.open_pair: both legs of a configured pair as one linked position."""
+        if not getattr(self.engine, 'pairs', None):
+            return self._handle_nop('trade.open_pair')
+        return self.engine.pairs.open_pair(**kwargs)
+
+    def _apply_regime_profile(self, **kwargs):
+        """regime.apply_profile: re-weight the session filters for the current (or given) regime."""
+        if not getattr(self.engine, 'regime', None):
+            return self._handle_nop('regime.apply_profile')
+        return self.engine.regime.apply_profile(self.session_manager, **kwargs)
+
     def _handle_nop(self, handler_name, **kwargs):
         """No-op handler for unimplemented handlers."""
         logger.debug(f"[NOP] Handler: {handler_name} (not yet implemented)")
@@ -205,6 +219,10 @@ class RegistrationManager:
         # Engine Facts (Portfolio)
         if self.engine:
             self.rule_manager.register_provider(lambda: self.rule_manager.fact_calc.calculate_portfolio_facts(self.engine.state))
+            # Pair Facts (engine.pairs exists once prime_data has started it)
+            self.rule_manager.register_provider(lambda: self.engine.pairs.get_facts() if getattr(self.engine, 'pairs', None) else {})
+            # Regime Facts (engine.regime is set when RegimeService attaches)
+            self.rule_manager.register_provider(lambda: self.engine.regime.get_facts() if getattr(self.engine, 'regime', None) else {})
 
         logger.debug(self.constants.get('constants', 'fact_providers_registered_msg'))
 
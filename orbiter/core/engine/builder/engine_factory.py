@@ -86,9 +86,10 @@ class EngineFactory:
         state = StateManager(client, universe, full_config, segment_name=seg_name, clear_paper_positions=context.get('clear_paper_positions', False) if context else False)
         logger.debug(f"[{EngineFactory.__name__}.build_engine] - StateManager initialized.")
         
-        from orbiter.bot.sheets import log_buy_signals, log_closed_positions, update_active_positions, update_engine_state, get_engine_state
+        from orbiter.bot.sheets_sink import SheetsSink
         executor = ActionExecutor(state)
-        syncer = Syncer(update_active_positions, update_engine_state, get_engine_state)
+        sheets_sink = SheetsSink.get_instance()
+        syncer = Syncer(sheets_sink.update_active_positions, sheets_sink.update_engine_state, sheets_sink.get_engine_state)
         logger.debug(f"[{EngineFactory.__name__}.build_engine] - ActionExecutor and Syncer initialized.")
 
         # 4. Finalize State and Linkages
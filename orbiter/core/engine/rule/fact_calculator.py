@@ -8,29 +8,15 @@ import importlib
 from typing import Dict, Any, List
 from orbiter.utils.constants_manager import ConstantsManager
 from orbiter.utils.schema_manager import SchemaManager
+from orbiter.utils.yf_adapter import INDEX_SYMBOLS, MCX_YF_SYMBOLS
 from .technical_analyzer import TechnicalAnalyzer
 
 logger = logging.getLogger("ORBITER")
 
-_yf_indicators_cache = {'value': None, 'timestamp': 0}
-
-# MCX to Yahoo Finance commodity futures mapping
-MCX_YF_SYMBOLS = {
-    'CRUDEOILM': 'CL=F',
-    'NATURALGAS': 'NG=F',
-    'NATGASMINI': 'NG=F',
-    'GOLDM': 'GC=F',
-    'GOLDTEN': 'GC=F',
-    'GOLDGUINEA': 'GC=F',
-    'SILVERM': 'SI=F',
-    'SILVERMIC': 'SI=F',
-    'ALUMINI': 'ALI=F',
-    'LEADMINI': 'PB=F',
-    'ZINCMINI': 'ZN=F',
-}
+_FALLBACK_KEYS = (('adx', 0), ('ema_fast', 0), ('ema_slow', 0), ('supertrend_dir', 0), ('supertrend', 0))
 
 class FactCalculator:
-    def __init__(self, project_root: str, fact_definitions: Dict[str, Any]):
+    def __init__(self, project_root: str, fact_definitions: Dict[str, Any], fallback_data=None):
         logger.trace(f"[FactCalculator.__init__] - Initializing with project_root: {project_root}")
         self.constants = ConstantsManager.get_instance()
         self.schema_manager = SchemaManager.get_instance(project_root)
@@ -38,9 +24,22 @@ class FactCalculator:
         self.fact_definitions = fact_definitions
         self._custom_modules = {}
         self.analyzer = TechnicalAnalyzer()
+        self._fallback_data = fallback_data
+
+    @property
+    def fallback_data(self):
+        """Memory-only proxy indicators (FallbackDataProvider), created on first fallback."""
+        if self._fallback_data is None:
+            from orbiter.utils.fallback_data import FallbackDataProvider
+            self._fallback_data = FallbackDataProvider.get_instance()
+        return self._fallback_data
+
+    @staticmethod
+    def _apply_fallback(target: Dict[str, Any], data: Dict[str, Any]):
+        for key, default in _FALLBACK_KEYS:
+            target[f'index.{key}'] = target[f'index_{key}'] = data.get(key, default)
 
     def calculate_technical_facts(self, standardized_data: Dict[str, np.ndarray], filter_config: Dict[str, Any] = None, **kwargs) -> Dict[str, Any]:
-        import time
         facts = {}
         close_data = standardized_data.get('close')
         token = kwargs.get('token', 'UNKNOWN')
@@ -57,65 +56,16 @@ class FactCalculator:
                 yf_symbol = MCX_YF_SYMBOLS.get(token.upper())
                 
                 if yf_symbol:
-                    logger.warning(f"[{self.__class__.__name__}] - MCX instrument {token} has insufficient data ({data_len} bars). Trying YF fallback: {yf_symbol}")
-                    global _yf_indicators_cache
-                    current_time = time.time()
-                    
-                    # Create cache key for this specific commodity
-                    cache_key = f'mcx_{token.upper()}'
-                    if cache_key not in _yf_indicators_cache or (current_time - _yf_indicators_cache.get(f'{cache_key}_ts', 0)) > 300:
-                        try:
-                            import yfinance as yf
-                            import talib as talib_lib
-                            
-                            ticker = yf.Ticker(yf_symbol)
-                            df = ticker.history(period='1d', interval='5m')
-                            
-                            if df is not None and len(df) >= 14:
-                                high = np.array(df['High'].values, dtype=float)
-                                low = np.array(df['Low'].values, dtype=float)
-                                close = np.array(df['Close'].values, dtype=float)
-                                
-                                adx = talib_lib.ADX(high, low, close, timeperiod=14)[-1]
-                                ema_fast = talib_lib.EMA(close, timeperiod=5)[-1]
-                                ema_slow = talib_lib.EMA(close, timeperiod=20)[-1]
-                                atr = talib_lib.ATR(high, low, close, timeperiod=10)[-1]
-                                
-                                # SuperTrend direction
-                                hl2 = (high + low) / 2
-                                upper = hl2 + (3 * atr)
-                                lower = hl2 - (3 * atr)
-                                st_dir = 1 if close[-1] > lower[-1] else -1
-                                
-                                yf_data = {
-                                    'adx': round(float(adx), 2) if not np.isnan(adx) else 0,
-                                    'ema_fast': round(float(ema_fast), 2),
-                                    'ema_slow': round(float(ema_slow), 2),
-                                    'supertrend_dir': st_dir,
-                                    'supertrend': round(float(atr * 3), 2),
-                                }
-                                
-                                _yf_indicators_cache[cache_key] = yf_data
-                                _yf_indicators_cache[f'{cache_key}_ts'] = current_time
-                                logger.info(f"🔄 MCX YF fallback for {token}: ADX={yf_data['adx']}, EMA_fast={yf_data['ema_fast']}, ST_dir={yf_data['supertrend_dir']}")
-                            else:
-                                logger.warning(f"MCX YF fallback: No data for {yf_symbol}")
-                        except Exception as e:
-                            logger.warning(f"MCX YF fallback failed for {token}: {e}")
-                    
-                    # Apply cached YF values
-                    if cache_key in _yf_indicators_cache:
-                        yf = _yf_indicators_cache[cache_key]
-                        facts['index.adx'] = facts['index_adx'] = yf.get('adx', 0)
-                        facts['index.ema_fast'] = facts['index_ema_fast'] = yf.get('ema_fast', 0)
-                        facts['index.ema_slow'] = facts['index_ema_slow'] = yf.get('ema_slow', 0)
-                        facts['index.supertrend_dir'] = facts['index_supertrend_dir'] = yf.get('supertrend_dir', 0)
-                        facts['index.supertrend'] = facts['index_supertrend'] = yf.get('supertrend', 0)
+                    # Served from the prefetch cache; a miss queues the symbol, never fetches inline
+                    yf = self.fallback_data.get(yf_symbol)
+                    if yf:
+                        self._apply_fallback(facts, yf)
                         facts['data_source'] = 'yf_mcx_fallback'
-                        logger.info(f"🔄 Applied MCX YF fallback: ADX={yf.get('adx')}")
+                        logger.info(f"🔄 Applied MCX YF fallback for {token} ({yf_symbol}): ADX={yf.get('adx')}")
                         return facts
+                    logger.warning(f"[{self.__class__.__name__}] - MCX instrument {token} has insufficient data ({data_len} bars); YF fallback {yf_symbol} not cached yet")
                 
-                # No YF mapping or YF failed - return zeros
+                # No YF mapping or nothing cached yet - return zeros
                 logger.warning(f"[{self.__class__.__name__}] - MCX instrument {token} has no data ({data_len} bars) and no YF fallback. Returning zeros.")
                 facts['index.adx'] = facts['index_adx'] = 0
                 facts['index.ema_fast'] = facts['index_ema_fast'] = 0.0
@@ -134,30 +84,11 @@ class FactCalculator:
                 yf_index = 'NIFTY'  # Default to NIFTY for NFO/NSE
             
             logger.info(f"🔄 Using YF {yf_index} for fallback (exchange={exchange})")
-            # 🔄 Fallback: Use Yahoo Finance for ALL indicators when broker candles are insufficient
-            current_time = time.time()
-            
-            # Cache YF data for 5 minutes
-            if _yf_indicators_cache['value'] is None or (current_time - _yf_indicators_cache['timestamp']) > 300:
-                try:
-                    from orbiter.utils.yf_adapter import get_all_indicators
-                    yf_data = get_all_indicators(yf_index, '5m')
-                    if yf_data:
-                        _yf_indicators_cache = {'value': yf_data, 'timestamp': current_time}
-                        logger.info(f"🔄 Using YF indicators fallback: {yf_data}")
-                    else:
-                        logger.warning("YF fallback returned no data")
-                except Exception as e:
-                    logger.warning(f"YF indicators fallback failed: {e}")
+            yf = self.fallback_data.get(INDEX_SYMBOLS[yf_index])
             
             # Apply YF fallback values
-            if _yf_indicators_cache.get('value'):
-                yf = _yf_indicators_cache['value']
-                facts['index.adx'] = facts['index_adx'] = yf.get('adx', 0)
-                facts['index.ema_fast'] = facts['index_ema_fast'] = yf.get('ema_fast', 0)
-                facts['index.ema_slow'] = facts['index_ema_slow'] = yf.get('ema_slow', 0)
-                facts['index.supertrend_dir'] = facts['index_supertrend_dir'] = yf.get('supertrend_dir', 0)
-                facts['index.supertrend'] = facts['index_supertrend'] = yf.get('supertrend', 0)
+            if yf:
+                self._apply_fallback(facts, yf)
                 facts['data_source'] = 'yf_fallback'
                 logger.info(f"🔄 Applied YF fallback: ADX={yf.get('adx')}, EMA_fast={yf.get('ema_fast')}, ST_dir={yf.get('supertrend_dir')}")
             else:
@@ -190,37 +121,12 @@ class FactCalculator:
         if (adx_value == 0 or adx_value is None or (isinstance(adx_value, float) and np.isnan(adx_value))) and exchange.upper() == 'MCX':
             yf_symbol = MCX_YF_SYMBOLS.get(symbol.upper() if isinstance(symbol, str) else token.upper())
             if yf_symbol:
-                logger.warning(f"MCX ADX is {adx_value}, trying YF fallback for {token} ({yf_symbol})")
-                try:
-                    import yfinance as yf
-                    import talib as talib_lib
-                    ticker = yf.Ticker(yf_symbol)
-                    df = ticker.history(period='1d', interval='5m')
-                    
-                    if df is not None and len(df) >= 14:
-                        high = np.array(df['High'].values, dtype=float)
-                        low = np.array(df['Low'].values, dtype=float)
-                        close = np.array(df['Close'].values, dtype=float)
-                        
-                        adx = talib_lib.ADX(high, low, close, timeperiod=14)[-1]
-                        ema_fast = talib_lib.EMA(close, timeperiod=5)[-1]
-                        ema_slow = talib_lib.EMA(close, timeperiod=20)[-1]
-                        atr = talib_lib.ATR(high, low, close, timeperiod=10)[-1]
-                        
-                        hl2 = (high + low) / 2
-                        upper = hl2 + (3 * atr)
-                        lower = hl2 - (3 * atr)
-                        st_dir = 1 if close[-1] > lower[-1] else -1
-                        
-                        indicators['index_adx'] = indicators['index.adx'] = round(float(adx), 2) if not np.isnan(adx) else 0
-                        indicators['index_ema_fast'] = indicators['index.ema_fast'] = round(float(ema_fast), 2)
-                        indicators['index_ema_slow'] = indicators['index.ema_slow'] = round(float(ema_slow), 2)
-                        indicators['index_supertrend_dir'] = indicators['index.supertrend_dir'] = st_dir
-                        indicators['index_supertrend'] = indicators['index.supertrend'] = round(float(atr * 3), 2)
-                        
-                        logger.info(f"🔄 MCX YF fallback applied: ADX={indicators['index_adx']}, ST_dir={st_dir}")
-                except Exception as e:
-                    logger.warning(f"MCX YF fallback failed: {e}")
+                yf = self.fallback_data.get(yf_symbol)
+                if yf:
+                    self._apply_fallback(indicators, yf)
+                    logger.info(f"🔄 MCX YF fallback applied for {token} ({yf_symbol}): ADX={indicators['index_adx']}, ST_dir={indicators['index_supertrend_dir']}")
+                else:
+                    logger.warning(f"MCX ADX is {adx_value} for {token}; YF fallback {yf_symbol} not cached yet")
         
         # Add indicators as index.* facts (BOTH dot and underscore formats)
         # Indicators from TechnicalAnalyzer already have full key names like 'market_supertrend_dir'
@@ -237,18 +143,7 @@ class FactCalculator:
         param_key = self.fact_schema.get('params_key')
         in_key = self.fact_schema.get('inputs_key')
 
-        # Flatten strategy filters for easy lookup (Recursive)
-        flat_filters = {}
-        def _flatten(d):
-            for k, v in d.items():
-                if isinstance(v, dict):
-                    if 'enabled' in v: # Leaf node (filter config)
-                        flat_filters[k] = v
-                    else: # Structural node (group)
-                        _flatten(v)
-        
-        if filter_config:
-            _flatten(filter_config)
+        flat_filters = self._flatten_filters(filter_config)
 
         for name, definition in self.fact_definitions.get(f_key, {}).items():
             f_id = name.split('.')[-1]
@@ -279,23 +174,7 @@ class FactCalculator:
                 try:
                     module_path = definition.get('module')
                     method_name = definition.get('method')
-                    
-                    if module_path not in self._custom_modules:
-                        self._custom_modules[module_path] = importlib.import_module(module_path)
-                    
-                    method = getattr(self._custom_modules[module_path], method_name, None)
-                    
-                    # 🚀 Fix: Handle class-based filters (like DynamicBudgetTP)
-                    if method is None:
-                        # Try to find a class in the module that has the method
-                        for attr_name in dir(self._custom_modules[module_path]):
-                            attr = getattr(self._custom_modules[module_path], attr_name)
-                            if isinstance(attr, type) and hasattr(attr, method_name):
-                                # Instantiate and get method
-                                logger.trace(f"[FactCalculator] - Instantiating class {attr_name} for filter {name}")
-                                instance = attr()
-                                method = getattr(instance, method_name)
-                                break
+                    method = self._resolve_custom_method(name, module_path, method_name)
                     
                     if method is None:
                         raise AttributeError(f"Module {module_path} has no attribute {method_name}")
@@ -335,6 +214,120 @@ class FactCalculator:
                     
         return facts
 
+    def calculate_technical_facts_series(self, standardized_data: Dict[str, np.ndarray], filter_config: Dict[str, Any] = None, **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Series mode of `calculate_technical_facts` for backtests.
+        Returns {fact_name: np.ndarray} aligned with the input bars, where element i
+        is the fact as the last-bar API would compute it on bars[:i+1] with LTP = close[i].
+        Pass a 'timestamp' array (datetime64) in standardized_data for session-aware
+        filters (ORB window, yesterday's levels). Custom filters are looked up as
+        `<method>_series` (or the definition's 'series_method'); filters without a
+        series implementation (e.g. cross-symbol ratio_raider) are skipped.
+        The YF fallback for short histories is a live-only concern and is not applied.
+        """
+        facts = {}
+        close_data = standardized_data.get('close')
+        if close_data is None or len(close_data) == 0:
+            return facts
+
+        indicators = self.analyzer.analyze_series(standardized_data)
+        facts.update(indicators)
+
+        input_map = {k: v for k, v in standardized_data.items() if isinstance(v, np.ndarray)}
+
+        f_key = self.fact_schema.get('facts_key')
+        p_key = self.fact_schema.get('provider_key')
+        m_key = self.fact_schema.get('method_key')
+        param_key = self.fact_schema.get('params_key')
+        in_key = self.fact_schema.get('inputs_key')
+
+        flat_filters = self._flatten_filters(filter_config)
+
+        for name, definition in self.fact_definitions.get(f_key, {}).items():
+            f_id = name.split('.')[-1]
+            strat_settings = flat_filters.get(f_id, {"enabled": True})
+
+            if not strat_settings.get('enabled', True):
+                continue
+
+            if definition[p_key] == 'talib':
+                try:
+                    method = getattr(talib, definition[m_key])
+                    inputs = [input_map[inp] for inp in definition[in_key]]
+                    params = definition[param_key].copy()
+
+                    if 'time_period' in strat_settings: params['timeperiod'] = strat_settings['time_period']
+                    for k, v in strat_settings.items():
+                        if k in params: params[k] = v
+
+                    result = np.asarray(method(*inputs, **params), dtype=float)
+                    facts[name] = np.round(np.nan_to_num(result, nan=0.0), 2)
+                except Exception as e:
+                    logger.warning(f"Failed to calculate series {name}: {e}")
+                    facts[name] = np.zeros(len(close_data))
+
+            elif definition[p_key] == 'custom':
+                module_path = definition.get('module')
+                series_name = definition.get('series_method', f"{definition.get('method')}_series")
+                try:
+                    method = self._resolve_custom_method(name, module_path, series_name)
+                    if method is None:
+                        logger.debug(f"[FactCalculator] - No series implementation for {name} ({module_path}.{series_name}), skipping.")
+                        continue
+
+                    filter_kwargs = {
+                        **definition.get(param_key, {}),
+                        **strat_settings,
+                        'indicators': indicators,
+                    }
+                    for k, v in kwargs.items():
+                        if k not in filter_kwargs:
+                            filter_kwargs[k] = v
+
+                    res = method(standardized_data, **filter_kwargs)
+                    facts[name] = res.get('score', np.zeros(len(close_data)))
+                    for k, v in res.items():
+                        if k != 'score': facts[f"{name}.{k}"] = v
+                except Exception as e:
+                    logger.warning(f"Custom series filter {name} failed: {e}")
+                    facts[name] = np.zeros(len(close_data))
+
+        return facts
+
+    def _flatten_filters(self, filter_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten strategy filters for easy lookup (Recursive)."""
+        flat_filters = {}
+        def _flatten(d):
+            for k, v in d.items():
+                if isinstance(v, dict):
+                    if 'enabled' in v: # Leaf node (filter config)
+                        flat_filters[k] = v
+                    else: # Structural node (group)
+                        _flatten(v)
+        
+        if filter_config:
+            _flatten(filter_config)
+        return flat_filters
+
+    def _resolve_custom_method(self, name: str, module_path: str, method_name: str):
+        if module_path not in self._custom_modules:
+            self._custom_modules[module_path] = importlib.import_module(module_path)
+        
+        method = getattr(self._custom_modules[module_path], method_name, None)
+        
+        # 🚀 Fix: Handle class-based filters (like DynamicBudgetTP)
+        if method is None:
+            # Try to find a class in the module that has the method
+            for attr_name in dir(self._custom_modules[module_path]):
+                attr = getattr(self._custom_modules[module_path], attr_name)
+                if isinstance(attr, type) and hasattr(attr, method_name):
+                    # Instantiate and get method
+                    logger.trace(f"[FactCalculator] - Instantiating class {attr_name} for filter {name}")
+                    instance = attr()
+                    method = getattr(instance, method_name)
+                    break
+        return method
+
     def calculate_portfolio_facts(self, state: Any) -> Dict[str, Any]:
         realized = getattr(state, 'realized_pnl', 0.0)
         return {
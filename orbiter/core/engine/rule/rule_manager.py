@@ -1,6 +1,10 @@
+import hashlib
+import json
 import logging
+import time
 import traceback
-import rule_engine
+from collections import deque
+from orbiter.utils.config_bundle import compile_rule
 import re
 import threading
 from typing import List, Dict, Any, Callable, Optional
@@ -14,6 +18,17 @@ from orbiter.utils.utils import merge_dicts, safe_float
 
 logger = logging.getLogger("ORBITER")
 
+
+def rules_version(data: Any) -> str:
+    """Short content hash of a parsed rules file; identifies the rule set behind each decision."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:10]
+
+
+def bundle_version(strategy: Any, rules: Any, filters: Any) -> str:
+    """rules_version of a strategy's strategy.json + rules.json + filters.json, as loaded and as hot reloaded."""
+    return rules_version({'strategy': strategy, 'rules': rules, 'filters': filters})
+
+
 class RuleManager:
     def __init__(self, project_root: str, rules_file_path: str, session_manager: SessionManager):
         self.project_root = project_root
@@ -34,6 +49,10 @@ class RuleManager:
         
         # Cache for compiled math evaluators to avoid re-compilation in loops
         self._score_evaluators = {} 
+
+        # Hot reload: RuleReloader swaps rule_sets/scoring_rules between scans; every match is audited
+        self.rules_version = None
+        self.decision_log = deque(maxlen=1000)
         
         self.rule_sets = self._load_and_compile_rules()
         logger.trace(f"📋 Initialized with {len(self.rule_sets)} rule sets")
@@ -137,7 +156,7 @@ class RuleManager:
                     standardized, 
                     filter_config=self.session_manager.filters, 
                     raw_data_for_filter=raw_data_for_filter,
-                    **extra_facts
+                    **{k: v for k, v in extra_facts.items() if k != 'raw_data_for_filter'}
                 )
                 tech_facts_flat["instrument.symbol"] = raw_data.get('symbol', 'UNKNOWN')
                 
@@ -178,7 +197,11 @@ class RuleManager:
                     logger.trace(f"🔍 Rule '{rule_set.get('name')}' - strategy_sum_bi={facts.get('strategy_sum_bi')}, market_adx={facts.get('market_adx')}")
                 match_result = rule_set['engine'].matches(facts)
                 if match_result:
-                    logger.info(f"✅ Rule matched: {rule_set['name']}")
+                    logger.info(f"✅ Rule matched: {rule_set['name']} (rules {self.rules_version})")
+                    self.decision_log.append({
+                        'time': time.time(), 'rule': rule_set['name'], 'version': self.rules_version,
+                        'context': context, 'symbol': extra_facts.get('symbol') or extra_facts.get('token'),
+                    })
                     # IMPORTANT: Deep copy actions to avoid mutating the original rule_set objects
                     import copy
                     for op in rule_set[op_key]:
@@ -223,7 +246,7 @@ class RuleManager:
                     standardized, 
                     filter_config=self.session_manager.filters, 
                     raw_data_for_filter=raw_data_for_filter,
-                    **extra_facts
+                    **{k: v for k, v in extra_facts.items() if k != 'raw_data_for_filter'}
                 )
                 if not tech_facts_flat:
                     return 0.0
@@ -308,7 +331,7 @@ class RuleManager:
                     expr_str = score_rule.get('scoring_expression')
                     if expr_str:
                         if expr_str not in self._score_evaluators:
-                            self._score_evaluators[expr_str] = rule_engine.Rule(expr_str)
+                            self._score_evaluators[expr_str] = compile_rule(expr_str)
                         
                         # 🔥 DEBUG: Log facts if scoring is expected
                         if 'filter_supertrend_direction_numeric' not in facts:
@@ -349,6 +372,19 @@ class RuleManager:
         # Return both total score and the individual scores dict
         return scores['sum_bi'] + scores['sum_uni'], scores
 
+    def swap_rules(self, rule_sets: List[Dict], scoring_rules: List[Dict], version: str) -> tuple:
+        """Install a compiled rule set. Returns the (rule_sets, scoring_rules, version) it replaced."""
+        previous = (self.rule_sets, self.scoring_rules, self.rules_version)
+        self.rule_sets, self.scoring_rules, self.rules_version = rule_sets, scoring_rules, version
+        logger.info(f"🔁 Rules swapped: {previous[2]} -> {version} ({len(rule_sets)} rule sets, {len(scoring_rules)} scoring rules)")
+        return previous
+
+    def compile_rule_data(self, data: dict) -> tuple:
+        """(rule_sets, scoring_rules) for a parsed rules file. Raises on the first bad rule."""
+        rules_key = self.rule_schema.get('rules_key', 'strategies')
+        scoring_key = self.rule_schema.get('scoring_rules_key', 'scoring_rules')
+        return self._compile_rule_list(data, rules_key), self._compile_rule_list(data, scoring_key)
+
     def _load_and_compile_rules(self) -> List[Dict]:
         logger.debug(f"📋 Loading rules from: {self.rules_file_path}")
         rules = self._compile_rules(self.rule_schema.get('rules_key', 'strategies'), self.rule_sets)
@@ -362,28 +398,36 @@ class RuleManager:
         try:
             data = DataManager.load_json(self.rules_file_path)
             if not data: return []
-            compiled = []
-            strategies_key = self.rule_schema.get('rules_key', 'strategies')
-            signals_key = self.rule_schema.get('conditions_key', 'market_signals')
-            ops_key = self.rule_schema.get('actions_key', 'order_operations')
-            prio_key = self.rule_schema.get('priority_key', 'priority')
-            score_expr_key = self.rule_schema.get('score_expression_key', 'scoring_expression')
-
-            for s in data.get(rule_list_key, []):
-                expr = s.get('expression') or self._convert_to_expression(s.get(signals_key, {}))
-                rule_entry = {"name": s.get('name', 'Unnamed'), "engine": rule_engine.Rule(expr), prio_key: s.get(prio_key, 0)}
-                if ops_key in s: rule_entry[ops_key] = s.get(ops_key, [])
-                if score_expr_key in s:
-                    raw_expr = s.get(score_expr_key)
-                    # Recursively replace all dots with underscores in the scoring expression
-                    processed_score_expr = raw_expr.replace('.', '_')
-                    rule_entry['scoring_expression'] = processed_score_expr
-                compiled.append(rule_entry)
-            return sorted(compiled, key=lambda x: x[prio_key], reverse=True)
+            self.rules_version = bundle_version(getattr(self.session_manager, 'strategy_bundle', None) or {}, data,
+                                                getattr(self.session_manager, 'filters', None) or {})
+            return self._compile_rule_list(data, rule_list_key)
         except Exception as e:
             logger.error(f"❌ Load Error {rule_list_key}: {e}")
             return []
 
+    def _compile_rule_list(self, data: dict, rule_list_key: str) -> List[Dict]:
+        compiled = []
+        signals_key = self.rule_schema.get('conditions_key', 'market_signals')
+        ops_key = self.rule_schema.get('actions_key', 'order_operations')
+        prio_key = self.rule_schema.get('priority_key', 'priority')
+        score_expr_key = self.rule_schema.get('score_expression_key', 'scoring_expression')
+
+        for s in data.get(rule_list_key, []):
+            expr = s.get('expression') or self._convert_to_expression(s.get(signals_key, {}))
+            try:
+                engine = compile_rule(expr)
+            except Exception as e:
+                raise ValueError(f"rule '{s.get('name', 'Unnamed')}': {e}") from e
+            rule_entry = {"name": s.get('name', 'Unnamed'), "engine": engine, prio_key: s.get(prio_key, 0)}
+            if ops_key in s: rule_entry[ops_key] = s.get(ops_key, [])
+            if score_expr_key in s:
+                raw_expr = s.get(score_expr_key)
+                # Recursively replace all dots with underscores in the scoring expression
+                processed_score_expr = raw_expr.replace('.', '_')
+                rule_entry['scoring_expression'] = processed_score_expr
+            compiled.append(rule_entry)
+        return sorted(compiled, key=lambda x: x[prio_key], reverse=True)
+
     def _convert_to_expression(self, node: dict) -> str:
         operators = {
             "equal": "==", "notEqual": "!=", 
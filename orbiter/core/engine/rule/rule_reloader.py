@@ -0,0 +1,232 @@
+# orbiter/core/engine/rule/rule_reloader.py
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from orbiter.core.engine.rule.rule_manager import bundle_version
+
+logger = logging.getLogger("ORBITER")
+
+
+class RuleReloader:
+    """
+    Hot reload of the active strategy's strategy.json, rules.json and filters.json.
+
+    Flow:
+        watcher thread -> check(): stat the three files every `interval` seconds
+            -> changed? parse -> validate against schema_manager keys -> compile rules
+            -> valid: stage the candidate | invalid: log, keep the running set (rollback)
+        Engine.tick -> apply(): swap the staged candidate into RuleManager and
+            SessionManager before the scan starts, so a scan never mixes two versions
+
+    Compilation happens on the watcher thread; the engine thread only swaps references.
+    Every applied/rejected/rolled-back version lands in `history`; every matched rule
+    lands in `rule_manager.decision_log` with the version that matched it.
+    """
+
+    def __init__(self, rule_manager, session_manager, interval: float = 2.0, action_registry: Dict[str, Any] = None):
+        self.rule_manager = rule_manager
+        self.session_manager = session_manager
+        self.schema_manager = rule_manager.schema_manager
+        self.project_root = session_manager.project_root
+        self.interval = interval
+        self.action_registry = action_registry
+
+        self.history = deque(maxlen=100)
+        self.reloads = 0
+        self.rejections = 0
+        self.last_error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._previous: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seen = self._stat_files(self._watched_paths(session_manager.strategy_bundle))
+
+    # ---- paths
+    def _abs(self, rel_path: Optional[str]) -> Optional[str]:
+        return os.path.join(self.project_root, rel_path) if rel_path else None
+
+    def _watched_paths(self, strategy_bundle: dict) -> Dict[str, Optional[str]]:
+        files = strategy_bundle.get(self.schema_manager.get_key('strategy_schema', 'files_key', 'files'), {})
+        return {
+            'strategy': self.session_manager.strategy_path,
+            'rules': self._abs(files.get(self.schema_manager.get_key('strategy_schema', 'rules_file_key', 'rules_file'))),
+            'filters': self._abs(files.get(self.schema_manager.get_key('strategy_schema', 'filters_file_key', 'filters_file'))),
+        }
+
+    @staticmethod
+    def _stat_files(paths: Dict[str, Optional[str]]) -> Dict[str, tuple]:
+        stamps = {}
+        for role, path in paths.items():
+            try:
+                st = os.stat(path)
+                stamps[role] = (path, st.st_mtime_ns, st.st_size)
+            except (OSError, TypeError):
+                stamps[role] = (path, None, None)
+        return stamps
+
+    # ---- watcher
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="RuleReloader", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"❌ RuleReloader check failed: {e}")
+
+    def check(self) -> Optional[str]:
+        """One polling pass. Returns the staged version, or None if nothing new was staged."""
+        stamps = self._stat_files(self._watched_paths(self.session_manager.strategy_bundle))
+        if stamps == self._seen:
+            return None
+
+        try:
+            with open(stamps['strategy'][0]) as f:
+                strategy = json.load(f)
+            # strategy.json may point at different rules/filters files; watch those from now on
+            stamps = self._stat_files(self._watched_paths(strategy))
+            rules = self._read(stamps['rules'][0])
+            filters = self._read(stamps['filters'][0]) if stamps['filters'][0] else {}
+            errors = self.validate(strategy, rules, filters)
+            if errors:
+                raise ValueError("; ".join(errors))
+            rule_sets, scoring_rules = self.rule_manager.compile_rule_data(rules)
+        except Exception as e:
+            self._seen = stamps  # retry only once the files change again
+            self._reject(str(e))
+            return None
+
+        version = bundle_version(strategy, rules, filters)
+        candidate = {
+            'version': version, 'rule_sets': rule_sets, 'scoring_rules': scoring_rules,
+            'strategy_bundle': strategy, 'filters': filters, 'rules_path': stamps['rules'][0],
+        }
+        with self._lock:
+            self._pending = candidate
+        self._seen = stamps
+        logger.info(f"📥 Rules {version} validated and compiled; swapping in at the next scan")
+        return version
+
+    @staticmethod
+    def _read(path: Optional[str]) -> Any:
+        if not path:
+            raise ValueError("file not set in strategy.json")
+        with open(path) as f:
+            return json.load(f)
+
+    # ---- validation
+    def validate(self, strategy: Any, rules: Any, filters: Any) -> List[str]:
+        """Schema problems in a candidate strategy bundle; empty when it is safe to swap in."""
+        sk = lambda key, default: self.schema_manager.get_key('strategy_schema', key, default)
+        rk = lambda key, default: self.schema_manager.get_key('rule_schema', key, default)
+        errors = []
+
+        if not isinstance(strategy, dict):
+            return ["strategy.json is not an object"]
+        for key in (sk('name_key', 'name'), sk('exchange_id_key', 'exchange_id'), sk('files_key', 'files')):
+            if key not in strategy:
+                errors.append(f"strategy.json missing '{key}'")
+        exch_key = sk('exchange_id_key', 'exchange_id')
+        current_exch = self.session_manager.strategy_bundle.get(exch_key)
+        if exch_key in strategy and strategy[exch_key] != current_exch:
+            errors.append(f"exchange_id changed {current_exch} -> {strategy[exch_key]} (needs a restart)")
+        if not isinstance(strategy.get(sk('strategy_parameters_key', 'strategy_parameters'), {}), dict):
+            errors.append("strategy_parameters is not an object")
+
+        if not isinstance(filters, dict):
+            errors.append("filters.json is not an object")
+
+        if not isinstance(rules, dict):
+            return errors + ["rules.json is not an object"]
+        rules_key = rk('rules_key', 'strategies')
+        scoring_key = rk('scoring_rules_key', 'scoring_rules')
+        signals_key = rk('conditions_key', 'market_signals')
+        ops_key = rk('actions_key', 'order_operations')
+        if not isinstance(rules.get(rules_key), list):
+            errors.append(f"rules.json '{rules_key}' must be a list")
+        for rule in rules.get(rules_key) or []:
+            name = rule.get('name', '?') if isinstance(rule, dict) else '?'
+            if not isinstance(rule, dict) or 'name' not in rule:
+                errors.append(f"rule without a name in '{rules_key}'")
+                continue
+            if 'expression' not in rule and signals_key not in rule:
+                errors.append(f"rule '{name}' has neither 'expression' nor '{signals_key}'")
+            ops = rule.get(ops_key, [])
+            if not isinstance(ops, list) or not all(isinstance(op, dict) and op.get('type') for op in ops):
+                errors.append(f"rule '{name}' {ops_key} must be a list of {{'type', 'params'}}")
+            elif self.action_registry is not None:
+                unknown = sorted({op['type'] for op in ops} - set(self.action_registry))
+                if unknown:
+                    errors.append(f"rule '{name}' uses unregistered actions {unknown}")
+        for rule in rules.get(scoring_key) or []:
+            if not isinstance(rule, dict) or not isinstance(rule.get('scoring_expression', ''), str):
+                errors.append(f"scoring rule '{rule.get('name', '?') if isinstance(rule, dict) else '?'}' is malformed")
+        return errors
+
+    def _reject(self, error: str):
+        self.rejections += 1
+        self.last_error = error
+        self.history.append({'time': time.time(), 'version': None, 'status': 'rejected', 'error': error})
+        logger.error(f"❌ Rule reload rejected, keeping rules {self.rule_manager.rules_version}: {error}")
+
+    # ---- swap (engine thread)
+    def apply(self) -> bool:
+        """Swap in the staged candidate, if any. Call between scans. Returns True on swap."""
+        with self._lock:
+            candidate, self._pending = self._pending, None
+        if candidate is None:
+            return False
+        self._previous = self._install(candidate)
+        self.reloads += 1
+        self.history.append({'time': time.time(), 'version': candidate['version'], 'status': 'applied'})
+        return True
+
+    def rollback(self) -> bool:
+        """Reinstall the rule set that the last swap replaced."""
+        if self._previous is None:
+            return False
+        previous = self._previous
+        self._previous = self._install(previous)
+        self._seen = self._stat_files(self._watched_paths(self.session_manager.strategy_bundle))
+        self.history.append({'time': time.time(), 'version': previous['version'], 'status': 'rolled_back'})
+        logger.warning(f"⏪ Rules rolled back to {previous['version']}")
+        return True
+
+    def _install(self, candidate: Dict[str, Any]) -> Dict[str, Any]:
+        rm, sm = self.rule_manager, self.session_manager
+        current = {
+            'version': rm.rules_version, 'rule_sets': rm.rule_sets, 'scoring_rules': rm.scoring_rules,
+            'strategy_bundle': sm.strategy_bundle, 'filters': sm.filters, 'rules_path': rm.rules_file_path,
+        }
+        rm.swap_rules(candidate['rule_sets'], candidate['scoring_rules'], candidate['version'])
+        rm.rules_file_path = candidate['rules_path']
+        sm.strategy_bundle = candidate['strategy_bundle']
+        sm.filters = candidate['filters']
+        return current
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.rule_manager.rules_version,
+            'reloads': self.reloads,
+            'rejections': self.rejections,
+            'pending': self._pending is not None,
+            'last_error': self.last_error,
+            'decisions': len(self.rule_manager.decision_log),
+        }
@@ -1,6 +1,7 @@
 import numpy as np
 import talib
 import logging
+from orbiter.utils.supertrend import supertrend
 
 logger = logging.getLogger("ORBITER")
 
@@ -65,6 +66,45 @@ class TechnicalAnalyzer:
             
         return indicators
 
+    def analyze_series(self, standardized_data: dict) -> dict:
+        """
+        Series counterpart of `analyze`: same keys, each holding one value per bar
+        (rounded to 2 decimals, with the same NaN defaults as the last-bar path).
+        """
+        indicators = {}
+        close = standardized_data.get('close')
+        high = standardized_data.get('high')
+        low = standardized_data.get('low')
+
+        if close is None or len(close) < 14:
+            return indicators
+
+        def _clean(values, fill=0.0):
+            return np.round(np.nan_to_num(np.asarray(values, dtype=float), nan=fill), 2)
+
+        try:
+            for period in (5, 9, 20, 50):
+                indicators[f'index.ema{period}'] = indicators[f'index_ema{period}'] = _clean(talib.EMA(close, timeperiod=period))
+            indicators['index.ema_fast'] = indicators['index_ema_fast'] = indicators['index.ema5']
+            indicators['index.ema_slow'] = indicators['index_ema_slow'] = indicators['index.ema20']
+
+            indicators['index.rsi'] = indicators['index_rsi'] = _clean(talib.RSI(close, timeperiod=14), fill=50.0)
+            indicators['index.adx'] = indicators['index_adx'] = _clean(talib.ADX(high, low, close, timeperiod=14))
+            indicators['index.atr'] = indicators['index_atr'] = _clean(talib.ATR(high, low, close, timeperiod=14))
+
+            st, trend = self._supertrend_series(high, low, close, 10, 3)
+            indicators['index.supertrend'] = indicators['index_supertrend'] = np.round(st, 2)
+            indicators['index.supertrend_dir'] = indicators['index_supertrend_dir'] = trend.astype(int)
+
+            u, m, l = talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+            indicators['index.bb_upper'] = indicators['index_bb_upper'] = _clean(u)
+            indicators['index.bb_middle'] = indicators['index_bb_middle'] = _clean(m)
+            indicators['index.bb_lower'] = indicators['index_bb_lower'] = _clean(l)
+        except Exception as e:
+            logger.error(f"TechnicalAnalyzer Series Error: {e}")
+
+        return indicators
+
     def _ema(self, close, period):
         try:
             val = talib.EMA(close, timeperiod=period)[-1]
@@ -136,52 +176,13 @@ class TechnicalAnalyzer:
         Direction: 1 (Bullish/Green), -1 (Bearish/Red)
         """
         try:
-            # Calculate ATR
-            atr = talib.ATR(high, low, close, timeperiod=period)
-            
-            # Basic Upper and Lower Bands
-            hl2 = (high + low) / 2
-            basic_upper = hl2 + (multiplier * atr)
-            basic_lower = hl2 - (multiplier * atr)
-            
-            final_upper = np.zeros(len(close))
-            final_lower = np.zeros(len(close))
-            st = np.zeros(len(close))
-            trend = np.zeros(len(close)) # 1 for Bull, -1 for Bear
-            
-            for i in range(1, len(close)):
-                # Final Upper Band
-                if basic_upper[i] < final_upper[i-1] or close[i-1] > final_upper[i-1]:
-                    final_upper[i] = basic_upper[i]
-                else:
-                    final_upper[i] = final_upper[i-1]
-                
-                # Final Lower Band
-                if basic_lower[i] > final_lower[i-1] or close[i-1] < final_lower[i-1]:
-                    final_lower[i] = basic_lower[i]
-                else:
-                    final_lower[i] = final_lower[i-1]
-                
-                # Trend Logic
-                prev_trend = trend[i-1] if i > 0 else 1
-                
-                if prev_trend == 1: # Was Bullish
-                    if close[i] <= final_lower[i-1]: # Breakdown
-                        trend[i] = -1
-                        st[i] = final_upper[i]
-                    else: # Hold
-                        trend[i] = 1
-                        st[i] = final_lower[i]
-                else: # Was Bearish
-                    if close[i] >= final_upper[i-1]: # Breakout
-                        trend[i] = 1
-                        st[i] = final_lower[i]
-                    else: # Hold
-                        trend[i] = -1
-                        st[i] = final_upper[i]
-
+            st, trend = self._supertrend_series(high, low, close, period, multiplier)
             return round(float(st[-1]), 2), int(trend[-1])
 
         except Exception as e:
             logger.error(f"SuperTrend Error: {e}")
             return 0.0, 0
+
+    def _supertrend_series(self, high, low, close, period, multiplier):
+        """Full SuperTrend value and direction arrays behind `_supertrend` (shared kernel)."""
+        return supertrend(high, low, close, period, multiplier)
@@ -24,6 +24,10 @@ class Engine:
         self.action_manager = action_manager # ActionManager passed from OrbiterApp
         self.constants = ConstantsManager.get_instance()
         self.shutdown_triggered = False # Flag for rule-driven shutdown
+        self.exit_monitor = None # Per-tick exit path, started in prime_data
+        self.pairs = None # Streaming pairs engine, started in prime_data when configured
+        self.reloader = None # Strategy/rules/filters hot reload, started in prime_data when configured
+        self.regime = None # RegimeService, attached once the index feed is primed
         
         # 1. Rule Hub
         rules_path = session_manager.get_active_rules_file()
@@ -35,6 +39,11 @@ class Engine:
         self.registration_manager = RegistrationManager(None, self, self.session_manager, self.action_manager, self.rule_manager)
         logger.debug(f"[{self.__class__.__name__}.__init__] - Engine initialization complete.")
 
+    def _trailing_sl_filter(self) -> dict:
+        """The strategy's exit.tp.trailing_sl filter (empty when the strategy has none)."""
+        filters = self.session_manager.filters or {}
+        return filters.get('exit', {}).get('tp', {}).get('trailing_sl', {})
+
     def _get_symbol_key(self, instrument) -> str:
         """Get symbol key from instrument dict."""
         if isinstance(instrument, dict):
@@ -56,11 +65,19 @@ class Engine:
                            If provided, only processes symbols with new ticks.
                            If None, processes all symbols (full scan).
         """
+        # Edited rules/filters validated off-thread are swapped in here, between scans
+        if self.reloader is not None and self.reloader.apply() and self.exit_monitor:
+            self.exit_monitor.set_trailing_sl(self._trailing_sl_filter())
+
         symbols_to_process = self.state.symbols
         
         if buffered_ticks:
-            tick_symbols = list(buffered_ticks.keys())
-            logger.debug(f"🔄 ENGINE TICK (buffered) - Processing {len(tick_symbols)} symbols with new data")
+            tick_symbols = set(buffered_ticks.keys())
+            # TickHandler keys batches by tradingsymbol once the master maps the token; match on EXCH|token too
+            for batch in buffered_ticks.values():
+                if batch and isinstance(batch[-1], dict) and batch[-1].get('token'):
+                    tick_symbols.add(f"{batch[-1].get('exchange', 'NSE')}|{batch[-1]['token']}")
+            logger.debug(f"🔄 ENGINE TICK (buffered) - Processing {len(buffered_ticks)} symbols with new data")
             
             # Filter to only symbols with new ticks
             symbols_to_process = [
@@ -74,6 +91,18 @@ class Engine:
         else:
             logger.info(f"🔄 ENGINE TICK (full scan) - Universe: {len(self.state.symbols)} symbols")
         
+        # Candles repaired after a websocket reconnect must be merged before indicators run
+        tick_handler = getattr(getattr(self.state.client, 'conn', None), 'tick_handler', None)
+        backfill = getattr(tick_handler, 'backfill', None)
+        if backfill is not None and backfill.running is True:
+            logger.info("⏳ Waiting for post-reconnect candle backfill...")
+            backfill.wait(timeout=self.state.config.get('backfill_wait_seconds', 15))
+        
+        # Local portfolio margin prices new spreads against what is held right now
+        margin = getattr(self.state.client, 'margin', None)
+        if margin is not None and hasattr(margin, 'sync_portfolio'):
+            margin.sync_portfolio(self.state.active_positions)
+
         # Reset scan metrics for this tick
         self.state.last_scan_metrics = []
 
@@ -134,6 +163,8 @@ class Engine:
             if isinstance(instrument, dict):
                 for k, v in instrument.items():
                     extra_facts[f"instrument.{k}"] = v
+            if self.pairs is not None:
+                extra_facts.update(self.pairs.facts_for(lookup_key))
             
             # 📊 Collect Reporting Metrics
             # 🔄 For BSE stocks, use NSE NIFTY data for ADX calculation
@@ -252,7 +283,10 @@ class Engine:
             expiry_type = self.state.config.get('OPTION_EXPIRY', 'monthly')
 
             span_key = f"{base_symbol}|{expiry_type}|{instrument_type}|{hedge_steps}"
-            cached = self.state.client.margin.span_cache.get(span_key) if self.state.client.margin.span_cache else None
+            # Local margin is incremental to the held portfolio, so it is recomputed rather than cached
+            cached = None
+            if self.state.client.margin.span_cache and self.state.client.margin.source != 'local':
+                cached = self.state.client.margin.span_cache.get(span_key)
             if cached:
                 span_pe = cached.get('pe', {'ok': False})
                 span_ce = cached.get('ce', {'ok': False})
@@ -266,6 +300,7 @@ class Engine:
                                                                     instrument=instrument_type)
                     if spread.get('ok'):
                         if not spread.get('lot_size'): spread['lot_size'] = instrument.get('lotsize') or 1
+                        spread.setdefault('spot', ltp) # local portfolio margin revalues around the underlying
                         margin = self.state.client.margin.calculate_span_for_spread(spread, self.state.client.conn.api, self.state.client.conn.cred['user'], product_type=product)
                         if side == 'PUT': span_pe = margin
                         else: span_ce = margin
@@ -343,6 +378,10 @@ class Engine:
 
                 logger.debug(f"[{self.__class__.__name__}.tick] - Executing {len(actions)} instrument actions for {token} ({symbol_name}).")
                 self.action_manager.execute_batch(actions)
+
+        # Pick up positions opened in this cycle for per-tick exit checks
+        if self.exit_monitor:
+            self.exit_monitor.sync()
         logger.debug(f"[{self.__class__.__name__}.tick] - Engine tick cycle complete.")
 
 
@@ -356,6 +395,13 @@ class Engine:
         # Stop tick processor
         if hasattr(self, '_tick_processor') and self._tick_processor:
             self._tick_processor.stop()
+        if self.reloader is not None:
+            self.reloader.stop()
+        margin = getattr(self.state.client, 'margin', None)
+        if margin is not None and hasattr(margin, 'reconciliation_report'):
+            report = margin.reconciliation_report()
+            if report.get('samples'):
+                logger.info(f"📐 Local vs broker margin: {report}")
         
         self.shutdown_triggered = True
         logger.info(self.constants.get('constants', 'engine_shutdown_triggered_msg').format(reason=reason))
@@ -364,6 +410,9 @@ class Engine:
         """Start market data feed - historical priming + live WebSocket + TickProcessor."""
         from orbiter.core.market_data import MarketData
         from orbiter.core.tick_processor import TickProcessor
+        from orbiter.core.engine.runtime.exit_monitor import ExitMonitor
+        from orbiter.core.engine.runtime.pairs_engine import PairsEngine
+        from orbiter.core.engine.rule.rule_reloader import RuleReloader
         
         if not self.state.client:
             return False
@@ -375,6 +424,35 @@ class Engine:
         )
         
         if self.state.primed:
+            # Exit monitor goes first so open positions see each tick before anything else
+            if self.state.config.get('exit_monitor_enabled', True):
+                self.exit_monitor = ExitMonitor(
+                    self.state,
+                    square_off=self.action_logic.square_off_position,
+                    subscribe=self.state.client.conn.subscribe,
+                    trailing_sl=self._trailing_sl_filter()
+                )
+                self.exit_monitor.sync()
+                self.state.client.conn.tick_handler.register_tick_callback(self.exit_monitor.on_tick)
+                logger.info(f"✅ ExitMonitor started (positions: {len(self.state.active_positions)})")
+
+            pairs_config = self.session_manager.op_config.get('pairs', {})
+            if pairs_config.get('enabled'):
+                tick_handler = self.state.client.conn.tick_handler
+                self.pairs = PairsEngine(self.state, pairs_config, square_off=self.action_logic.square_off_position)
+                self.pairs.seed(tick_handler.SYMBOLDICT)
+                tick_handler.register_tick_callback(self.pairs.on_tick)
+                logger.info(f"✅ PairsEngine started (pairs: {', '.join(self.pairs.pairs) or 'none'})")
+
+            if self.state.config.get('hot_reload_enabled', False):
+                self.reloader = RuleReloader(
+                    self.rule_manager, self.session_manager,
+                    interval=self.state.config.get('hot_reload_interval_seconds', 2),
+                    action_registry=self.action_manager.action_registry
+                )
+                self.reloader.start()
+                logger.info(f"✅ RuleReloader watching {self.session_manager.strategy_dir} (rules {self.rule_manager.rules_version})")
+
             # Start tick processor with configurable interval
             interval = self.state.config.get('tick_process_interval_seconds', 60)
             enabled = self.state.config.get('tick_processor_enabled', True)
@@ -0,0 +1,250 @@
+# orbiter/core/engine/runtime/exit_monitor.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.filters.tp.f2_trailing_sl import trail_floor_rs
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+
+def position_legs(key: str, position: Dict[str, Any], master=None) -> List[Dict[str, Any]]:
+    """
+    Tradable legs of an active position: [{'key', 'tsym', 'exchange', 'qty', 'sign'}].
+    Spreads (atm_symbol + hedge_symbol) are a short ATM leg and a long hedge leg;
+    linked positions (pairs) carry their own `legs`; anything else is a single leg
+    fed by the position key. sign: +1 long, -1 short.
+    """
+    if position.get('legs'):
+        # Short legs first, so an exit buys back before it sells
+        return sorted((dict(leg) for leg in position['legs']), key=lambda leg: leg['sign'])
+    exch = key.split('|')[0] if '|' in key else position.get('exchange', 'NFO')
+    atm, hedge = position.get('atm_symbol'), position.get('hedge_symbol')
+    if atm and hedge:
+        qty = int(safe_float(position.get('lot_size', 0)))
+        legs = []
+        for tsym, sign in ((atm, -1), (hedge, 1)):
+            token = master.SYMBOL_TO_TOKEN.get(tsym) if master is not None else None
+            legs.append({'key': f"{exch}|{token}" if token else None, 'tsym': tsym, 'exchange': exch, 'qty': qty, 'sign': sign})
+        return legs
+
+    qty = int(safe_float(position.get('qty') or position.get('lot_size') or 0))
+    strategy = str(position.get('strategy', '')).upper()
+    is_short = str(position.get('side') or '').upper() == 'S' or 'SHORT' in strategy or qty < 0
+    return [{
+        'key': key, 'tsym': position.get('symbol') or position.get('tsym'), 'exchange': exch,
+        'qty': abs(qty), 'sign': -1 if is_short else 1
+    }]
+
+
+class ExitState:
+    """
+    Compact per-position exit state.
+    PnL = base + Σ(sign * qty * ltp) over the legs; `mark` is that sum, updated
+    in O(1) per leg tick. For spreads base is entry_net_premium * lot_size.
+    """
+    __slots__ = ('key', 'weights', 'ltps', 'missing', 'base', 'mark', 'pnl', 'peak_pnl',
+                 'trail_level', 'hard_sl_rs', 'target_rs', 'activation_rs', 'retracement_pct', 'exiting', 'retry_at')
+
+    def __init__(self, key: str, legs: List[Dict[str, Any]], position: Dict[str, Any], defaults: Dict[str, Any] = None):
+        defaults = defaults or {}
+        self.key = key
+        self.weights = {leg['key']: leg['sign'] * leg['qty'] for leg in legs}
+        self.ltps: Dict[str, float] = {}
+        self.missing = len(self.weights)
+        self.mark = 0.0
+
+        entry_net = position.get('entry_net_premium')
+        entry_price = safe_float(position.get('entry_price', 0))
+        if len(legs) > 1 and entry_net is not None:
+            self.base = safe_float(entry_net) * legs[0]['qty']
+        elif len(legs) > 1 and all(safe_float(leg.get('entry_price')) > 0 for leg in legs):
+            self.base = -sum(self.weights[leg['key']] * safe_float(leg['entry_price']) for leg in legs)
+        elif len(legs) == 1 and entry_price > 0:
+            self.base = -self.weights[legs[0]['key']] * entry_price
+        else:
+            self.base = None # Unknown entry: PnL starts flat at the first full quote
+
+        self.pnl = 0.0
+        self.peak_pnl = safe_float(position.get('max_pnl_rs', 0.0))
+        self.hard_sl_rs = safe_float(position.get('stop_loss_rs', defaults.get('stop_loss_rs', 0)))
+        self.target_rs = safe_float(position.get('target_profit_rs', defaults.get('target_profit_rs', 0)))
+        # Cash trail only where the strategy's trailing_sl filter is on (or the position carries its own levels)
+        trailing = defaults.get('trailing_sl_enabled', 'tsl_activation_rs' in position)
+        self.activation_rs = safe_float(position.get('tsl_activation_rs', defaults.get('tsl_activation_rs', 1000))) if trailing else None
+        self.retracement_pct = safe_float(position.get('tsl_retracement_pct', defaults.get('tsl_retracement_pct', 40)))
+        self.trail_level = (trail_floor_rs(self.peak_pnl, self.retracement_pct)
+                            if trailing and self.peak_pnl >= self.activation_rs else None)
+        self.exiting = False
+        self.retry_at = 0.0
+
+    def on_price(self, leg_key: str, ltp: float) -> Optional[str]:
+        """Apply a leg price. Returns the exit reason when a level is crossed, else None."""
+        weight = self.weights[leg_key]
+        prev = self.ltps.get(leg_key)
+        if prev is None:
+            self.missing -= 1
+            self.mark += weight * ltp
+        else:
+            self.mark += weight * (ltp - prev)
+        self.ltps[leg_key] = ltp
+
+        if self.missing > 0:
+            return None
+        if self.base is None:
+            self.base = -self.mark
+        self.pnl = self.base + self.mark
+
+        if self.pnl > self.peak_pnl:
+            self.peak_pnl = self.pnl
+            if self.activation_rs is not None and self.peak_pnl >= self.activation_rs:
+                self.trail_level = trail_floor_rs(self.peak_pnl, self.retracement_pct)
+
+        if self.hard_sl_rs > 0 and self.pnl <= -self.hard_sl_rs:
+            return f"Hard SL: PnL ₹{self.pnl:.2f} <= ₹-{self.hard_sl_rs:.0f}"
+        if self.trail_level is not None and self.pnl <= self.trail_level:
+            return f"Cash TSL Hit: Peak ₹{self.peak_pnl:.0f}, Floor ₹{self.trail_level:.0f}, Current ₹{self.pnl:.0f}"
+        if self.target_rs > 0 and self.pnl >= self.target_rs:
+            return f"Profit Target hit: Total PnL ₹{self.pnl:.2f} >= ₹{self.target_rs:.0f}"
+        return None
+
+
+class ExitMonitor:
+    """
+    Per-tick exit path for open positions.
+
+    Flow:
+        WebSocket tick → on_tick → leg lookup (only legs of open positions)
+                                        ↓
+                        ExitState.on_price (PnL, peak, trail, hard SL)
+                                        ↓
+                        square_off(position_key, reason) → executor
+
+    Runs on the tick ingest workers next to the TickProcessor, without indicators
+    or the rule engine, so trailing stops do not wait for the next engine scan.
+    """
+
+    RETRY_SECONDS = 5.0 # after a failed square-off, before the next tick may try again
+
+    def __init__(self, state, square_off: Callable, subscribe: Callable = None, trailing_sl: Dict[str, Any] = None):
+        self.state = state
+        self.square_off = square_off
+        self.subscribe = subscribe
+        self.defaults = {
+            'stop_loss_rs': state.config.get('exit_monitor_stop_loss_rs', 0),
+            'target_profit_rs': state.config.get('exit_monitor_target_profit_rs', 0),
+        }
+        self.set_trailing_sl(trailing_sl)
+
+        self._positions: Dict[str, ExitState] = {}
+        self._by_leg: Dict[str, List[ExitState]] = {}
+        self._subscribed = set()
+        self._synced_count = -1
+        self._lock = threading.RLock() # spread legs can tick on different ingest shards
+
+        self._tick_count = 0
+        self._exit_count = 0
+
+    def set_trailing_sl(self, trailing_sl: Dict[str, Any] = None):
+        """The strategy's exit.tp.trailing_sl filter; positions watched from now on use it."""
+        trailing_sl = trailing_sl or {}
+        self.defaults['trailing_sl_enabled'] = bool(trailing_sl.get('enabled', False))
+        self.defaults['tsl_activation_rs'] = trailing_sl.get('activation_rs', 1000)
+        self.defaults['tsl_retracement_pct'] = trailing_sl.get('retracement_pct', 40)
+
+    def sync(self):
+        """Rebuild the watch list from state.active_positions, keeping peaks of known positions."""
+        with self._lock:
+            master = getattr(self.state.client, 'master', None)
+            positions = {}
+            by_leg: Dict[str, List[ExitState]] = {}
+            for key, position in list(self.state.active_positions.items()):
+                exit_state = self._positions.get(key)
+                if exit_state is None:
+                    legs = position_legs(key, position, master)
+                    if any(leg['key'] is None or leg['qty'] <= 0 for leg in legs):
+                        logger.warning(f"⚠️ ExitMonitor: cannot resolve legs for {key}, left to engine scan")
+                        continue
+                    exit_state = ExitState(key, legs, position, self.defaults)
+                    logger.debug(f"ExitMonitor: watching {key} legs={list(exit_state.weights)}")
+                positions[key] = exit_state
+                for leg_key in exit_state.weights:
+                    by_leg.setdefault(leg_key, []).append(exit_state)
+
+            self._positions = positions
+            self._by_leg = by_leg
+            self._synced_count = len(self.state.active_positions)
+
+            new_keys = [k for k in by_leg if k not in self._subscribed]
+            if new_keys and self.subscribe:
+                try:
+                    self.subscribe(new_keys)
+                except Exception as e:
+                    logger.error(f"ExitMonitor subscribe error: {e}")
+            self._subscribed.update(new_keys)
+
+    def on_tick(self, symbol: str, tick_data: Dict[str, Any]):
+        """
+        Handle incoming tick from WebSocket.
+        Registered with TickHandler; ticks for instruments without open positions return immediately.
+        """
+        if len(self.state.active_positions) != self._synced_count:
+            self.sync()
+
+        leg_key = f"{tick_data.get('exchange')}|{tick_data.get('token')}"
+        watchers = self._by_leg.get(leg_key)
+        if not watchers:
+            return
+
+        self._tick_count += 1
+        ltp = safe_float(tick_data.get('ltp') or tick_data.get('lp'))
+        if ltp <= 0:
+            return
+
+        fired = []
+        with self._lock:
+            now = time.time()
+            for exit_state in watchers:
+                if exit_state.exiting or exit_state.retry_at > now:
+                    continue
+                reason = exit_state.on_price(leg_key, ltp)
+
+                position = self.state.active_positions.get(exit_state.key)
+                if position is not None and exit_state.missing == 0:
+                    position['pnl_rs'] = exit_state.pnl
+                    position['max_pnl_rs'] = exit_state.peak_pnl
+
+                if reason:
+                    exit_state.exiting = True
+                    fired.append((exit_state, reason))
+
+        # The square-off is a blocking REST call; other shards keep updating meanwhile
+        for exit_state, reason in fired:
+            self._fire(exit_state, reason)
+
+    def _fire(self, exit_state: ExitState, reason: str):
+        self._exit_count += 1
+        logger.info(f"🚨 ExitMonitor: {exit_state.key} | {reason}")
+        try:
+            self.square_off(exit_state.key, reason=reason)
+        except Exception as e:
+            logger.error(f"ExitMonitor square-off error for {exit_state.key}: {e}")
+        if exit_state.key in self.state.active_positions:
+            # Not closed (order rejected / broker error): re-arm after a pause instead of hammering the API
+            with self._lock:
+                exit_state.exiting = False
+                exit_state.retry_at = time.time() + self.RETRY_SECONDS
+            logger.warning(f"⚠️ ExitMonitor: {exit_state.key} still open after square-off, retry in {self.RETRY_SECONDS:.0f}s")
+        self.sync()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitor statistics."""
+        return {
+            "positions": len(self._positions),
+            "legs": len(self._by_leg),
+            "ticks_checked": self._tick_count,
+            "exits_fired": self._exit_count
+        }
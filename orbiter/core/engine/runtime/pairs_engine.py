@@ -0,0 +1,266 @@
+# orbiter/core/engine/runtime/pairs_engine.py
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from orbiter.utils.pairs import PairState
+from orbiter.utils.utils import safe_float
+
+logger = logging.getLogger("ORBITER")
+
+PAIR_KEY_PREFIX = "PAIR|"
+
+
+class _Pair:
+    """One configured pair: leg instruments, bar bucket and the rolling PairState."""
+    __slots__ = ('name', 'legs', 'state', 'bucket', 'prices')
+
+    def __init__(self, name: str, legs: List[Dict[str, Any]], state: PairState):
+        self.name = name
+        self.legs = legs  # [a, b]: {'symbol', 'key', 'tsym', 'exchange', 'lot_size'}
+        self.state = state
+        self.bucket = None
+        self.prices: List[Optional[float]] = [None, None]
+
+
+class PairsEngine:
+    """
+    Live pairs / ratio-spread engine for configured leg pairs (MCX metals, energy).
+
+    Flow:
+        WebSocket tick (either leg) → bar bucket rolled? → PairState.update(close A, close B)  O(1)
+                                          ↓
+        facts: pair.<name>.* (global provider), pair.zscore / hedge_ratio / half_life
+               for the instrument being evaluated (`facts_for`)
+                                          ↓
+        open_pair → both legs as one linked position PAIR|<name> in state.active_positions
+                                          ↓
+        shared exits: ExitMonitor on the combined PnL of both legs, and on bar close
+        the spread reverting inside exit_z (or running past stop_z) squares off both legs
+
+    The series is seeded from the primed candles in SYMBOLDICT, then advanced from
+    ticks; a bar closes with the last price of each leg when the first tick of the
+    next bucket arrives.
+    """
+
+    def __init__(self, state, config: Dict[str, Any], square_off: Callable = None, dispatcher=None,
+                 clock: Callable[[], float] = time.time):
+        self.state = state
+        self.config = config
+        self.square_off = square_off
+        self.dispatcher = dispatcher
+        self._clock = clock
+
+        self.window = int(config.get('window', 60))
+        self.min_bars = int(config.get('min_bars', 20))
+        self.bar_seconds = int(config.get('bar_seconds', 60))
+        self.entry_z = safe_float(config.get('entry_z', 2.0))
+        self.exit_z = safe_float(config.get('exit_z', 0.5))
+        self.stop_z = safe_float(config.get('stop_z', 4.0))
+        self.lots = int(config.get('lots', 1))
+
+        self.pairs: Dict[str, _Pair] = {}
+        self._by_leg: Dict[str, List[tuple]] = {}
+        self._lock = threading.RLock()  # legs can tick on different ingest shards
+        self._bars = 0
+        self._opened = 0
+        self._z_exits = 0
+
+        for spec in config.get('pairs', []):
+            legs = [self._resolve(spec.get('a')), self._resolve(spec.get('b'))]
+            name = spec.get('name') or f"{spec.get('a')}_{spec.get('b')}"
+            if any(leg is None for leg in legs):
+                logger.warning(f"⚠️ PairsEngine: cannot resolve legs for {name}, pair skipped")
+                continue
+            pair = _Pair(name, legs, PairState(self.window, self.min_bars))
+            self.pairs[name] = pair
+            for idx, leg in enumerate(legs):
+                self._by_leg.setdefault(leg['key'], []).append((pair, idx))
+
+    # ---- configuration
+    def _resolve(self, symbol: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Leg instrument from the strategy universe, falling back to the MCX instrument list."""
+        if not symbol:
+            return None
+        inst = next((s for s in self.state.symbols if isinstance(s, dict)
+                     and str(s.get('symbol', '')).upper() == symbol.upper()), None)
+        if inst is None:
+            from orbiter.config.mcx.config import MCX_INSTRUMENTS
+            inst = next((i for i in MCX_INSTRUMENTS if i['symbol'].upper() == symbol.upper()), None)
+        if inst is None or not inst.get('token'):
+            return None
+
+        token, exch = str(inst['token']), inst.get('exchange', 'MCX')
+        master = getattr(self.state.client, 'master', None)
+        lot_size = inst.get('lot_size') or (master.TOKEN_TO_LOTSIZE.get(token) if master is not None else None)
+        tsym = inst.get('tsym') or (master.TOKEN_TO_SYMBOL.get(token) if master is not None else None)
+        return {'symbol': symbol.upper(), 'key': f"{exch}|{token}", 'token': token, 'exchange': exch,
+                'tsym': tsym or symbol.upper(), 'lot_size': int(safe_float(lot_size)) or 1}
+
+    def seed(self, symboldict: Dict[str, Dict[str, Any]]):
+        """Warm every pair from the primed candles of its legs (bars matched on candle time)."""
+        with self._lock:
+            for pair in self.pairs.values():
+                series = []
+                for leg in pair.legs:
+                    candles = (symboldict.get(leg['key']) or {}).get('candles') or []
+                    series.append({c.get('time'): safe_float(c.get('intc')) for c in candles if c.get('time')})
+                closes_a, closes_b = series
+                for t in closes_a:
+                    if t in closes_b and closes_a[t] > 0 and closes_b[t] > 0:
+                        pair.state.update(closes_a[t], closes_b[t])
+                        pair.prices = [closes_a[t], closes_b[t]]
+                logger.info(f"📐 Pair {pair.name}: seeded {pair.state.count} bars, z={pair.state.zscore}")
+
+    # ---- live feed
+    def on_tick(self, symbol: str, tick_data: Dict[str, Any]):
+        """TickHandler callback. Ticks for tokens outside the configured pairs return immediately."""
+        watchers = self._by_leg.get(f"{tick_data.get('exchange')}|{tick_data.get('token')}")
+        if not watchers:
+            return
+        ltp = safe_float(tick_data.get('ltp') or tick_data.get('lp'))
+        if ltp <= 0:
+            return
+        ts = safe_float(tick_data.get('ft')) or self._clock()
+        bucket = int(ts // self.bar_seconds)
+
+        with self._lock:
+            for pair, idx in watchers:
+                if pair.bucket is not None and bucket > pair.bucket and None not in pair.prices:
+                    self._close_bar(pair)
+                if pair.bucket is None or bucket > pair.bucket:
+                    pair.bucket = bucket
+                pair.prices[idx] = ltp
+
+    def _close_bar(self, pair: _Pair):
+        zscore = pair.state.update(*pair.prices)
+        self._bars += 1
+        if zscore is None or self.square_off is None:
+            return
+        key = PAIR_KEY_PREFIX + pair.name
+        position = self.state.active_positions.get(key)
+        if not position or position.get('exiting'):
+            return
+        # Long spread (bought A) was entered at z <= -entry_z and reverts upward
+        direction = 1 if position.get('side') == 'B' else -1
+        reason = None
+        if direction * zscore >= -self.exit_z:
+            reason = f"Pair reverted: z {zscore:.2f} (entry {position.get('entry_zscore')})"
+        elif direction * zscore <= -self.stop_z:
+            reason = f"Pair stop: z {zscore:.2f} beyond {self.stop_z}"
+        if reason:
+            position['exiting'] = True
+            self._z_exits += 1
+            logger.info(f"🚨 PairsEngine: {key} | {reason}")
+            try:
+                self.square_off(key, reason=reason)
+            except Exception as e:
+                logger.error(f"PairsEngine square-off error for {key}: {e}")
+            if self.state.active_positions.get(key) is position:
+                # Still open (a leg failed or raised): the next bar close re-checks and retries
+                position.pop('exiting', None)
+                logger.warning(f"⚠️ PairsEngine: {key} still open after square-off, retry on the next bar")
+
+    # ---- facts
+    def get_facts(self) -> Dict[str, Any]:
+        """Global provider: pair.<name>.{ready, zscore, hedge_ratio, half_life} for every pair."""
+        facts = {}
+        for name, pair in self.pairs.items():
+            facts.update(pair.state.facts(f"pair.{name}"))
+        return facts
+
+    def facts_for(self, key: str) -> Dict[str, Any]:
+        """pair.* facts for an instrument key (EXCH|token) that is a leg of a configured pair."""
+        watchers = self._by_leg.get(key)
+        if not watchers:
+            return {}
+        pair, idx = watchers[0]
+        facts = pair.state.facts('pair')
+        facts['pair.name'] = pair.name
+        facts['pair.leg'] = 'a' if idx == 0 else 'b'
+        facts['pair.has_position'] = PAIR_KEY_PREFIX + pair.name in self.state.active_positions
+        return facts
+
+    # ---- execution
+    def open_pair(self, pair: str = None, side: str = 'auto', lots: int = None, execute: bool = None,
+                  **params) -> Dict[str, Any]:
+        """
+        Action: enter both legs of `pair` as one linked position.
+        side 'B' buys the spread (A long, B short), 'S' sells it; 'auto' follows the
+        z-score against entry_z. Leg B is sized by the hedge ratio in whole lots.
+        """
+        with self._lock:
+            p = self.pairs.get(pair or params.get('name') or params.get('symbol'))
+            if p is None:
+                return {'ok': False, 'reason': f"unknown_pair {pair}"}
+            key = PAIR_KEY_PREFIX + p.name
+            if key in self.state.active_positions:
+                return {'ok': False, 'reason': 'already_in_positions'}
+            st = p.state
+            if not st.ready or not st.hedge_ratio or st.hedge_ratio <= 0 or None in p.prices:
+                return {'ok': False, 'reason': 'pair_not_ready'}
+            if side == 'auto':
+                side = 'S' if st.zscore >= self.entry_z else 'B' if st.zscore <= -self.entry_z else None
+                if side is None:
+                    return {'ok': False, 'reason': f"zscore {st.zscore:.2f} inside entry band"}
+
+            leg_a, leg_b = p.legs
+            qty_a = (lots or self.lots) * leg_a['lot_size']
+            lots_b = max(1, int(round(st.hedge_ratio * qty_a / leg_b['lot_size'])))
+            sign_a = 1 if side == 'B' else -1
+            legs = [
+                dict(leg_a, qty=qty_a, sign=sign_a, entry_price=p.prices[0]),
+                dict(leg_b, qty=lots_b * leg_b['lot_size'], sign=-sign_a, entry_price=p.prices[1]),
+            ]
+            paper = (not execute) if execute is not None else self.state.config.get('paper_trade', True)
+            entry = {'zscore': st.zscore, 'hedge_ratio': st.hedge_ratio, 'half_life': st.half_life}
+
+        result = self._place(legs, paper, params.get('remark', f"PAIR_{p.name}"))
+        if not result.get('ok'):
+            logger.warning(f"⚠️ Pair {p.name} entry failed: {result.get('reason')}")
+            return result
+
+        self.state.active_positions[key] = {
+            'symbol': p.name, 'strategy': 'PAIR', 'pair': p.name, 'side': side,
+            'exchange': leg_a['exchange'], 'legs': legs, 'paper': paper,
+            'entry_zscore': round(entry['zscore'], 2), 'hedge_ratio': entry['hedge_ratio'],
+            'half_life': entry['half_life'] if entry['half_life'] not in (None, math.inf) else None,
+            'entry_time': time.time(),
+        }
+        self._opened += 1
+        logger.info(f"🔗 Pair {p.name} {'LONG' if side == 'B' else 'SHORT'} spread | "
+                    f"{leg_a['symbol']} x{qty_a} / {leg_b['symbol']} x{legs[1]['qty']} | z={entry['zscore']:.2f}")
+        if paper and hasattr(self.state, 'save_paper_positions'):
+            self.state.save_paper_positions()
+        return dict(result, key=key)
+
+    def _place(self, legs: List[Dict[str, Any]], paper: bool, remark: str) -> Dict[str, Any]:
+        if paper:
+            for leg in legs:
+                logger.info(f"🔬 SIM-PAIR: {'B' if leg['sign'] > 0 else 'S'} {leg['tsym']} | QTY: {leg['qty']}")
+            return {'ok': True, 'simulated': True}
+
+        product = self.state.config.get('OPTION_PRODUCT_TYPE', 'I')
+        orders = [{'name': leg['symbol'], 'order': {
+            'buy_or_sell': 'B' if leg['sign'] > 0 else 'S', 'product_type': product, 'exchange': leg['exchange'],
+            'tradingsymbol': leg['tsym'], 'quantity': leg['qty'], 'discloseqty': 0, 'price_type': 'MKT',
+            'price': 0, 'trigger_price': None, 'retention': 'DAY', 'remarks': remark}} for leg in legs]
+        dispatcher = self.dispatcher
+        if dispatcher is None:
+            from orbiter.core.broker.multi_leg import MultiLegDispatcher
+            dispatcher = self.dispatcher = MultiLegDispatcher(
+                self.state.client.conn.api, order_store=getattr(self.state.client, 'orders', None))
+        # Both legs in one phase: concurrent placement, a rejected leg unwinds the other
+        return dispatcher.execute([orders], gate='fill')
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pairs": len(self.pairs),
+            "bars": self._bars,
+            "opened": self._opened,
+            "z_exits": self._z_exits,
+            "ready": sum(1 for p in self.pairs.values() if p.state.ready),
+        }
@@ -82,6 +82,7 @@ class SessionManager:
             raise ValueError("No valid strategy path provided")
             
         full_strategy_path = os.path.join(self.project_root, strat_path_val, rel_path)
+        self.strategy_path = full_strategy_path
         self.strategy_dir = os.path.dirname(full_strategy_path)
         self.strategy_bundle = DataManager.load_json(full_strategy_path)
         
@@ -1,14 +1,13 @@
 from datetime import datetime
 import os
-import json
 import logging
 import traceback # Import traceback
 from typing import Dict, Any, List, Optional
 from orbiter.utils.data_manager import DataManager
-from orbiter.utils.json_helpers import JSONEncoder
+from orbiter.utils.journal import StateJournal
 from orbiter.utils.constants_manager import ConstantsManager
 from orbiter.utils.meta_config_manager import MetaConfigManager
-import rule_engine
+from orbiter.utils.config_bundle import compile_rule
 
 logger = logging.getLogger("ORBITER")
 
@@ -28,6 +27,7 @@ class StateManager:
         self.rule_file_schema = self.meta_config.get_key('rule_file_schema')
 
         self.active_positions = {}
+        self._journals = {}
         
         # Paper trading: separate file for paper positions (set early for clear flag)
         self.paper_positions_file = DataManager.get_manifest_path(project_root, 'settings', 'paper_positions_file')
@@ -67,42 +67,43 @@ class StateManager:
         """Clear paper positions file without accessing other instance variables (for startup use)"""
         self.active_positions = {}
         try:
-            if os.path.exists(self.paper_positions_file):
-                os.remove(self.paper_positions_file)
+            if self.paper_positions_file:
+                self._journal(self.paper_positions_file).clear()
             logger.info("🧹 Paper positions cleared")
         except Exception as e:
             logger.warning(f"Failed to clear paper positions: {e}")
 
     def _load_paper_positions(self):
         """Load paper positions from file (for paper trading persistence)"""
-        if os.path.exists(self.paper_positions_file):
+        if self.paper_positions_file:
             try:
-                with open(self.paper_positions_file, 'r') as f:
-                    data = json.load(f)
-                    self.active_positions = data.get('positions', {})
-                    if self.active_positions:
-                        logger.info(f"📄 Loaded {len(self.active_positions)} paper positions from disk")
-                        logger.warning(f"⚠️  {len(self.active_positions)} existing paper positions loaded. Use --clear_paper_positions=true to start fresh.")
+                data = self._journal(self.paper_positions_file).load() or {}
+                self.active_positions = data.get('positions', {})
+                if self.active_positions:
+                    logger.info(f"📄 Loaded {len(self.active_positions)} paper positions from disk")
+                    logger.warning(f"⚠️  {len(self.active_positions)} existing paper positions loaded. Use --clear_paper_positions=true to start fresh.")
             except Exception as e:
                 logger.warning(f"Failed to load paper positions: {e}")
 
     def save_paper_positions(self):
-        """Save paper positions to file"""
-        if not self.active_positions:
+        """Save paper positions to file (journals only the positions that changed)"""
+        if not self.paper_positions_file:
+            return
+        journal = self._journal(self.paper_positions_file)
+        # Nothing saved yet and nothing to save; once saved, closing the last position must persist too
+        if not self.active_positions and not os.path.exists(journal.path):
             return
         try:
-            os.makedirs(os.path.dirname(self.paper_positions_file), exist_ok=True)
-            with open(self.paper_positions_file, 'w') as f:
-                json.dump({'positions': self.active_positions, 'updated': datetime.now().isoformat()}, f, indent=4, cls=JSONEncoder)
-            logger.debug(f"📄 Saved {len(self.active_positions)} paper positions")
+            mode = journal.save({'positions': self._sanitized_positions()})
+            logger.debug(f"📄 Saved {len(self.active_positions)} paper positions ({mode})")
         except Exception as e:
             logger.warning(f"Failed to save paper positions: {e}")
 
     def clear_paper_positions(self):
         """Clear all paper positions (call at EOD)"""
         self.active_positions = {}
-        if os.path.exists(self.paper_positions_file):
-            os.remove(self.paper_positions_file)
+        if self.paper_positions_file:
+            self._journal(self.paper_positions_file).clear()
         logger.info("🧹 Paper positions cleared (EOD reset)")
         self.client.load_span_cache()
         logger.debug(f"[{self.__class__.__name__}.__init__] - State file: {self.state_file}, Span cache: {self.client.span_cache_path}")
@@ -125,7 +126,7 @@ class StateManager:
             conditions_expr = self._convert_to_expression(rule_data.get(conditions_key, {}))
             compiled_rules.append({
                 "name": rule_data.get('name', 'Unnamed Ghost Rule'),
-                "engine": rule_engine.Rule(conditions_expr),
+                "engine": compile_rule(conditions_expr),
                 actions_key: rule_data.get(actions_key, [])
             })
             logger.trace(f"[{self.__class__.__name__}._compile_ghost_strategy_rules] - Compiled rule '{rule_data.get('name', 'Unnamed Ghost Rule')}': {conditions_expr}")
@@ -148,19 +149,35 @@ class StateManager:
         return " and ".join(parts) if parts else "true"
 
 
+    def _journal(self, path: str) -> StateJournal:
+        """Snapshot + write-ahead journal for a state file (one per path)."""
+        journal = self._journals.get(path)
+        if journal is None:
+            if path == self.paper_positions_file:
+                journal = StateJournal(path, compact_every=self.config.get('session_journal_compact_every', 200),
+                                       fsync=self.config.get('session_journal_fsync', 'interval'),
+                                       ts_key='updated', stamp=lambda: datetime.now().isoformat())
+            else:
+                journal = StateJournal(path, compact_every=self.config.get('session_journal_compact_every', 200),
+                                       fsync=self.config.get('session_journal_fsync', 'interval'),
+                                       append_only=('exit_history',))
+            self._journals[path] = journal
+        return journal
+
+    def _sanitized_positions(self) -> Dict[str, Any]:
+        sanitized_positions = {}
+        for token, info in self.active_positions.items():
+            pos_copy = info.copy()
+            if 'config' in pos_copy: del pos_copy['config']
+            sanitized_positions[token] = pos_copy
+        return sanitized_positions
+
     def save_session(self):
-        """Persist active positions and exit history to disk"""
+        """Persist active positions and exit history to disk (journal of changes, periodic snapshot)"""
         logger.debug(f"[{self.__class__.__name__}.save_session] - Attempting to save session state to {self.state_file}")
         try:
-            sanitized_positions = {}
-            for token, info in self.active_positions.items():
-                pos_copy = info.copy()
-                if 'config' in pos_copy: del pos_copy['config']
-                sanitized_positions[token] = pos_copy
-
             data = {
-                'last_updated': datetime.now().timestamp(),
-                'active_positions': sanitized_positions,
+                'active_positions': self._sanitized_positions(),
                 'exit_history': self.exit_history,
                 'opening_scores': self.opening_scores,
                 'max_portfolio_pnl': self.max_portfolio_pnl,
@@ -169,12 +186,8 @@ class StateManager:
                 'trade_count': self.trade_count
             }
             
-            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-            tmp_file = self.state_file + ".tmp"
-            with open(tmp_file, 'w') as f:
-                json.dump(data, f, indent=4, cls=JSONEncoder)
-            os.replace(tmp_file, self.state_file)
-            logger.info(f"[{self.__class__.__name__}.save_session] - Session state saved successfully.")
+            mode = self._journal(self.state_file).save(data)
+            logger.info(f"[{self.__class__.__name__}.save_session] - Session state saved successfully ({mode}).")
                 
         except Exception as e:
             msg_tpl = self.constants.get('constants', 'save_session_fail_msg', "⚠️ Failed to save session: {error}")
@@ -186,10 +199,10 @@ class StateManager:
         """Recover session from disk or Cloud Snapshot (Google Sheets)"""
         logger.debug(f"[{self.__class__.__name__}.load_session] - Attempting to load session state from {self.state_file}")
         data = None
-        if os.path.exists(self.state_file):
+        if os.path.exists(self.state_file) or os.path.exists(self.state_file + ".journal"):
             try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
+                # Snapshot + replay of the journal written since; bounded by session_journal_compact_every
+                data = self._journal(self.state_file).load()
                 
                 freshness_minutes = self.config.get('session_freshness_minutes', self.constants.get('constants', 'default_session_freshness_minutes', 30))
                 if (datetime.now().timestamp() - data.get('last_updated', 0)) > (freshness_minutes * 60):
@@ -233,7 +246,13 @@ class StateManager:
         Missing positions are re-imported with configurable defaults from a template.
         """
         logger.debug(f"[{self.__class__.__name__}.sync_with_broker] - Starting broker synchronization.")
-        real_positions = self.client.executor.get_positions()
+        orders = getattr(self.client, 'orders', None)
+        if getattr(self.client, 'real_broker_trade', False) is True and orders is not None:
+            # Live: broker net positions from the order store (one REST reconcile if it is cold)
+            orders.refresh(max_age=self.config.get('order_store_max_age_seconds', 30))
+            real_positions = orders.get_positions()
+        else:
+            real_positions = self.client.executor.get_positions()
         if not real_positions:
             logger.info(self.constants.get('constants', 'broker_zero_pos_msg'))
             return
@@ -0,0 +1,151 @@
+# orbiter/core/regime_service.py
+
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from orbiter.core.ancillary_service import AncillaryService
+from orbiter.core.broker.gap_backfill import bar_epoch
+from orbiter.utils.regime import RegimeState
+from orbiter.utils.utils import merge_dicts, safe_float
+
+logger = logging.getLogger("ORBITER")
+
+
+class RegimeService(AncillaryService):
+    """
+    Intraday sideways/trending classifier for the segment's index, kept live from its ticks.
+
+    Flow:
+        _run_loop: wait for the engine to prime → attach(): seed RegimeState from the
+                   primed index candles, register on_tick with the TickHandler
+        on_tick (index token only): 1-minute buckets by feed time; on bucket roll
+                   → RegimeState.update(bar) → publish a new facts dict
+        rules: get_facts() hands back the last published dict (regime.state, regime.score,
+               regime.adx, ...); `regime.apply_profile` merges the configured filter
+               overrides for the current regime (re-weighting the scorers) into the session
+
+    Configured by the `regime` block of the segment in exchange_config.json. Replaces the
+    one-shot Yahoo ADX check in StrategySelector for decisions made after startup.
+    """
+
+    def name(self) -> str:
+        return "RegimeService"
+
+    def __init__(self, app, config: Dict[str, Any] = None, clock: Callable[[], float] = time.time):
+        super().__init__(app)
+        self.config = config
+        self._clock = clock
+        self.regime: Optional[RegimeState] = None
+        self.index_key: Optional[str] = None
+        self.attached = False
+        self._bar = None  # [start, open, high, low, close]
+        self._lock = threading.Lock()
+        self._facts: Dict[str, Any] = {}
+        self._base_filters = None
+        self._applied_filters = None
+        self.applied_profile: Optional[str] = None
+        self.bars = 0
+
+    # ---- lifecycle
+    def _run_loop(self):
+        engine = self.app.ctx.engine
+        if not self.attached and engine is not None and getattr(engine.state, 'primed', False):
+            self.attach(engine)
+        time.sleep(5)
+
+    def attach(self, engine) -> bool:
+        """Seed from the primed candles and start following index ticks. Returns False when disabled."""
+        if self.config is None:
+            self.config = engine.session_manager.op_config.get('regime', {})
+        self.attached = True
+        if not self.config.get('enabled') or not self.config.get('index'):
+            return False
+
+        self.index_key = self.config['index']
+        params = ('enter_score', 'exit_score', 'confirm_bars', 'adx_sideways', 'adx_minutes', 'min_bars',
+                  'session_start', 'orb_end', 'first_hour_end')
+        self.regime = RegimeState(**{k: self.config[k] for k in params if k in self.config})
+        engine.regime = self
+
+        tick_handler = engine.state.client.conn.tick_handler
+        self.seed(tick_handler.SYMBOLDICT.get(self.index_key, {}).get('candles', []))
+        tick_handler.register_tick_callback(self.on_tick)
+        logger.info(f"✅ RegimeService following {self.index_key}: {self.regime.state} (score {self.regime.score})")
+        return True
+
+    def seed(self, candles):
+        """Primed candles, oldest first; the last one is still forming and is left to the ticks."""
+        with self._lock:
+            for candle in candles[:-1]:
+                ts = bar_epoch(candle)
+                if ts is not None:
+                    self.regime.update(ts, safe_float(candle.get('into')), safe_float(candle.get('inth')),
+                                       safe_float(candle.get('intl')), safe_float(candle.get('intc')),
+                                       safe_float(candle.get('v')))
+            self._publish()
+
+    # ---- ticks
+    def on_tick(self, symbol: str, tick_data: Dict[str, Any]):
+        """TickHandler callback. Anything but the index token returns immediately."""
+        if f"{tick_data.get('exchange')}|{tick_data.get('token')}" != self.index_key:
+            return
+        ltp = safe_float(tick_data.get('ltp') or tick_data.get('lp'))
+        if ltp <= 0:
+            return
+        ts = safe_float(tick_data.get('ft')) or self._clock()
+        start = ts - ts % 60
+        with self._lock:
+            bar = self._bar
+            if bar is not None and start > bar[0]:
+                before = self.regime.state
+                self.regime.update(*bar)
+                self.bars += 1
+                self._publish()
+                if self.regime.state != before:
+                    logger.info(f"🧭 Regime {before} -> {self.regime.state} on {self.index_key} (score {self.regime.score})")
+                bar = None
+            if bar is None:
+                self._bar = [start, ltp, ltp, ltp, ltp, 0.0]
+            elif start == bar[0]:
+                bar[2], bar[3], bar[4] = max(bar[2], ltp), min(bar[3], ltp), ltp
+
+    def _publish(self):
+        self._facts = self.regime.facts()
+
+    # ---- rule layer
+    def get_facts(self) -> Dict[str, Any]:
+        """Last published regime facts; a dict lookup on the scan path."""
+        return self._facts
+
+    def apply_profile(self, session_manager, profile: str = None, **kwargs) -> Dict[str, Any]:
+        """
+        Merge `profiles[profile or current regime]` over the strategy's own filters.
+        Applying the same profile again is a no-op; a missing profile restores the base filters.
+        """
+        if self.regime is None:
+            return {'ok': False, 'reason': 'regime service not attached'}
+        profile = profile or self.regime.state
+        if session_manager.filters is not self._applied_filters:
+            self._base_filters = session_manager.filters  # first use, or filters hot-reloaded since
+        if profile == self.applied_profile and session_manager.filters is self._applied_filters:
+            return {'ok': True, 'profile': profile, 'changed': False}
+
+        overrides = self.config.get('profiles', {}).get(profile)
+        filters = merge_dicts(copy.deepcopy(self._base_filters), overrides) if overrides else self._base_filters
+        session_manager.filters = self._applied_filters = filters
+        self.applied_profile = profile
+        logger.info(f"🎚️ Regime profile '{profile}' applied to filters ({'overrides' if overrides else 'base'})")
+        return {'ok': True, 'profile': profile, 'changed': True}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'index': self.index_key,
+            'state': self.regime.state if self.regime else None,
+            'score': self.regime.score if self.regime else None,
+            'flips': self.regime.flips if self.regime else 0,
+            'bars': self.bars,
+            'profile': self.applied_profile,
+        }
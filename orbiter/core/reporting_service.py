@@ -2,16 +2,15 @@
 
 import logging
 import time
-import os
-import gspread
 from orbiter.core.ancillary_service import AncillaryService
-from orbiter.bot.sheets import log_scan_metrics, Credentials, SCOPE, _get_or_create_worksheet, SCAN_METRICS_HEADER
+from orbiter.bot.sheets import SCAN_METRICS_HEADER
+from orbiter.bot.sheets_sink import SheetsSink
 
 logger = logging.getLogger("ORBITER")
 
 
 class ReportingService(AncillaryService):
-    """Handles periodic reporting to Google Sheets."""
+    """Handles periodic reporting to Google Sheets (queued on the SheetsSink worker)."""
 
     def name(self) -> str:
         return "ReportingService"
@@ -21,6 +20,7 @@ class ReportingService(AncillaryService):
         self.project_root = app.ctx.project_root
         self.last_scan_log_ts = 0
         self.last_active_strategy = None
+        self.sink = SheetsSink.get_instance()
 
     def _run_loop(self):
         engine = self.app.ctx.engine
@@ -43,7 +43,7 @@ class ReportingService(AncillaryService):
                 self.last_active_strategy = current_strat
 
             logger.info(f"📊 Publishing {len(metrics)} scan metrics to Google Sheets [{tab_name}]...")
-            log_scan_metrics(metrics, tab_name=tab_name)
+            self.sink.log_scan_metrics(metrics, tab_name=tab_name)
 
             if hasattr(engine.state, 'syncer') and engine.state.syncer:
                 engine.state.syncer.sync_active_positions_to_sheets(engine.state)
@@ -54,14 +54,5 @@ class ReportingService(AncillaryService):
 
     def _clear_sheet(self, tab_name: str):
         """Clear sheet on strategy change."""
-        try:
-            creds_path = os.path.join(self.project_root, "orbiter", "bot", "credentials.json")
-            creds = Credentials.from_service_account_file(creds_path, scopes=SCOPE)
-            client = gspread.authorize(creds)
-            book = client.open("trade_log")
-            sheet = _get_or_create_worksheet(book, tab_name)
-            sheet.clear()
-            sheet.insert_row(SCAN_METRICS_HEADER, 1)
-            logger.info(f"🧹 Cleared {tab_name} due to strategy switch")
-        except Exception as e:
-            logger.error(f"⚠️ Sheet clear failed: {e}")
+        self.sink.clear_sheet(tab_name, SCAN_METRICS_HEADER)
+        logger.info(f"🧹 Queued clear of {tab_name} due to strategy switch")
@@ -1,5 +1,6 @@
 import talib
 import numpy as np
+from orbiter.utils import series as S
 
 def range_raider_filter(data, candles, **kwargs):
     """
@@ -27,3 +28,17 @@ def range_raider_filter(data, candles, **kwargs):
         return 0
     except Exception:
         return 0
+
+
+def range_raider_filter_series(series, **kwargs):
+    """
+    Series mode of `range_raider_filter`: one score per bar, LTP = close[i].
+    """
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    if n < 20:
+        return {'score': np.zeros(n)}
+
+    upper, middle, lower = talib.BBANDS(closes, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+    score = np.where(closes < lower, 0.51, np.where(closes > upper, -0.51, 0.0))
+    return {'score': np.where(closes > 0, score, 0.0)}
@@ -4,7 +4,9 @@ import logging
 import os
 from datetime import datetime, timedelta
 import math
+import numpy as np
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 VERBOSE_LOGS = False
 logger = logging.getLogger("ORBITER")
@@ -110,3 +112,73 @@ def orb_filter(data, ret, **kwargs):
         'orb_open': round(orb_open or 0, 2),
         'orb_size': round(orbsize, 2)
     }
+
+def orb_filter_series(series, **kwargs):
+    """
+    Series mode of `orb_filter`: one score per bar, LTP = close[i].
+    The ORB window is tracked per session (calendar day of `timestamp`);
+    without timestamps the first 15 bars form the range, as in the last-bar path.
+    """
+    closes = S.as_float_array(series['close'])
+    highs = S.as_float_array(series['high'])
+    lows = S.as_float_array(series['low'])
+    opens = S.as_float_array(series.get('open', closes))
+    n = len(closes)
+    zeros = np.zeros(n)
+    if n == 0:
+        return {'score': zeros, 'orb_high': zeros, 'orb_low': zeros, 'orb_open': zeros, 'orb_size': zeros}
+
+    try:
+        sh, sm = map(int, kwargs.get('start_time_str', '09:15').split(':'))
+        eh, em = map(int, kwargs.get('end_time_str', '09:30').split(':'))
+        orb_start, orb_cutoff = sh * 60 + sm, eh * 60 + em
+    except:
+        orb_start, orb_cutoff = 9*60+15, 9*60+30
+
+    timestamps = series.get('timestamp')
+    sessions = S.session_ids(timestamps, n)
+    minutes = S.minute_of_day(timestamps)
+    in_window = ((minutes >= orb_start) & (minutes <= orb_cutoff)) if minutes is not None else np.zeros(n, dtype=bool)
+    in_fallback = S.session_position(sessions) < 15
+
+    win_high = S.session_accumulate(np.where(in_window, highs, -np.inf), sessions, np.maximum)
+    win_low = S.session_accumulate(np.where(in_window, lows, np.inf), sessions, np.minimum)
+    fb_high = S.session_accumulate(np.where(in_fallback, highs, -np.inf), sessions, np.maximum)
+    fb_low = S.session_accumulate(np.where(in_fallback, lows, np.inf), sessions, np.minimum)
+
+    has_window = np.isfinite(win_high)
+    orb_high = np.where(has_window, win_high, fb_high)
+    orb_low = np.where(has_window, win_low, fb_low)
+
+    # ORB open: first window bar of the session once one is seen, else the session's first bar
+    first_win_open = np.full(n, np.nan)
+    for start, stop in S.session_bounds(sessions):
+        idx = np.flatnonzero(in_window[start:stop])
+        if len(idx):
+            first_win_open[start + idx[0]:stop] = opens[start + idx[0]]
+    session_open = S.session_first(opens, sessions)
+    orb_open = np.where(has_window, first_win_open, session_open)
+
+    day_open = S.session_first(opens, sessions)
+    day_open = np.where(day_open == 0, orb_open, day_open)
+
+    valid = (closes != 0) & (orb_high != 0) & (orb_low != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        distance_score = np.where(
+            closes > orb_high, np.round((closes - orb_high) / closes * 100, 2),
+            np.where(closes < orb_low, np.round(-(orb_low - closes) / closes * 100, 2), 0.0))
+        momentum_score = np.round((closes - day_open) / closes * 100, 2)
+
+    token = kwargs.get('token', 'UNKNOWN') or 'UNKNOWN'
+    symbol_name = token.split('|')[-1] if '|' in token else token
+    research = ORB_RESEARCH_MASTER.get(symbol_name, {'reliability': 0.8, 'precision': 0.8, 'efficiency': 0.5})
+    research_multiplier = research['reliability'] * research['precision'] * research['efficiency']
+    score = np.round((distance_score + momentum_score) * research_multiplier, 2)
+
+    return {
+        'score': np.where(valid, S.nan_to(score), 0.0),
+        'orb_high': np.where(valid, np.round(orb_high, 2), 0.0),
+        'orb_low': np.where(valid, np.round(orb_low, 2), 0.0),
+        'orb_open': np.where(valid, np.round(S.nan_to(orb_open), 2), 0.0),
+        'orb_size': np.where(valid, np.round(orb_high - orb_low, 2), 0.0)
+    }
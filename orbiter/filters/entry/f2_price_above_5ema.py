@@ -8,6 +8,7 @@ Drop-in replacement for existing orbiter
 import talib
 import numpy as np
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 def price_above_5ema_filter(data, candle_data, **kwargs):
     """
@@ -81,6 +82,23 @@ def price_above_5ema_filter(data, candle_data, **kwargs):
         'direction': direction
     }
 
+
+def price_above_5ema_filter_series(series, **kwargs):
+    """
+    Series mode of `price_above_5ema_filter`: one score per bar, LTP = close[i].
+    """
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    with S.talib_compatibility(1):
+        ema5 = S.round2(talib.EMA(closes, timeperiod=5)) if n else np.zeros(0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.round((closes - ema5) / closes * 100, 2)
+
+    valid = (closes != 0) & (S.bar_count(n) >= 5)
+    score = np.where(valid & (closes != ema5), S.nan_to(score), 0.0)
+    return {'score': score, 'ema5': np.where(valid, S.nan_to(ema5), 0.0)}
+
 """
 ✅ FIXED - ORB-STYLE SIMPLIFIED
 ✅ (LTP - EMA5) / LTP × 100 = Raw %pts  
@@ -8,6 +8,7 @@ Drop-in replacement - F1/F2/F3 PERFECTLY consistent
 import talib
 import numpy as np
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 def ema5_above_9ema_filter(data, candle_data, **kwargs):
     """
@@ -82,6 +83,28 @@ def ema5_above_9ema_filter(data, candle_data, **kwargs):
         'direction': direction
     }
 
+
+def ema5_above_9ema_filter_series(series, **kwargs):
+    """
+    Series mode of `ema5_above_9ema_filter`: one score per bar.
+    """
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    with S.talib_compatibility(1):
+        ema5 = S.round2(talib.EMA(closes, timeperiod=5)) if n else np.zeros(0)
+        ema9 = S.round2(talib.EMA(closes, timeperiod=9)) if n else np.zeros(0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.round((ema5 - ema9) / ema5 * 100, 2)
+
+    valid = S.bar_count(n) >= 9
+    score = np.where(valid & (ema5 != 0) & (ema5 != ema9), S.nan_to(score), 0.0)
+    return {
+        'score': score,
+        'ema5': np.where(valid, S.nan_to(ema5), 0.0),
+        'ema9': np.where(valid, S.nan_to(ema9), 0.0)
+    }
+
 """
 ✅ FIXED - ORB-STYLE SIMPLIFIED (F1/F2/F3 CONSISTENT)
 ✅ (EMA5 - EMA9) / EMA5 × 100 = Raw %pts
@@ -1,60 +1,14 @@
 import logging
 import numpy as np
-import talib
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
+from orbiter.utils.supertrend import supertrend
 
 logger = logging.getLogger("ORBITER")
 
 def calculate_st_values(highs, lows, closes, period, multiplier):
-    """Internal helper to calculate SuperTrend array."""
-    tr = np.zeros_like(closes)
-    for i in range(1, len(closes)):
-        tr[i] = max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1]))
-    tr[0] = highs[0] - lows[0]
-    
-    # Standard TA-Lib EMA for ATR (Wilder's style)
-    try:
-        talib.set_compatibility(1) # Metastock compatibility
-        atr = talib.EMA(tr, timeperiod=period * 2 - 1)
-    finally:
-        talib.set_compatibility(0)
-
-    # Clean leading NaNs
-    first_valid = np.where(~np.isnan(atr))[0]
-    if len(first_valid) > 0:
-        atr = np.nan_to_num(atr, nan=atr[first_valid[0]])
-    else:
-        atr = np.nan_to_num(atr, nan=0)
-
-    hl2 = (highs + lows) / 2.0
-    upper_band = hl2 + multiplier * atr
-    lower_band = hl2 - multiplier * atr
-
-    final_ub = np.copy(upper_band)
-    final_lb = np.copy(lower_band)
-    st = np.zeros_like(closes)
-
-    for i in range(1, len(closes)):
-        # Upper Band
-        if upper_band[i] < final_ub[i-1] or closes[i-1] > final_ub[i-1]:
-            final_ub[i] = upper_band[i]
-        else:
-            final_ub[i] = final_ub[i-1]
-        
-        # Lower Band
-        if lower_band[i] > final_lb[i-1] or closes[i-1] < final_lb[i-1]:
-            final_lb[i] = lower_band[i]
-        else:
-            final_lb[i] = final_lb[i-1]
-
-    # Initialize trend
-    st[0] = final_ub[0]
-    for i in range(1, len(closes)):
-        if st[i-1] == final_ub[i-1]:
-            st[i] = final_ub[i] if closes[i] <= final_ub[i] else final_lb[i]
-        else:
-            st[i] = final_lb[i] if closes[i] >= final_lb[i] else final_ub[i]
-            
+    """Internal helper to calculate SuperTrend array (canonical kernel in orbiter.utils.supertrend)."""
+    st, _ = supertrend(highs, lows, closes, period, multiplier)
     return st
 
 def supertrend_filter(data, candle_data, **kwargs):
@@ -135,3 +89,40 @@ def supertrend_filter(data, candle_data, **kwargs):
         'direction': "🟢 BULL" if bias == "BULL" else "🔴 BEAR",
         'direction_numeric': 1 if bias == "BULL" else -1
     }
+
+
+def supertrend_filter_series(series, **kwargs):
+    """
+    Series mode of `supertrend_filter`: one score per bar, LTP = close[i].
+    """
+    period = kwargs.get('period', 10)
+    multiplier = kwargs.get('multiplier', 3)
+    highs = S.as_float_array(series['high'])
+    lows = S.as_float_array(series['low'])
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    if n == 0:
+        empty = np.zeros(0)
+        return {'score': empty, 'supertrend': empty, 'direction_numeric': empty}
+
+    st_series = calculate_st_values(highs, lows, closes, period, multiplier)
+    st_5m_ago = S.lag(st_series, 4)
+    close_5m_ago = S.lag(closes, 4)
+
+    bull = closes > st_series
+    st_slope = np.where(st_series > st_5m_ago + 0.01, 1, np.where(st_series < st_5m_ago - 0.01, -1, 0))
+    price_slope = np.where(closes >= close_5m_ago, 1, -1)
+
+    bull_score = np.select(
+        [(st_slope == 1) & (price_slope == 1), (st_slope == 0) & (price_slope == 1), (st_slope == 1) & (price_slope == -1)],
+        [0.20, 0.15, 0.10], default=0.05)
+    bear_score = np.select(
+        [(st_slope == -1) & (price_slope == -1), (st_slope == 0) & (price_slope == -1), (st_slope == -1) & (price_slope == 1)],
+        [-0.20, -0.15, -0.10], default=-0.05)
+
+    valid = (closes != 0) & (S.bar_count(n) >= 20)
+    return {
+        'score': np.where(valid, np.where(bull, bull_score, bear_score), 0.0),
+        'supertrend': np.where(valid, st_series, 0.0),
+        'direction_numeric': np.where(valid, np.where(bull, 1, -1), 0)
+    }
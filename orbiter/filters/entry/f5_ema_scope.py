@@ -2,6 +2,7 @@ import logging
 import numpy as np
 import talib
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 logger = logging.getLogger("ORBITER")
 
@@ -57,3 +58,26 @@ def ema_scope_filter(data, candle_data, **kwargs):
         'ema5_now': round(ema5_now, 2),
         'ema5_prev': round(ema5_prev, 2)
     }
+
+
+def ema_scope_filter_series(series, **kwargs):
+    """
+    Series mode of `ema_scope_filter`: one score per bar, LTP = close[i].
+    """
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    with S.talib_compatibility(1):
+        ema5 = talib.EMA(closes, timeperiod=5) if n else np.zeros(0)
+    ema5_prev = S.lag(ema5, 5)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.round((ema5 - ema5_prev) / closes * 100 * 5, 2)
+    score = np.where(np.abs(score) < 0.05, 0.0, score)
+    score = np.clip(score, -0.20, 0.20)
+
+    valid = (closes != 0) & (S.bar_count(n) >= 10)
+    return {
+        'score': np.where(valid, S.nan_to(score), 0.0),
+        'ema5_now': np.where(valid, S.round2(S.nan_to(ema5)), 0.0),
+        'ema5_prev': np.where(valid, S.round2(S.nan_to(ema5_prev)), 0.0)
+    }
@@ -2,6 +2,7 @@ import logging
 import numpy as np
 import talib
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 logger = logging.getLogger("ORBITER")
 
@@ -61,3 +62,28 @@ def ema_gap_expansion_filter(data, candle_data, **kwargs):
         'gap_now': round(gap_now, 2),
         'gap_prev': round(gap_prev, 2)
     }
+
+
+def ema_gap_expansion_filter_series(series, **kwargs):
+    """
+    Series mode of `ema_gap_expansion_filter`: one score per bar, LTP = close[i].
+    """
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    with S.talib_compatibility(1):
+        ema5 = talib.EMA(closes, timeperiod=5) if n else np.zeros(0)
+        ema9 = talib.EMA(closes, timeperiod=9) if n else np.zeros(0)
+    gap_now = ema5 - ema9
+    gap_prev = S.lag(gap_now, 5)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.round((gap_now - gap_prev) / closes * 100 * 20, 2)
+    score = np.where(np.abs(score) < 0.05, 0.0, score)
+    score = np.clip(score, -0.20, 0.20)
+
+    valid = (closes != 0) & (S.bar_count(n) >= 15)
+    return {
+        'score': np.where(valid, S.nan_to(score), 0.0),
+        'gap_now': np.where(valid, S.round2(S.nan_to(gap_now)), 0.0),
+        'gap_prev': np.where(valid, S.round2(S.nan_to(gap_prev)), 0.0)
+    }
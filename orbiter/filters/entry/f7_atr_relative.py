@@ -2,6 +2,7 @@ import logging
 import numpy as np
 import talib
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 logger = logging.getLogger("ORBITER")
 
@@ -58,3 +59,32 @@ def atr_momentum_filter(data, candle_data, **kwargs):
         'rel_vol': round(rel_vol, 2),
         'atr': round(current_atr, 2)
     }
+
+
+def atr_momentum_filter_series(series, **kwargs):
+    """
+    Series mode of `atr_momentum_filter`: one score per bar.
+    """
+    highs = S.as_float_array(series['high'])
+    lows = S.as_float_array(series['low'])
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    if n < 30:
+        zeros = np.zeros(n)
+        return {'score': zeros, 'rel_vol': zeros, 'atr': zeros}
+
+    atr = talib.ATR(highs, lows, closes, timeperiod=14)
+    # 20-bar trailing mean of ATR (NaN while the window still holds warm-up bars, as np.mean does)
+    baseline = np.full(n, np.nan)
+    baseline[19:] = np.lib.stride_tricks.sliding_window_view(atr, 20).mean(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_vol = np.where(baseline != 0, atr / baseline, 1.0)
+    score = np.select([rel_vol > 1.10, rel_vol > 0.90, rel_vol > 0.75], [0.10, 0.00, -0.10], default=-0.20)
+
+    valid = S.bar_count(n) >= 30
+    return {
+        'score': np.where(valid, score, 0.0),
+        'rel_vol': np.where(valid, np.round(rel_vol, 2), 0.0),
+        'atr': np.where(valid, np.round(atr, 2), 0.0)
+    }
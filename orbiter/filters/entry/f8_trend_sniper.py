@@ -2,6 +2,7 @@ import logging
 import numpy as np
 import talib
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 logger = logging.getLogger("ORBITER")
 
@@ -60,3 +61,27 @@ def trend_sniper_filter(data, candle_data, **kwargs):
         'adx': round(current_adx, 2),
         'direction': 'BULL' if e5 > e9 else 'BEAR'
     }
+
+
+def trend_sniper_filter_series(series, **kwargs):
+    """
+    Series mode of `trend_sniper_filter`: one score per bar.
+    """
+    highs = S.as_float_array(series['high'])
+    lows = S.as_float_array(series['low'])
+    closes = S.as_float_array(series['close'])
+    n = len(closes)
+    if n < 30:
+        return {'score': np.zeros(n), 'adx': np.zeros(n)}
+
+    adx = S.nan_to(talib.ADX(highs, lows, closes, timeperiod=14))
+    ema5 = talib.EMA(closes, timeperiod=5)
+    ema9 = talib.EMA(closes, timeperiod=9)
+
+    score = np.where(adx > 25, np.where(ema5 > ema9, 0.25, np.where(ema5 < ema9, -0.25, 0.0)), 0.0)
+
+    valid = S.bar_count(n) >= 30
+    return {
+        'score': np.where(valid, score, 0.0),
+        'adx': np.where(valid, np.round(adx, 2), 0.0)
+    }
@@ -1,5 +1,6 @@
 import numpy as np
 from orbiter.utils.utils import safe_float
+from orbiter.utils import series as S
 
 def institutional_flip_filter(data, candle_data, **kwargs):
     """
@@ -57,3 +58,36 @@ def institutional_flip_filter(data, candle_data, **kwargs):
         'score': score,
         'pattern': pattern
     }
+
+
+def institutional_flip_filter_series(series, **kwargs):
+    """
+    Series mode of `institutional_flip_filter`: one score per bar, LTP = close[i].
+    Yesterday's OHLC comes from the previous session of `timestamp`; today's
+    high/low are the running session extremes. Patterns are coded
+    0=NONE, 1=BULL_FLIP, 2=BEAR_FLIP, 3=YHIGH_BREAK, 4=YLOW_BREAK.
+    """
+    highs = S.as_float_array(series['high'])
+    lows = S.as_float_array(series['low'])
+    closes = S.as_float_array(series['close'])
+    opens = S.as_float_array(series.get('open', closes))
+    n = len(closes)
+
+    sessions = S.session_ids(series.get('timestamp'), n)
+    yest_high = S.previous_session(highs, sessions, np.max)
+    yest_low = S.previous_session(lows, sessions, np.min)
+    yest_close = S.previous_session(closes, sessions, lambda a: a[-1])
+    yest_open = S.previous_session(opens, sessions, lambda a: a[0])
+    day_high = S.session_accumulate(highs, sessions, np.maximum)
+    day_low = S.session_accumulate(lows, sessions, np.minimum)
+
+    yest_red = ~(yest_close > yest_open)
+    bull_flip = yest_red & (day_low < yest_high) & (closes > yest_high)
+    bear_flip = ~yest_red & (day_high > yest_low) & (closes < yest_low)
+    conditions = [bull_flip, bear_flip, closes > yest_high, closes < yest_low]
+
+    valid = (closes != 0) & (yest_high != 0) & (yest_low != 0)
+    return {
+        'score': np.where(valid, np.select(conditions, [0.50, -0.50, 0.25, -0.25], default=0.0), 0.0),
+        'pattern': np.where(valid, np.select(conditions, [1, 2, 3, 4], default=0), 0)
+    }
@@ -17,6 +17,8 @@ from pathlib import Path
 # Add orbiter to path for telegram notifier
 sys.path.insert(0, '/home/trading_ceo/python-trader')
 from orbiter.utils.telegram_notifier import send_telegram_msg
+from orbiter.utils.journal import StateJournal
+from orbiter.utils.log_tail import LogScanner
 
 # Configuration
 CONFIG = {
@@ -81,28 +83,30 @@ def check_process_running(strategy: str) -> bool:
         return False
 
 
+# strategy -> LogScanner (byte offset + rolling counters persisted beside the log)
+_SCANNERS = {}
+
+
+def get_log_scanner(strategy: str) -> LogScanner:
+    scanner = _SCANNERS.get(strategy)
+    if scanner is None:
+        log_path = os.path.join(CONFIG["tmp_dir"], f"orbiter_{strategy}.log")
+        scanner = _SCANNERS[strategy] = LogScanner(log_path, ERROR_PATTERNS, state_path=log_path + ".monitor.json")
+    return scanner
+
+
 def parse_log_errors(strategy: str) -> list:
-    """Parse log file for errors."""
-    log_path = os.path.join(CONFIG["tmp_dir"], f"orbiter_{strategy}.log")
+    """Parse log lines appended since the previous cycle for errors."""
     errors = []
     
-    if not os.path.exists(log_path):
-        return errors
-    
     try:
-        with open(log_path, 'r') as f:
-            lines = f.readlines()
-            # Read last 100 lines
-            recent_lines = lines[-100:] if len(lines) > 100 else lines
-            
-            for line in recent_lines:
-                for error_type, pattern in ERROR_PATTERNS.items():
-                    if re.search(pattern, line, re.IGNORECASE):
-                        errors.append({
-                            "type": error_type,
-                            "message": line.strip(),
-                            "timestamp": extract_timestamp(line)
-                        })
+        for line, error_types in get_log_scanner(strategy).scan():
+            for error_type in error_types:
+                errors.append({
+                    "type": error_type,
+                    "message": line.strip(),
+                    "timestamp": extract_timestamp(line)
+                })
     except Exception as e:
         print(f"Error parsing log: {e}")
     
@@ -130,8 +134,8 @@ def get_paper_positions_status() -> dict:
         return {"exists": False, "valid": False}
     
     try:
-        with open(path) as f:
-            data = json.load(f)
+        # Snapshot + journaled changes since
+        data = StateJournal(path, ts_key="updated").load()
         
         if not isinstance(data, dict):
             return {"exists": True, "valid": False, "error": "Not a dict"}
@@ -140,7 +144,7 @@ def get_paper_positions_status() -> dict:
             "exists": True,
             "valid": True,
             "positions_count": len(data.get("positions", [])),
-            "last_update": data.get("last_updated", "unknown")
+            "last_update": data.get("updated", data.get("last_updated", "unknown"))
         }
     except json.JSONDecodeError as e:
         return {"exists": True, "valid": False, "error": str(e)}
@@ -168,7 +172,8 @@ def check_system_health() -> dict:
             "log_age_minutes": log_info.get("age_minutes"),
             "last_modified": log_info.get("last_modified"),
             "is_running": is_running,
-            "errors": errors
+            "errors": errors,
+            "error_counts": get_log_scanner(strategy).counter.counts()
         }
         
         # Determine health
@@ -217,6 +222,10 @@ def generate_status_report(health: dict) -> str:
         
         lines.append(f"  {status_emoji} {strat.upper()}: {running} | Log: {age} | Last: {info.get('last_modified', 'N/A')}")
         
+        counts = {k: v for k, v in (info.get("error_counts") or {}).items() if v.get("60m")}
+        if counts:
+            lines.append("     " + ", ".join(f"{k}: {v['5m']}/5m {v['60m']}/1h" for k, v in counts.items()))
+        
         if info["errors"]:
             for err in info["errors"][:2]:
                 msg = err['message'][:60].replace('[', '').replace(']', '')
@@ -0,0 +1,215 @@
+# orbiter/tests/benchmarks/feed_load.py
+"""
+Offline load test of the live ingest path.
+
+    python -m orbiter.tests.benchmarks.feed_load --symbols 50 --rate 5000 --seconds 10
+    python -m orbiter.tests.benchmarks.feed_load --symbols 200 --rate 50000 --no-engine
+    python -m orbiter.tests.benchmarks.feed_load --disconnect-every 4 --burst-every 2 --burst-size 20000
+    python -m orbiter.tests.benchmarks.feed_load --replay orbiter/data/replay.json --output feed.json
+
+A SimulatedFeedApi stands in for NorenApi inside a real ConnectionManager, so
+messages take the production route:
+
+    SimulatedFeedApi → ConnectionManager.on_tick → TickIngest → TickHandler._apply_tick
+        → QuoteCache.on_tick + TickProcessor.on_tick → (every --process-interval) Engine.tick
+
+Reported: sent vs target rate, ingest throughput/drops/lag, TickProcessor
+batches and tick-to-decision latency (message send → Engine.tick done for that
+symbol's batch, freshest and oldest tick of the batch).
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import yaml
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.core.broker import connection as connection_mod
+from orbiter.core.broker.feed_simulator import RandomWalkSource, RecordedSource, SimulatedFeedApi
+from orbiter.core.broker.quote_cache import QuoteCache
+from orbiter.core.broker.tick_handler import TickHandler
+from orbiter.core.tick_processor import TickProcessor
+from orbiter.tests.benchmarks.harness import machine_metadata, save_results
+from orbiter.tests.benchmarks.run import DEFAULT_STRATEGY, BenchmarkContext
+from orbiter.tests.benchmarks.universe import SyntheticUniverse
+
+
+def _summary_ms(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0}
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * (len(samples) - 1)))] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+class DecisionRecorder:
+    """TickProcessor callback: runs Engine.tick on the batch and records send → decision latency."""
+
+    def __init__(self, run_engine: bool = True):
+        self.run_engine = run_engine
+        self.freshest: List[float] = []
+        self.oldest: List[float] = []
+        self.engine_seconds: List[float] = []
+        self.ticks = 0
+
+    def __call__(self, engine, ticks: Dict[str, List[Dict[str, Any]]]):
+        started = time.perf_counter()
+        if self.run_engine:
+            engine.tick(buffered_ticks=ticks)
+        done = time.perf_counter()
+        self.engine_seconds.append(done - started)
+        for batch in ticks.values():
+            stamps = [t['sim_ts'] for t in batch if 'sim_ts' in t]
+            if stamps:
+                self.freshest.append(done - max(stamps))
+                self.oldest.append(done - min(stamps))
+            self.ticks += len(batch)
+
+
+def _write_creds(workdir: str) -> str:
+    path = os.path.join(workdir, 'cred.yml')
+    with open(path, 'w') as f:
+        yaml.dump({'user': 'SIM', 'pwd': '', 'factor2': '', 'vc': '', 'apikey': '', 'imei': ''}, f)
+    return path
+
+
+def run_feed_load(n_symbols: int = 50, n_bars: int = 120, rate: float = 5000, seconds: float = 10.0,
+                  process_interval: float = 1.0, run_engine: bool = True, replay: str = None,
+                  disconnect_every: float = 0, burst_every: float = 0, burst_size: int = 0,
+                  shards: int = None, strategy: str = DEFAULT_STRATEGY,
+                  project_root: str = PROJECT_ROOT) -> Dict[str, Any]:
+    ctx = BenchmarkContext(project_root, strategy)
+    uni = SyntheticUniverse(project_root, n_symbols, n_bars)
+    conn = handler = processor = None
+    try:
+        if replay:
+            source = RecordedSource.from_replay_file(replay)
+        else:
+            source = RandomWalkSource({f"{s['exchange']}|{s['token']}": ltp for s, ltp in zip(uni.symbols, uni.ltps)})
+        sim = SimulatedFeedApi(source, rate=rate, rest_api=uni.client.api, disconnect_every=disconnect_every,
+                               burst_every=burst_every, burst_size=burst_size)
+
+        with patch.object(connection_mod, 'ShoonyaApiPy', lambda: sim):
+            conn = connection_mod.ConnectionManager(config_path=_write_creds(uni.workdir))
+        conn.INITIAL_RECONNECT_DELAY = 0.2
+
+        handler = TickHandler(sim, uni.client, project_root, 'nfo')
+        if shards is not None:
+            handler.INGEST_SHARDS = shards
+        # Primed candles, as prime_candles would have left them
+        handler.SYMBOLDICT.update({k: dict(v, candles=list(v.get('candles', [])))
+                                   for k, v in uni.client.SYMBOLDICT.items()})
+        conn.tick_handler = handler
+        quotes = QuoteCache(sim, uni.client, subscribe=conn.subscribe, is_live=lambda: conn.socket_opened)
+        handler.register_tick_callback(quotes.on_tick)
+        uni.client.conn = conn
+
+        engine = ctx.build_engine(uni.state())
+        recorder = DecisionRecorder(run_engine)
+        processor = TickProcessor(engine, recorder, interval_seconds=process_interval)
+        handler.register_tick_callback(processor.on_tick)
+        processor.start()
+
+        started = time.perf_counter()
+        handler.start_live_feed(conn, uni.symbols)
+        time.sleep(seconds)
+        conn.close()
+        drained = handler.ingest.drain(10.0) if handler.ingest else True
+        elapsed = time.perf_counter() - started
+        processor.stop()
+        # The last partial interval is flushed so every applied tick gets a decision sample
+        processor._process_buffer()
+
+        ingest = handler.get_ingest_stats()
+        processed = ingest.get('processed', recorder.ticks)
+        return {
+            "meta": {**machine_metadata(project_root), "strategy": strategy},
+            "config": {"symbols": n_symbols, "bars": n_bars, "rate": rate, "seconds": seconds,
+                       "process_interval": process_interval, "engine": run_engine, "replay": replay,
+                       "disconnect_every": disconnect_every, "burst_every": burst_every,
+                       "burst_size": burst_size, "shards": handler.INGEST_SHARDS},
+            "feed": sim.get_stats(),
+            "ingest": {**ingest, "drained": drained,
+                       "throughput_per_s": round(processed / elapsed, 1) if elapsed else None},
+            "processor": processor.get_stats(),
+            "latency": {
+                "tick_to_decision_freshest": _summary_ms(recorder.freshest),
+                "tick_to_decision_oldest": _summary_ms(recorder.oldest),
+                "engine_tick": _summary_ms(recorder.engine_seconds),
+            },
+            "reconnect": {"reconnect_attempts": conn._reconnect_attempts, "backfill": handler.backfill.get_stats()},
+        }
+    finally:
+        if processor:
+            processor.stop()
+        if conn:
+            conn.close()
+        ctx.close()
+        uni.cleanup()
+
+
+def _print_report(result: Dict[str, Any]):
+    feed, ingest, lat = result["feed"], result["ingest"], result["latency"]
+    print(f"📡 Feed    : sent {feed['sent']} @ {feed['achieved_rate']}/s (target {feed['target_rate']:.0f}/s), "
+          f"behind {feed['behind']}, disconnects {feed['disconnects']}, bursts {feed['bursts']}")
+    print(f"📥 Ingest  : {ingest.get('throughput_per_s')}/s processed {ingest.get('processed')}, "
+          f"dropped {ingest.get('dropped')}, lag avg/max {ingest.get('lag_ms_avg')}/{ingest.get('lag_ms_max')}ms")
+    print(f"🔄 Batches : {result['processor']['batches_processed']}, engine tick {lat['engine_tick']}")
+    print(f"⏱️ Tick→decision (freshest): {lat['tick_to_decision_freshest']}")
+    print(f"⏱️ Tick→decision (oldest)  : {lat['tick_to_decision_oldest']}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline websocket ingest load test")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=120, help="Primed candles per symbol")
+    parser.add_argument("--rate", type=float, default=5000, help="Target messages per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--process-interval", type=float, default=1.0, help="TickProcessor batch interval")
+    parser.add_argument("--no-engine", action="store_true", help="Measure ingest only (skip Engine.tick)")
+    parser.add_argument("--replay", help="MockBrokerClient replay JSON to take prices from")
+    parser.add_argument("--disconnect-every", type=float, default=0)
+    parser.add_argument("--burst-every", type=float, default=0)
+    parser.add_argument("--burst-size", type=int, default=0)
+    parser.add_argument("--shards", type=int, help="TickHandler.INGEST_SHARDS override (0 = inline)")
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("ORBITER").setLevel(logging.ERROR)
+    logging.getLogger("tick_handler").setLevel(logging.ERROR)
+
+    with open(os.devnull, "w") as sink:
+        real_stdout = sys.stdout
+        sys.stdout = sink # connection/order prints and rule warnings
+        try:
+            result = run_feed_load(args.symbols, args.bars, args.rate, args.seconds, args.process_interval,
+                                   not args.no_engine, args.replay, args.disconnect_every, args.burst_every,
+                                   args.burst_size, args.shards, args.strategy)
+        finally:
+            sys.stdout = real_stdout
+    for name in ("NorenRestApiPy", "urllib3", "websocket"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _print_report(result)
+    if args.output:
+        save_results(args.output, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# orbiter/tests/benchmarks/harness.py
+"""
+Timing, machine metadata and baseline comparison for the benchmark suite.
+
+Results are plain JSON:
+    {"meta": {...machine...}, "results": {"<symbols>x<bars>": {"<stage>": {stats}}}}
+`compare()` checks a run against a stored baseline: a stage regresses when its
+median exceeds the baseline median by more than its threshold (a ratio, default
+0.25 = +25%). Stages faster than `min_ms` in the baseline are ignored as noise.
+"""
+
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+
+def time_stage(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Run `fn` warmup + repeat times (GC off while timing); stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+    return {
+        "runs": len(samples),
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def machine_metadata(project_root: str = None) -> Dict[str, Any]:
+    meta = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    for module in ("numpy", "talib", "rule_engine"):
+        try:
+            meta[f"{module}_version"] = getattr(__import__(module), "__version__", "unknown")
+        except ImportError:
+            meta[f"{module}_version"] = None
+    try:
+        meta["git_commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                                            capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        meta["git_commit"] = None
+    return meta
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_results(path: str, data: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.25,
+            stage_thresholds: Dict[str, float] = None, metric: str = "median_ms",
+            min_ms: float = 0.5) -> List[Dict[str, Any]]:
+    """Stages slower than baseline * (1 + threshold). Cases/stages missing from either side are skipped."""
+    stage_thresholds = stage_thresholds or {}
+    regressions = []
+    for case, stages in current.get("results", {}).items():
+        base_stages = baseline.get("results", {}).get(case, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage)
+            if not base or "error" in stats or "error" in base or base.get(metric, 0) < min_ms:
+                continue
+            limit = stage_thresholds.get(stage, threshold)
+            ratio = stats[metric] / base[metric]
+            if ratio > 1 + limit:
+                regressions.append({"case": case, "stage": stage, "baseline_ms": base[metric],
+                                    "current_ms": stats[metric], "ratio": round(ratio, 3), "threshold": limit})
+    return regressions
+
+
+def format_table(results: Dict[str, Any], baseline: Dict[str, Any] = None, metric: str = "median_ms") -> str:
+    lines = [f"{'case':<10} {'stage':<28} {'median':>10} {'p95':>10} {'per sym':>9} {'vs base':>8}"]
+    for case, stages in results.get("results", {}).items():
+        n_symbols = int(case.split("x")[0]) if "x" in case else 1
+        for stage, stats in stages.items():
+            if "error" in stats:
+                lines.append(f"{case:<10} {stage:<28} ERROR: {stats['error']}")
+                continue
+            base = ((baseline or {}).get("results", {}).get(case, {}) or {}).get(stage)
+            delta = f"{stats[metric] / base[metric]:.2f}x" if base and base.get(metric) else "-"
+            lines.append(f"{case:<10} {stage:<28} {stats['median_ms']:>8.2f}ms {stats['p95_ms']:>8.2f}ms "
+                         f"{stats['median_ms'] / n_symbols:>7.3f}ms {delta:>8}")
+    return "\n".join(lines)
@@ -0,0 +1,214 @@
+# orbiter/tests/benchmarks/run.py
+"""
+Hot-path benchmark runner.
+
+    python -m orbiter.tests.benchmarks.run                          # default sizes
+    python -m orbiter.tests.benchmarks.run --sizes 50x60 500x1000 --repeat 3
+    python -m orbiter.tests.benchmarks.run --output out.json --baseline orbiter/tests/benchmarks/baseline.json
+    python -m orbiter.tests.benchmarks.run --update-baseline        # record a new baseline
+
+Each case builds a SyntheticUniverse (<symbols>x<bars>) and times, over the whole
+universe: FactConverter.convert_candle_data, TechnicalAnalyzer.analyze,
+FactCalculator.calculate_technical_facts, RuleManager.evaluate_score / evaluate,
+ContractResolver spread lookups, ScripMaster.load_mappings and one full
+Engine.tick (the end-to-end scan). Exit status is 1 when any stage regresses past
+its threshold against the baseline.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.tests.benchmarks.harness import (compare, format_table, load_results, machine_metadata,
+                                              save_results, time_stage)
+from orbiter.tests.benchmarks.universe import SyntheticUniverse
+
+DEFAULT_SIZES = ["50x60", "50x1000", "200x200", "500x200"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_STRATEGY = "nifty_fno_topn_trend"
+STAGES = ["convert_candle_data", "analyze", "calculate_technical_facts", "evaluate_score", "evaluate",
+          "resolver_spreads", "load_mappings", "engine_tick"]
+
+
+def parse_size(size: str):
+    symbols, bars = size.lower().split("x")
+    return int(symbols), int(bars)
+
+
+class BenchmarkContext:
+    """Session and action hub shared by every case (built once, like one app start)."""
+
+    def __init__(self, project_root: str, strategy: str):
+        from orbiter.core.engine.action.action_manager import ActionManager
+        from orbiter.core.engine.session.session_manager import SessionManager
+        from orbiter.utils import system
+        from orbiter.utils.data_manager import ConfigLoader
+        from orbiter.utils.fallback_data import FALLBACK_FILE_ENV
+
+        self.project_root = project_root
+        # What bootstrap() loads, minus its CLI parsing (argv here is the benchmark's)
+        if not system.CONSTANTS:
+            system.MANIFEST = ConfigLoader.load_manifest(project_root)
+            system.CONSTANTS = ConfigLoader.load_config(project_root, 'mandatory_files', 'constants')
+        self.workdir = tempfile.mkdtemp(prefix="orbiter_bench_ctx_")
+        # Proxy fallback served from a file: no network in a benchmark
+        fallback_file = os.path.join(self.workdir, "fallback.json")
+        with open(fallback_file, "w") as f:
+            json.dump({}, f)
+        self._owns_fallback_env = FALLBACK_FILE_ENV not in os.environ
+        if self._owns_fallback_env:
+            os.environ[FALLBACK_FILE_ENV] = fallback_file
+
+        self.session = SessionManager(project_root, strategy_id=strategy)
+        self.action_manager = ActionManager()
+        self.action_manager.execute_batch = lambda actions: None # time the scan, not order placement
+
+    def build_engine(self, state):
+        from orbiter.core.engine.runtime.core_engine import Engine
+        # Registration wiring is not on the scan path
+        with patch("orbiter.core.engine.runtime.core_engine.RegistrationManager"):
+            return Engine(state, self.session, self.action_manager)
+
+    def close(self):
+        from orbiter.utils.fallback_data import FALLBACK_FILE_ENV
+        if self._owns_fallback_env:
+            os.environ.pop(FALLBACK_FILE_ENV, None)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def build_stages(ctx: BenchmarkContext, uni: SyntheticUniverse) -> Dict[str, Callable[[], Any]]:
+    from orbiter.core.broker.master import ScripMaster
+    from orbiter.core.broker.resolver import ContractResolver
+
+    engine = ctx.build_engine(uni.state())
+    rm = engine.rule_manager
+    instrument_ctx = engine.constants.get("factContexts", "instrument_context")
+    filters = ctx.session.filters
+    raw_candles = [uni.candles(inst) for inst in uni.symbols]
+    standardized = [rm.fact_converter.convert_candle_data(c) for c in raw_candles]
+    kwargs = [{"token": inst["token"], "instrument.exchange": inst["exchange"],
+               "instrument_exchange": inst["exchange"], "instrument.symbol": inst["symbol"]}
+              for inst in uni.symbols]
+    tech = [rm.fact_calc.calculate_technical_facts(std, filter_config=filters, **kw)
+            for std, kw in zip(standardized, kwargs)]
+    extra = []
+    for kw, facts, ltp in zip(kwargs, tech, uni.ltps):
+        e = {**kw, "position": {}, "raw_data_for_filter": {"lp": ltp}}
+        e.update({k.replace(".", "_"): v for k, v in facts.items()})
+        extra.append(e)
+
+    # Scrip master / resolver over a synthetic option chain (21 strikes x CE/PE per symbol)
+    master_root = os.path.join(uni.workdir, "root")
+    uni.write_derivatives(os.path.join(master_root, "orbiter", "data"),
+                          engine.constants.get("constants", "nfo_derivatives_file"))
+    master = ScripMaster(ctx.project_root)
+    master.project_root = master_root
+    master.load_mappings("nfo")
+    resolver = ContractResolver(master)
+
+    def load_mappings():
+        fresh = ScripMaster(ctx.project_root)
+        fresh.project_root = master_root
+        fresh.load_mappings("nfo")
+
+    return {
+        "convert_candle_data": lambda: [rm.fact_converter.convert_candle_data(c) for c in raw_candles],
+        "analyze": lambda: [rm.fact_calc.analyzer.analyze(std) for std in standardized],
+        "calculate_technical_facts": lambda: [rm.fact_calc.calculate_technical_facts(std, filter_config=filters, **kw)
+                                              for std, kw in zip(standardized, kwargs)],
+        "evaluate_score": lambda: [rm.evaluate_score(source=engine, context=instrument_ctx, **e) for e in extra],
+        "evaluate": lambda: [rm.evaluate(source=engine, context=instrument_ctx, **e) for e in extra],
+        "resolver_spreads": lambda: [resolver.get_credit_spread_contracts(inst["symbol"], ltp, side)
+                                     for inst, ltp in zip(uni.symbols, uni.ltps) for side in ("PUT", "CALL")],
+        "load_mappings": load_mappings,
+        "engine_tick": engine.tick,
+    }
+
+
+def run(sizes: List[str], stages: List[str] = None, repeat: int = 5, warmup: int = 1,
+        strategy: str = DEFAULT_STRATEGY, project_root: str = PROJECT_ROOT, log=None) -> Dict[str, Any]:
+    """Time `stages` for every `<symbols>x<bars>` size; a failing stage is recorded as {"error": ...}."""
+    stages = stages or STAGES
+    log = log or (lambda msg: print(msg, file=sys.stderr))
+    output = {"meta": {**machine_metadata(project_root), "strategy": strategy, "repeat": repeat, "warmup": warmup},
+              "results": {}}
+    ctx = BenchmarkContext(project_root, strategy)
+    try:
+        for size in sizes:
+            n_symbols, n_bars = parse_size(size)
+            uni = SyntheticUniverse(project_root, n_symbols, n_bars)
+            try:
+                # Rule evaluation prints its warnings; keep them out of the report (still paid for)
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    fns = build_stages(ctx, uni)
+                    case = output["results"][f"{n_symbols}x{n_bars}"] = {}
+                    for stage in stages:
+                        try:
+                            case[stage] = time_stage(fns[stage], repeat=repeat, warmup=warmup)
+                        except Exception as e:
+                            case[stage] = {"error": f"{type(e).__name__}: {e}"}
+                        log(f"  {size:<9} {stage:<28} {case[stage].get('median_ms', case[stage].get('error'))}")
+            finally:
+                uni.cleanup()
+    finally:
+        ctx.close()
+    return output
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Orbiter hot-path benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="Universe sizes as <symbols>x<bars>")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, help="Subset of stages to time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio (0.25 = +25%%)")
+    parser.add_argument("--stage-threshold", action="append", default=[], metavar="STAGE=RATIO",
+                        help="Per-stage override, e.g. engine_tick=0.15")
+    parser.add_argument("--update-baseline", action="store_true", help="Write these results as the baseline")
+    args = parser.parse_args(argv)
+
+    # Engine logs per symbol; keep the timings about the code, not the log handlers
+    logging.getLogger("ORBITER").setLevel(logging.ERROR)
+
+    results = run(args.sizes, args.stages, args.repeat, args.warmup, args.strategy)
+    if args.output:
+        save_results(args.output, results)
+
+    baseline = load_results(args.baseline) if os.path.exists(args.baseline) and not args.update_baseline else None
+    print(format_table(results, baseline))
+
+    if args.update_baseline:
+        save_results(args.baseline, results)
+        print(f"📌 Baseline written: {args.baseline}")
+        return 0
+    if baseline is None:
+        print("ℹ️ No baseline to compare against (use --update-baseline to record one)")
+        return 0
+
+    stage_thresholds = {k: float(v) for k, v in (item.split("=", 1) for item in args.stage_threshold)}
+    regressions = compare(results, baseline, args.threshold, stage_thresholds)
+    for r in regressions:
+        print(f"❌ REGRESSION {r['case']} {r['stage']}: {r['baseline_ms']:.2f}ms -> {r['current_ms']:.2f}ms "
+              f"({r['ratio']:.2f}x, limit {1 + r['threshold']:.2f}x)")
+    if not regressions:
+        print("✅ No regressions against baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
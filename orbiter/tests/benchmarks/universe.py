@@ -0,0 +1,147 @@
+# orbiter/tests/benchmarks/universe.py
+"""
+Synthetic universes for the benchmark suite.
+
+`SyntheticUniverse(root, n_symbols, n_bars)` writes a replay file in the
+MockBrokerClient format ({symbol: {exchange, token, candles}}), primes a
+MockBrokerClient from it and wires the attributes Engine.tick reads
+(`conn.tick_handler`, `margin`, `resolver`, `master`). Candles are a seeded
+random walk, so every run of a given size sees identical data.
+"""
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import numpy as np
+
+from orbiter.core.broker.mock_client import MockApi, MockBrokerClient
+
+
+def synthetic_candles(n_bars: int, seed: int, base: float = 1000.0) -> List[Dict[str, str]]:
+    """Broker-format 1-minute candles (intc/inth/intl/into/v/stat) on a seeded random walk."""
+    rng = np.random.default_rng(seed)
+    close = base * np.exp(np.cumsum(rng.normal(0, 0.0015, n_bars)))
+    open_ = np.concatenate(([base], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.001, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(100, 5000, n_bars)
+    start = datetime.datetime.now().replace(hour=9, minute=15, second=0, microsecond=0)
+    return [{
+        'time': (start + datetime.timedelta(minutes=i)).strftime('%d-%m-%Y %H:%M:%S'),
+        'into': f"{open_[i]:.2f}", 'inth': f"{high[i]:.2f}", 'intl': f"{low[i]:.2f}",
+        'intc': f"{close[i]:.2f}", 'v': str(int(volume[i])), 'stat': 'Ok',
+    } for i in range(n_bars)]
+
+
+def synthetic_derivatives(symbols: List[str], ltps: List[float], expiry: datetime.date,
+                          strikes_per_side: int = 10, exchange: str = 'NFO') -> List[Dict[str, Any]]:
+    """Option chain rows (ScripMaster.DERIVATIVE_OPTIONS shape) around each symbol's LTP."""
+    rows = []
+    exp = expiry.strftime('%d%b%y').upper()
+    token = 500000
+    for symbol, ltp in zip(symbols, ltps):
+        step = 50 if ltp > 2000 else 20 if ltp > 500 else 10
+        atm = int(round(ltp / step) * step)
+        for strike in range(atm - strikes_per_side * step, atm + (strikes_per_side + 1) * step, step):
+            for opt_type in ('CE', 'PE'):
+                token += 1
+                tsym = f"{symbol}{exp}{opt_type}{strike}"
+                rows.append({
+                    'symbol': symbol, 'tradingsymbol': tsym, 'token': str(token),
+                    'instrument': 'OPTSTK', 'exchange': exchange, 'expiry': expiry.isoformat(),
+                    'strike': float(strike), 'option_type': opt_type, 'lot_size': 50,
+                    'lotsize': 50, 'companyname': symbol,
+                })
+    return rows
+
+
+def next_monthly_expiry(today: datetime.date = None) -> datetime.date:
+    """Last Thursday on or after today (the resolver's 'monthly' expiry)."""
+    today = today or datetime.date.today()
+    year, month = today.year, today.month
+    while True:
+        day = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+        while day.weekday() != 3:
+            day -= datetime.timedelta(days=1)
+        if day >= today:
+            return day
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class _SpanCache(dict):
+    """dict with the `.cache` attribute Engine.tick writes through."""
+
+    @property
+    def cache(self):
+        return self
+
+
+class SyntheticUniverse:
+    def __init__(self, project_root: str, n_symbols: int, n_bars: int, exchange: str = 'NFO', seed: int = 7):
+        self.project_root = project_root
+        self.n_symbols = n_symbols
+        self.n_bars = n_bars
+        self.exchange = exchange
+        self.workdir = tempfile.mkdtemp(prefix=f"orbiter_bench_{n_symbols}x{n_bars}_")
+
+        self.symbols = [{'token': str(10000 + i), 'exchange': exchange, 'symbol': f"BSYM{i:03d}",
+                         'company_name': f"BSYM{i:03d}", 'lotsize': 50} for i in range(n_symbols)]
+        replay = {}
+        for i, inst in enumerate(self.symbols):
+            candles = synthetic_candles(n_bars, seed + i, base=200.0 + 37.0 * i)
+            replay[inst['symbol']] = {'exchange': exchange, 'token': inst['token'], 'candles': candles}
+        self.data_file = os.path.join(self.workdir, 'replay.json')
+        with open(self.data_file, 'w') as f:
+            json.dump(replay, f)
+
+        self.client = self._build_client()
+        self.ltps = [float(replay[s['symbol']]['candles'][-1]['intc']) for s in self.symbols]
+
+    def _build_client(self) -> MockBrokerClient:
+        previous = os.environ.get('ORBITER_MOCK_DATA_FILE')
+        os.environ['ORBITER_MOCK_DATA_FILE'] = self.data_file
+        try:
+            client = MockBrokerClient(self.project_root, segment_name=self.exchange.lower())
+        finally:
+            if previous is None:
+                os.environ.pop('ORBITER_MOCK_DATA_FILE', None)
+            else:
+                os.environ['ORBITER_MOCK_DATA_FILE'] = previous
+        client.prime_candles(self.symbols, lookback_mins=self.n_bars)
+        # Attributes the live BrokerClient exposes and Engine.tick reads
+        client.conn = SimpleNamespace(tick_handler=client, api=MockApi(), cred={'user': 'BENCH'})
+        client.margin = SimpleNamespace(
+            span_cache=_SpanCache(),
+            source='broker',
+            save_span_cache=lambda: None,
+            calculate_span_for_spread=lambda *a, **k: {'ok': True, 'total_margin': 0.0},
+            calculate_future_margin=lambda *a, **k: {'ok': True, 'total_margin': 0.0},
+        )
+        return client
+
+    def candles(self, inst: Dict[str, Any]) -> List[Dict[str, str]]:
+        return self.client.SYMBOLDICT[f"{inst['exchange']}|{inst['token']}"]['candles']
+
+    def state(self, config: Dict[str, Any] = None) -> SimpleNamespace:
+        """Minimal OrbiterState stand-in for Engine / RuleManager."""
+        return SimpleNamespace(client=self.client, symbols=self.symbols, active_positions={},
+                               verbose_logs=False, config=dict(config or {}), last_scan_metrics=[],
+                               primed=True)
+
+    def write_derivatives(self, data_dir: str, filename: str, strikes_per_side: int = 10) -> str:
+        rows = synthetic_derivatives([s['symbol'] for s in self.symbols], self.ltps,
+                                     next_monthly_expiry(), strikes_per_side)
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, filename)
+        with open(path, 'w') as f:
+            json.dump({'options': rows}, f)
+        return path
+
+    def cleanup(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
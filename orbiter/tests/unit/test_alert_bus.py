@@ -0,0 +1,126 @@
+import logging
+import threading
+import unittest
+
+import orbiter.utils.logger  # noqa: F401 - registers Logger.trace
+from orbiter.bot.alert_bus import AlertBus, AlertLogHandler, LocalTransport, fingerprint_of
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def raise_at_same_line(value):
+    try:
+        raise ValueError(f"bad value {value}")
+    except ValueError as e:
+        return e
+
+
+class TestAlertBus(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.transport = LocalTransport()
+        self.bus = AlertBus(transports=[self.transport], window=60, rate_per_minute=6, burst=2,
+                            base_backoff=5, clock=self.clock, autostart=False)
+
+    def pump(self, advance=0.0):
+        self.clock.now += advance
+        return self.bus.pump()
+
+    def test_error_loop_becomes_one_alert_and_one_digest(self):
+        for i in range(50):
+            self.bus.alert(f"Order {i} rejected: margin", exc=raise_at_same_line(i))
+        self.pump()
+        self.assertEqual(len(self.transport.sent), 1)
+        self.assertIn("ValueError: bad value 0", self.transport.sent[0])
+
+        self.pump(30)
+        self.assertEqual(len(self.transport.sent), 1)  # window still open
+        self.pump(30)
+        self.assertEqual(len(self.transport.sent), 2)
+        self.assertIn("x49", self.transport.sent[1])
+        self.assertIn("bad value 49", self.transport.sent[1])
+
+        self.pump(60)  # quiet window: the group closes without another message
+        self.assertEqual(self.bus.get_stats()['open_groups'], 0)
+        self.assertEqual(self.bus.get_stats()['suppressed'], 49)
+
+    def test_distinct_fingerprints_rate_limited_and_coalesced(self):
+        for i in range(5):
+            self.bus.alert(f"feed <{i}> down", fingerprint=f"fp{i}")
+            wait = self.pump()
+        self.assertEqual(len(self.transport.sent), 2)  # burst of 2
+        self.assertAlmostEqual(wait, 10.0)  # 6/min → one token per 10s
+        self.assertIn("&lt;0&gt;", self.transport.sent[0])  # HTML-escaped for parse_mode=HTML
+
+        self.pump(10)
+        self.assertEqual(len(self.transport.sent), 3)
+        self.assertEqual([f"&lt;{i}&gt;" in self.transport.sent[2] for i in range(2, 5)], [True] * 3)
+        self.assertEqual(self.bus.get_stats()['channels']['local']['coalesced'], 2)
+
+    def test_failed_sends_back_off_and_keep_the_message(self):
+        self.transport.failures = 2
+        self.bus.alert("broker down")
+        self.assertAlmostEqual(self.pump(), 5.0)
+        self.assertEqual(self.transport.sent, [])
+        self.pump(4)
+        self.assertEqual(self.transport.attempts, 1)  # still backing off
+        self.assertAlmostEqual(self.pump(1), 10.0)  # second failure doubles the backoff
+        self.pump(10)
+        self.assertEqual(len(self.transport.sent), 1)
+        self.assertIn("broker down", self.transport.sent[0])
+
+        self.transport.failures, self.transport.retry_after = 1, 42
+        self.bus.alert("another", fingerprint="other")
+        self.assertAlmostEqual(self.pump(), 42.0)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        bus = AlertBus(transports=[LocalTransport()], max_queue=3, clock=self.clock, autostart=False)
+        self.assertEqual([bus.alert(f"x{i}") for i in range(5)], [True, True, True, False, False])
+        self.assertEqual(bus.get_stats()['dropped'], 2)
+
+    def test_fingerprints(self):
+        self.assertEqual(fingerprint_of(raise_at_same_line(1)), fingerprint_of(raise_at_same_line(2)))
+        self.assertNotEqual(fingerprint_of(raise_at_same_line(1)), fingerprint_of(ValueError("x")))
+        self.assertEqual(fingerprint_of(message="retry 3 of 5"), fingerprint_of(message="retry 4 of 5"))
+
+
+class TestAlertLogHandler(unittest.TestCase):
+    def test_log_records_reach_transport_through_the_worker(self):
+        transport = LocalTransport()
+        bus = AlertBus(transports=[transport], window=60)
+        log = logging.getLogger("ORBITER.alert_test")
+        log.propagate = False
+        handler = AlertLogHandler(bus)
+        log.addHandler(handler)
+        try:
+            threads = [threading.Thread(target=lambda: [log.error("tick loop failed") for _ in range(100)])
+                       for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            log.warning("below the handler level")
+            try:
+                {}['missing']
+            except KeyError:
+                log.exception("lookup failed")
+            self.assertTrue(bus.flush(5))
+        finally:
+            log.removeHandler(handler)
+            bus.stop()
+
+        sent = "\n".join(transport.sent)
+        self.assertEqual(sent.count("tick loop failed"), 2)  # first + one digest
+        self.assertIn("x399", sent)
+        self.assertIn("KeyError", sent)
+        self.assertNotIn("below the handler level", sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
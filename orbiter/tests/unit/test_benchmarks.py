@@ -0,0 +1,53 @@
+import os
+import unittest
+
+from orbiter.tests.benchmarks.harness import compare, time_stage
+from orbiter.tests.benchmarks.run import PROJECT_ROOT, run
+from orbiter.tests.benchmarks.universe import SyntheticUniverse, next_monthly_expiry
+
+
+def _result(**stages):
+    return {"results": {"50x60": {name: {"median_ms": ms} for name, ms in stages.items()}}}
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_time_stage_reports_stats(self):
+        calls = []
+        stats = time_stage(lambda: calls.append(1), repeat=3, warmup=2)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(stats["runs"], 3)
+        self.assertLessEqual(stats["min_ms"], stats["median_ms"])
+
+    def test_compare_flags_only_stages_past_threshold(self):
+        baseline = _result(analyze=10.0, engine_tick=100.0, tiny=0.1)
+        current = _result(analyze=12.0, engine_tick=130.0, tiny=5.0)
+        regressions = compare(current, baseline, threshold=0.25)
+        self.assertEqual([r["stage"] for r in regressions], ["engine_tick"])
+        # Per-stage override is stricter for analyze; sub-min_ms stages are noise
+        regressions = compare(current, baseline, threshold=0.5, stage_thresholds={"analyze": 0.1})
+        self.assertEqual([r["stage"] for r in regressions], ["analyze"])
+
+    def test_synthetic_universe_is_deterministic(self):
+        a = SyntheticUniverse(PROJECT_ROOT, 3, 60)
+        b = SyntheticUniverse(PROJECT_ROOT, 3, 60)
+        try:
+            self.assertEqual(len(a.candles(a.symbols[0])), 60)
+            self.assertEqual(a.ltps, b.ltps)
+            self.assertGreaterEqual(next_monthly_expiry(), next_monthly_expiry().replace(day=1))
+        finally:
+            a.cleanup()
+            b.cleanup()
+        self.assertFalse(os.path.exists(a.workdir))
+
+    def test_small_run_times_every_requested_stage(self):
+        stages = ["convert_candle_data", "analyze", "resolver_spreads", "load_mappings"]
+        out = run(["3x60"], stages=stages, repeat=1, warmup=0, log=lambda msg: None)
+        case = out["results"]["3x60"]
+        self.assertEqual(sorted(case), sorted(stages))
+        for stage in stages:
+            self.assertNotIn("error", case[stage], stage)
+        self.assertIn("python", out["meta"])
+
+
+if __name__ == '__main__':
+    unittest.main()
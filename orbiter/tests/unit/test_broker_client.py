@@ -135,6 +135,7 @@ class TestBrokerClient(unittest.TestCase):
     def test_start_live_feed_updates_symboldict(self):
         client = self._make_client()
         client.conn.tick_handler.start_live_feed(client.conn, ['NSE|123'])
+        self.assertTrue(client.conn.tick_handler.ingest.drain())
         self.assertIn('NSE|123', client.conn.tick_handler.SYMBOLDICT)
         self.assertEqual(client.conn.tick_handler.SYMBOLDICT['NSE|123']['ltp'], 100.0)
 
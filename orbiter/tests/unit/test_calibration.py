@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from orbiter.utils.calibration import Calibrator, predicate
+
+
+def sample(n=400, seed=11):
+    rng = np.random.default_rng(seed)
+    features = pd.DataFrame({
+        'day_range_pct': rng.uniform(0.2, 2.0, n),
+        'vwap_deviation_pct': rng.normal(0, 0.5, n),
+        'within_orb': rng.integers(0, 2, n).astype(bool),
+    })
+    features.loc[::37, 'day_range_pct'] = np.nan
+    outcome = (features['day_range_pct'].fillna(2.0) < 1.0) & (rng.uniform(size=n) < 0.8)
+    returns = rng.normal(0.1, 1.0, n)
+    return features, outcome.to_numpy(), returns
+
+
+def loop_stats(mask, outcome, returns):
+    """The per-threshold re-filtering the sweep replaces."""
+    signals = mask.sum()
+    hits = (mask & outcome).sum()
+    return {'signals': signals, 'precision': hits / signals, 'recall': hits / outcome.sum(),
+            'accuracy': (mask == outcome).mean(), 'expectancy': returns[mask].mean()}
+
+
+class TestCalibrator(unittest.TestCase):
+    def setUp(self):
+        self.features, self.outcome, self.returns = sample()
+        self.cal = Calibrator(self.features, self.outcome, self.returns, folds=4, min_signals=5)
+
+    def assertRowMatches(self, row, mask):
+        for name, value in loop_stats(mask, self.outcome, self.returns).items():
+            self.assertAlmostEqual(row[name], value, places=9, msg=name)
+
+    def test_threshold_sweep_matches_loop(self):
+        table = self.cal.sweep(operators=('<', '<=', '>', '>=', 'abs<'))
+        self.assertEqual(set(table['indicator']), set(self.features.columns))
+        for _, row in table.iterrows():
+            self.assertRowMatches(row, predicate(self.features[row['indicator']], row['op'], row['threshold']))
+        self.assertTrue(table['precision'].is_monotonic_decreasing)
+
+        flags = self.cal.sweep({'within_orb': {'==': [1]}})
+        self.assertRowMatches(flags.iloc[0], self.features['within_orb'].to_numpy())
+
+    def test_walk_forward_scores_train_pick_on_next_fold(self):
+        table = self.cal.sweep({'day_range_pct': {'<': [0.5, 0.8, 1.0, 1.2]}})
+        self.assertEqual(len(table), 4)
+        wf = self.cal.walk_forward()
+        self.assertEqual(wf['fold'].tolist(), [1, 2, 3])
+        x = self.features['day_range_pct'].to_numpy()
+        for _, row in wf.iterrows():
+            train, test = self.cal.fold < row['fold'], self.cal.fold == row['fold']
+            precisions = {t: self.outcome[train & (x < t)].mean() for t in (0.5, 0.8, 1.0, 1.2)}
+            self.assertAlmostEqual(row['train_precision'], max(precisions.values()))
+            mask = test & (x < row['threshold'])
+            self.assertAlmostEqual(row['test_precision'], self.outcome[mask].mean())
+            self.assertAlmostEqual(row['test_expectancy'], self.returns[mask].mean())
+
+        fold_precision = [self.outcome[(self.cal.fold == f) & (x < 1.0)].mean() for f in range(4)]
+        self.assertAlmostEqual(table.set_index('threshold').loc[1.0, 'wf_precision_min'], min(fold_precision))
+
+    def test_composite_sweep_covers_every_weight_vector(self):
+        conditions = [('day_range_pct', '<', 1.0), ('vwap_deviation_pct', 'abs<', 0.3), ('within_orb', '==', 1)]
+        table = self.cal.sweep_composite(conditions, weights=(0, 1, 2), chunk=5)
+        self.assertLessEqual(len(table), (3 ** 3 - 1) * 6)
+        hits = [predicate(self.features[i], op, t) for i, op, t in conditions]
+        for _, row in table.iterrows():
+            weights = [row[f"w:{self.cal.label(c)}"] for c in conditions]
+            score = sum(w * h for w, h in zip(weights, hits))
+            self.assertRowMatches(row, score >= row['min_score'])
+
+        best = table.iloc[0]
+        filters = self.cal.to_filters(best, name='sideways_score')['scoring']['sideways_score']
+        self.assertEqual(filters['min_score'], best['min_score'])
+        self.assertEqual({k: v['weight'] for k, v in filters['conditions'].items()},
+                         {c[0]: best[f"w:{self.cal.label(c)}"] for c in conditions if best[f"w:{self.cal.label(c)}"]})
+
+    def test_to_filters_keeps_best_row_per_indicator(self):
+        table = self.cal.sweep({'day_range_pct': [0.8, 1.0], 'vwap_deviation_pct': {'abs<': [0.2, 0.4]}})
+        filters = self.cal.to_filters(table)
+        best_range = table[table['indicator'] == 'day_range_pct'].iloc[0]
+        self.assertEqual(filters['entry']['day_range_pct'],
+                         {'enabled': True, 'operator': best_range['op'], 'threshold': best_range['threshold']})
+        self.assertEqual(filters['entry']['vwap_deviation_pct']['operator'], 'abs<')
+
+
+if __name__ == '__main__':
+    unittest.main()
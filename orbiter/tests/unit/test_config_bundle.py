@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from orbiter.utils.config_bundle import ConfigBundle, compile_rule
+from orbiter.utils.data_manager import ConfigLoader
+from orbiter.utils.lazy_import import lazy_import
+
+
+class TestConfigBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cfg = os.path.join(self.tmp.name, "cfg.json")
+        self.cache = os.path.join(self.tmp.name, "cache", "bundle.pkl")
+        with open(self.cfg, "w") as f:
+            json.dump({"a": {"b": 1}}, f)
+
+    def tearDown(self):
+        ConfigBundle._active = None
+        self.tmp.cleanup()
+
+    def test_bundle_serves_fresh_copies_and_survives_restart(self):
+        bundle = ConfigBundle(self.cache)
+        first = bundle.load_json(self.cfg)
+        first["a"]["b"] = 99 # caller mutation must not leak into the cache
+        self.assertEqual(bundle.load_json(self.cfg), {"a": {"b": 1}})
+        self.assertEqual((bundle.hits, bundle.misses), (1, 1))
+        self.assertTrue(bundle.save())
+
+        restarted = ConfigBundle(self.cache)
+        self.assertEqual(restarted.load_json(self.cfg), {"a": {"b": 1}})
+        self.assertEqual(restarted.hits, 1)
+
+    def test_changed_file_is_reparsed(self):
+        bundle = ConfigBundle(self.cache)
+        bundle.load_json(self.cfg)
+        with open(self.cfg, "w") as f:
+            json.dump({"a": {"b": 22}}, f)
+        os.utime(self.cfg, ns=(0, 1)) # force an mtime change on coarse filesystems
+        self.assertEqual(bundle.load_json(self.cfg)["a"]["b"], 22)
+        self.assertEqual(bundle.misses, 2)
+
+    def test_config_loader_uses_active_bundle(self):
+        bundle = ConfigBundle.activate(self.tmp.name, cache_path=self.cache)
+        self.assertEqual(ConfigLoader.load_json_file(self.cfg), {"a": {"b": 1}})
+        self.assertEqual(ConfigLoader.load_json_file(os.path.join(self.tmp.name, "missing.json")), {})
+        ConfigLoader.load_json_file(self.cfg)
+        self.assertEqual(bundle.hits, 1)
+
+    def test_compiled_rules_are_shared(self):
+        rule = compile_rule("x > 1")
+        self.assertIs(compile_rule("x > 1"), rule)
+        self.assertTrue(rule.matches({"x": 2}))
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_deferred_until_first_use(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(0, 0, 0), (0, 0, 0))
+        self.assertIn("colorsys", sys.modules)
+
+        rgb_to_hsv = lazy_import("colorsys", "rgb_to_hsv")
+        self.assertEqual(rgb_to_hsv(0, 0, 0), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+from unittest.mock import MagicMock
+
+import orbiter.utils.logger  # noqa: F401 - registers Logger.trace
+from orbiter.core.engine.runtime.exit_monitor import ExitMonitor, ExitState, position_legs
+from orbiter.core.engine.action.executor import ActionExecutor
+from orbiter.filters.tp.f2_trailing_sl import check_trailing_sl
+
+
+def _tick(key, ltp):
+    exch, token = key.split('|')
+    return {'exchange': exch, 'token': token, 'ltp': ltp}
+
+
+class TestExitState(unittest.TestCase):
+    def test_long_future_trailing_matches_filter(self):
+        position = {'symbol': 'CRUDEOIL', 'side': 'B', 'qty': 100, 'entry_price': 100.0,
+                    'tsl_activation_rs': 1000, 'tsl_retracement_pct': 40}
+        st = ExitState('MCX|1', position_legs('MCX|1', position), position)
+
+        self.assertIsNone(st.on_price('MCX|1', 125.0))    # peak ₹2500, floor ₹1500
+        self.assertEqual(st.peak_pnl, 2500.0)
+        self.assertIsNone(st.on_price('MCX|1', 116.0))    # ₹1600 > floor
+        reason = st.on_price('MCX|1', 114.0)               # ₹1400 <= floor
+        self.assertIn('Cash TSL Hit', reason)
+
+        # Same decision as the scan-time TP filter
+        res = check_trailing_sl({}, position={**position, 'max_pnl_rs': st.peak_pnl, 'pnl_rs': st.pnl})
+        self.assertTrue(res['hit'])
+
+    def test_short_hard_sl(self):
+        position = {'symbol': 'X', 'side': 'S', 'qty': 50, 'entry_price': 200.0, 'stop_loss_rs': 500}
+        st = ExitState('NFO|2', position_legs('NFO|2', position), position)
+        self.assertIsNone(st.on_price('NFO|2', 205.0))
+        self.assertAlmostEqual(st.pnl, -250.0)
+        self.assertIn('Hard SL', st.on_price('NFO|2', 211.0))
+
+    def test_spread_pnl_needs_both_legs(self):
+        master = MagicMock()
+        master.SYMBOL_TO_TOKEN = {'ATM': '10', 'HDG': '11'}
+        position = {'atm_symbol': 'ATM', 'hedge_symbol': 'HDG', 'lot_size': 75, 'entry_net_premium': 60.0}
+        legs = position_legs('NFO|26000', position, master)
+        self.assertEqual([(l['key'], l['sign']) for l in legs], [('NFO|10', -1), ('NFO|11', 1)])
+
+        st = ExitState('NFO|26000', legs, position)
+        self.assertIsNone(st.on_price('NFO|10', 90.0))
+        self.assertEqual(st.missing, 1)
+        st.on_price('NFO|11', 40.0)
+        self.assertAlmostEqual(st.pnl, (60.0 - (90.0 - 40.0)) * 75)
+
+
+class TestExitMonitor(unittest.TestCase):
+    def setUp(self):
+        self.state = MagicMock()
+        self.state.config = {}
+        self.state.active_positions = {
+            'NFO|2': {'symbol': 'X', 'side': 'S', 'qty': 50, 'entry_price': 200.0, 'stop_loss_rs': 500}
+        }
+        self.square_off = MagicMock(side_effect=lambda key, reason: self.state.active_positions.pop(key))
+        self.subscribe = MagicMock()
+        self.monitor = ExitMonitor(self.state, square_off=self.square_off, subscribe=self.subscribe)
+        self.monitor.sync()
+
+    def test_subscribes_position_legs(self):
+        self.subscribe.assert_called_once_with(['NFO|2'])
+
+    def test_ignores_other_symbols(self):
+        self.monitor.on_tick('Y', _tick('NSE|99', 1.0))
+        self.assertEqual(self.monitor.get_stats()['ticks_checked'], 0)
+
+    def test_square_off_fires_once_and_updates_position(self):
+        self.monitor.on_tick('X', _tick('NFO|2', 190.0))
+        self.assertEqual(self.state.active_positions['NFO|2']['max_pnl_rs'], 500.0)
+
+        self.monitor.on_tick('X', _tick('NFO|2', 215.0))
+        self.monitor.on_tick('X', _tick('NFO|2', 220.0))
+        self.square_off.assert_called_once()
+        self.assertEqual(self.square_off.call_args[0][0], 'NFO|2')
+        self.assertEqual(self.monitor.get_stats()['positions'], 0)
+
+    def test_failed_square_off_retries_after_cooldown(self):
+        self.square_off.side_effect = None  # broker rejects: position stays
+        self.monitor.on_tick('X', _tick('NFO|2', 215.0))
+        self.monitor.on_tick('X', _tick('NFO|2', 216.0))
+        self.square_off.assert_called_once()
+
+        self.monitor._positions['NFO|2'].retry_at = 0.0
+        self.monitor.on_tick('X', _tick('NFO|2', 216.0))
+        self.assertEqual(self.square_off.call_count, 2)
+
+    def test_trailing_only_with_strategy_filter(self):
+        self.state.active_positions = {'MCX|1': {'symbol': 'C', 'side': 'B', 'qty': 100, 'entry_price': 100.0}}
+        self.monitor.sync()
+        for ltp in (125.0, 110.0):
+            self.monitor.on_tick('C', _tick('MCX|1', ltp))
+        self.square_off.assert_not_called()  # no trailing_sl filter: no cash trail
+
+        monitor = ExitMonitor(self.state, square_off=self.square_off,
+                              trailing_sl={'enabled': True, 'retracement_pct': 30})
+        monitor.sync()
+        monitor.on_tick('C', _tick('MCX|1', 125.0))  # peak ₹2500, 30% floor ₹1750
+        monitor.on_tick('C', _tick('MCX|1', 117.0))
+        self.square_off.assert_called_once()
+
+    def test_new_position_picked_up_on_tick(self):
+        self.state.active_positions['MCX|1'] = {'symbol': 'C', 'side': 'B', 'qty': 1, 'entry_price': 10.0}
+        self.monitor.on_tick('C', _tick('MCX|1', 11.0))
+        self.assertEqual(self.monitor.get_stats()['positions'], 2)
+        self.assertEqual(self.state.active_positions['MCX|1']['pnl_rs'], 1.0)
+
+
+class TestSquareOffPosition(unittest.TestCase):
+    def test_paper_square_off_closes_all_legs(self):
+        state = MagicMock()
+        state.config = {'paper_trade': True}
+        state.exit_history = {}
+        state.client.master.SYMBOL_TO_TOKEN = {'ATM': '10', 'HDG': '11'}
+        state.active_positions = {
+            'NFO|26000': {'atm_symbol': 'ATM', 'hedge_symbol': 'HDG', 'lot_size': 75, 'entry_net_premium': 60.0}
+        }
+        executor = ActionExecutor(state)
+        res = executor.square_off_position('NFO|26000', reason='TSL')
+
+        self.assertEqual([r['tsym'] for r in res], ['ATM', 'HDG'])
+        self.assertNotIn('NFO|26000', state.active_positions)
+        self.assertEqual(state.exit_history['NFO|26000']['reason'], 'TSL')
+        state.client.conn.api.place_order.assert_not_called()
+
+    def test_live_square_off_reverses_side(self):
+        state = MagicMock()
+        state.config = {'paper_trade': False}
+        state.exit_history = {}
+        state.active_positions = {'MCX|1': {'symbol': 'CRUDEOILFUT', 'strategy': 'FUTURE_LONG', 'lot_size': 2}}
+        state.client.conn.api.place_order.return_value = {'stat': 'Ok', 'norenordno': '1'}
+        ActionExecutor(state).square_off_position('MCX|1', reason='SL')
+
+        kwargs = state.client.conn.api.place_order.call_args.kwargs
+        self.assertEqual((kwargs['buy_or_sell'], kwargs['tradingsymbol'], kwargs['quantity']), ('S', 'CRUDEOILFUT', 2))
+        self.assertNotIn('MCX|1', state.active_positions)
+
+    def test_rejected_leg_keeps_position_and_resumes(self):
+        state = MagicMock()
+        state.config = {'paper_trade': True}
+        state.exit_history = {}
+        state.client.master.SYMBOL_TO_TOKEN = {'ATM': '10', 'HDG': '11'}
+        state.active_positions = {'NFO|26000': {'atm_symbol': 'ATM', 'hedge_symbol': 'HDG', 'lot_size': 75,
+                                                'entry_net_premium': 60.0, 'paper': False}}
+        place = state.client.conn.api.place_order
+        place.side_effect = [{'stat': 'Ok'}, {'stat': 'Not_Ok', 'emsg': 'RMS: margin'}]
+        executor = ActionExecutor(state)
+        executor.square_off_position('NFO|26000', reason='SL')  # paper=False on the position wins
+
+        self.assertIn('NFO|26000', state.active_positions)
+        self.assertEqual(state.active_positions['NFO|26000']['exited_legs'], ['ATM'])
+        self.assertEqual(state.exit_history, {})
+
+        place.side_effect = [{'stat': 'Ok'}]
+        executor.square_off_position('NFO|26000', reason='SL')
+        self.assertEqual(place.call_args.kwargs['tradingsymbol'], 'HDG')  # ATM is not bought back twice
+        self.assertNotIn('NFO|26000', state.active_positions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+import json
+import os
+import numpy as np
+
+import orbiter.utils.logger  # noqa: F401 - registers Logger.trace
+
+from orbiter.core.engine.rule.fact_calculator import FactCalculator
+from orbiter.utils.data_manager import DataManager
+from orbiter.utils.constants_manager import ConstantsManager
+from orbiter.utils.schema_manager import SchemaManager
+from orbiter.filters.entry import (
+    f1_orb, f2_price_above_5ema, f3_5ema_above_9ema, f4_supertrend, f5_ema_scope,
+    f6_ema_gap, f7_atr_relative, f8_trend_sniper, f9_institutional_flip,
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _load_session(day='2024-07-25', shift=0.0):
+    path = os.path.join(PROJECT_ROOT, 'orbiter', 'tests', 'data', 'RECLTD_2024-07-25.json')
+    with open(path, 'r') as f:
+        rows = json.load(f)
+    timestamps = np.datetime64(f'{day}T09:15') + np.arange(len(rows)).astype('timedelta64[m]')
+    candles = []
+    for ts, row in zip(timestamps, rows):
+        candles.append({
+            'time': str(ts).replace('T', ' '),
+            'into': str(row['open'] + shift),
+            'inth': str(row['high'] + shift),
+            'intl': str(row['low'] + shift),
+            'intc': str(row['close'] + shift),
+            'v': str(row['volume']),
+            'stat': 'Ok',
+        })
+    return candles, timestamps
+
+
+def _to_series(candles, timestamps):
+    return {
+        'open': np.array([float(c['into']) for c in candles]),
+        'high': np.array([float(c['inth']) for c in candles]),
+        'low': np.array([float(c['intl']) for c in candles]),
+        'close': np.array([float(c['intc']) for c in candles]),
+        'volume': np.array([float(c['v']) for c in candles]),
+        'timestamp': timestamps,
+    }
+
+
+class TestFilterSeriesParity(unittest.TestCase):
+    """series[i] must equal the last-bar filter evaluated on candles[:i+1] with LTP = close[i]."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.candles, cls.timestamps = _load_session()
+        cls.series = _to_series(cls.candles, cls.timestamps)
+        cls.sample = [0, 4, 9, 14, 19, 29, 30, 45, 90, 200, len(cls.candles) - 1]
+
+    def _assert_parity(self, last_bar, series_fn, **kwargs):
+        out = series_fn(self.series, **kwargs)
+        self.assertEqual(len(out['score']), len(self.candles))
+        for i in self.sample:
+            data = {'lp': self.series['close'][i], 'o': self.series['open'][0]}
+            expected = last_bar(data, self.candles[:i + 1], **kwargs)
+            self.assertAlmostEqual(expected['score'], out['score'][i], places=9, msg=f"{last_bar.__name__} bar {i}")
+
+    def test_orb(self):
+        self._assert_parity(f1_orb.orb_filter, f1_orb.orb_filter_series, token='NSE|RECLTD')
+
+    def test_price_above_5ema(self):
+        self._assert_parity(f2_price_above_5ema.price_above_5ema_filter, f2_price_above_5ema.price_above_5ema_filter_series)
+
+    def test_ema5_above_9ema(self):
+        self._assert_parity(f3_5ema_above_9ema.ema5_above_9ema_filter, f3_5ema_above_9ema.ema5_above_9ema_filter_series)
+
+    def test_supertrend(self):
+        self._assert_parity(f4_supertrend.supertrend_filter, f4_supertrend.supertrend_filter_series)
+
+    def test_ema_scope(self):
+        self._assert_parity(f5_ema_scope.ema_scope_filter, f5_ema_scope.ema_scope_filter_series)
+
+    def test_ema_gap(self):
+        self._assert_parity(f6_ema_gap.ema_gap_expansion_filter, f6_ema_gap.ema_gap_expansion_filter_series)
+
+    def test_atr_relative(self):
+        self._assert_parity(f7_atr_relative.atr_momentum_filter, f7_atr_relative.atr_momentum_filter_series)
+
+    def test_trend_sniper(self):
+        self._assert_parity(f8_trend_sniper.trend_sniper_filter, f8_trend_sniper.trend_sniper_filter_series)
+
+    def test_institutional_flip_uses_previous_session(self):
+        prev_candles, prev_ts = _load_session(day='2024-07-24', shift=-8.0)
+        series = _to_series(prev_candles + self.candles, np.concatenate([prev_ts, self.timestamps]))
+        out = f9_institutional_flip.institutional_flip_filter_series(series)
+
+        prev = _to_series(prev_candles, prev_ts)
+        offset = len(prev_candles)
+        self.assertTrue(np.all(out['score'][:offset] == 0.0))
+        for i in self.sample:
+            data = {
+                'lp': self.series['close'][i],
+                'ph': prev['high'].max(), 'pl': prev['low'].min(),
+                'pc': prev['close'][-1], 'po': prev['open'][0],
+            }
+            expected = f9_institutional_flip.institutional_flip_filter(data, self.candles[:i + 1])
+            self.assertAlmostEqual(expected['score'], out['score'][offset + i], places=9)
+
+
+class TestFactCalculatorSeries(unittest.TestCase):
+    def setUp(self):
+        ConstantsManager._instance = None
+        SchemaManager._instance = None
+        facts_path = DataManager.get_manifest_path(PROJECT_ROOT, 'mandatory_files', 'fact_definitions')
+        self.fact_definitions = DataManager.load_json(facts_path)
+        self.calc = FactCalculator(PROJECT_ROOT, self.fact_definitions)
+        self.candles, timestamps = _load_session()
+        self.series = _to_series(self.candles, timestamps)
+
+    def test_series_facts_are_aligned_with_bars(self):
+        facts = self.calc.calculate_technical_facts_series(self.series, token='NSE|RECLTD')
+        n = len(self.candles)
+        for name in ('index.adx', 'index.rsi', 'filter.orb', 'filter.supertrend', 'filter.trend_sniper'):
+            self.assertIn(name, facts)
+            self.assertEqual(len(facts[name]), n, name)
+        # Cross-symbol / position-bound filters have no series form
+        self.assertNotIn('filter.ratio_raider', facts)
+        self.assertNotIn('tp.trailing_sl', facts)
+
+    def test_series_last_bar_matches_last_bar_api(self):
+        facts = self.calc.calculate_technical_facts_series(self.series, token='NSE|RECLTD')
+
+        standardized = {k: v for k, v in self.series.items() if k != 'timestamp'}
+        standardized['_raw_list'] = self.candles
+        last = self.calc.calculate_technical_facts(
+            standardized, token='NSE|RECLTD',
+            raw_data_for_filter={'lp': self.series['close'][-1], 'o': self.series['open'][0]})
+
+        for name in ('index.adx', 'index.ema_fast', 'index.rsi', 'index.supertrend_dir', 'filter.orb',
+                     'filter.price_above_5ema', 'filter.ema5_above_9ema', 'filter.supertrend',
+                     'filter.ema_scope', 'filter.ema_gap', 'filter.atr_relative', 'filter.trend_sniper'):
+            self.assertAlmostEqual(float(facts[name][-1]), float(last[name]), places=6, msg=name)
+
+    def test_disabled_filter_is_skipped(self):
+        facts = self.calc.calculate_technical_facts_series(self.series, filter_config={'orb': {'enabled': False}})
+        self.assertNotIn('filter.orb', facts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from orbiter.utils.fallback_data import FallbackDataProvider, FileFallbackSource
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFallbackDataProvider(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fallback.json")
+        self._write({"^NSEI": {"adx": 22.5, "ema_fast": 101.0, "ema_slow": 100.0, "supertrend_dir": 1, "supertrend": 12.0},
+                     "CL=F": {"adx": 31.0, "supertrend_dir": -1}})
+        self.clock = FakeClock()
+        self.provider = FallbackDataProvider(source=FileFallbackSource(self.path), symbols=["^NSEI"],
+                                             ttl=300, refresh_interval=60, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, data):
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def test_reads_are_memory_only(self):
+        source = MagicMock()
+        provider = FallbackDataProvider(source=source, clock=self.clock)
+        self.assertIsNone(provider.get("^BSESN"))
+        source.fetch.assert_not_called()
+        self.assertEqual(provider.get_stats()["symbols"], 1) # the miss is queued for the worker
+
+    def test_refresh_populates_and_expires(self):
+        self.assertIsNone(self.provider.get("CL=F"))
+        self.assertEqual(self.provider.refresh_due(), 2)
+        self.assertEqual(self.provider.get("^NSEI")["adx"], 22.5)
+        self.assertEqual(self.provider.get("CL=F")["supertrend_dir"], -1)
+
+        self.clock.now += 30
+        self.assertEqual(self.provider.refresh_due(), 0) # nothing due yet
+        self.clock.now += 301
+        self.assertIsNone(self.provider.get("^NSEI")) # past ttl: not served
+        self._write({"^NSEI": {"adx": 40.0}})
+        self.provider.refresh_due()
+        self.assertEqual(self.provider.get("^NSEI")["adx"], 40.0)
+        self.assertEqual(self.provider.get_stats()["stale"], 1)
+
+    def test_failing_symbol_backs_off(self):
+        source = MagicMock()
+        source.fetch.return_value = {}
+        provider = FallbackDataProvider(source=source, clock=self.clock, retry_delay=30, refresh_interval=60)
+        self.assertIsNone(provider.get("^BSESN"))
+        self.assertTrue(provider._wake.is_set())
+        provider._wake.clear()
+        self.assertIsNone(provider.get("^BSESN")) # already queued: no extra wake-up
+        self.assertFalse(provider._wake.is_set())
+
+        provider.refresh_due()
+        provider.refresh_due() # inside the backoff: not refetched at scan rate
+        self.assertEqual(source.fetch.call_count, 1)
+        self.assertEqual(provider._next_wait(), 30)
+
+        self.clock.now += 30
+        provider.refresh_due()
+        self.assertEqual(source.fetch.call_count, 2)
+        self.assertEqual(provider._next_wait(), 60) # second failure doubles the delay
+
+        source.fetch.return_value = {"adx": 20.0}
+        self.clock.now += 60
+        provider.refresh_due()
+        self.assertEqual(provider.get("^BSESN")["adx"], 20.0)
+        self.assertEqual(provider.get_stats()["backing_off"], 0)
+
+    def test_fact_calculator_uses_cached_proxy(self):
+        from orbiter.core.engine.rule.fact_calculator import FactCalculator
+        self.provider.refresh_due()
+        calc = FactCalculator.__new__(FactCalculator)
+        calc._fallback_data = self.provider
+        short = {'close': np.array([100.0, 101.0]), 'high': np.array([101.0, 102.0]), 'low': np.array([99.0, 100.0])}
+
+        facts = calc.calculate_technical_facts(short, token='NIFTY26MARFUT', instrument_exchange='NFO')
+        self.assertEqual(facts['data_source'], 'yf_fallback')
+        self.assertEqual(facts['index_adx'], 22.5)
+        self.assertEqual(facts['index.supertrend_dir'], 1)
+
+        facts = calc.calculate_technical_facts(short, token='SENSEX26MARFUT', instrument_exchange='BFO')
+        self.assertEqual(facts['data_source'], 'none') # SENSEX not cached yet: zeros, no fetch
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from backtest_lab.core.feature_store import BUCKETS, FeatureStore
+
+
+def minute_bars(days, seed=3, start=500.0, first=datetime(2026, 10, 12, 9, 15)):
+    """`days` sessions of 375 1-minute bars as a minute-CSV frame."""
+    rng = np.random.default_rng(seed)
+    rows, close = [], start
+    for d in range(days):
+        day = first + timedelta(days=d)
+        close *= 1 + rng.normal(0, 0.01)  # overnight gap
+        for i in range(375):
+            o = close
+            close = o * (1 + rng.normal(0, 0.001))
+            rows.append({'date': day + timedelta(minutes=i), 'open': o, 'high': max(o, close) * 1.0005,
+                         'low': min(o, close) * 0.9995, 'close': close, 'volume': int(rng.integers(1, 500))})
+    return pd.DataFrame(rows)
+
+
+def reference_day(day_df, prev_close):
+    """The per-day loop the research tools used to run."""
+    day_df = day_df.set_index('date')
+    d_high, d_low = day_df['high'].max(), day_df['low'].min()
+    orb = day_df.iloc[:15]
+    post = day_df.iloc[15:]
+    row = {
+        'gap_pct': (day_df.iloc[0]['open'] - prev_close) / prev_close * 100,
+        'range_pct': (d_high - d_low) / d_low * 100,
+        'orb15_high': orb['high'].max(),
+        'orb15_break_up': bool((post['high'] > orb['high'].max()).any()),
+        'orb15_break_down': bool((post['low'] < orb['low'].min()).any()),
+    }
+    for name, (lo, hi) in BUCKETS.items():
+        mask = (day_df.index.time >= lo) & (day_df.index.time < hi)
+        sub = day_df[mask]
+        row.update({f"{name}_open": sub.iloc[0]['open'], f"{name}_high": sub['high'].max(),
+                    f"{name}_low": sub['low'].min(), f"{name}_close": sub.iloc[-1]['close']})
+    return row
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.workdir, 'stocks')
+        self.store_dir = os.path.join(self.workdir, 'store')
+        os.makedirs(self.data_dir)
+        self.frames = {'AAA': minute_bars(4, seed=1), 'BBB': minute_bars(3, seed=2, start=80.0)}
+        for symbol, df in self.frames.items():
+            self.write(symbol, df)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def write(self, symbol, df):
+        path = os.path.join(self.data_dir, f"{symbol}_minute.csv")
+        df.to_csv(path, index=False)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # coarse mtimes on some filesystems
+
+    def store(self):
+        return FeatureStore(self.store_dir, self.data_dir, fmt='npz')
+
+    def test_features_match_per_day_loop(self):
+        self.assertEqual(self.store().build(workers=1), {'AAA': 4, 'BBB': 3})
+        table = self.store().load(symbols=['AAA'])
+        df = self.frames['AAA']
+        prev_close = np.nan
+        for (day, day_df), (_, row) in zip(df.groupby(df['date'].dt.date), table.iterrows()):
+            self.assertEqual(row['date'].date(), day)
+            for name, value in reference_day(day_df, prev_close).items():
+                if isinstance(value, bool):
+                    self.assertEqual(bool(row[name]), value, msg=f"{day} {name}")
+                elif not np.isnan(value):
+                    self.assertAlmostEqual(row[name], value, places=9, msg=f"{day} {name}")
+            prev_close = day_df.iloc[-1]['close']
+        self.assertTrue(np.isnan(table.iloc[0]['gap_pct']))
+        self.assertEqual(table['bars'].tolist(), [375] * 4)
+
+    def test_incremental_build_matches_full_rebuild(self):
+        self.store().build(workers=1)
+        self.assertEqual(self.store().build(workers=1), {})  # nothing changed
+
+        grown = minute_bars(6, seed=1)
+        self.write('AAA', grown)
+        self.assertEqual(self.store().build(workers=1), {'AAA': 6})
+        incremental = self.store().load()
+
+        self.store().build(workers=1, full=True)
+        full = self.store().load()
+        pd.testing.assert_frame_equal(incremental, full)
+        self.assertEqual(self.store().symbols(), ['AAA', 'BBB'])
+
+    def test_load_narrows_columns_and_dates(self):
+        self.store().build(workers=1)
+        days = self.store().load(columns=['range_pct', 'is_mover'], start='2026-10-13', end='2026-10-14')
+        self.assertEqual(list(days.columns), ['symbol', 'date', 'range_pct', 'is_mover'])
+        self.assertEqual(len(days), 4)
+        self.assertTrue((days['date'] >= pd.Timestamp('2026-10-13')).all())
+        self.assertTrue(days['date'].dt.time.eq(time(0, 0)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
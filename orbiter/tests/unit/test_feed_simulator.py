@@ -0,0 +1,101 @@
+import tempfile
+import threading
+import time
+import unittest
+
+import yaml
+from unittest.mock import patch
+
+from orbiter.core.broker import connection as connection_mod
+from orbiter.core.broker.feed_simulator import RandomWalkSource, RecordedSource, SimulatedFeedApi
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestFeedSimulator(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.lock = threading.Lock()
+
+    def _on_tick(self, msg):
+        with self.lock:
+            self.received.append(msg)
+
+    def _start(self, sim, keys=("NFO|1", "NFO|2"), on_close=None):
+        sim.start_websocket(subscribe_callback=self._on_tick,
+                            socket_open_callback=lambda: sim.subscribe(list(keys), feed_type='d'),
+                            socket_close_callback=on_close)
+
+    def test_messages_have_noren_shape_and_follow_rate(self):
+        sim = SimulatedFeedApi(RandomWalkSource({"NFO|1": 100.0, "NFO|2": 2500.0}), rate=2000)
+        self._start(sim)
+        time.sleep(0.3)
+        sim.close_websocket()
+
+        self.assertGreater(len(self.received), 200)
+        self.assertLess(len(self.received), 2000 * 0.3 * 2)
+        first = {m['tk']: m for m in reversed(self.received)}
+        self.assertEqual({m['t'] for m in first.values()}, {'dk'})
+        self.assertEqual(self.received[2]['t'], 'df')
+        msg = self.received[-1]
+        self.assertTrue({'t', 'e', 'tk', 'lp', 'h', 'l', 'v', 'ft', 'sim_ts'} <= set(msg))
+        self.assertLessEqual(float(msg['l']), float(msg['lp']))
+        self.assertGreaterEqual(float(msg['h']), float(msg['lp']))
+        self.assertFalse(sim.get_stats()['connected'])
+
+    def test_burst_and_injected_disconnect(self):
+        closed = threading.Event()
+        sim = SimulatedFeedApi(rate=10)
+        self._start(sim, on_close=closed.set)
+        sim.burst(500)
+        self.assertTrue(_wait_for(lambda: len(self.received) >= 500))
+
+        sim.inject_disconnect()
+        self.assertTrue(closed.wait(2.0))
+        count = len(self.received)
+        time.sleep(0.15)
+        self.assertEqual(len(self.received), count)
+        stats = sim.get_stats()
+        self.assertEqual((stats['disconnects'], stats['subscribed']), (1, 2))
+
+        # Reconnect: a new socket starts with no subscriptions until on_open re-subscribes
+        self._start(sim, keys=("NFO|3",))
+        sim.burst(10)
+        self.assertTrue(_wait_for(lambda: any(m['tk'] == '3' for m in self.received)))
+        sim.close_websocket()
+        self.assertEqual(sim.get_stats()['sessions'], 2)
+
+    def test_recorded_source_loops(self):
+        source = RecordedSource({"NSE|5": [1.0, 2.0]})
+        self.assertEqual([source.next_price("NSE|5") for _ in range(3)], [1.0, 2.0, 1.0])
+
+    def test_drives_connection_manager_and_reconnects(self):
+        sim = SimulatedFeedApi(rate=1000)
+        creds = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yml')
+        yaml.dump({'user': 'U', 'pwd': 'P', 'factor2': '', 'vc': 'V', 'apikey': 'K', 'imei': 'I'}, creds)
+        creds.flush()
+        ticks = []
+
+        with patch.object(connection_mod, 'ShoonyaApiPy', lambda: sim):
+            cm = connection_mod.ConnectionManager(config_path=creds.name)
+        cm.INITIAL_RECONNECT_DELAY = 0.05
+        cm.start_live_feed([{'token': '7', 'exchange': 'NFO'}], lambda msg, tk, ex: ticks.append((tk, ex)))
+        self.assertTrue(_wait_for(lambda: len(ticks) > 10))
+
+        sim.inject_disconnect()
+        self.assertTrue(_wait_for(lambda: sim.get_stats()['sessions'] == 2 and cm.socket_opened))
+        seen = len(ticks)
+        self.assertTrue(_wait_for(lambda: len(ticks) > seen))
+        cm.close()
+        self.assertEqual(ticks[-1], ('7', 'NFO'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+
+from orbiter.core.broker.fill_simulator import FillSimulator
+from orbiter.core.broker.order_manager import OrderManager
+from orbiter.core.broker.order_store import OrderStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMaster:
+    def __init__(self):
+        self.SYMBOL_TO_TOKEN = {'NIFTY26OCT25000CE': '101', 'NIFTY26OCT25000PE': '102'}
+        self.TOKEN_TO_LOTSIZE = {'101': 75, '102': 75}
+
+
+def tick(token, lp, v=None, **depth):
+    data = {'exchange': 'NFO', 'token': token, 'lp': str(lp), **depth}
+    if v is not None:
+        data['v'] = str(v)
+    return data
+
+
+class TestFillSimulator(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sim = FillSimulator(master=FakeMaster(), latency_ms=50, latency_jitter_ms=0,
+                                 participation=0.5, clock=self.clock)
+        self.store = OrderStore()
+        self.sim.register_order_callback(self.store.on_order_update)
+        self.sim.on_tick('CE', tick('101', 100.0, v=1000, bp1='99.5', sp1='100.5', bq1='600', sq1='600'))
+
+    def place(self, side, qty, price_type='MKT', price=0.0, tsym='NIFTY26OCT25000CE'):
+        return self.sim.place_order(side, 'M', 'NFO', tsym, qty, price_type=price_type, price=price)['norenordno']
+
+    def test_market_order_waits_for_latency_then_crosses_spread(self):
+        oid = self.place('B', 150)
+        self.assertEqual(self.sim.get_order(oid)['status'], 'PENDING')
+
+        self.clock.now += 0.01
+        self.sim.on_tick('CE', tick('101', 100.0, v=1100))
+        self.assertEqual(self.sim.get_order(oid)['status'], 'PENDING')
+
+        self.clock.now += 0.05
+        self.sim.on_tick('CE', tick('101', 100.2, v=1200, sp1='100.7'))
+        order = self.sim.get_order(oid)
+        self.assertEqual(order['status'], 'COMPLETE')
+        self.assertAlmostEqual(order['avgprc'], 100.7)
+
+        stats = self.sim.get_stats()
+        self.assertAlmostEqual(stats['fill_latency_ms_p50'], 60.0, places=1)
+        self.assertAlmostEqual(stats['slippage_bps_mean'], 70.0, places=2) # vs 100.0 mid at placement
+        self.assertEqual(self.store.get_position('101')['netqty'], 150)
+
+    def test_resting_limit_fills_only_through_price_in_lots(self):
+        oid = self.place('B', 225, price_type='LMT', price=99.0)
+        self.clock.now += 0.1
+        self.sim.on_tick('CE', tick('101', 99.0, v=1400))
+        self.assertEqual(self.sim.get_order(oid)['fillshares'], 0) # touching is not trading through
+
+        self.sim.on_tick('CE', tick('101', 98.9, v=1600)) # 200 traded x 0.5 → one lot
+        order = self.sim.get_order(oid)
+        self.assertEqual((order['status'], order['fillshares'], order['avgprc']), ('OPEN', 75, 99.0))
+
+        self.sim.on_tick('CE', tick('101', 98.8, v=1900)) # 150 more credit → two lots
+        order = self.sim.get_order(oid)
+        self.assertEqual((order['status'], order['fillshares']), ('COMPLETE', 225))
+        self.assertEqual(self.sim.get_stats()['partial_fills'], 1)
+
+    def test_rejections(self):
+        self.assertEqual(self.sim.place_order('B', 'M', 'NFO', 'NIFTY26OCT25000CE', 0)['stat'], 'Not_Ok')
+        banded = self.place('S', 75, price_type='LMT', price=150.0)
+        self.sim.reject_rate = 1.0
+        rms = self.place('B', 75)
+        self.clock.now += 0.1
+        self.sim.on_tick('CE', tick('101', 100.0, v=2000))
+        self.assertEqual(self.sim.get_order(banded)['status'], 'REJECTED')
+        self.assertEqual(self.sim.get_order(rms)['status'], 'REJECTED')
+        self.assertEqual(self.store.get_orders()[0]['status'], 'REJECTED')
+
+    def test_mark_to_market_and_realized_pnl(self):
+        self.place('B', 75)
+        self.clock.now += 0.1
+        self.sim.on_tick('CE', tick('101', 100.0, v=1100))
+        self.sim.on_tick('CE', tick('101', 104.0, v=1200, bp1='103.5', sp1='104.5'))
+        self.assertAlmostEqual(self.sim.get_total_pnl(), (104.0 - 100.5) * 75)
+
+        self.place('S', 75)
+        self.clock.now += 0.1
+        self.sim.on_tick('CE', tick('101', 104.0, v=1300))
+        pos = self.sim.get_positions()[0]
+        self.assertEqual(pos['netqty'], 0)
+        self.assertAlmostEqual(pos['rpnl'], (103.5 - 100.5) * 75)
+
+    def test_order_manager_status_follows_simulated_fills(self):
+        manager = OrderManager(paper_trade=True)
+        manager.fill_simulator = self.sim
+        resp = self.sim.place_order('B', 'M', 'NFO', 'NIFTY26OCT25000CE', 75)
+        manager.record_order({'ok': True, 'tsym': 'NIFTY26OCT25000CE', 'side': 'B', 'lot_size': 75, 'resp': resp})
+        self.assertEqual(manager.get_order_history()[0]['status'], 'PENDING')
+
+        self.clock.now += 0.1
+        self.sim.on_tick('CE', tick('101', 100.0, v=1100))
+        self.assertEqual(manager.get_order_history()[0]['status'], 'FILLED')
+
+    def test_book_seed_quote_is_fetched_outside_the_lock(self):
+        import threading
+        from unittest.mock import MagicMock
+        sim = FillSimulator(master=FakeMaster(), latency_ms=0, clock=self.clock)
+        held = []
+
+        def probe():
+            acquired = sim._lock.acquire(blocking=False)
+            if acquired:
+                sim._lock.release()
+            held.append(not acquired)
+
+        def get_quote(exchange, token=None):
+            # RLock is re-entrant, so probe it from another thread
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return {'lp': '100.0', 'bp1': '99.5', 'sp1': '100.5'}
+
+        sim.quote_cache = MagicMock()
+        sim.quote_cache.watch.return_value = 'NFO|101'
+        sim.quote_cache.get_quote.side_effect = get_quote
+        oid = sim.place_order('B', 'M', 'NFO', 'NIFTY26OCT25000CE', 75)['norenordno']
+        self.assertEqual(held, [False])
+        self.assertEqual(sim.get_order(oid)['status'], 'COMPLETE')
+        self.assertAlmostEqual(sim.get_order(oid)['avgprc'], 100.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+
+from orbiter.core.broker.gap_backfill import GapBackfill, bar_epoch, merge_candles
+
+T0 = 1_773_000_000 # bar boundary, epoch seconds
+BAR = 300
+
+
+def _bar(ts, close):
+    return {'stat': 'Ok', 'ssboe': str(ts), 'into': str(close), 'inth': str(close),
+            'intl': str(close), 'intc': str(close), 'v': '1'}
+
+
+class FakeAPI:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_time_price_series(self, exchange=None, token=None, starttime=None, endtime=None, interval=None):
+        with self._lock:
+            self.calls.append((exchange, token, starttime, endtime, interval))
+        # Broker returns newest first
+        bars = []
+        ts = int(starttime)
+        while ts < endtime:
+            bars.append(_bar(ts, 200))
+            ts += interval * 60
+        return bars[::-1]
+
+
+class FakeTickHandler:
+    def __init__(self):
+        self.api = FakeAPI()
+        self._priming_interval = 5
+        fresh = {'candles': [_bar(T0 - BAR, 99), _bar(T0 + 2 * BAR, 101)]}
+        stale = {'candles': [_bar(T0 - BAR, 50), _bar(T0, 51)]}
+        self.SYMBOLDICT = {
+            'NSE|1': fresh,
+            'NSE|2': stale,
+            'NSE|STALE': stale, # alias of NSE|2
+            'NSE|3': {'ltp': 5.0}, # never primed
+        }
+
+
+class TestGapBackfill(unittest.TestCase):
+    def test_merge_dedupes_and_orders(self):
+        merged = merge_candles([_bar(T0, 1), _bar(T0 + BAR, 2)], [_bar(T0 + 2 * BAR, 4), _bar(T0 + BAR, 3)])
+        self.assertEqual([c['intc'] for c in merged], ['1', '3', '4'])
+        self.assertEqual(bar_epoch({'time': '13-03-2026 09:15:00'}), 1773373500.0)
+
+    def test_outage_window_fetched_for_primed_symbols(self):
+        handler = FakeTickHandler()
+        backfill = GapBackfill(handler, max_rps=0)
+        down, up = T0 + BAR + 40, T0 + 3 * BAR + 20 # outage began inside the T0+BAR bar
+
+        self.assertEqual(sorted(backfill.find_gaps(down, up)), [('NSE|1', float(T0 + BAR)), ('NSE|2', float(T0 + BAR))])
+        result = backfill.run(down, up)
+
+        self.assertEqual(sorted(handler.api.calls), [('NSE', '1', float(T0 + BAR), up, 5), ('NSE', '2', float(T0 + BAR), up, 5)])
+        candles = handler.SYMBOLDICT['NSE|2']['candles']
+        self.assertEqual([int(c['ssboe']) for c in candles], [T0 - BAR, T0, T0 + BAR, T0 + 2 * BAR, T0 + 3 * BAR])
+        self.assertIs(handler.SYMBOLDICT['NSE|STALE']['candles'], candles)
+        self.assertEqual(result['bars'], 5) # NSE|1 already had T0+2*BAR
+
+    def test_short_outage_is_ignored(self):
+        handler = FakeTickHandler()
+        backfill = GapBackfill(handler, max_rps=0, min_gap_seconds=30)
+        self.assertEqual(backfill.find_gaps(T0, T0 + 20), [])
+        backfill.mark_disconnect()
+        self.assertFalse(backfill.on_reconnect())
+        self.assertEqual(handler.api.calls, [])
+
+    def test_reconnect_runs_in_background_once(self):
+        handler = FakeTickHandler()
+        backfill = GapBackfill(handler, max_rps=0)
+        self.assertFalse(backfill.on_reconnect()) # never disconnected
+
+        backfill.mark_disconnect(time.time() - 120)
+        self.assertTrue(backfill.on_reconnect())
+        self.assertTrue(backfill.wait(5))
+        self.assertFalse(backfill.running)
+        self.assertEqual(backfill.get_stats()['runs'], 1)
+        self.assertEqual(len(handler.api.calls), 2)
+        self.assertFalse(backfill.on_reconnect())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+from orbiter.utils.journal import StateJournal
+
+
+class TestStateJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _journal(self, **kwargs):
+        return StateJournal(self.path, fsync='never', append_only=('exit_history',), **kwargs)
+
+    def _journal_lines(self):
+        with open(self.path + ".journal") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_only_changes_are_appended(self):
+        journal = self._journal()
+        state = {'active_positions': {'NFO|1': {'qty': 50}}, 'exit_history': {}, 'realized_pnl': 0.0}
+        self.assertEqual(journal.save(state), 'snapshot')
+        self.assertEqual(journal.save(state), 'noop')
+
+        state['active_positions']['NFO|2'] = {'qty': 25}
+        state['active_positions']['NFO|1']['qty'] = 75
+        self.assertEqual(journal.save(state), 'journal')
+        self.assertEqual(sorted(r['k'] for r in self._journal_lines()), ['NFO|1', 'NFO|2'])
+
+        exit_rec = state['active_positions'].pop('NFO|2')
+        state['exit_history']['NFO|2'] = {'reason': 'TP', **exit_rec}
+        state['realized_pnl'] = 120.5
+        journal.save(state)
+        ops = [(r['op'], r['sec']) for r in self._journal_lines()[2:]]
+        self.assertEqual(sorted(ops), [('del', 'active_positions'), ('put', 'exit_history'), ('set', 'realized_pnl')])
+
+        recovered = self._journal().load()
+        self.assertEqual(recovered['active_positions'], {'NFO|1': {'qty': 75}})
+        self.assertEqual(recovered['exit_history']['NFO|2']['reason'], 'TP')
+        self.assertEqual(recovered['realized_pnl'], 120.5)
+
+    def test_unchanged_save_refreshes_timestamp(self):
+        clock = iter(range(100, 200))
+        journal = self._journal(stamp=lambda: next(clock), touch_interval=0)
+        state = {'active_positions': {'NFO|1': {'qty': 50}}, 'exit_history': {}}
+        journal.save(state)
+        self.assertEqual(journal.save(state), 'touch')
+        self.assertEqual(self._journal_lines()[-1]['op'], 'touch')
+
+        recovered = self._journal().load()
+        self.assertEqual(recovered['last_updated'], 101)
+        self.assertEqual(recovered['active_positions'], {'NFO|1': {'qty': 50}})
+
+        quiet = self._journal(touch_interval=3600)
+        quiet.save(state)
+        self.assertEqual(quiet.save(state), 'noop')
+
+    def test_compaction_bounds_replay(self):
+        journal = self._journal(compact_every=5)
+        state = {'active_positions': {}, 'exit_history': {}}
+        journal.save(state)
+        for i in range(12):
+            state['exit_history'][f'NFO|{i}'] = {'pnl': i}
+            journal.save(state)
+
+        self.assertLess(len(self._journal_lines()), 5)
+        reloaded = self._journal(compact_every=5)
+        self.assertEqual(len(reloaded.load()['exit_history']), 12)
+        # Reloaded journal continues the sequence instead of re-snapshotting
+        state['exit_history']['NFO|99'] = {'pnl': 99}
+        self.assertEqual(reloaded.save(state), 'journal')
+
+    def test_torn_tail_is_ignored(self):
+        journal = self._journal()
+        state = {'active_positions': {'NFO|1': {'qty': 1}}}
+        journal.save(state)
+        state['active_positions']['NFO|1'] = {'qty': 2}
+        journal.save(state)
+        with open(self.path + ".journal", 'a') as f:
+            f.write('{"op":"put","sec":"active_positions","k":"NFO|1","v":{"qty"')
+
+        self.assertEqual(self._journal().load()['active_positions']['NFO|1']['qty'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import shutil
+import tempfile
+import unittest
+
+from orbiter.core.broker.broker_executor import BrokerOrderExecutor
+from orbiter.core.broker.fill_simulator import FillSimulator
+from orbiter.core.broker.limit_chaser import LimitChaser
+from orbiter.core.broker.multi_leg import MultiLegDispatcher
+
+TSYM = 'NIFTY26OCT25000CE'
+
+
+class FakeQuotes:
+    """QuoteCache stand-in: websocket-fed book, counts lookups."""
+
+    def __init__(self, quote):
+        self.quote = quote
+        self.reads = 0
+
+    def watch(self, exchange, token=None, tsym=None):
+        return f"{exchange}|101"
+
+    def get_quote(self, exchange=None, token=None, tsym=None, max_age=None):
+        self.reads += 1
+        return dict(self.quote)
+
+
+class RecordingSim(FillSimulator):
+    def __init__(self, **kwargs):
+        super().__init__(latency_ms=0, latency_jitter_ms=0, **kwargs)
+        self.modifies = []
+
+    def modify_order(self, orderno, **kwargs):
+        self.modifies.append(kwargs.get('newprice'))
+        return super().modify_order(orderno, **kwargs)
+
+
+def book_tick(lp=100.0, bid=99.0, ask=101.0):
+    return {'exchange': 'NFO', 'token': '101', 'lp': str(lp), 'bp1': str(bid), 'sp1': str(ask),
+            'bq1': '1000', 'sq1': '1000'}
+
+
+class TestLimitChaser(unittest.TestCase):
+    def setUp(self):
+        self.quotes = FakeQuotes({'lp': '100', 'bp1': '99', 'sp1': '101'})
+        self.sim = RecordingSim(quote_cache=self.quotes)
+        self.sim.on_tick(TSYM, book_tick())
+
+    def order(self, side='B', qty=75):
+        return dict(buy_or_sell=side, product_type='M', exchange='NFO', tradingsymbol=TSYM, quantity=qty,
+                    discloseqty=0, price_type='LMT', price=0, trigger_price=None, retention='DAY', remarks='t')
+
+    def test_starts_at_mid_and_reprices_to_fill(self):
+        chaser = LimitChaser(self.sim, self.quotes, max_chase_pct=2.0, sleep=lambda s: None)
+        res = chaser.execute(self.order(), token='101')
+
+        self.assertEqual(res['status'], 'COMPLETE')
+        self.assertEqual(self.sim.get_order(res['order_id'])['prc'], 101.0)
+        self.assertEqual(self.sim.modifies, [100.5, 101.0]) # placed at mid 100.0
+        self.assertEqual((res['filled_qty'], res['avg_price'], res['reprices']), (75, 101.0, 2))
+        self.assertEqual(res['cost_bps'], 100.0)
+        self.assertEqual(chaser.get_stats()['filled'], 1)
+
+    def test_sell_side_prices_down_from_the_ask(self):
+        chaser = LimitChaser(self.sim, self.quotes, aggression=0.0, aggression_step=0.5, sleep=lambda s: None)
+        res = chaser.execute(self.order(side='S'), token='101')
+        self.assertEqual(self.sim.modifies, [100.0, 99.0])
+        self.assertEqual((res['status'], res['avg_price'], res['cost_bps']), ('COMPLETE', 99.0, 100.0))
+
+    def test_chase_cap_then_cancel(self):
+        chaser = LimitChaser(self.sim, self.quotes, max_chase_pct=0.25, max_reprices=3, sleep=lambda s: None)
+        res = chaser.execute(self.order(), token='101')
+
+        self.assertFalse(res['ok'])
+        self.assertEqual((res['status'], res['reason'], res['filled_qty']), ('CANCELED', 'chase_limit_reached', 0))
+        self.assertTrue(all(p <= 100.25 for p in self.sim.modifies))
+
+    def test_requotes_from_live_depth(self):
+        def market_moves(seconds):
+            self.quotes.quote = {'lp': '102', 'bp1': '101.5', 'sp1': '102.5'}
+            self.sim.on_tick(TSYM, book_tick(102.0, 101.5, 102.5))
+
+        chaser = LimitChaser(self.sim, self.quotes, aggression_step=0.5, max_chase_pct=5.0, sleep=market_moves)
+        res = chaser.execute(self.order(), token='101')
+        self.assertEqual(res['status'], 'COMPLETE')
+        self.assertEqual(res['avg_price'], 102.5)
+        self.assertEqual(res['arrival_price'], 100.0)
+        self.assertEqual(res['cost_bps'], 250.0)
+
+    def test_partial_fill_is_not_ok_and_unwinds(self):
+        class Api:
+            """Order rests with 25 of 75 filled until it is cancelled."""
+            def __init__(self):
+                self.placed, self.cancelled = [], []
+
+            def place_order(self, **kwargs):
+                self.placed.append(kwargs)
+                return {'stat': 'Ok', 'norenordno': str(len(self.placed))}
+
+            def single_order_history(self, orderno):
+                status = 'CANCELED' if orderno in self.cancelled else 'OPEN'
+                return [{'status': status, 'fillshares': '25', 'avgprc': '100.0'}]
+
+            def cancel_order(self, orderno):
+                self.cancelled.append(orderno)
+                return {'stat': 'Ok'}
+
+        api = Api()
+        chaser = LimitChaser(api, self.quotes, max_reprices=0, on_exhausted='leave', sleep=lambda s: None)
+        order = self.order()
+        res = chaser.execute(order, token='101')
+        self.assertFalse(res['ok'])
+        self.assertEqual((res['status'], res['filled_qty']), ('OPEN', 25))
+
+        chaser.unwind(order, res)
+        self.assertEqual(api.cancelled, ['1'])
+        self.assertEqual((res['status'], res['unwound_qty']), ('CANCELED', 25))
+        self.assertEqual({k: api.placed[1][k] for k in ('buy_or_sell', 'quantity', 'price_type')},
+                         {'buy_or_sell': 'S', 'quantity': 25, 'price_type': 'MKT'})
+
+
+class TestChasedLegs(unittest.TestCase):
+    def test_failed_leg_with_partial_fill_is_reversed(self):
+        class Api:
+            def __init__(self):
+                self.orders = []
+
+            def place_order(self, **kwargs):
+                self.orders.append(kwargs)
+                return {'stat': 'Ok', 'norenordno': str(len(self.orders))}
+
+        api = Api()
+        hedge = {'name': 'hedge', 'order': {'buy_or_sell': 'B', 'quantity': 150, 'tradingsymbol': 'H'}}
+        atm = {'name': 'atm', 'order': {'buy_or_sell': 'S', 'quantity': 150, 'tradingsymbol': 'A'}}
+        responses = {'hedge': {'stat': 'Ok', 'norenordno': 'h1', 'filled': True},
+                     'atm': {'stat': 'Not_Ok', 'emsg': 'chase_limit_reached', 'norenordno': 'a1', 'filled_qty': 75}}
+        dispatcher = MultiLegDispatcher(api, place_fn=lambda leg: responses[leg['name']])
+
+        res = dispatcher.execute([[hedge], [atm]], gate='ack')
+        self.assertFalse(res['ok'])
+        reversed_qty = {a['name']: a['qty'] for a in res['rolled_back'] if a['action'] == 'reverse'}
+        self.assertEqual(reversed_qty, {'atm': 75, 'hedge': 150})
+
+    def test_broker_executor_chases_lmt_option_orders(self):
+        workdir = tempfile.mkdtemp()
+        try:
+            quotes = FakeQuotes({'lp': '100', 'bp1': '99', 'sp1': '101'})
+            sim = RecordingSim(quote_cache=quotes) # no REST api behind it: get_quotes would raise
+            sim.on_tick(TSYM, book_tick())
+            policy = {'limit_chase': {'enabled': True, 'max_chase_pct': 2.0, 'reprice_interval_ms': 0}}
+            executor = BrokerOrderExecutor(sim, execution_policy=policy, project_root=workdir,
+                                           segment_name='nfo', quote_cache=quotes)
+
+            res = executor.place_option_order({'tsym': TSYM, 'lot_size': 75, 'exchange': 'NFO', 'token': '101'},
+                                              'B', True, 'M', 'LMT')
+            self.assertTrue(res['ok'])
+            self.assertEqual(res['chase']['status'], 'COMPLETE')
+            self.assertIs(executor._options_executor.dispatcher.place_fn.__self__, executor.chaser)
+        finally:
+            shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from orbiter.utils.log_tail import LogScanner, LogTailer, PatternMatcher, RollingCounter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLogTail(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, "orbiter_n1.log")
+        self.state = self.log + ".monitor.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _append(self, text):
+        with open(self.log, "a") as f:
+            f.write(text)
+
+    def test_reads_only_new_complete_lines(self):
+        self._append("old line 1\nold line 2\n")
+        tailer = LogTailer(self.log, state_path=self.state)
+        self.assertEqual(tailer.read_lines(), ["old line 1", "old line 2"])
+
+        self._append("new line\npartial")
+        self.assertEqual(tailer.read_lines(), ["new line"])
+        self._append(" done\n")
+        tailer.save_state()
+
+        # A fresh tailer resumes from the persisted offset
+        resumed = LogTailer(self.log, state_path=self.state)
+        self.assertEqual(resumed.read_lines(), ["partial done"])
+        self.assertEqual(resumed.read_lines(), [])
+
+    def test_first_read_starts_near_the_end(self):
+        self._append("".join(f"line {i}\n" for i in range(1000)))
+        tailer = LogTailer(self.log, initial_bytes=30)
+        lines = tailer.read_lines()
+        self.assertEqual(lines[-1], "line 999")
+        self.assertTrue(all(line.startswith("line ") for line in lines))
+        self.assertLess(tailer.bytes_read, 31)
+
+    def test_rotation_restarts_from_top(self):
+        self._append("a\nb\nc\n")
+        tailer = LogTailer(self.log)
+        tailer.read_lines()
+        os.rename(self.log, self.log + ".1")
+        self._append("fresh\n")
+        self.assertEqual(tailer.read_lines(), ["fresh"])
+        self.assertEqual(tailer.rotations, 1)
+
+    def test_one_pass_matching_keeps_every_type(self):
+        matcher = PatternMatcher({"scoring": r"Scoring Error", "exception": r"Exception|Traceback|Error:",
+                                  "crash": r"💥 App Crash"})
+        text = "ok\nScoring Error: bad input\nquiet\n💥 App Crash\nall good\n"
+        self.assertEqual(matcher.match_text(text),
+                         [("Scoring Error: bad input", ["scoring", "exception"]), ("💥 App Crash", ["crash"])])
+
+    def test_rolling_counts_survive_restart(self):
+        clock = FakeClock()
+        self._append("Traceback (most recent call last)\n")
+        scanner = LogScanner(self.log, {"exception": r"Traceback"}, state_path=self.state, clock=clock)
+        self.assertEqual(len(scanner.scan()), 1)
+
+        clock.now += 600
+        self._append("Traceback again\n")
+        scanner = LogScanner(self.log, {"exception": r"Traceback"}, state_path=self.state, clock=clock)
+        self.assertEqual(len(scanner.scan()), 1) # first line not re-read
+        self.assertEqual(scanner.counter.counts()["exception"], {"5m": 1, "60m": 2, "total": 2})
+
+        counter = RollingCounter((60,), clock=clock)
+        counter.add("x", clock.now - 120)
+        self.assertEqual(counter.counts()["x"]["1m"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+
+from orbiter.core.broker.multi_leg import MultiLegDispatcher
+from orbiter.core.broker.order_store import OrderStore
+
+
+class FakeApi:
+    """Acks every order after `delay`; tradingsymbols in `reject` fail."""
+
+    def __init__(self, delay=0.0, reject=()):
+        self.delay = delay
+        self.reject = set(reject)
+        self.orders = []
+        self.cancels = []
+        self._lock = threading.Lock()
+
+    def place_order(self, **kwargs):
+        time.sleep(self.delay)
+        with self._lock:
+            self.orders.append(kwargs)
+            oid = str(len(self.orders))
+        if kwargs['tradingsymbol'] in self.reject:
+            return {'stat': 'Not_Ok', 'emsg': 'RMS: margin'}
+        return {'stat': 'Ok', 'norenordno': oid}
+
+    def cancel_order(self, orderno=None):
+        self.cancels.append(orderno)
+        return {'stat': 'Ok'}
+
+
+def _leg(name, side, tsym, qty=50):
+    return {'name': name, 'order': dict(buy_or_sell=side, product_type='M', exchange='NFO', tradingsymbol=tsym,
+                                        quantity=qty, discloseqty=0, price_type='LMT', price=10.0,
+                                        trigger_price=None, retention='DAY', remarks=name)}
+
+
+class TestMultiLegDispatcher(unittest.TestCase):
+    def test_phase_legs_are_sent_concurrently(self):
+        api = FakeApi(delay=0.2)
+        dispatcher = MultiLegDispatcher(api, max_workers=4)
+        started = time.monotonic()
+        res = dispatcher.execute([[_leg('w1', 'B', 'CE1'), _leg('w2', 'B', 'PE1')],
+                                  [_leg('s1', 'S', 'CE0'), _leg('s2', 'S', 'PE0')]], gate='ack')
+        elapsed = time.monotonic() - started
+
+        self.assertTrue(res['ok'])
+        self.assertLess(elapsed, 0.6) # two round-trips, not four
+        self.assertEqual([o['buy_or_sell'] for o in api.orders], ['B', 'B', 'S', 'S'])
+        self.assertTrue(all(leg['ack_ms'] >= 150 for leg in res['legs']))
+        self.assertEqual(dispatcher.get_stats()['legs'], 4)
+
+    def test_next_phase_waits_for_fills(self):
+        api = FakeApi()
+        store = OrderStore()
+        dispatcher = MultiLegDispatcher(api, order_store=store)
+        fill = {'norenordno': '1', 'token': 'W', 'trantype': 'B', 'status': 'COMPLETE', 'qty': '50', 'fillshares': '50'}
+        threading.Timer(0.1, store.on_order_update, args=(fill,)).start()
+
+        res = dispatcher.execute([[_leg('wing', 'B', 'CE1')], [_leg('short', 'S', 'CE0')]], gate='fill',
+                                 timeout=0.5)
+        self.assertFalse(res['ok']) # second phase never fills
+        self.assertEqual(res['failed_phase'], 2)
+        self.assertGreaterEqual(res['legs'][0]['fill_ms'], 50)
+
+        # Rollback: the working short is cancelled, the filled wing reversed
+        self.assertEqual(api.cancels, ['2'])
+        reverse = api.orders[-1]
+        self.assertEqual((reverse['buy_or_sell'], reverse['tradingsymbol'], reverse['price_type']), ('S', 'CE1', 'MKT'))
+        self.assertEqual([a['action'] for a in res['rolled_back']], ['cancel', 'reverse'])
+
+    def test_rejected_leg_rolls_back_acked_legs(self):
+        api = FakeApi(reject={'PE1'})
+        api.cancel_order = lambda orderno=None: {'stat': 'Not_Ok', 'emsg': 'already complete'}
+        res = MultiLegDispatcher(api).execute([[_leg('w1', 'B', 'CE1'), _leg('w2', 'B', 'PE1')],
+                                               [_leg('s1', 'S', 'CE0')]], gate='ack')
+
+        self.assertFalse(res['ok'])
+        self.assertEqual(res['failed_phase'], 1)
+        self.assertIn('RMS: margin', res['reason'])
+        # Phase 2 never sent; CE1 could not be cancelled so it is reversed
+        self.assertNotIn('CE0', [o['tradingsymbol'] for o in api.orders])
+        self.assertEqual(api.orders[-1]['tradingsymbol'], 'CE1')
+        self.assertEqual(api.orders[-1]['buy_or_sell'], 'S')
+
+
+if __name__ == '__main__':
+    unittest.main()
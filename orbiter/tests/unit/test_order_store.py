@@ -0,0 +1,62 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from orbiter.core.broker.order_store import OrderStore
+
+
+def _update(oid, status, token='101', side='B', qty=50, filled=0, price=10.0):
+    return {'norenordno': oid, 'token': token, 'tsym': f'SYM{token}', 'exch': 'NFO', 'trantype': side,
+            'status': status, 'qty': str(qty), 'fillshares': str(filled), 'flprc': str(price)}
+
+
+class TestOrderStore(unittest.TestCase):
+    def setUp(self):
+        self.store = OrderStore()
+
+    def test_status_index_moves_with_updates(self):
+        self.store.on_order_update(_update('1', 'PENDING'))
+        self.assertTrue(self.store.has_order('101', 'BUY'))
+        self.assertFalse(self.store.has_order('101', 'SELL'))
+        self.assertEqual(len(self.store.open_orders('101')), 1)
+
+        self.store.on_order_update({'norenordno': '1', 'status': 'REJECTED'})
+        self.assertFalse(self.store.has_order('101', 'B'))
+        self.assertEqual(self.store.open_orders(), [])
+        self.assertEqual(self.store.get_order('1')['tsym'], 'SYM101')
+
+    def test_partial_fills_build_net_position(self):
+        self.store.on_order_update(_update('1', 'OPEN', filled=20, price=10.0))
+        self.store.on_order_update(_update('1', 'COMPLETE', filled=50, price=13.0))
+        self.store.on_order_update(_update('1', 'COMPLETE', filled=50, price=13.0)) # duplicate event
+        pos = self.store.get_position('101')
+        self.assertEqual(pos['netqty'], 50)
+        self.assertAlmostEqual(pos['avgprc'], (10.0 * 20 + 13.0 * 30) / 50)
+
+        self.store.on_order_update(_update('2', 'COMPLETE', side='S', filled=50, price=15.0))
+        self.assertEqual(self.store.get_positions(), [])
+
+    def test_wait_for_fill(self):
+        self.store.on_order_update(_update('9', 'OPEN'))
+        self.assertIsNone(self.store.wait_for_fill('9', timeout=0.01))
+
+        timer = threading.Timer(0.05, self.store.on_order_update, args=(_update('9', 'COMPLETE', filled=50),))
+        timer.start()
+        order = self.store.wait_for_fill('9', timeout=2)
+        self.assertEqual(order['status'], 'COMPLETE')
+
+    def test_reconcile_uses_rest_as_truth(self):
+        api = MagicMock()
+        api.get_order_book.return_value = [_update('5', 'COMPLETE', token='202', side='S', filled=25)]
+        api.get_positions.return_value = [{'exch': 'NFO', 'token': '202', 'tsym': 'X', 'netqty': '-25', 'avgprc': '99.5'}]
+        store = OrderStore(api)
+
+        self.assertTrue(store.refresh(max_age=60))
+        self.assertTrue(store.refresh(max_age=60))
+        self.assertEqual(api.get_order_book.call_count, 1)
+        self.assertTrue(store.has_order('202', 'SELL'))
+        self.assertEqual(store.get_positions()[0]['netqty'], '-25')
+
+
+if __name__ == '__main__':
+    unittest.main()
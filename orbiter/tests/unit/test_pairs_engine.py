@@ -0,0 +1,212 @@
+import math
+import unittest
+
+import numpy as np
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.core.engine.runtime.exit_monitor import ExitState, position_legs
+from orbiter.core.engine.runtime.pairs_engine import PairsEngine
+from orbiter.utils.pairs import PairState, pair_series
+
+
+def cointegrated(n=400, beta=1.5, phi=0.8, seed=3):
+    """Leg B a random walk, leg A = 1000 + beta * B + AR(1) noise with coefficient phi."""
+    rng = np.random.default_rng(seed)
+    b = 6000 + np.cumsum(rng.normal(0, 5, n))
+    noise = np.zeros(n)
+    for i in range(1, n):
+        noise[i] = phi * noise[i - 1] + rng.normal(0, 4)
+    return 1000 + beta * b + noise, b
+
+
+class FakeMaster:
+    TOKEN_TO_LOTSIZE = {}
+    TOKEN_TO_SYMBOL = {'1': 'GOLDM05DEC25', '2': 'SILVERM28NOV25'}
+
+
+class FakeClient:
+    master = FakeMaster()
+
+
+class FakeState:
+    def __init__(self):
+        self.client = FakeClient()
+        self.config = {'paper_trade': True}
+        self.active_positions = {}
+        self.symbols = [{'symbol': 'GOLDM', 'token': '1', 'exchange': 'MCX', 'lot_size': 10},
+                        {'symbol': 'SILVERM', 'token': '2', 'exchange': 'MCX', 'lot_size': 5}]
+
+
+CONFIG = {'window': 60, 'min_bars': 20, 'bar_seconds': 60, 'entry_z': 2.0, 'exit_z': 0.5,
+          'pairs': [{'name': 'GOLDM_SILVERM', 'a': 'GOLDM', 'b': 'SILVERM'}]}
+
+
+class _FixedZ(PairState):
+    """PairState pinned to a z-score, for exit and sizing checks."""
+
+    def __init__(self, zscore, hedge_ratio=1.5):
+        super().__init__()
+        self._z, self._hr = zscore, hedge_ratio
+        self.zscore, self.hedge_ratio = zscore, hedge_ratio
+
+    def update(self, a, b):
+        self.zscore, self.hedge_ratio = self._z, self._hr
+        return self._z
+
+
+def tick(token, ltp, ts):
+    return {'exchange': 'MCX', 'token': token, 'lp': str(ltp), 'ft': str(ts)}
+
+
+class TestPairKernel(unittest.TestCase):
+    def test_incremental_matches_vectorized(self):
+        a, b = cointegrated()
+        series = pair_series(a, b, window=60, min_bars=20)
+        st = PairState(window=60, min_bars=20)
+        for i in range(len(a)):
+            st.update(a[i], b[i])
+            for name in ('zscore', 'hedge_ratio', 'half_life'):
+                value, expected = getattr(st, name), series[name][i]
+                if value is None:
+                    self.assertTrue(np.isnan(expected), (i, name))
+                elif math.isinf(value):
+                    self.assertTrue(np.isinf(expected))
+                else:
+                    self.assertAlmostEqual(value, expected, places=6)
+        self.assertTrue(np.isnan(series['zscore'][18]))
+        self.assertFalse(np.isnan(series['zscore'][19]))
+
+    def test_recovers_hedge_ratio_and_mean_reversion(self):
+        a, b = cointegrated(n=2000, beta=1.5, phi=0.8)
+        st = PairState(window=500, min_bars=50)
+        for x, y in zip(a, b):
+            st.update(x, y)
+        self.assertAlmostEqual(st.hedge_ratio, 1.5, delta=0.1)
+        self.assertTrue(1.0 < st.half_life < 8.0)  # true -ln2/ln(0.8) ≈ 3.1 bars
+        self.assertTrue(st.facts()['pair.ready'])
+
+
+class TestPairsEngine(unittest.TestCase):
+    def setUp(self):
+        self.state = FakeState()
+        self.exits = []
+
+        def square_off(key, reason):
+            self.exits.append((key, reason))
+            self.state.active_positions.pop(key, None)
+
+        self.engine = PairsEngine(self.state, CONFIG, square_off=square_off)
+        self.a, self.b = cointegrated()
+        self.ts = 1_700_000_000
+
+    def feed(self, bars):
+        for a, b in bars:
+            self.engine.on_tick('A', tick('1', a, self.ts))
+            self.engine.on_tick('B', tick('2', b, self.ts + 1))
+            self.ts += 60
+
+    def test_ticks_build_bars_and_expose_facts(self):
+        self.feed(zip(self.a[:100], self.b[:100]))
+        pair = self.engine.pairs['GOLDM_SILVERM']
+        self.assertEqual(pair.state.count, 99)  # the last bar closes with the next bucket's first tick
+
+        expected = pair_series(self.a[:99], self.b[:99])
+        self.assertAlmostEqual(pair.state.zscore, expected['zscore'][-1], places=6)
+        facts = self.engine.facts_for('MCX|2')
+        self.assertEqual((facts['pair.name'], facts['pair.leg']), ('GOLDM_SILVERM', 'b'))
+        self.assertAlmostEqual(facts['pair.zscore'], round(expected['zscore'][-1], 4))
+        self.assertIn('pair.GOLDM_SILVERM.half_life', self.engine.get_facts())
+        self.assertEqual(self.engine.facts_for('MCX|99'), {})
+
+    def test_seed_from_primed_candles(self):
+        symboldict = {
+            'MCX|1': {'candles': [{'time': str(i), 'intc': str(v)} for i, v in enumerate(self.a[:50])]},
+            'MCX|2': {'candles': [{'time': str(i), 'intc': str(v)} for i, v in enumerate(self.b[:50])]},
+        }
+        self.engine.seed(symboldict)
+        self.assertEqual(self.engine.pairs['GOLDM_SILVERM'].state.count, 50)
+
+    def test_linked_position_and_shared_exits(self):
+        self.feed(zip(self.a[:80], self.b[:80]))
+        pair = self.engine.pairs['GOLDM_SILVERM']
+        res = self.engine.open_pair('GOLDM_SILVERM', side='S')
+        self.assertTrue(res['ok'])
+
+        position = self.state.active_positions['PAIR|GOLDM_SILVERM']
+        legs = position_legs('PAIR|GOLDM_SILVERM', position)
+        lots_b = max(1, round(pair.state.hedge_ratio * 10 / 5))
+        self.assertEqual([(l['key'], l['sign'], l['qty']) for l in legs],
+                         [('MCX|1', -1, 10), ('MCX|2', 1, lots_b * 5)])
+        self.assertEqual(self.engine.open_pair('GOLDM_SILVERM', side='S')['reason'], 'already_in_positions')
+
+        # ExitMonitor sees one position: PnL of both legs together from their entry prices
+        exit_state = ExitState('PAIR|GOLDM_SILVERM', legs, position)
+        exit_state.on_price('MCX|1', pair.prices[0] - 2.0)
+        exit_state.on_price('MCX|2', pair.prices[1] + 1.0)
+        self.assertAlmostEqual(exit_state.pnl, 2.0 * 10 + 1.0 * lots_b * 5)
+
+        # A short spread exits once the z-score is back inside exit_z
+        position['side'] = 'S'
+        self.engine.pairs['GOLDM_SILVERM'].state = _FixedZ(0.2)
+        self.feed([(self.a[80], self.b[80]), (self.a[81], self.b[81])])
+        self.assertEqual(self.exits[0][0], 'PAIR|GOLDM_SILVERM')
+        self.assertIn('reverted', self.exits[0][1])
+
+    def test_failed_square_off_is_retried_on_next_bar(self):
+        attempts = []
+
+        def flaky_square_off(key, reason):
+            attempts.append(key)
+            if len(attempts) == 1:
+                raise RuntimeError("leg rejected")
+            self.state.active_positions.pop(key, None)
+
+        self.engine.square_off = flaky_square_off
+        self.state.active_positions['PAIR|GOLDM_SILVERM'] = {'side': 'S', 'entry_zscore': 2.5}
+        self.engine.pairs['GOLDM_SILVERM'].state = _FixedZ(0.2)
+        self.feed([(self.a[0], self.b[0]), (self.a[1], self.b[1])])
+        self.assertEqual(len(attempts), 1)
+        self.assertNotIn('exiting', self.state.active_positions['PAIR|GOLDM_SILVERM'])
+
+        self.feed([(self.a[2], self.b[2])])
+        self.assertEqual(len(attempts), 2)
+        self.assertNotIn('PAIR|GOLDM_SILVERM', self.state.active_positions)
+
+    def test_auto_side_respects_entry_band_and_live_dispatch(self):
+        self.feed(zip(self.a[:80], self.b[:80]))
+        self.engine.pairs['GOLDM_SILVERM'].state = _FixedZ(-2.5, hedge_ratio=1.5)
+        phases = []
+
+        class Dispatcher:
+            def execute(self, structure, gate):
+                phases.extend(structure)
+                return {'ok': True, 'legs': []}
+
+        self.engine.dispatcher = Dispatcher()
+        res = self.engine.open_pair('GOLDM_SILVERM', execute=True)
+        self.assertTrue(res['ok'])
+        self.assertEqual(len(phases), 1)  # both legs in one phase
+        orders = [leg['order'] for leg in phases[0]]
+        self.assertEqual([(o['buy_or_sell'], o['tradingsymbol'], o['quantity']) for o in orders],
+                         [('B', 'GOLDM05DEC25', 10), ('S', 'SILVERM28NOV25', 5 * 3)])
+        self.assertFalse(self.state.active_positions['PAIR|GOLDM_SILVERM']['paper'])
+
+        self.state.active_positions.clear()
+        self.engine.pairs['GOLDM_SILVERM'].state = _FixedZ(1.0, hedge_ratio=1.5)
+        self.assertIn('inside entry band', self.engine.open_pair('GOLDM_SILVERM')['reason'])
+
+    def test_default_dispatcher_uses_broker_client(self):
+        from unittest.mock import MagicMock
+        self.state.client = client = MagicMock()
+        client.conn.api.place_order.return_value = {'stat': 'Ok', 'norenordno': '7'}
+        client.orders.wait_for_fill.return_value = {'status': 'COMPLETE'}
+        legs = [{'symbol': 'GOLDM', 'tsym': 'GOLDM05DEC25', 'exchange': 'MCX', 'qty': 10, 'sign': 1}]
+        self.engine.dispatcher = None
+        self.engine._place(legs, paper=False, remark='PAIR')
+        self.assertIs(self.engine.dispatcher.api, client.conn.api)
+        self.assertIs(self.engine.dispatcher.order_store, client.orders)
+        client.conn.api.place_order.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
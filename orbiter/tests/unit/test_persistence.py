@@ -63,6 +63,26 @@ class TestPersistence(unittest.TestCase):
         self.assertEqual(len(new_state.active_positions), 1)
         self.assertEqual(new_state.active_positions["TOKEN1"]["symbol"], "TEST1")
 
+    def test_incremental_saves_replay_on_load(self):
+        """Saves after the first snapshot append changes to the journal; load replays them"""
+        self.state.active_positions = {"T1": {"symbol": "A"}, "T2": {"symbol": "B"}}
+        self.state.save_session()
+        self.state.active_positions.pop("T1")
+        self.state.exit_history["T1"] = {"reason": "SL"}
+        self.state.trade_count = 3
+        self.state.save_session()
+
+        with open(self.test_file, 'r') as f:
+            self.assertIn("T1", json.load(f)["active_positions"]) # snapshot untouched
+        self.assertTrue(os.path.getsize(self.test_file + ".journal") > 0)
+
+        new_state = StateManager(self.client, self.symbols, self.config)
+        new_state.state_file = self.test_file
+        new_state.load_session()
+        self.assertEqual(list(new_state.active_positions), ["T2"])
+        self.assertEqual(new_state.exit_history["T1"]["reason"], "SL")
+        self.assertEqual(new_state.trade_count, 3)
+
     def test_serialization_sanitization(self):
         """CRITICAL: Test that non-serializable objects are stripped and don't crash the bot"""
         class UnserializableLoader:
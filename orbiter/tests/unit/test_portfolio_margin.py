@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import date
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.utils.margin.margin_calculator import MarginCalculator
+from orbiter.utils.margin.portfolio_margin import MarginReconciliation, PortfolioMarginEngine, RiskParameters
+
+TODAY = date(2026, 10, 19)
+EXPIRY = '2026-10-27'
+PARAMS = {
+    "date": "2026-10-19",
+    "defaults": {"price_scan_pct": 0.10, "volatility": 0.30},
+    "underlyings": {"NIFTY": {"price_scan_pct": 0.06, "volatility": 0.14,
+                              "short_option_min_pct": 0.005, "exposure_pct": 0.02}},
+}
+
+
+def leg(strike, option_type, qty, spot=25000.0, underlying='NIFTY'):
+    return {'underlying': underlying, 'spot': spot, 'strike': strike, 'expiry': EXPIRY,
+            'option_type': option_type, 'qty': qty}
+
+
+class FakeApi:
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def span_calculator(self, actid, positionlist):
+        self.calls += 1
+        return self.response
+
+
+class FakeMaster:
+    def __init__(self, rows):
+        self.DERIVATIVE_OPTIONS = rows
+
+
+class TestPortfolioMarginEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = PortfolioMarginEngine(RiskParameters(PARAMS), today=TODAY)
+
+    def test_hedge_offsets_naked_short(self):
+        naked = self.engine.margin([leg(25000, 'PE', -75)])
+        spread = self.engine.margin([leg(24800, 'PE', 75), leg(25000, 'PE', -75)])
+        self.assertTrue(spread['ok'])
+        self.assertLess(spread['total_margin'], naked['total_margin'])
+        # A defined-risk spread never needs more SPAN than its width
+        self.assertLessEqual(spread['span'], 200 * 75)
+
+    def test_incremental_matches_full_recompute(self):
+        held = [leg(24800, 'PE', 75), leg(25000, 'PE', -75)]
+        added = [leg(25200, 'CE', 75), leg(25000, 'CE', -75)]
+        self.engine.set_portfolio(held)
+        inc = self.engine.incremental(added)
+        expected = self.engine.margin(held + added)['total_margin'] - self.engine.margin(held)['total_margin']
+        self.assertAlmostEqual(inc['incremental_margin'], expected, places=1)
+
+    def test_rank_matches_incremental(self):
+        self.engine.set_portfolio([leg(24800, 'PE', 75), leg(25000, 'PE', -75)])
+        candidates = [[leg(25000 + w, 'CE', 75), leg(25000, 'CE', -75)] for w in (100, 200, 400)]
+        candidates.append([leg(2400, 'FUT', 250, spot=2450, underlying='RELIANCE')])
+        ranked = self.engine.rank(candidates)
+        for cost, legs in zip(ranked, candidates):
+            self.assertAlmostEqual(cost, self.engine.incremental(legs)['incremental_margin'], places=1)
+
+    def test_risk_parameters_reload_on_change(self):
+        workdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(workdir, 'risk_parameters.json')
+            with open(path, 'w') as f:
+                json.dump(PARAMS, f)
+            params = RiskParameters.load(path)
+            self.assertEqual(params.for_underlying('NIFTY')['price_scan_pct'], 0.06)
+            self.assertFalse(params.reload_if_changed())
+
+            with open(path, 'w') as f:
+                json.dump({**PARAMS, "underlyings": {"NIFTY": {"price_scan_pct": 0.09}}}, f)
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            self.assertTrue(params.reload_if_changed())
+            self.assertEqual(params.for_underlying('NIFTY')['price_scan_pct'], 0.09)
+            self.assertIsNone(RiskParameters.load(os.path.join(workdir, 'missing.json')))
+        finally:
+            shutil.rmtree(workdir)
+
+    def test_reconciliation_report(self):
+        rec = MarginReconciliation()
+        rec.record('A', 90.0, 100.0)
+        rec.record('B', 110.0, 100.0)
+        report = rec.report()
+        self.assertEqual(report['samples'], 2)
+        self.assertEqual(report['mean_abs_diff_pct'], 10.0)
+        self.assertEqual(report['under_margined'], 1)
+
+
+class TestMarginCalculatorLocalSource(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.params_path = os.path.join(self.workdir, 'risk_parameters.json')
+        with open(self.params_path, 'w') as f:
+            json.dump(PARAMS, f)
+        rows = [{'tradingsymbol': tsym, 'symbol': 'NIFTY', 'instrument': 'OPTIDX', 'exchange': 'NFO',
+                 'expiry': EXPIRY, 'option_type': 'PE', 'strike': strike, 'lotsize': '75'}
+                for tsym, strike in (('ATM', '25000'), ('HEDGE', '24800'), ('FAR', '24600'))]
+        self.calc = MarginCalculator(FakeMaster(rows), risk_params_path=self.params_path)
+        self.calc.portfolio_margin._today = TODAY
+        self.spread = {'atm_symbol': 'ATM', 'hedge_symbol': 'HEDGE', 'lot_size': 75, 'spot': 25000.0}
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_local_source_skips_broker(self):
+        api = FakeApi({'stat': 'Ok', 'span': '1000', 'expo': '200'})
+        self.calc.source = 'local'
+        res = self.calc.calculate_span_for_spread(self.spread, api, 'ACCT')
+        self.assertTrue(res['ok'])
+        self.assertEqual(res['source'], 'local')
+        self.assertEqual(api.calls, 0)
+
+    def test_broker_source_records_reconciliation(self):
+        api = FakeApi({'stat': 'Ok', 'span': '1000', 'expo': '200'})
+        res = self.calc.calculate_span_for_spread(self.spread, api, 'ACCT')
+        self.assertEqual(res['total_margin'], 1200.0)
+        self.assertIsNotNone(res['local_total_margin'])
+        self.assertEqual(self.calc.reconciliation_report()['samples'], 1)
+
+    def test_sync_portfolio_prices_spread_incrementally(self):
+        alone = self.calc.local_span_for_spread(self.spread)
+        self.assertEqual(alone['incremental_margin'], alone['total_margin'])
+
+        held = {'NFO|1': {'symbol': 'FAR', 'side': 'S', 'qty': 75, 'ltp': 25000.0}}
+        self.assertEqual(self.calc.sync_portfolio(held), 1)
+        res = self.calc.local_span_for_spread(self.spread)
+        engine = self.calc.portfolio_margin
+        held_legs = self.calc.position_legs(held['NFO|1'])
+        expected = (engine.margin(held_legs + self.calc.spread_legs(self.spread))['total_margin']
+                    - engine.margin(held_legs)['total_margin'])
+        self.assertAlmostEqual(res['incremental_margin'], expected, delta=0.05)
+        self.assertEqual(res['total_margin'], alone['total_margin'])
+
+    def test_paper_spread_gated_on_incremental_margin(self):
+        from unittest.mock import MagicMock
+        from orbiter.utils.margin.margin_executor import MarginAwareExecutor
+        executor = MarginAwareExecutor(MagicMock(), MagicMock(), paper_trade=True)
+        executor.margin_manager = MagicMock()
+        executor.margin_manager.check_margin.return_value = {'allowed': False, 'required': 1.0, 'available': 0.0}
+        executor.margin_calculator = self.calc
+        res = executor.place_spread(self.spread, execute=True, product_type='M', price_type='MKT')
+        self.assertEqual(res['reason'], 'margin_blocked')
+        required = executor.margin_manager.check_margin.call_args.kwargs['required']
+        self.assertEqual(required, self.calc.local_span_for_spread(self.spread)['incremental_margin'])
+
+    def test_live_spread_blocked_when_increment_exceeds_limits(self):
+        from unittest.mock import MagicMock
+        from orbiter.core.broker.broker_options_executor import BrokerOptionsOrderExecutor
+        api = MagicMock()
+        api.get_limits.return_value = {'stat': 'Ok', 'cash': '100', 'collateral': '0', 'marginused': '0'}
+        executor = BrokerOptionsOrderExecutor(api, project_root=self.workdir, segment_name='nfo')
+        executor.margin = self.calc
+        res = executor.place_spread({**self.spread, 'side': 'PUT'}, execute=True, product_type='M', price_type='MKT')
+        self.assertEqual(res['reason'], 'margin_blocked')
+        api.place_order.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
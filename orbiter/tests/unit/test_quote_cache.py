@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from orbiter.core.broker.quote_cache import QuoteCache
+
+
+class SlowAPI:
+    """get_quotes that blocks until released, counting calls per token."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_quotes(self, exchange=None, token=None):
+        with self._lock:
+            self.calls.append((exchange, token))
+        time.sleep(self.delay)
+        return {'stat': 'Ok', 'lp': '101.5', 'c': '100'}
+
+
+class FakeMaster:
+    def __init__(self):
+        self.SYMBOL_TO_TOKEN = {'RECLTD': '123'}
+        self.DERIVATIVE_OPTIONS = [{'tradingsymbol': 'RECLTD26MAR500CE', 'exchange': 'NFO', 'token': '555'}]
+
+
+class TestQuoteCache(unittest.TestCase):
+    def setUp(self):
+        self.api = SlowAPI()
+        self.live = True
+        self.subscribe = MagicMock()
+        self.cache = QuoteCache(self.api, FakeMaster(), subscribe=self.subscribe,
+                                is_live=lambda: self.live, ttl_seconds=0.2)
+
+    def test_websocket_quote_served_without_rest(self):
+        self.cache.on_tick('NFO|555', {'exchange': 'NFO', 'token': '555', 'symbol': 'RECLTD26MAR500CE',
+                                       'lp': '12.5', 'ltp': 12.5, 'candles': [1, 2, 3]})
+        self.assertEqual(self.cache.get_ltp('NFO', token='555'), 12.5)
+        self.assertEqual(self.cache.get_ltp(tsym='RECLTD26MAR500CE'), 12.5)
+        self.assertEqual(self.api.calls, [])
+        self.assertNotIn('candles', self.cache.get_quote('NFO', token='555'))
+
+    def test_delta_ticks_merge(self):
+        self.cache.on_tick('x', {'exchange': 'NSE', 'token': '123', 'lp': '100', 'c': '98'})
+        self.cache.on_tick('x', {'exchange': 'NSE', 'token': '123', 'lp': '101'})
+        quote = self.cache.get_quote('NSE', token='123')
+        self.assertEqual((quote['lp'], quote['c']), ('101', '98'))
+
+    def test_ws_quote_expires_when_feed_down(self):
+        self.cache.on_tick('x', {'exchange': 'NSE', 'token': '123', 'lp': '100'})
+        self.live = False
+        self.assertIsNotNone(self.cache.get_quote('NSE', token='123'))
+        time.sleep(0.25)
+        self.assertEqual(self.cache.get_ltp('NSE', token='123'), 101.5)
+        self.assertEqual(self.api.calls, [('NSE', '123')])
+
+    def test_max_age_applies_to_ws_quotes(self):
+        self.cache.on_tick('x', {'exchange': 'NSE', 'token': '123', 'lp': '100'})
+        time.sleep(0.05)
+        self.assertEqual(self.cache.get_ltp('NSE', token='123'), 100.0)  # live feed: no age limit
+        self.assertEqual(self.cache.get_ltp('NSE', token='123', max_age=0.01), 101.5)
+        self.assertEqual(self.api.calls, [('NSE', '123')])
+
+    def test_concurrent_misses_single_flight(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_ltp('NFO', token='555')))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [101.5] * 8)
+        self.assertEqual(len(self.api.calls), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['coalesced'] + stats['hits'], 7)
+
+    def test_batch_fetches_misses_in_parallel(self):
+        self.cache.on_tick('x', {'exchange': 'NFO', 'token': '1', 'lp': '5'})
+        start = time.monotonic()
+        quotes = self.cache.get_quotes([('NFO', '1', None), ('NFO', '2', None), ('NFO', '3', None), ('NFO', '2', None)])
+        elapsed = time.monotonic() - start
+        self.assertEqual([q['lp'] for q in quotes], ['5', '101.5', '101.5', '101.5'])
+        self.assertEqual(sorted(c[1] for c in self.api.calls), ['2', '3'])
+        self.assertLess(elapsed, 2 * self.api.delay)
+
+    def test_watch_subscribes_once(self):
+        self.cache.watch('NFO', '555', 'RECLTD26MAR500CE')
+        self.cache.watch('NFO', '555', 'RECLTD26MAR500CE')
+        self.subscribe.assert_called_once_with(['NFO|555'])
+
+
+class TestQuoteLtpFallback(unittest.TestCase):
+    def test_tsym_fallback_when_token_has_no_quote(self):
+        from orbiter.core.broker.executor_base import BaseOrderExecutor
+
+        class Api:
+            def __init__(self):
+                self.calls = []
+
+            def get_quotes(self, exchange=None, token=None):
+                self.calls.append(token)
+                return {'stat': 'Ok', 'lp': '42'} if token == 'RECLTD-EQ' else {'stat': 'Not_Ok'}
+
+        api = Api()
+        executor = BaseOrderExecutor.__new__(BaseOrderExecutor)
+        executor.api, executor.quote_cache = api, QuoteCache(api)
+        self.assertEqual(executor._quote_ltp('NSE', '999', 'RECLTD-EQ'), 42.0)
+        self.assertEqual(api.calls, ['999', 'RECLTD-EQ'])
+
+
+if __name__ == '__main__':
+    unittest.main()
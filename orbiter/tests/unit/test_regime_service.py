@@ -0,0 +1,152 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import talib
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.core.regime_service import RegimeService
+from orbiter.utils.analyze_sideways import calculate_indicators
+from orbiter.utils.regime import IST, SIDEWAYS, TRENDING, RegimeState, WilderADX
+
+OPEN = datetime(2026, 10, 19, 9, 15)
+
+
+def session(n=375, drift=0.0, vol=3.0, seed=5, start=25000.0, day=OPEN):
+    """One day of 1-minute bars: [(naive IST datetime, o, h, l, c, v)]."""
+    rng = np.random.default_rng(seed)
+    bars, close = [], start
+    for i in range(n):
+        o = close
+        close = o + drift + rng.normal(0, vol)
+        bars.append((day + timedelta(minutes=i), o, max(o, close) + abs(rng.normal(0, 1)),
+                     min(o, close) - abs(rng.normal(0, 1)), close, float(rng.integers(100, 1000))))
+    return bars
+
+
+def epoch(dt):
+    return IST.localize(dt).timestamp()
+
+
+def feed(state, bars):
+    for dt, o, h, l, c, v in bars:
+        state.update(epoch(dt), o, h, l, c, v)
+    return state
+
+
+class TestRegimeKernel(unittest.TestCase):
+    def test_adx_matches_talib(self):
+        bars = session(n=400, drift=0.5)
+        h, l, c = (np.array([b[i] for b in bars]) for i in (2, 3, 4))
+        expected = talib.ADX(h, l, c, timeperiod=14)
+        adx = WilderADX(14)
+        for i, bar in enumerate(zip(h, l, c)):
+            value = adx.update(*bar)
+            if np.isnan(expected[i]):
+                self.assertIsNone(value)
+            else:
+                self.assertAlmostEqual(value, expected[i], places=8)
+
+    def test_day_features_match_offline_script(self):
+        bars = session()
+        df = pd.DataFrame([{'date': dt, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+                           for dt, o, h, l, c, v in bars]).set_index('date')
+        expected = calculate_indicators(df)
+        features = feed(RegimeState(), bars).features()
+        for name in ('first_hour_range_pct', 'vwap_deviation_pct', 'orb_range_pct'):
+            self.assertAlmostEqual(features[name], expected[name], places=9, msg=name)
+        self.assertAlmostEqual(features['day_range_pct'], expected['day_range_pct'], places=9)
+        self.assertEqual(features['within_orb'], bool(expected['within_orb']))
+
+    def test_hysteresis_needs_confirmed_bars_to_flip(self):
+        quiet = session(n=120, vol=0.5)
+        state = feed(RegimeState(), quiet)
+        self.assertEqual(state.state, SIDEWAYS)
+
+        last = quiet[-1]
+        trend = session(n=200, drift=6.0, vol=2.0, start=last[4], day=last[0] + timedelta(minutes=1), seed=9)
+        scores = []
+        for dt, o, h, l, c, v in trend:
+            state.update(epoch(dt), o, h, l, c, v)
+            scores.append((state.score, state.state))
+        self.assertEqual(state.state, TRENDING)
+        self.assertEqual(state.flips, 1)
+        first = next(i for i, (_, s) in enumerate(scores) if s == TRENDING)
+        self.assertTrue(all(score <= state.exit_score for score, _ in scores[first - state.confirm_bars + 1:first + 1]))
+
+    def test_new_day_resets_day_features(self):
+        state = feed(RegimeState(), session(n=200, drift=5.0))
+        state.update(epoch(OPEN + timedelta(days=1)), 100.0, 101.0, 99.0, 100.5, 10)
+        self.assertEqual(state.day_bars, 1)
+        self.assertAlmostEqual(state.features()['day_range_pct'], 2 / 99 * 100)
+        self.assertIsNotNone(state.adx.value)  # carried across days
+
+
+class FakeTickHandler:
+    def __init__(self, candles):
+        self.SYMBOLDICT = {'NSE|26000': {'candles': candles}}
+        self.callbacks = []
+
+    def register_tick_callback(self, callback):
+        self.callbacks.append(callback)
+
+
+class FakeEngine:
+    def __init__(self, candles):
+        self.regime = None
+        self.session_manager = type('Session', (), {})()
+        self.session_manager.filters = {'scoring': {'combined_score': {'weight_adx': 0.4, 'weight_ema_slope': 0.3}}}
+        tick_handler = FakeTickHandler(candles)
+        conn = type('Conn', (), {'tick_handler': tick_handler})()
+        self.state = type('State', (), {'primed': True, 'client': type('Client', (), {'conn': conn})()})()
+
+
+CONFIG = {'enabled': True, 'index': 'NSE|26000',
+          'profiles': {'sideways': {'scoring': {'combined_score': {'weight_adx': 0.1}}}, 'trending': {}}}
+
+
+class TestRegimeService(unittest.TestCase):
+    def setUp(self):
+        self.bars = session(n=121, vol=0.5)
+        candles = [{'time': dt.strftime("%d-%m-%Y %H:%M:%S"), 'into': str(o), 'inth': str(h), 'intl': str(l),
+                    'intc': str(c), 'v': str(v)} for dt, o, h, l, c, v in self.bars[:100]]
+        self.engine = FakeEngine(candles)
+        self.service = RegimeService(app=None, config=CONFIG)
+        self.assertTrue(self.service.attach(self.engine))
+
+    def tick(self, token, ltp, dt):
+        return {'exchange': 'NSE', 'token': token, 'lp': str(ltp), 'ft': str(epoch(dt))}
+
+    def test_seeds_from_primed_candles_and_follows_index_ticks(self):
+        self.assertIs(self.engine.regime, self.service)
+        self.assertEqual(self.service.regime.day_bars, 99)  # the forming candle is left to the ticks
+        reference = feed(RegimeState(), self.bars[:99])
+        self.assertEqual(self.service.get_facts(), reference.facts())
+
+        facts = self.service.get_facts()
+        self.service.on_tick('OTHER', self.tick('2885', 1.0, self.bars[99][0]))
+        for dt, o, h, l, c, v in self.bars[99:]:
+            for price in (o, h, l, c):
+                self.service.on_tick('NIFTY', self.tick('26000', price, dt))
+        self.assertEqual(self.service.bars, 21)  # the last bar stays open until the next minute
+        self.assertIsNot(self.service.get_facts(), facts)
+        feed(reference, [bar[:5] + (0.0,) for bar in self.bars[99:120]])  # index ticks carry no volume
+        self.assertEqual(self.service.get_facts(), reference.facts())
+        self.assertEqual(self.service.get_facts()['regime.state'], SIDEWAYS)
+
+    def test_apply_profile_reweights_and_restores(self):
+        session_manager = self.engine.session_manager
+        base = session_manager.filters
+        res = self.service.apply_profile(session_manager)
+        self.assertEqual((res['profile'], res['changed']), (SIDEWAYS, True))
+        self.assertEqual(session_manager.filters['scoring']['combined_score'], {'weight_adx': 0.1, 'weight_ema_slope': 0.3})
+        self.assertEqual(base['scoring']['combined_score']['weight_adx'], 0.4)  # base untouched
+        self.assertFalse(self.service.apply_profile(session_manager)['changed'])
+
+        self.service.apply_profile(session_manager, profile=TRENDING)
+        self.assertIs(session_manager.filters, base)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import orbiter.utils.logger  # noqa: F401 - installs Logger.trace
+from orbiter.core.engine.rule.rule_manager import RuleManager
+from orbiter.core.engine.rule.rule_reloader import RuleReloader
+from orbiter.utils.data_manager import ConfigLoader
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SOURCE = os.path.join(PROJECT_ROOT, 'orbiter', 'strategies', 'mcx_trend_follower')
+
+
+class FakeSession:
+    """SessionManager stand-in over a strategy folder copied to a temp dir."""
+
+    def __init__(self, strategy_dir):
+        self.project_root = PROJECT_ROOT
+        self.strategy_dir = strategy_dir
+        self.strategy_path = os.path.join(strategy_dir, 'strategy.json')
+        with open(self.strategy_path) as f:
+            self.strategy_bundle = json.load(f)
+        with open(os.path.join(strategy_dir, 'filters.json')) as f:
+            self.filters = json.load(f)
+
+    def get_all_strategy_parameters(self):
+        return self.strategy_bundle.get('strategy_parameters', {})
+
+
+def always_rule(name, action='trade.place_future_order'):
+    return {'name': name, 'priority': 1, 'expression': 'true', 'order_operations': [{'type': action, 'params': {}}]}
+
+
+class TestRuleReloader(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        for name in ('strategy.json', 'rules.json', 'filters.json'):
+            shutil.copy(os.path.join(SOURCE, name), self.workdir)
+        strategy = self.load('strategy.json')
+        strategy['files'] = {'rules_file': os.path.join(self.workdir, 'rules.json'),
+                             'filters_file': os.path.join(self.workdir, 'filters.json')}
+        self.dump('strategy.json', strategy)
+        self.dump('rules.json', {'strategies': [always_rule('v1')], 'scoring_rules': []})
+
+        self.session = FakeSession(self.workdir)
+        self.rules = RuleManager(PROJECT_ROOT, os.path.join(self.workdir, 'rules.json'), self.session)
+        self.reloader = RuleReloader(self.rules, self.session, action_registry={'trade.place_future_order': None})
+        self.source = SimpleNamespace(state=None)
+
+    def tearDown(self):
+        self.reloader.stop()
+        shutil.rmtree(self.workdir)
+
+    def load(self, name):
+        with open(os.path.join(self.workdir, name)) as f:
+            return json.load(f)
+
+    def dump(self, name, data):
+        path = os.path.join(self.workdir, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))  # coarse mtimes on some filesystems
+
+    def matched(self):
+        self.rules.evaluate(self.source)
+        return self.rules.decision_log[-1]
+
+    def test_startup_version_matches_reload_hash(self):
+        # Touching a file without changing it stages the same bundle under the same version
+        self.dump('filters.json', self.load('filters.json'))
+        self.assertEqual(self.reloader.check(), self.rules.rules_version)
+
+    def test_changed_rules_swap_in_only_at_apply(self):
+        v1 = self.rules.rules_version
+        self.assertIsNone(self.reloader.check())  # nothing changed yet
+        self.assertEqual(self.matched()['rule'], 'v1')
+
+        self.dump('rules.json', {'strategies': [always_rule('v2')], 'scoring_rules': []})
+        version = self.reloader.check()
+        self.assertIsNotNone(version)
+        decision = self.matched()
+        self.assertEqual((decision['rule'], decision['version']), ('v1', v1))  # staged, not live until apply()
+
+        self.assertTrue(self.reloader.apply())
+        decision = self.matched()
+        self.assertEqual((decision['rule'], decision['version']), ('v2', version))
+        self.assertFalse(self.reloader.apply())
+
+        self.assertTrue(self.reloader.rollback())
+        self.assertEqual((self.matched()['rule'], self.rules.rules_version), ('v1', v1))
+
+    def test_invalid_files_are_rejected_and_running_rules_kept(self):
+        v1 = self.rules.rules_version
+        bad_rules = [
+            {'strategies': [{'name': 'no_condition', 'order_operations': []}]},
+            {'strategies': [always_rule('typo', action='trade.place_futur_order')]},
+            {'strategies': [{'name': 'bad_syntax', 'expression': 'adx >>> 3'}]},
+        ]
+        for rules in bad_rules:
+            self.dump('rules.json', rules)
+            self.assertIsNone(self.reloader.check())
+            self.assertFalse(self.reloader.apply())
+        self.assertEqual(self.reloader.rejections, 3)
+        self.assertIn("rule 'bad_syntax'", self.reloader.last_error)
+        self.assertEqual((self.rules.rules_version, self.matched()['rule']), (v1, 'v1'))
+
+        with open(os.path.join(self.workdir, 'rules.json'), 'w') as f:
+            f.write('{"strategies": [')  # half-written save
+        self.assertIsNone(self.reloader.check())
+        self.assertEqual(self.reloader.history[-1]['status'], 'rejected')
+
+    def test_filters_and_strategy_parameters_reload(self):
+        filters = self.load('filters.json')
+        filters['scoring'] = {'combined_score': {'threshold': 0.9}}
+        self.dump('filters.json', filters)
+        strategy = self.load('strategy.json')
+        strategy['strategy_parameters']['top_n'] = 7
+        self.dump('strategy.json', strategy)
+
+        self.assertIsNotNone(self.reloader.check())
+        self.reloader.apply()
+        self.assertEqual(self.session.get_all_strategy_parameters()['top_n'], 7)
+        self.assertEqual(self.session.filters['scoring']['combined_score']['threshold'], 0.9)
+
+        strategy['exchange_id'] = 'nfo'
+        self.dump('strategy.json', strategy)
+        self.assertIsNone(self.reloader.check())
+        self.assertIn('exchange_id changed', self.reloader.last_error)
+
+    def test_manifest_lookups_reparse_only_on_change(self):
+        path = ConfigLoader.get_path(PROJECT_ROOT, 'mandatory_files', 'fact_definitions')
+        self.assertTrue(os.path.exists(path))
+        manifest = ConfigLoader._cached_manifest(PROJECT_ROOT)
+        self.assertIs(ConfigLoader._cached_manifest(PROJECT_ROOT), manifest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import threading
+import unittest
+
+import orbiter.utils.logger  # noqa: F401 - registers Logger.trace
+from orbiter.bot import sheets
+from orbiter.bot.sheets_sink import SheetsSink, LocalBook
+
+
+class FlakyBook(LocalBook):
+    """LocalBook whose next `failures` worksheet calls raise, counting resets."""
+    def __init__(self, failures=0):
+        super().__init__()
+        self.failures = failures
+        self.resets = 0
+
+    def _maybe_fail(self):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("APIError 503")
+
+    def worksheet(self, title):
+        if title in self.worksheets:
+            self._maybe_fail()
+        return super().worksheet(title)
+
+    def add_worksheet(self, title, rows="1000", cols="20"):
+        self._maybe_fail()
+        return super().add_worksheet(title, rows, cols)
+
+    def reset(self):
+        self.resets += 1
+
+
+class TestSheetsSink(unittest.TestCase):
+    def setUp(self):
+        self.book = LocalBook()
+        self.sink = SheetsSink(book=self.book, flush_interval=0, retry_backoff=0)
+
+    def tearDown(self):
+        self.sink.stop()
+
+    def test_appends_batched_under_header(self):
+        self.sink.log_buy_signals([{'token': 'NSE|1', 'symbol': 'A', 'ltp': 10.0}])
+        self.sink.log_square_off([{'token': 'NSE|1', 'symbol': 'A', 'exit_price': 11.0}])
+        self.sink.log_closed_positions([{'token': 'NSE|1', 'symbol': 'A'}])
+        self.assertTrue(self.sink.flush())
+
+        trade_log = self.book.worksheet("trade_log").get_all_values()
+        self.assertEqual(trade_log[0], sheets.TRADE_LOG_HEADER)
+        self.assertEqual([r[4] for r in trade_log[1:]], ['🚀 AUTO-BUY', '🔻 SQUARE-OFF'])
+        self.assertEqual(self.book.worksheet("closed_positions").row_values(1), sheets.CLOSED_POSITIONS_HEADER)
+        self.assertEqual(self.sink.get_stats()['rows_written'], 3)
+
+    def test_snapshots_latest_wins(self):
+        gate = threading.Event()
+        self.sink._latest(('snapshot', 'block'), lambda book: gate.wait(2))
+        for i in range(5):
+            self.sink.update_active_positions([{'token': f'NFO|{i}', 'symbol': f'S{i}'}])
+        gate.set()
+        self.sink.flush()
+
+        rows = self.book.worksheet("active_positions").get_all_values()
+        self.assertEqual(rows[0], sheets.POSITIONS_HEADER)
+        self.assertEqual([r[1] for r in rows[1:]], ['NFO|4'])
+        self.assertGreaterEqual(self.sink.get_stats()['coalesced'], 3)
+
+    def test_engine_state_round_trip(self):
+        self.sink.update_engine_state('{"a": 1}')
+        self.sink.update_engine_state('{"a": 2}')
+        self.sink.flush()
+        self.assertEqual(self.sink.get_engine_state(), '{"a": 2}')
+
+    def test_scan_metrics_upsert_and_clear(self):
+        self.sink.log_scan_metrics([{'token': '1', 'symbol': 'A', 'ltp': 1.0}], tab_name='scan_metrics_nfo')
+        self.sink.flush()
+        self.sink.log_scan_metrics([{'token': '1', 'symbol': 'A', 'ltp': 2.0},
+                                    {'token': '2', 'symbol': 'B', 'ltp': 3.0}], tab_name='scan_metrics_nfo')
+        self.sink.flush()
+        rows = self.book.worksheet('scan_metrics_nfo').get_all_values()
+        self.assertEqual([r[1] for r in rows[1:]], ['1', '2'])
+        ltp_col = sheets.SCAN_METRICS_HEADER.index('LTP')
+        self.assertEqual(rows[1][ltp_col], '₹2.00')
+
+        self.sink.clear_sheet('scan_metrics_nfo', sheets.SCAN_METRICS_HEADER)
+        self.sink.flush()
+        self.assertEqual(self.book.worksheet('scan_metrics_nfo').get_all_values(), [sheets.SCAN_METRICS_HEADER])
+
+    def test_backpressure_drops_oldest_rows(self):
+        self.sink.stop()
+        sink = SheetsSink(book=self.book, max_pending_rows=2, autostart=False)
+        sink.log_closed_positions([{'token': str(i)} for i in range(5)])
+        stats = sink.get_stats()
+        self.assertEqual((stats['pending_rows'], stats['dropped_rows']), (2, 3))
+        sink.start()
+        sink.flush()
+        rows = self.book.worksheet('closed_positions').get_all_values()
+        self.assertEqual([r[2] for r in rows[1:]], ['3', '4'])
+        sink.stop()
+
+    def test_retries_then_gives_up(self):
+        self.sink.stop()
+        book = FlakyBook(failures=2)
+        sink = SheetsSink(book=book, flush_interval=0, max_retries=2, retry_backoff=0)
+        sink.update_engine_state('x')
+        sink.flush()
+        self.assertEqual(book.worksheet('engine_state').get('B1'), [['x']])
+        self.assertEqual((sink.get_stats()['retries'], book.resets), (2, 2))
+
+        book.failures = 10
+        sink.update_engine_state('y')
+        sink.flush()
+        self.assertEqual(sink.get_stats()['failed'], 1)
+        sink.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import importlib.util
+import json
+import os
+import numpy as np
+import talib
+
+from orbiter.utils.supertrend import supertrend, wilder_atr, SuperTrendState, _jit_loop
+from orbiter.filters.entry.f4_supertrend import calculate_st_values
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def legacy_calculate_st_values(highs, lows, closes, period, multiplier):
+    """Verbatim copy of the pre-kernel f4_supertrend.calculate_st_values (reference output)."""
+    tr = np.zeros_like(closes)
+    for i in range(1, len(closes)):
+        tr[i] = max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1]))
+    tr[0] = highs[0] - lows[0]
+    try:
+        talib.set_compatibility(1)
+        atr = talib.EMA(tr, timeperiod=period * 2 - 1)
+    finally:
+        talib.set_compatibility(0)
+    first_valid = np.where(~np.isnan(atr))[0]
+    if len(first_valid) > 0:
+        atr = np.nan_to_num(atr, nan=atr[first_valid[0]])
+    else:
+        atr = np.nan_to_num(atr, nan=0)
+    hl2 = (highs + lows) / 2.0
+    upper_band = hl2 + multiplier * atr
+    lower_band = hl2 - multiplier * atr
+    final_ub = np.copy(upper_band)
+    final_lb = np.copy(lower_band)
+    st = np.zeros_like(closes)
+    for i in range(1, len(closes)):
+        if upper_band[i] < final_ub[i-1] or closes[i-1] > final_ub[i-1]:
+            final_ub[i] = upper_band[i]
+        else:
+            final_ub[i] = final_ub[i-1]
+        if lower_band[i] > final_lb[i-1] or closes[i-1] < final_lb[i-1]:
+            final_lb[i] = lower_band[i]
+        else:
+            final_lb[i] = final_lb[i-1]
+    st[0] = final_ub[0]
+    for i in range(1, len(closes)):
+        if st[i-1] == final_ub[i-1]:
+            st[i] = final_ub[i] if closes[i] <= final_ub[i] else final_lb[i]
+        else:
+            st[i] = final_lb[i] if closes[i] >= final_lb[i] else final_ub[i]
+    return st
+
+
+def _random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    closes = 1000 + np.cumsum(rng.normal(0, 2.5, n))
+    spread = np.abs(rng.normal(0, 1.5, n))
+    highs = closes + spread
+    lows = closes - np.abs(rng.normal(0, 1.5, n))
+    return highs, lows, closes
+
+
+def _recltd():
+    path = os.path.join(PROJECT_ROOT, 'orbiter', 'tests', 'data', 'RECLTD_2024-07-25.json')
+    with open(path, 'r') as f:
+        rows = json.load(f)
+    return (np.array([r['high'] for r in rows], dtype=float),
+            np.array([r['low'] for r in rows], dtype=float),
+            np.array([r['close'] for r in rows], dtype=float))
+
+
+class TestSuperTrendKernelParity(unittest.TestCase):
+    CASES = [(10, 3.0), (7, 2.0), (14, 1.5), (3, 4.0)]
+
+    def _datasets(self):
+        yield 'recltd', _recltd()
+        for seed in (1, 2, 3):
+            yield f'walk{seed}', _random_walk(2000, seed)
+
+    def test_series_matches_legacy_output(self):
+        for name, (h, l, c) in self._datasets():
+            for period, mult in self.CASES:
+                expected = legacy_calculate_st_values(h, l, c, period, mult)
+                st, _ = supertrend(h, l, c, period, mult)
+                np.testing.assert_array_equal(st, expected, err_msg=f"{name} p={period} m={mult}")
+                np.testing.assert_array_equal(calculate_st_values(h, l, c, period, mult), expected)
+
+    @unittest.skipUnless(importlib.util.find_spec('numba'), "numba not installed")
+    def test_python_fallback_matches_jit(self):
+        self.assertIsNotNone(_jit_loop()) # otherwise both runs below take the Python loop
+        for name, (h, l, c) in self._datasets():
+            for period, mult in self.CASES:
+                st_py, dir_py = supertrend(h, l, c, period, mult, use_jit=False)
+                st_jit, dir_jit = supertrend(h, l, c, period, mult, use_jit=True)
+                np.testing.assert_array_equal(st_py, st_jit, err_msg=f"{name} p={period} m={mult}")
+                np.testing.assert_array_equal(dir_py, dir_jit, err_msg=f"{name} p={period} m={mult}")
+
+    def test_direction_follows_line_side(self):
+        h, l, c = _recltd()
+        st, direction = supertrend(h, l, c, 10, 3.0)
+        self.assertTrue(set(np.unique(direction)) <= {-1, 1})
+        # Bullish bars sit on the lower band, bearish on the upper band
+        self.assertTrue(np.all(c[direction == 1] >= st[direction == 1]))
+        self.assertTrue(np.all(c[1:][direction[1:] == -1] <= st[1:][direction[1:] == -1]))
+
+    def test_short_and_empty_inputs(self):
+        st, direction = supertrend([], [], [], 10, 3.0)
+        self.assertEqual(len(st), 0)
+        h, l, c = _random_walk(5, 4)
+        np.testing.assert_array_equal(supertrend(h, l, c, 10, 3.0)[0], legacy_calculate_st_values(h, l, c, 10, 3.0))
+        self.assertTrue(np.all(wilder_atr(h, l, c, 10) == 0))
+
+
+class TestSuperTrendIncremental(unittest.TestCase):
+    def test_incremental_matches_series_after_warmup(self):
+        for period, mult in ((10, 3.0), (5, 2.0)):
+            h, l, c = _random_walk(1500, 11)
+            st, direction = supertrend(h, l, c, period, mult)
+            state = SuperTrendState(period, mult)
+            warmup = 2 * period - 2
+            for i in range(len(c)):
+                value, d = state.update(h[i], l[i], c[i])
+                if i < warmup:
+                    self.assertTrue(np.isnan(value))
+                    continue
+                self.assertAlmostEqual(value, st[i], places=9, msg=f"bar {i}")
+                self.assertEqual(d, direction[i])
+
+    def test_seed_then_update(self):
+        h, l, c = _recltd()
+        st, direction = supertrend(h, l, c, 10, 3.0)
+        state = SuperTrendState(10, 3.0)
+        state.seed(h[:300], l[:300], c[:300])
+        self.assertAlmostEqual(state.value, st[299], places=9)
+        for i in range(300, len(c)):
+            value, d = state.update(h[i], l[i], c[i])
+            self.assertAlmostEqual(value, st[i], places=9)
+            self.assertEqual(d, direction[i])
+
+    def test_peek_does_not_commit(self):
+        h, l, c = _recltd()
+        state = SuperTrendState(10, 3.0)
+        state.seed(h[:-1], l[:-1], c[:-1])
+        before = (state.value, state.direction, state.atr, state.count)
+        peeked = state.peek(h[-1], l[-1], c[-1])
+        self.assertEqual(before, (state.value, state.direction, state.atr, state.count))
+        self.assertEqual(peeked, state.update(h[-1], l[-1], c[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
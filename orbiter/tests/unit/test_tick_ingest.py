@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from orbiter.core.broker.tick_handler import TickHandler
+from orbiter.core.broker.tick_ingest import TickIngest
+
+
+class FakeConnection:
+    """Captures the websocket callback instead of opening a socket."""
+    def start_live_feed(self, symbols, on_tick_callback):
+        self.on_tick = on_tick_callback
+
+
+def _msg(tk, lp, **extra):
+    return {'tk': tk, 'lp': str(lp), 'h': str(lp), 'l': str(lp), 'v': '10', **extra}
+
+
+class TestTickIngest(unittest.TestCase):
+    def test_per_token_order_across_shards(self):
+        seen = {}
+        lock = threading.Lock()
+
+        def apply(msg, tk, ex):
+            with lock:
+                seen.setdefault(tk, []).append(msg['n'])
+
+        ingest = TickIngest(apply, num_shards=3)
+        ingest.start()
+        for n in range(200):
+            ingest.submit({'n': n}, str(n % 5), 'NSE')
+        self.assertTrue(ingest.drain())
+        ingest.stop()
+
+        self.assertEqual(sorted(seen), ['0', '1', '2', '3', '4'])
+        for tk, ns in seen.items():
+            self.assertEqual(ns, sorted(ns))
+        self.assertEqual(ingest.get_stats()['processed'], 200)
+
+    def test_slow_consumer_does_not_block_submit(self):
+        release = threading.Event()
+        ingest = TickIngest(lambda msg, tk, ex: release.wait(2), num_shards=1, capacity=10)
+        ingest.start()
+
+        start = time.monotonic()
+        for n in range(50):
+            ingest.submit({'n': n}, '1', 'NSE')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        stats = ingest.get_stats()
+        self.assertGreater(stats['dropped'], 0)
+        self.assertLessEqual(stats['queue_depth'], 10)
+        release.set()
+        self.assertTrue(ingest.drain())
+        self.assertGreater(ingest.get_stats()['lag_ms_max'], 0)
+        ingest.stop()
+
+
+class TestTickHandlerIngest(unittest.TestCase):
+    def setUp(self):
+        master = MagicMock()
+        master.TOKEN_TO_SYMBOL = {'123': 'CRUDEOIL19MAR26F'}
+        master.TOKEN_TO_COMPANY = {'123': 'CRUDE OIL'}
+        self.handler = TickHandler(MagicMock(), master, '/tmp', 'mcx')
+        self.callback = MagicMock()
+        self.handler.register_tick_callback(self.callback)
+        self.conn = FakeConnection()
+        self.handler.start_live_feed(self.conn, ['MCX|123'])
+
+    def tearDown(self):
+        self.handler.ingest.stop()
+
+    def test_ticks_applied_off_socket_thread(self):
+        self.conn.on_tick(_msg('123', 100), '123', 'MCX')
+        self.conn.on_tick(_msg('123', 105, h='106'), '123', 'MCX')
+        self.assertTrue(self.handler.ingest.drain())
+
+        tick = self.handler.SYMBOLDICT['MCX|123']
+        self.assertEqual((tick['ltp'], tick['symbol'], tick['company_name']), (105.0, 'CRUDEOIL19MAR26F', 'CRUDE OIL'))
+        self.assertEqual(tick['candles'][-1]['inth'], '106')
+        self.assertIs(self.handler.SYMBOLDICT['MCX|CRUDEOIL19MAR26F'], tick)
+        self.assertIs(self.handler.SYMBOLDICT['MCX|CRUDEOIL'], tick)
+
+        self.assertEqual(self.callback.call_count, 2)
+        first, second = (c.args[1] for c in self.callback.call_args_list)
+        self.assertIsNot(first, second) # buffered ticks keep their own snapshot
+        self.assertEqual(self.handler.get_ingest_stats()['processed'], 2)
+
+    def test_inline_mode(self):
+        handler = TickHandler(MagicMock(), MagicMock(TOKEN_TO_SYMBOL={}, TOKEN_TO_COMPANY={}), '/tmp', 'nse')
+        handler.INGEST_SHARDS = 0
+        conn = FakeConnection()
+        handler.start_live_feed(conn, ['NSE|9'])
+        conn.on_tick(_msg('9', 10), '9', 'NSE')
+        self.assertIsNone(handler.ingest)
+        self.assertEqual(handler.SYMBOLDICT['NSE|9']['ltp'], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
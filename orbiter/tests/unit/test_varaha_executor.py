@@ -0,0 +1,75 @@
+import os
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from orbiter.core.broker.order_store import OrderStore  # noqa: E402
+from varaha_executor import VarahaExecutor  # noqa: E402
+
+
+class FakeApi:
+    """Order history per order id; wings listed in `filled` complete, the rest stay OPEN."""
+
+    def __init__(self, filled=()):
+        self.filled = set(filled)
+        self.cancelled = []
+
+    def single_order_history(self, orderno):
+        if orderno in self.filled:
+            return [{'status': 'COMPLETE', 'fillshares': '200'}]
+        return [{'status': 'OPEN', 'fillshares': '0'}]
+
+    def cancel_order(self, orderno):
+        self.cancelled.append(orderno)
+        return {'stat': 'Ok'}
+
+
+class PlacingExecutor(VarahaExecutor):
+    """place_varaha_order only simulates; this one 'places' with ids named after the leg."""
+
+    def place_varaha_order(self, buy_or_sell, symbol_info, quantity, price=None):
+        record = {'side': buy_or_sell, 'symbol': symbol_info['tsym'], 'quantity': quantity,
+                  'limit_price': symbol_info['ltp'], 'timestamp': '09:20:00.000',
+                  'order_id': f"{buy_or_sell}_{symbol_info['tsym']}", 'status': 'PLACED'}
+        with self._log_lock:
+            self.order_log.append(record)
+        return record
+
+
+LEGS = {
+    'buy_ce': {'exchange': 'NFO', 'tsym': 'WING_CE', 'ltp': 50.0},
+    'buy_pe': {'exchange': 'NFO', 'tsym': 'WING_PE', 'ltp': 48.0},
+    'sell_ce': {'exchange': 'NFO', 'tsym': 'ATM_CE', 'ltp': 125.0},
+    'sell_pe': {'exchange': 'NFO', 'tsym': 'ATM_PE', 'ltp': 118.0},
+    'lot_size': 50,
+}
+
+
+class TestVarahaFillTimeout(unittest.TestCase):
+    def test_unfilled_wing_rolls_the_butterfly_back(self):
+        api = FakeApi(filled={'BUY_WING_CE'})
+        executor = PlacingExecutor(api, order_store=OrderStore(api), fill_timeout=0.5)
+        result = executor.execute_iron_butterfly(LEGS, lots=4)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['straddle_ordered'], 0)
+        self.assertNotIn('SELL_ATM_CE', [o['order_id'] for o in executor.order_log])
+        actions = {(a['name'], a['action']) for a in result['rolled_back']}
+        self.assertEqual(actions, {('buy_pe', 'cancel'), ('buy_ce', 'reverse')})
+        self.assertEqual(api.cancelled, ['BUY_WING_PE'])
+        self.assertIn('SELL_WING_CE', [o['order_id'] for o in executor.order_log])
+
+    def test_filled_wings_release_the_straddle(self):
+        api = FakeApi(filled={'BUY_WING_CE', 'BUY_WING_PE', 'SELL_ATM_CE', 'SELL_ATM_PE'})
+        executor = PlacingExecutor(api, order_store=OrderStore(api), fill_timeout=5.0)
+        result = executor.execute_iron_butterfly(LEGS, lots=4)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['rolled_back'], [])
+        self.assertEqual([o['side'] for o in executor.order_log], ['BUY', 'BUY', 'SELL', 'SELL'])
+
+
+if __name__ == '__main__':
+    unittest.main()
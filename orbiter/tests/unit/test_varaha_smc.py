@@ -0,0 +1,183 @@
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from collections import deque
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from orbiter.utils.supertrend import supertrend  # noqa: E402
+from varaha_multiframe_supertrend import compute_multiframe_supertrend  # noqa: E402
+from varaha_smc_and_logger import CSVLogger, SMCState, compute_smc_indicators, export_to_csv  # noqa: E402
+
+
+class FakeBuffer:
+    """IndicatorBuffer stand-in: the same rolling deque of OHLC dicts."""
+
+    def __init__(self, maxlen=200):
+        self.buf = deque(maxlen=maxlen)
+
+    def append(self, o, h, l, c, v=0):
+        self.buf.append({"open": o, "high": h, "low": l, "close": c, "volume": v})
+
+
+def random_session(n=375, seed=7, start=25000.0):
+    rng = random.Random(seed)
+    bars, close = [], start
+    for _ in range(n):
+        o = close
+        close = o + rng.gauss(0, 8)
+        h = max(o, close) + abs(rng.gauss(0, 4))
+        l = min(o, close) - abs(rng.gauss(0, 4))
+        bars.append((o, h, l, close))
+    return bars
+
+
+class TestSMCIndicators(unittest.TestCase):
+    def feed(self, bars):
+        buf = FakeBuffer()
+        smc = {}
+        for bar in bars:
+            buf.append(*bar)
+            smc = compute_smc_indicators(buf)
+        return smc
+
+    def test_bos_order_block_and_fvg_mitigation(self):
+        bars = [
+            (100, 101, 99, 100.5),
+            (100.5, 102, 100, 101.5),
+            (101.5, 105, 101, 104),     # swing high 105
+            (104, 104.5, 102, 102.5),
+            (102.5, 103, 101.5, 102),   # last down candle before the break
+            (102, 106.5, 101.8, 106),   # closes above 105: BOS
+        ]
+        smc = self.feed(bars)
+        self.assertEqual(smc["swing_high"], 105)
+        self.assertEqual((smc["structure_type"], smc["structure_confirmed"]), ("bos_bullish", True))
+        self.assertEqual((smc["ob_zone_high"], smc["ob_zone_low"], smc["ob_strength"]), (103, 101.5, 1))
+
+        bars.append((106, 108, 106, 107.5))  # low 106 above the high two bars back (103)
+        smc = self.feed(bars)
+        self.assertEqual((smc["fvg_high"], smc["fvg_low"], smc["fvg_mitigated"]), (106, 103, False))
+
+        bars += [(107.5, 108.2, 106.8, 107), (107, 107.2, 102.8, 103.2)]
+        smc = self.feed(bars)
+        self.assertTrue(smc["fvg_mitigated"])
+        self.assertEqual(smc["ob_zone_low"], 101.5)  # held above the block: still valid
+
+    def test_sweep_then_bearish_break(self):
+        bars = [
+            (100, 100, 98, 99),
+            (99, 99.5, 97, 97.5),
+            (97.5, 98, 95, 96),         # swing low 95
+            (96, 98, 96.5, 97.8),
+            (97.8, 99, 97, 98.5),
+            (98.5, 99, 94.5, 97),       # wick below, close back inside
+        ]
+        smc = self.feed(bars)
+        self.assertEqual(smc["swing_low"], 95)
+        self.assertTrue(smc["liquidity_swept"])
+        self.assertIsNone(smc["structure_type"])
+
+        bars.append((97, 97.5, 94, 94.2))
+        smc = self.feed(bars)
+        self.assertFalse(smc["liquidity_swept"])
+        self.assertEqual(smc["structure_type"], "bos_bearish")
+        self.assertEqual((smc["ob_zone_high"], smc["ob_zone_low"]), (99, 97))
+
+    def test_per_minute_calls_match_single_pass_past_buffer_length(self):
+        buf = FakeBuffer(maxlen=200)
+        reference = SMCState()
+        for o, h, l, c in random_session():
+            buf.append(o, h, l, c)
+            reference.update(buf.buf[-1])
+            self.assertEqual(compute_smc_indicators(buf), reference.snapshot())
+        self.assertEqual(reference.count, 375)
+
+    def test_empty_buffer(self):
+        self.assertEqual(compute_smc_indicators(FakeBuffer()), {})
+
+
+class TestMultiframeSuperTrend(unittest.TestCase):
+    def test_higher_timeframes_match_aggregated_series(self):
+        bars = random_session()
+        buf = FakeBuffer()
+        snaps = []
+        for bar in bars:
+            buf.append(*bar)
+            snaps.append(compute_multiframe_supertrend(buf))
+
+        arr = np.array(bars)
+        for minutes in (1, 5, 15):
+            n = len(bars) // minutes * minutes
+            blocks = arr[:n].reshape(-1, minutes, 4)
+            line, direction = supertrend(blocks[:, :, 1].max(axis=1), blocks[:, :, 2].min(axis=1), blocks[:, -1, 3])
+            last = snaps[n - 1]
+            self.assertAlmostEqual(last[f"st_{minutes}min_value"], round(line[-1], 2))
+            self.assertEqual(last[f"st_{minutes}min_direction"], "bullish" if direction[-1] == 1 else "bearish")
+
+    def test_higher_timeframe_only_advances_on_close(self):
+        buf = FakeBuffer()
+        values = []
+        for bar in random_session(n=200):
+            buf.append(*bar)
+            values.append(compute_multiframe_supertrend(buf)["st_5min_value"])
+        self.assertIsNone(values[93])  # 19 five-minute bars needed
+        self.assertIsNotNone(values[94])
+        self.assertTrue(all(values[i] == values[i - 1] for i in range(95, 200) if i % 5 != 4))
+
+    def test_consensus(self):
+        buf = FakeBuffer()
+        for i in range(400):
+            buf.append(100 + i, 101 + i, 99.5 + i, 100.8 + i)
+            st = compute_multiframe_supertrend(buf)
+        self.assertEqual(st["st_consensus"], "bullish")
+        self.assertEqual(compute_multiframe_supertrend(FakeBuffer()), {})
+
+
+class TestCSVLogger(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_export_appends_rows_and_rotates_old_days(self):
+        class Cursor:
+            description = [("timestamp",), ("index_name",), ("spot",)]
+
+            def __init__(self, row):
+                self.row = row
+
+            def fetchone(self):
+                return self.row
+
+        class Db:
+            def execute(self, sql, params):
+                return Cursor((params[0], params[1], 25000.0))
+
+        for name in ("NIFTY_2026-10-16.csv", "NIFTY_2026-09-01.csv"):
+            with open(os.path.join(self.workdir, name), "w") as f:
+                f.write("timestamp\n")
+
+        logger = CSVLogger(self.workdir, retention_days=14, compress_old=True)
+        export_to_csv(logger, Db(), "2026-10-19 09:16:00", "2026-10-19", "NIFTY")
+        export_to_csv(logger, Db(), "2026-10-19 09:17:00", "2026-10-19", "NIFTY")
+
+        with open(logger.path_for("NIFTY", "2026-10-19")) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "timestamp,index_name,spot")
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(sorted(os.listdir(self.workdir)), ["NIFTY_2026-10-16.csv.gz", "NIFTY_2026-10-19.csv"])
+        with gzip.open(os.path.join(self.workdir, "NIFTY_2026-10-16.csv.gz"), "rt") as f:
+            self.assertEqual(f.read(), "timestamp\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,8 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from orbiter.utils.calibration import Calibrator
+
 DATA_DIR = "backtest_lab/data/intraday1pct"
 INDEX_NAME = "NIFTY 50"
 
@@ -224,41 +226,24 @@ def test_indicator_thresholds(df):
     print(f"\nTotal days: {total_count}, Sideways: {sideways_count} ({sideways_count/total_count*100:.1f}%)")
     print("-"*80)
     
+    # One vectorized sweep over every (indicator, op, threshold) instead of re-filtering per threshold
+    op_map = {'less': '<', 'abs_less': 'abs<', 'equals': '=='}
+    grid = {indicator: {op_map[op]: thresholds} for indicator, op, thresholds in tests if indicator in df.columns}
+    calibrator = Calibrator(df[list(grid)], df['is_sideways'], min_signals=0)
+    table = calibrator.sweep(grid).fillna({'precision': 0.0, 'recall': 0.0})
+    
     best_results = []
     
-    for indicator, op, thresholds in tests:
-        if indicator not in df.columns:
-            continue
-            
+    for indicator in grid:
         print(f"\n{indicator}:")
         
-        for thresh in thresholds:
-            if op == 'less':
-                predicted = df[indicator] < thresh
-            elif op == 'abs_less':
-                predicted = df[indicator].abs() < thresh
-            elif op == 'equals':
-                predicted = df[indicator] == thresh
-            else:
-                continue
-            
-            # Calculate accuracy
-            correct = (predicted == df['is_sideways']).sum()
-            accuracy = correct / len(df) * 100
-            
-            # Precision (when we predict sideways, how often correct)
-            true_positive = (predicted & df['is_sideways']).sum()
-            predicted_sideways = predicted.sum()
-            precision = (true_positive / predicted_sideways * 100) if predicted_sideways > 0 else 0
-            
-            # Recall (how many sideways days did we catch)
-            recall = (true_positive / sideways_count * 100) if sideways_count > 0 else 0
-            
-            print(f"  thresh={thresh}: accuracy={accuracy:.1f}%, precision={precision:.1f}%, recall={recall:.1f}%")
+        for _, row in table[table['indicator'] == indicator].sort_values('threshold').iterrows():
+            accuracy, precision, recall = row['accuracy'] * 100, row['precision'] * 100, row['recall'] * 100
+            print(f"  thresh={row['threshold']}: accuracy={accuracy:.1f}%, precision={precision:.1f}%, recall={recall:.1f}%")
             
             best_results.append({
                 'indicator': indicator,
-                'threshold': thresh,
+                'threshold': row['threshold'],
                 'accuracy': accuracy,
                 'precision': precision,
                 'recall': recall
@@ -278,41 +263,36 @@ def test_composite_score(df):
     print("TESTING COMPOSITE SIDEWAYS SCORE")
     print("="*80)
     
-    # Create composite score
-    df = df.copy()
-    
-    # Score 1: Day range small
-    df['score_range'] = (df['day_range_pct'] < 1.0).astype(int)
-    
-    # Score 2: First hour range small
-    df['score_fhour'] = (df['first_hour_range_pct'] < 0.5).astype(int)
-    
-    # Score 3: Near VWAP
-    df['score_vwap'] = (df['vwap_deviation_pct'].abs() < 0.3).astype(int)
-    
-    # Score 4: Within ORB
-    df['score_orb'] = df['within_orb'].astype(int)
-    
-    # Score 5: NR4 (narrowest)
-    df['score_nr4'] = df['nr4_is_narrowest'].astype(int)
-    
-    # Score 6: BB middle
-    df['score_bb'] = df['bb_middle'].astype(int)
+    # Score 1: Day range small, 2: First hour range small, 3: Near VWAP,
+    # 4: Within ORB, 5: NR4 (narrowest), 6: BB middle
+    conditions = [
+        ('day_range_pct', '<', 1.0),
+        ('first_hour_range_pct', '<', 0.5),
+        ('vwap_deviation_pct', 'abs<', 0.3),
+        ('within_orb', '==', 1),
+        ('nr4_is_narrowest', '==', 1),
+        ('bb_middle', '==', 1),
+    ]
+    calibrator = Calibrator(df[[c[0] for c in conditions]], df['is_sideways'], min_signals=0)
     
-    df['total_score'] = df['score_range'] + df['score_fhour'] + df['score_vwap'] + df['score_orb'] + df['score_nr4'] + df['score_bb']
+    # Every weight vector in {0, 1, 2}^6 and every min score in one pass; equal weights is one row of it
+    table = calibrator.sweep_composite(conditions, weights=(0, 1, 2)).fillna({'precision': 0.0, 'recall': 0.0})
+    weight_cols = [c for c in table.columns if c.startswith('w:')]
+    equal = table[(table[weight_cols] == 1).all(axis=1)]
     
     print("\nScore breakdown:")
     for score_thresh in [2, 3, 4]:
-        predicted = df['total_score'] >= score_thresh
-        correct = (predicted == df['is_sideways']).sum()
-        accuracy = correct / len(df) * 100
-        
-        true_positive = (predicted & df['is_sideways']).sum()
-        predicted_sideways = predicted.sum()
-        precision = (true_positive / predicted_sideways * 100) if predicted_sideways > 0 else 0
-        recall = (true_positive / df['is_sideways'].sum() * 100) if df['is_sideways'].sum() > 0 else 0
-        
+        row = equal[equal['min_score'] == score_thresh].iloc[0]
+        accuracy, precision, recall = row['accuracy'] * 100, row['precision'] * 100, row['recall'] * 100
         print(f"  score >= {score_thresh}: accuracy={accuracy:.1f}%, precision={precision:.1f}%, recall={recall:.1f}%")
+    
+    tuned = table[table['signals'] >= max(5, len(df) // 20)]
+    if len(tuned):
+        best = tuned.iloc[0]
+        print(f"\n>>> BEST WEIGHTS (of {len(table)} combinations): score >= {best['min_score']:g}, "
+              f"precision={best['precision']*100:.1f}%, recall={best['recall']*100:.1f}%")
+        print(json.dumps(calibrator.to_filters(best, name='sideways_score'), indent=2))
+    return table
 
 def main():
     print(f"Analyzing {INDEX_NAME} intraday data...")
@@ -0,0 +1,219 @@
+# orbiter/utils/calibration.py
+"""
+Threshold calibration over a (days x indicators) feature matrix.
+
+`Calibrator(features, outcome, returns=None, folds=4)` scores rules of the form
+`indicator <op> threshold` (ops: < <= > >= == abs<) and weighted composites of
+such conditions against a boolean outcome (e.g. `is_sideways`, "range >= 1%").
+
+- `sweep()`: every operator x threshold for every indicator. Each indicator is
+  sorted once; counts, hits and summed returns for all thresholds then come from
+  `searchsorted` into cumulative sums - no per-threshold re-filtering.
+- `sweep_composite()`: every weight vector (product of `weights` per condition) x
+  every `min_score`, as one matrix product plus a broadcast comparison.
+- Rows are time-ordered and cut into `folds` contiguous blocks. Tables carry the
+  per-fold spread (wf_precision_min, wf_expectancy_mean) and `walk_forward()`
+  picks the best rule on folds[:k] and reports it on fold k.
+- `to_filters()` turns table rows into a filters.json fragment.
+
+Expectancy is the mean of `returns` over the days a rule fires; without
+`returns` a hit counts +1 and a miss -1.
+"""
+
+import itertools
+import warnings
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+OPS = ('<', '<=', '>', '>=', '==', 'abs<')
+
+
+def predicate(values, op: str, threshold: float) -> np.ndarray:
+    """Boolean mask for `values <op> threshold` (NaN never fires)."""
+    x = np.asarray(values, dtype=float)
+    if op == 'abs<':
+        x, op = np.abs(x), '<'
+    with np.errstate(invalid='ignore'):
+        if op == '<':
+            return x < threshold
+        if op == '<=':
+            return x <= threshold
+        if op == '>':
+            return x > threshold
+        if op == '>=':
+            return x >= threshold
+        if op == '==':
+            return x == threshold
+    raise ValueError(f"Unknown operator: {op}")
+
+
+def default_thresholds(values, n: int = 50) -> np.ndarray:
+    """Up to `n` distinct quantiles of the column (1%..99%); 0/1 flags get [0, 1]."""
+    x = np.asarray(values, dtype=float)
+    x = x[~np.isnan(x)]
+    if x.size == 0:
+        return np.array([])
+    if np.isin(x, (0.0, 1.0)).all():
+        return np.array([0.0, 1.0])
+    return np.unique(np.quantile(x, np.linspace(0.01, 0.99, n)))
+
+
+def _cumulative_counts(x, y, r, thresholds, op):
+    """(signals, hits, summed returns) of `x <op> t` for every t, from one sort of x."""
+    valid = ~np.isnan(x)
+    x, y, r = x[valid], y[valid], r[valid]
+    if op == 'abs<':
+        x, op = np.abs(x), '<'
+    order = np.argsort(x, kind='mergesort')
+    xs = x[order]
+    cum_y = np.concatenate(([0.0], np.cumsum(y[order])))
+    cum_r = np.concatenate(([0.0], np.cumsum(r[order])))
+    lo = np.searchsorted(xs, thresholds, 'left')
+    hi = np.searchsorted(xs, thresholds, 'right')
+    a, b = {'<': (0, lo), '<=': (0, hi), '>': (hi, len(xs)), '>=': (lo, len(xs)), '==': (lo, hi)}[op]
+    a = np.broadcast_to(a, np.shape(thresholds))
+    b = np.broadcast_to(b, np.shape(thresholds))
+    return b - a, cum_y[b] - cum_y[a], cum_r[b] - cum_r[a]
+
+
+class Calibrator:
+    """See the module docstring."""
+
+    def __init__(self, features: pd.DataFrame, outcome, returns=None, folds: int = 4, min_signals: int = 10):
+        self.features = features.reset_index(drop=True)
+        self.y = np.asarray(outcome, dtype=bool)
+        self.r = np.where(self.y, 1.0, -1.0) if returns is None else np.asarray(returns, dtype=float)
+        self.folds = max(1, int(folds))
+        self.min_signals = min_signals
+        n = len(self.y)
+        self.fold = np.minimum(np.arange(n) * self.folds // max(n, 1), self.folds - 1)
+        self.fold_total = np.bincount(self.fold, minlength=self.folds).astype(float)
+        self.fold_positives = np.bincount(self.fold, weights=self.y, minlength=self.folds)
+        self._last = None
+        self._conditions: List[Tuple[str, str, float]] = []
+
+    # ---- sweeps
+    def sweep(self, grid: Dict[str, Iterable[float]] = None, operators: Sequence[str] = ('<', '>'),
+              n_thresholds: int = 50) -> pd.DataFrame:
+        """
+        One row per (indicator, op, threshold). `grid` maps indicator -> thresholds
+        (default: quantiles of every column) and may map to {op: thresholds} instead.
+        """
+        keys, counts = [], []
+        for name in (grid or self.features.columns):
+            x = self.features[name].to_numpy(dtype=float)
+            spec = (grid or {}).get(name)
+            if spec is None:
+                spec = default_thresholds(x, n_thresholds)
+            by_op = spec if isinstance(spec, dict) else {op: spec for op in operators}
+            for op, thresholds in by_op.items():
+                t = np.asarray(sorted(thresholds), dtype=float)
+                if t.size == 0:
+                    continue
+                per_fold = [_cumulative_counts(x[self.fold == f], self.y[self.fold == f], self.r[self.fold == f], t, op)
+                            for f in range(self.folds)]
+                counts.append(np.stack([np.stack(c, axis=-1) for c in per_fold], axis=1))  # (t, folds, 3)
+                keys.append(pd.DataFrame({'indicator': name, 'op': op, 'threshold': t}))
+        if not keys:
+            return pd.DataFrame()
+        return self._table(pd.concat(keys, ignore_index=True), np.concatenate(counts))
+
+    def sweep_composite(self, conditions: Sequence[Tuple[str, str, float]], weights: Sequence[float] = (0, 1),
+                        min_scores: Iterable[float] = None, chunk: int = 128) -> pd.DataFrame:
+        """
+        Score = sum(weight_i * condition_i). One row per (weight vector, min_score);
+        every vector in product(weights, repeat=len(conditions)) except all zeros.
+        """
+        self._conditions = [(c[0], c[1], float(c[2])) for c in conditions]
+        hits = np.column_stack([predicate(self.features[i], op, t) for i, op, t in self._conditions]).astype(np.float32)
+        W = np.array([w for w in itertools.product(weights, repeat=len(self._conditions)) if any(w)], dtype=np.float32)
+        T = (np.arange(1, int(np.ceil(W.sum(axis=1).max())) + 1) if min_scores is None
+             else np.asarray(sorted(min_scores))).astype(np.float32)
+
+        onehot = np.eye(self.folds)[self.fold]  # (days, folds)
+        weighted = np.stack([onehot, onehot * self.y[:, None], onehot * self.r[:, None]], axis=-1)  # (days, folds, 3)
+        counts = []
+        for start in range(0, len(W), chunk):
+            scores = hits @ W[start:start + chunk].T  # (days, m)
+            fired = (scores[:, :, None] >= T[None, None, :]).astype(float)  # (days, m, scores)
+            counts.append(np.einsum('nms,nfk->msfk', fired, weighted).reshape(-1, self.folds, 3))
+
+        labels = [self.label(c) for c in self._conditions]
+        keys = pd.DataFrame(np.repeat(W, len(T), axis=0), columns=[f"w:{l}" for l in labels])
+        keys.insert(0, 'min_score', np.tile(T, len(W)))
+        return self._table(keys, np.concatenate(counts))
+
+    @staticmethod
+    def label(condition: Tuple[str, str, float]) -> str:
+        return f"{condition[0]} {condition[1]} {condition[2]:g}"
+
+    # ---- statistics
+    def _metrics(self, n, tp, r, positives, total) -> Dict[str, np.ndarray]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'signals': n,
+                'precision': np.where(n > 0, tp / n, np.nan),
+                'recall': np.where(positives > 0, tp / positives, np.nan),
+                'accuracy': (total - positives - n + 2 * tp) / total,
+                'expectancy': np.where(n > 0, r / n, np.nan),
+            }
+
+    def _table(self, keys: pd.DataFrame, counts: np.ndarray) -> pd.DataFrame:
+        """counts: (combinations, folds, [signals, hits, returns])."""
+        self._last = (keys, counts)
+        n, tp, r = counts[..., 0], counts[..., 1], counts[..., 2]
+        full = self._metrics(n.sum(1), tp.sum(1), r.sum(1), self.fold_positives.sum(), self.fold_total.sum())
+        per_fold = self._metrics(n, tp, r, self.fold_positives, self.fold_total)
+        table = keys.assign(**full)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN rows: the rule never fires in any fold
+            table['wf_precision_min'] = np.nanmin(per_fold['precision'], axis=1)
+            table['wf_expectancy_mean'] = np.nanmean(per_fold['expectancy'], axis=1)
+        table['wf_signals_min'] = n.min(axis=1)
+        table = table[table['signals'] >= self.min_signals]
+        return table.sort_values(['precision', 'expectancy'], ascending=False).reset_index(drop=True)
+
+    def walk_forward(self, metric: str = 'precision') -> pd.DataFrame:
+        """For k = 1..folds-1: best rule of the last sweep on folds[:k] by `metric`, scored on fold k."""
+        if self._last is None:
+            raise ValueError("walk_forward() needs a sweep first")
+        keys, counts = self._last
+        train = np.cumsum(counts, axis=1)
+        rows = []
+        for k in range(1, self.folds):
+            tr = self._metrics(train[:, k - 1, 0], train[:, k - 1, 1], train[:, k - 1, 2],
+                               self.fold_positives[:k].sum(), self.fold_total[:k].sum())
+            score = np.where(tr['signals'] >= self.min_signals, np.nan_to_num(tr[metric], nan=-np.inf), -np.inf)
+            best = int(np.argmax(score))
+            if not np.isfinite(score[best]):
+                continue
+            te = self._metrics(counts[best, k, 0], counts[best, k, 1], counts[best, k, 2],
+                               self.fold_positives[k], self.fold_total[k])
+            row = {'fold': k, **keys.iloc[best].to_dict(), f"train_{metric}": tr[metric][best]}
+            row.update({f"test_{name}": float(value) for name, value in te.items()})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    # ---- output
+    def to_filters(self, rows: pd.DataFrame, section: str = 'entry', name: str = 'calibrated_score') -> Dict:
+        """
+        filters.json fragment. Threshold rows (best row per indicator wins) become
+        `{section: {indicator: {enabled, operator, threshold}}}`; a composite row becomes
+        `{'scoring': {name: {enabled, min_score, conditions: {indicator: {operator, threshold, weight}}}}}`.
+        """
+        if isinstance(rows, pd.Series):
+            rows = rows.to_frame().T
+        if 'indicator' in rows:
+            out = {}
+            for _, row in rows.drop_duplicates('indicator').iterrows():
+                out[row['indicator']] = {'enabled': True, 'operator': row['op'], 'threshold': round(float(row['threshold']), 6)}
+            return {section: out}
+        row = rows.iloc[0]
+        conditions = {}
+        for indicator, op, threshold in self._conditions:
+            weight = float(row[f"w:{self.label((indicator, op, threshold))}"])
+            if weight:
+                conditions[indicator] = {'operator': op, 'threshold': threshold, 'weight': weight}
+        return {'scoring': {name: {'enabled': True, 'min_score': float(row['min_score']), 'conditions': conditions}}}
@@ -0,0 +1,126 @@
+# orbiter/utils/config_bundle.py
+"""
+Config Bundle - parsed JSON configs cached in one file for fast cold starts.
+
+Once `ConfigBundle.activate(project_root)` is called (orbiter/main.py does), every
+`ConfigLoader.load_json_file` is served from the bundle: one read of
+`orbiter/data/cache/config_bundle_<key>.pkl` at startup, then a `stat` per file to
+check its entry is still current (mtime + size). Stale or new files are parsed
+normally and the bundle is rewritten at exit. `<key>` hashes the project root and
+interpreter version, so checkouts and Python upgrades never share a bundle.
+
+Compiled `rule_engine` rules are shared in-process through `compile_rule`. They are
+not stored on disk: unpickling a Rule costs more than compiling it.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("ORBITER")
+
+BUNDLE_VERSION = 1
+
+
+class ConfigBundle:
+    _active: Optional['ConfigBundle'] = None
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._entries: Dict[str, tuple] = {} # abs path -> (mtime_ns, size, pickled payload)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._read()
+
+    # ------------------------------------------------------------ lifecycle
+    @classmethod
+    def activate(cls, project_root: str, cache_path: str = None) -> 'ConfigBundle':
+        """Serve ConfigLoader reads from the bundle for the rest of the process."""
+        if cls._active is None:
+            if cache_path is None:
+                key = hashlib.sha1(f"{os.path.abspath(project_root)}|{sys.version}|{BUNDLE_VERSION}".encode()).hexdigest()[:12]
+                cache_path = os.path.join(project_root, 'orbiter', 'data', 'cache', f"config_bundle_{key}.pkl")
+            cls._active = cls(cache_path)
+            atexit.register(cls._active.save)
+        return cls._active
+
+    @classmethod
+    def active(cls) -> Optional['ConfigBundle']:
+        return cls._active
+
+    @classmethod
+    def deactivate(cls):
+        if cls._active is not None:
+            cls._active.save()
+        cls._active = None
+
+    def _read(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == BUNDLE_VERSION:
+                self._entries = data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"⚠️ Config bundle unreadable, rebuilding: {e}")
+            self._entries = {}
+
+    def save(self) -> bool:
+        """Write the bundle if any entry changed. Returns True if written."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_file = self.cache_path + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({'version': BUNDLE_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_path)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Config bundle save failed: {e}")
+            return False
+
+    # ---------------------------------------------------------------- reads
+    def load_json(self, file_path: str) -> Any:
+        """Parsed JSON for `file_path` (a fresh object per call). Raises like open/json.load."""
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self.hits += 1
+            return pickle.loads(entry[2])
+
+        with open(path, 'r') as f:
+            data = json.load(f)
+        with self._lock:
+            self._entries[path] = (st.st_mtime_ns, st.st_size, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+            self._dirty = True
+        self.misses += 1
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "path": self.cache_path}
+
+
+_RULES: Dict[str, Any] = {}
+
+
+def compile_rule(expression: str):
+    """rule_engine.Rule for `expression`, compiled once per process and shared."""
+    rule = _RULES.get(expression)
+    if rule is None:
+        import rule_engine
+        rule = _RULES[expression] = rule_engine.Rule(expression)
+    return rule
@@ -4,6 +4,8 @@ import os
 import json
 import logging
 
+from orbiter.utils.config_bundle import ConfigBundle
+
 logger = logging.getLogger(__name__)
 
 class ConfigLoader:
@@ -14,27 +16,46 @@ class ConfigLoader:
     
     @staticmethod
     def load_json_file(file_path: str) -> dict:
-        """Load a JSON file with error handling."""
+        """Load a JSON file with error handling (served from the ConfigBundle when one is active)."""
         if os.path.exists(file_path):
             try:
+                bundle = ConfigBundle.active()
+                if bundle is not None:
+                    return bundle.load_json(file_path)
                 with open(file_path, 'r') as f:
                     return json.load(f)
             except Exception as e:
                 logger.error(f"Failed to load {file_path}: {e}")
         return {}
 
+    # manifest path -> (mtime_ns, size, parsed manifest); shared read-only by get_path
+    _manifests: dict = {}
+
     @staticmethod
     def load_manifest(project_root: str) -> dict:
         """Load the master manifest.json registry."""
         return ConfigLoader.load_json_file(os.path.join(project_root, 'manifest.json'))
 
+    @staticmethod
+    def _cached_manifest(project_root: str) -> dict:
+        """Parsed manifest, re-read only when its mtime or size changes. Callers must not mutate it."""
+        path = os.path.join(project_root, 'manifest.json')
+        try:
+            st = os.stat(path)
+        except OSError:
+            return {}
+        entry = ConfigLoader._manifests.get(path)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            entry = ConfigLoader._manifests[path] = (st.st_mtime_ns, st.st_size, ConfigLoader.load_json_file(path))
+        return entry[2]
+
     @staticmethod
     def get_path(project_root: str, category: str, item: str) -> str | None:
         """
         Resolve an absolute path for a manifest entry.
         Example: get_path(root, 'mandatory_files', 'system_config')
         """
-        manifest = ConfigLoader.load_manifest(project_root)
+        manifest = ConfigLoader._cached_manifest(project_root)
         rel_path = manifest.get(category, {}).get(item)
         if rel_path:
             path = os.path.join(project_root, rel_path)
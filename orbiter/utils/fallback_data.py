@@ -0,0 +1,219 @@
+# orbiter/utils/fallback_data.py
+"""
+Fallback Data - proxy indicators (NIFTY, SENSEX, MCX commodity futures) served from memory.
+
+When broker candles are short, FactCalculator falls back to Yahoo Finance proxies.
+The scan never fetches: `get(symbol)` only reads the in-memory cache, and a miss
+on a new symbol registers it and wakes the background worker. The worker prefetches
+the known proxies at start and refreshes every symbol older than `refresh_interval`;
+entries older than `ttl` are no longer served. A symbol whose fetch fails is retried
+after `retry_delay`, doubling per consecutive failure up to `max_retry_delay`.
+
+`ORBITER_FALLBACK_DATA_FILE=<path.json>` swaps Yahoo for `FileFallbackSource`
+(`{"^NSEI": {"adx": 22.5, ...}, ...}`) so offline runs and tests never hit the network.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from orbiter.utils.yf_adapter import INDEX_SYMBOLS, MCX_YF_SYMBOLS
+
+logger = logging.getLogger("ORBITER")
+
+FALLBACK_FILE_ENV = "ORBITER_FALLBACK_DATA_FILE"
+
+
+# ----------------------------------------------------------------- sources
+class YahooFallbackSource:
+    """Blocking yfinance download + indicator calc; only ever called by the worker."""
+
+    def __init__(self, interval: str = '5m'):
+        self.interval = interval
+
+    def fetch(self, symbol: str) -> Dict[str, Any]:
+        from orbiter.utils.yf_adapter import fetch_indicators
+        return fetch_indicators(symbol, self.interval)
+
+
+class FileFallbackSource:
+    """Indicators per symbol from a JSON file, re-read when it changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+        self._data: Dict[str, Dict[str, Any]] = {}
+
+    def fetch(self, symbol: str) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime != self._mtime:
+                with open(self.path, 'r') as f:
+                    self._data = json.load(f)
+                self._mtime = mtime
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Fallback data file unreadable ({self.path}): {e}")
+            return {}
+        return dict(self._data.get(symbol) or {})
+
+
+# ---------------------------------------------------------------- provider
+class FallbackDataProvider:
+    _instance: Optional['FallbackDataProvider'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, source=None, symbols: Iterable[str] = (), ttl: float = 900.0,
+                 refresh_interval: float = 240.0, clock: Callable[[], float] = time.time,
+                 retry_delay: float = 30.0, max_retry_delay: float = 600.0):
+        self.source = source or YahooFallbackSource()
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._clock = clock
+        self._entries: Dict[str, tuple] = {} # symbol -> (indicators, fetched_at)
+        self._failures: Dict[str, tuple] = {} # symbol -> (consecutive failures, retry_at)
+        self._symbols = list(dict.fromkeys(symbols))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.last_fetch_ms = 0.0
+
+    @classmethod
+    def get_instance(cls) -> 'FallbackDataProvider':
+        """Process-wide provider for the default proxies, started on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    path = os.environ.get(FALLBACK_FILE_ENV)
+                    source = FileFallbackSource(path) if path else YahooFallbackSource()
+                    symbols = [INDEX_SYMBOLS['NIFTY'], INDEX_SYMBOLS['SENSEX'], *MCX_YF_SYMBOLS.values()]
+                    cls._instance = cls(source=source, symbols=symbols)
+                    cls._instance.start()
+        return cls._instance
+
+    # ------------------------------------------------------------------ reads
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached indicators for `symbol`, or None. Never blocks on a fetch."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self.hits += 1
+                return dict(entry[0])
+            if entry is None:
+                self.misses += 1
+            else:
+                self.stale += 1
+            if symbol in self._symbols:
+                # Already queued: the worker refreshes it on its own schedule (and failure backoff)
+                return None
+            self._symbols.append(symbol)
+        self._wake.set()
+        return None
+
+    def age(self, symbol: str) -> Optional[float]:
+        entry = self._entries.get(symbol)
+        return None if entry is None else self._clock() - entry[1]
+
+    # -------------------------------------------------------------- refreshes
+    def prefetch(self, symbols: Iterable[str]):
+        """Add symbols to the refresh set and wake the worker."""
+        with self._lock:
+            for symbol in symbols:
+                if symbol not in self._symbols:
+                    self._symbols.append(symbol)
+        self._wake.set()
+
+    def refresh_due(self, force: bool = False) -> int:
+        """Fetch every symbol missing or older than refresh_interval. Returns the number refreshed."""
+        now = self._clock()
+        with self._lock:
+            due = [s for s in self._symbols
+                   if force or (now >= self._failures.get(s, (0, 0.0))[1]
+                                and (s not in self._entries or now - self._entries[s][1] >= self.refresh_interval))]
+        refreshed = 0
+        for symbol in due:
+            started = time.perf_counter()
+            try:
+                data = self.source.fetch(symbol)
+            except Exception as e:
+                data = None
+                logger.warning(f"⚠️ Fallback fetch failed for {symbol}: {e}")
+            self.last_fetch_ms = (time.perf_counter() - started) * 1000
+            self.fetches += 1
+            if not data:
+                self.fetch_errors += 1
+                with self._lock:
+                    failures = self._failures.get(symbol, (0, 0.0))[0] + 1
+                    delay = min(self.max_retry_delay, self.retry_delay * 2 ** (failures - 1))
+                    self._failures[symbol] = (failures, self._clock() + delay)
+                continue
+            with self._lock:
+                self._entries[symbol] = (data, self._clock())
+                self._failures.pop(symbol, None)
+            refreshed += 1
+        if refreshed:
+            logger.debug(f"🔄 Fallback data refreshed {refreshed}/{len(due)} symbols")
+        return refreshed
+
+    # -------------------------------------------------------------- lifecycle
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name="FallbackData", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _worker(self):
+        while self._running:
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logger.error(f"❌ Fallback data worker error: {e}")
+            # Sleep until the next refresh is due, or a miss asks for a new symbol
+            self._wake.wait(self._next_wait())
+            self._wake.clear()
+
+    def _next_wait(self) -> float:
+        now = self._clock()
+        with self._lock:
+            due_at = []
+            for symbol in self._symbols:
+                entry = self._entries.get(symbol)
+                at = now if entry is None else entry[1] + self.refresh_interval
+                # Failing symbols (source down/no data) wait out their backoff
+                due_at.append(max(at, self._failures.get(symbol, (0, 0.0))[1]))
+        if not due_at:
+            return self.refresh_interval
+        return max(1.0, min(due_at) - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._symbols),
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "backing_off": len(self._failures),
+            "last_fetch_ms": round(self.last_fetch_ms, 1),
+            "source": type(self.source).__name__
+        }
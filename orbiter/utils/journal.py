@@ -0,0 +1,233 @@
+# orbiter/utils/journal.py
+"""
+State Journal - snapshot + append-only write-ahead journal for JSON state files.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from orbiter.utils.json_helpers import JSONEncoder
+
+logger = logging.getLogger("ORBITER")
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, cls=JSONEncoder, separators=(',', ':'), sort_keys=True)
+
+
+class StateJournal:
+    """
+    Persists a JSON state dict as `<path>` (snapshot) + `<path>.journal` (one record per line).
+
+    `save(data)` diffs `data` against what is already on disk and appends only the
+    changes: `put`/`del` per key of dict sections, `set` for top-level scalars.
+    Sections listed in `append_only` (e.g. exit history) are only checked for new keys.
+    After `compact_every` records the journal is folded into a fresh snapshot, so
+    `load()` replays at most that many records on startup.
+
+    An unchanged save still refreshes `ts_key` (readers judge staleness by it) with a
+    `touch` record, at most once per `touch_interval` seconds.
+
+    fsync policy: 'always' (every save), 'interval' (at most every `fsync_interval`
+    seconds) or 'never' (OS page cache only).
+    """
+
+    def __init__(self, path: str, compact_every: int = 200, fsync: str = 'interval', fsync_interval: float = 1.0,
+                 append_only: Iterable[str] = (), ts_key: str = 'last_updated',
+                 stamp: Callable[[], Any] = time.time, indent: Optional[int] = 4,
+                 touch_interval: float = 60.0):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.append_only = frozenset(append_only)
+        self.ts_key = ts_key
+        self.stamp = stamp
+        self.indent = indent
+        self.touch_interval = touch_interval
+
+        self._seq = 0
+        self._records = 0 # records in the journal since the last snapshot
+        self._baseline: Optional[Dict[str, Any]] = None # section -> {key: compact json} / scalar -> compact json
+        self._last_fsync = 0.0
+        self._last_write = 0.0 # monotonic time of the last snapshot/append
+
+        self._snapshots = 0
+        self._appends = 0
+        self._bytes = 0
+
+    # ----------------------------------------------------------------- write
+    def save(self, data: Dict[str, Any]) -> str:
+        """Persist `data`. Returns 'snapshot', 'journal', 'touch' or 'noop'."""
+        if self._baseline is None or self._records >= self.compact_every:
+            self.snapshot(data)
+            return 'snapshot'
+
+        records = self._diff(data)
+        if not records:
+            if time.monotonic() - self._last_write < self.touch_interval:
+                return 'noop'
+            records = [{'op': 'touch'}] # replay only takes its timestamp
+            if self._records + 1 >= self.compact_every:
+                self.snapshot(data)
+                return 'snapshot'
+            self._append(records)
+            return 'touch'
+        if self._records + len(records) >= self.compact_every:
+            self.snapshot(data)
+            return 'snapshot'
+        self._append(records)
+        return 'journal'
+
+    def snapshot(self, data: Dict[str, Any]):
+        """Write the full state atomically and truncate the journal."""
+        payload = dict(data)
+        payload[self.ts_key] = self.stamp()
+        payload['journal_seq'] = self._seq
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(payload, f, indent=self.indent, cls=JSONEncoder)
+            f.flush()
+            if self.fsync != 'never':
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+        # Records <= journal_seq are already in the snapshot; a crash before this truncate is harmless
+        with open(self.journal_path, 'w'):
+            pass
+        self._records = 0
+        self._baseline = self._fingerprint(data)
+        self._snapshots += 1
+        self._last_write = time.monotonic()
+
+    def clear(self):
+        """Remove snapshot and journal."""
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._baseline = None
+        self._records = 0
+
+    # ------------------------------------------------------------------ read
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Snapshot with journal records replayed, or None if neither exists. Raises on a corrupt snapshot."""
+        data = None
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        records = self._read_journal(after=(data or {}).get('journal_seq', 0))
+        if data is None and not records:
+            return None
+
+        data = data if isinstance(data, dict) else {}
+        for rec in records:
+            op, section = rec.get('op'), rec.get('sec')
+            if op == 'put':
+                target = data.get(section)
+                if not isinstance(target, dict):
+                    target = data[section] = {}
+                target[rec['k']] = rec.get('v')
+            elif op == 'del':
+                (data.get(section) or {}).pop(rec['k'], None)
+            elif op == 'set':
+                data[section] = rec.get('v')
+            if 't' in rec:
+                data[self.ts_key] = rec['t']
+
+        self._seq = max([data.get('journal_seq', 0)] + [rec['s'] for rec in records])
+        self._records = len(records)
+        self._baseline = self._fingerprint({k: v for k, v in data.items() if k not in (self.ts_key, 'journal_seq')})
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self._seq,
+            "pending_records": self._records,
+            "snapshots": self._snapshots,
+            "appends": self._appends,
+            "bytes_appended": self._bytes
+        }
+
+    # -------------------------------------------------------------- internals
+    def _fingerprint(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        baseline = {}
+        for name, value in data.items():
+            if isinstance(value, dict):
+                baseline[name] = {k: (None if name in self.append_only else _compact(v)) for k, v in value.items()}
+            else:
+                baseline[name] = _compact(value)
+        return baseline
+
+    def _diff(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records that turn the baseline into `data`; updates the baseline as it goes."""
+        records = []
+        for name, value in data.items():
+            old = self._baseline.get(name)
+            if isinstance(value, dict) and isinstance(old, dict):
+                for key, item in value.items():
+                    if name in self.append_only:
+                        if key not in old:
+                            old[key] = None
+                            records.append({'op': 'put', 'sec': name, 'k': key, 'v': item})
+                        continue
+                    blob = _compact(item)
+                    if old.get(key) != blob:
+                        old[key] = blob
+                        records.append({'op': 'put', 'sec': name, 'k': key, 'v': item})
+                for key in [k for k in old if k not in value]:
+                    del old[key]
+                    records.append({'op': 'del', 'sec': name, 'k': key})
+            else:
+                blob = _compact(value)
+                if old != blob:
+                    self._baseline[name] = self._fingerprint({name: value})[name]
+                    records.append({'op': 'set', 'sec': name, 'v': value})
+        return records
+
+    def _append(self, records: List[Dict[str, Any]]):
+        now = self.stamp()
+        lines = []
+        for rec in records:
+            self._seq += 1
+            rec['s'] = self._seq
+            rec['t'] = now
+            lines.append(json.dumps(rec, cls=JSONEncoder, separators=(',', ':')))
+        chunk = "\n".join(lines) + "\n"
+        with open(self.journal_path, 'a') as f:
+            f.write(chunk)
+            f.flush()
+            if self.fsync == 'always' or (
+                    self.fsync == 'interval' and time.monotonic() - self._last_fsync >= self.fsync_interval):
+                os.fsync(f.fileno())
+                self._last_fsync = time.monotonic()
+        self._records += len(records)
+        self._appends += 1
+        self._last_write = time.monotonic()
+        self._bytes += len(chunk)
+
+    def _read_journal(self, after: int) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.journal_path):
+            return []
+        records = []
+        with open(self.journal_path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash: everything before it is intact
+                    logger.warning(f"⚠️ Journal {self.journal_path}: ignoring unreadable record at line {line_no}")
+                    break
+                if rec.get('s', 0) > after:
+                    records.append(rec)
+        return records
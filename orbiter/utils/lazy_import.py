@@ -0,0 +1,68 @@
+# orbiter/utils/lazy_import.py
+"""
+Deferred imports for optional integrations (Sheets, yfinance, numba ...).
+
+`gspread = lazy_import("gspread")` binds a proxy; the real import happens on first
+attribute access or call, so a process that never touches the integration never
+pays for it. `mock.patch("pkg.mod.gspread.authorize")` still works: attribute
+writes and deletes are forwarded to the loaded module.
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# "module[.attr]" -> seconds spent importing it (for --profile-startup)
+RESOLVED: Dict[str, float] = {}
+
+_lock = threading.Lock()
+
+
+class LazyImport:
+    __slots__ = ("_lazy_module", "_lazy_attr", "_lazy_target")
+
+    def __init__(self, module: str, attr: Optional[str] = None):
+        object.__setattr__(self, "_lazy_module", module)
+        object.__setattr__(self, "_lazy_attr", attr)
+        object.__setattr__(self, "_lazy_target", None)
+
+    def _load(self) -> Any:
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is not None:
+            return target
+        with _lock:
+            target = object.__getattribute__(self, "_lazy_target")
+            if target is None:
+                module = object.__getattribute__(self, "_lazy_module")
+                attr = object.__getattribute__(self, "_lazy_attr")
+                started = time.perf_counter()
+                target = importlib.import_module(module)
+                if attr:
+                    target = getattr(target, attr)
+                RESOLVED[f"{module}.{attr}" if attr else module] = time.perf_counter() - started
+                object.__setattr__(self, "_lazy_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        module = object.__getattribute__(self, "_lazy_module")
+        attr = object.__getattribute__(self, "_lazy_attr")
+        loaded = object.__getattribute__(self, "_lazy_target") is not None
+        return f"<lazy {module}{'.' + attr if attr else ''} ({'loaded' if loaded else 'deferred'})>"
+
+
+def lazy_import(module: str, attr: Optional[str] = None) -> Any:
+    """Proxy for `module` (or `module.attr`) that imports on first use."""
+    return LazyImport(module, attr)
@@ -0,0 +1,199 @@
+# orbiter/utils/log_tail.py
+"""
+Log Tail - incremental log scanning for the ops monitors.
+
+`LogTailer` remembers a byte offset per log (persisted as JSON next to it or at
+`state_path`) and reads only what was appended since the last call. Rotation and
+truncation are detected from the inode and size, and a partial last line is left
+for the next read. `PatternMatcher` folds every error pattern into one compiled
+regex that is run once over the new text; only the rare matching lines are
+classified per type. `RollingCounter` keeps per-type counts over time windows.
+
+Monitoring cost is proportional to the bytes appended, not to the log size.
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# ------------------------------------------------------------------ tailer
+class LogTailer:
+    def __init__(self, path: str, state_path: str = None, initial_bytes: int = 64 * 1024,
+                 max_read_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.state_path = state_path
+        self.initial_bytes = initial_bytes # first run: only scan this much of the tail
+        self.max_read_bytes = max_read_bytes
+        self.offset: Optional[int] = None
+        self.inode: Optional[int] = None
+        self.extra: Dict = {} # caller state persisted alongside the offset
+        self.rotations = 0
+        self.bytes_read = 0
+        self.skipped_bytes = 0
+        self._load_state()
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            if state.get('path') == self.path:
+                self.offset, self.inode = state.get('offset'), state.get('inode')
+                self.extra = state.get('extra', {})
+        except (OSError, ValueError):
+            pass
+
+    def save_state(self):
+        if not self.state_path:
+            return
+        state = {'path': self.path, 'offset': self.offset, 'inode': self.inode, 'extra': self.extra}
+        tmp_file = self.state_path + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_path)
+
+    def read_lines(self) -> List[str]:
+        """Complete lines appended since the previous call ([] if none or the log is missing)."""
+        text = self.read_text()
+        return text.splitlines() if text else []
+
+    def read_text(self) -> str:
+        """New complete lines as one string, ending at the last newline."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return ""
+
+        start = self.offset
+        midline = False
+        if start is not None and (st.st_ino != self.inode or st.st_size < start):
+            self.rotations += 1 # rotated or truncated: the new file is read from the top
+            start = 0
+        if start is None:
+            start = max(0, st.st_size - self.initial_bytes)
+            midline = start > 0
+        if st.st_size - start > self.max_read_bytes:
+            # Far behind (monitor was down): skip ahead rather than scan gigabytes
+            self.skipped_bytes += st.st_size - self.max_read_bytes - start
+            start = st.st_size - self.max_read_bytes
+            midline = True
+        self.inode = st.st_ino
+
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(st.st_size - start)
+        self.bytes_read += len(data)
+
+        first = data.find(b'\n') + 1 if midline else 0 # drop a leading partial line
+        end = data.rfind(b'\n') + 1 # keep a partial last line for the next read
+        if end <= first:
+            self.offset = start + first if midline and first else start
+            return ""
+        self.offset = start + end
+        return data[first:end].decode('utf-8', errors='replace')
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"offset": self.offset or 0, "bytes_read": self.bytes_read,
+                "rotations": self.rotations, "skipped_bytes": self.skipped_bytes}
+
+
+# ----------------------------------------------------------------- matcher
+class PatternMatcher:
+    """All patterns compiled into one alternation; one scan per chunk of text."""
+
+    def __init__(self, patterns: Dict[str, str], flags: int = re.IGNORECASE):
+        self.patterns = {name: re.compile(p, flags) for name, p in patterns.items()}
+        self.combined = re.compile("|".join(f"(?:{p})" for p in patterns.values()), flags)
+
+    def match_text(self, text: str) -> List[Tuple[str, List[str]]]:
+        """[(line, [types...])] for every line of `text` matching at least one pattern."""
+        results = []
+        pos = 0
+        while True:
+            m = self.combined.search(text, pos)
+            if m is None:
+                break
+            line_start = text.rfind('\n', 0, m.start()) + 1
+            line_end = text.find('\n', m.end())
+            if line_end < 0:
+                line_end = len(text)
+            line = text[line_start:line_end]
+            results.append((line, self.classify(line)))
+            pos = line_end + 1
+        return results
+
+    def classify(self, line: str) -> List[str]:
+        return [name for name, rx in self.patterns.items() if rx.search(line)]
+
+
+# ----------------------------------------------------------------- counters
+class RollingCounter:
+    """Event counts per type over sliding windows (seconds)."""
+
+    def __init__(self, windows: Iterable[int] = (300, 3600), clock: Callable[[], float] = time.time):
+        self.windows = tuple(sorted(windows))
+        self._clock = clock
+        self._events: Dict[str, deque] = {}
+        self.totals: Dict[str, int] = {}
+
+    def add(self, kind: str, ts: float = None):
+        self._events.setdefault(kind, deque()).append(self._clock() if ts is None else ts)
+        self.totals[kind] = self.totals.get(kind, 0) + 1
+
+    def _prune(self, now: float):
+        horizon = now - self.windows[-1]
+        for events in self._events.values():
+            while events and events[0] < horizon:
+                events.popleft()
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{type: {'5m': n, '60m': n, 'total': n}}"""
+        now = self._clock()
+        self._prune(now)
+        result = {}
+        for kind, events in self._events.items():
+            row = {f"{w // 60}m": sum(1 for t in events if t >= now - w) for w in self.windows}
+            row["total"] = self.totals.get(kind, 0)
+            result[kind] = row
+        return result
+
+    def to_state(self) -> Dict[str, list]:
+        self._prune(self._clock())
+        return {"events": {k: list(v) for k, v in self._events.items()}, "totals": dict(self.totals)}
+
+    def load_state(self, state: Dict[str, list]):
+        self._events = {k: deque(v) for k, v in (state or {}).get("events", {}).items()}
+        self.totals = dict((state or {}).get("totals", {}))
+
+
+# ----------------------------------------------------------------- scanner
+class LogScanner:
+    """Tailer + matcher + counters for one log; counters survive restarts via the tailer state."""
+
+    def __init__(self, path: str, patterns: Dict[str, str], state_path: str = None,
+                 windows: Iterable[int] = (300, 3600), clock: Callable[[], float] = time.time, **tail_kwargs):
+        self.tailer = LogTailer(path, state_path=state_path, **tail_kwargs)
+        self.matcher = PatternMatcher(patterns)
+        self.counter = RollingCounter(windows, clock=clock)
+        self.counter.load_state(self.tailer.extra.get('counters'))
+
+    def scan(self) -> List[Tuple[str, List[str]]]:
+        """Matching lines appended since the last scan, with their types; counters updated."""
+        matches = self.matcher.match_text(self.tailer.read_text())
+        for _, kinds in matches:
+            for kind in kinds:
+                self.counter.add(kind)
+        self.tailer.extra['counters'] = self.counter.to_state()
+        try:
+            self.tailer.save_state()
+        except OSError:
+            pass
+        return matches
+
+    def get_stats(self) -> Dict:
+        return {**self.tailer.get_stats(), "counts": self.counter.counts()}
@@ -1,11 +1,15 @@
 import time
 import os
-import subprocess
-from telegram_notifier import send_telegram_msg
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from orbiter.bot.alert_bus import AlertBus
+from orbiter.utils.log_tail import LogTailer, PatternMatcher
 
 # Configuration
 LOG_DIR = "/home/pi/python/python-trader/logs/system"
 KEYWORDS = ["ERROR", "CRITICAL", "FATAL", "Traceback"]
+POLL_SECONDS = 1.0
 
 def get_latest_log_file():
     """Get the most recent orbiter log file."""
@@ -14,54 +18,57 @@ def get_latest_log_file():
         return None
     return os.path.join(LOG_DIR, sorted(files)[-1])
 
-def watch_logs():
-    """Tails the latest log file and looks for error keywords."""
+def split_log_line(line):
+    """'<asctime> | LEVEL | message' -> (level, message); other lines (tracebacks) -> ('ERROR', line)."""
+    parts = [p.strip() for p in line.split(' | ', 2)]
+    if len(parts) == 3 and parts[1] in ("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "TRACE"):
+        return parts[1], parts[2]
+    return "ERROR", line.strip()
+
+def watch_logs(bus):
+    """Reads what was appended to the latest log each poll and queues matching lines on the alert bus."""
     print(f"👀 Log Watcher started. Monitoring: {LOG_DIR}")
-    
+
     current_log = get_latest_log_file()
     if not current_log:
         print("⚠️ No logs found yet. Waiting...")
         time.sleep(10)
         return
 
-    # Start tailing the file
-    process = subprocess.Popen(['tail', '-n', '0', '-f', current_log], 
-                             stdout=subprocess.PIPE, 
-                             stderr=subprocess.PIPE, 
-                             text=True)
+    # initial_bytes=0: only lines written from now on, like `tail -n 0`
+    tailer = LogTailer(current_log, initial_bytes=0)
+    matcher = PatternMatcher({k: k for k in KEYWORDS}, flags=0)
 
     try:
         while True:
-            line = process.stdout.readline()
-            if not line:
-                # Check if a new log file was created (due to bot restart)
-                new_log = get_latest_log_file()
-                if new_log != current_log:
-                    print(f"🔄 Switched to new log file: {new_log}")
-                    process.terminate()
-                    current_log = new_log
-                    process = subprocess.Popen(['tail', '-n', '0', '-f', current_log], 
-                                             stdout=subprocess.PIPE, 
-                                             stderr=subprocess.PIPE, 
-                                             text=True)
-                continue
-
-            # Check for keywords
-            if any(keyword in line for keyword in KEYWORDS):
+            text = tailer.read_text()
+            for line, _ in matcher.match_text(text):
                 print(f"🚨 Alert detected: {line.strip()}")
-                clean_line = line.strip()
-                send_telegram_msg(f"🚨 *Orbiter Alert Detected*:\n`{clean_line}`")
-            
-            time.sleep(0.1)
+                level, message = split_log_line(line)
+                # Identical lines (numbers masked) share a fingerprint, so an error loop becomes one digest
+                bus.alert(message, level=level)
+
+            # Check if a new log file was created (due to bot restart)
+            new_log = get_latest_log_file()
+            if new_log != current_log:
+                print(f"🔄 Switched to new log file: {new_log}")
+                current_log = new_log
+                tailer = LogTailer(current_log, initial_bytes=tailer.max_read_bytes)  # fresh file: from the top
+
+            time.sleep(POLL_SECONDS)
 
     except KeyboardInterrupt:
-        process.terminate()
+        bus.stop()
         print("👋 Watcher stopped.")
+        raise
 
 if __name__ == "__main__":
+    bus = AlertBus.get_instance()
     while True:
         try:
-            watch_logs()
+            watch_logs(bus)
+        except KeyboardInterrupt:
+            break
         except Exception as e:
             print(f"Error in watcher: {e}")
             time.sleep(5)
@@ -3,10 +3,42 @@ from orbiter.utils.margin.span_cache import SpanCache
 
 
 class MarginCalculator:
-    def __init__(self, scrip_master, cache_path: str = None):
+    def __init__(self, scrip_master, cache_path: str = None, risk_params_path: str = None):
         self.master = scrip_master
         self.span_cache = SpanCache(cache_path)
         self._margin_checker = None
+        # 'broker': span_calculator per spread (local figure recorded alongside);
+        # 'local': PortfolioMarginEngine only, no broker round trip
+        self.source = 'broker'
+        self.risk_params_path = risk_params_path
+        self._portfolio_margin = None
+        self._rows_by_tsym = None
+        self._rows_indexed = -1
+        from orbiter.utils.margin.portfolio_margin import MarginReconciliation
+        self.reconciliation = MarginReconciliation()
+
+    @property
+    def portfolio_margin(self):
+        """Local SPAN engine over the daily risk-parameter file (None when the file is missing)."""
+        if self._portfolio_margin is None:
+            if not self.risk_params_path:
+                return None
+            from orbiter.utils.margin.portfolio_margin import PortfolioMarginEngine, RiskParameters
+            params = RiskParameters.load(self.risk_params_path)
+            if params is None:
+                return None
+            self._portfolio_margin = PortfolioMarginEngine(params)
+        else:
+            self._portfolio_margin.params.reload_if_changed()
+        return self._portfolio_margin
+
+    def get_row(self, tsym: str):
+        """Derivative row by tradingsymbol (index rebuilt when the master reloads)."""
+        rows = self.master.DERIVATIVE_OPTIONS
+        if self._rows_by_tsym is None or self._rows_indexed != len(rows):
+            self._rows_by_tsym = {r.get('tradingsymbol'): r for r in rows}
+            self._rows_indexed = len(rows)
+        return self._rows_by_tsym.get(tsym)
     
     def get_limits(self) -> Dict:
         """Get trading limits."""
@@ -41,15 +73,15 @@ class MarginCalculator:
         logger = logging.getLogger("ORBITER")
         logger.trace(f"[MarginCalculator.calculate_span_for_spread] - Calculating for spread: {spread}")
 
-        def get_row(tsym):
-            for row in self.master.DERIVATIVE_OPTIONS:
-                if row.get('tradingsymbol') == tsym: return row
-            return None
-
-        atm_row, hedge_row = get_row(spread.get('atm_symbol')), get_row(spread.get('hedge_symbol'))
+        atm_row, hedge_row = self.get_row(spread.get('atm_symbol')), self.get_row(spread.get('hedge_symbol'))
         if not atm_row or not hedge_row:
             return {'ok': False, 'reason': 'option_symbol_not_found'}
 
+        local = self.local_span_for_spread(spread, haircut=haircut)
+        if self.source == 'local' and local.get('ok'):
+            logger.trace(f"[MarginCalculator.calculate_span_for_spread] - Local margin: {local}")
+            return local
+
         def format_date(raw):
             try:
                 from datetime import datetime
@@ -83,9 +115,12 @@ class MarginCalculator:
             if span == 0 and expo == 0: return {'ok': False, 'reason': 'span_zero'}
             
             total = span + expo
+            if local.get('ok'):
+                self.reconciliation.record(f"{spread.get('atm_symbol')}/{spread.get('hedge_symbol')}",
+                                           local['total_margin'], total)
             return {
                 'ok': True, 'span': span, 'expo': expo, 'total_margin': total, 'haircut': haircut,
-                'pledged_required': total / (1.0 - haircut),
+                'pledged_required': total / (1.0 - haircut), 'local_total_margin': local.get('total_margin'),
                 'span_trade': float(ret.get('span_trade', 0.0)), 'expo_trade': float(ret.get('expo_trade', 0.0)),
                 'pre_trade': float(ret.get('pre_trade', 0.0)), 'add': float(ret.get('add', 0.0)),
                 'add_trade': float(ret.get('add_trade', 0.0)), 'ten': float(ret.get('ten', 0.0)),
@@ -95,6 +130,86 @@ class MarginCalculator:
             }
         except Exception as e: return {'ok': False, 'reason': f'span_exception:{e}'}
 
+    # ---- Local portfolio margin
+    def spread_legs(self, spread: Dict[str, Any], spot: float = None) -> List[Dict[str, Any]]:
+        """PortfolioMarginEngine legs for a credit spread: hedge bought, ATM sold, lot_size units each."""
+        spot = spot or spread.get('spot') or spread.get('ltp')
+        qty = int(spread.get('lot_size', 0) or 0)
+        legs = []
+        for tsym, sign in ((spread.get('hedge_symbol'), 1), (spread.get('atm_symbol'), -1)):
+            row = self.get_row(tsym)
+            if not row or not spot or not qty:
+                return []
+            legs.append({'underlying': row.get('symbol'), 'spot': float(spot), 'strike': float(row.get('strike', 0)),
+                         'expiry': row.get('expiry'), 'option_type': row.get('option_type'), 'qty': sign * qty,
+                         'symbol': tsym})
+        return legs
+
+    def position_legs(self, position: Dict[str, Any], spot: float = None) -> List[Dict[str, Any]]:
+        """Engine legs for a held position: a spread (atm/hedge symbols) or a single option/future leg."""
+        spot = spot or position.get('spot') or position.get('ltp') or position.get('entry_price')
+        if position.get('atm_symbol') and position.get('hedge_symbol'):
+            return self.spread_legs(position, spot)
+        tsym = position.get('tsym') or position.get('symbol')
+        row = self.get_row(tsym)
+        qty = int(position.get('qty') or position.get('lot_size') or 0)
+        if not row or not spot or not qty:
+            return []
+        option_type = row.get('option_type') if row.get('option_type') in ('CE', 'PE') else 'FUT'
+        sign = -1 if str(position.get('side', 'B')).upper() in ('S', 'SELL') else 1
+        return [{'underlying': row.get('symbol'), 'spot': float(spot), 'strike': float(row.get('strike') or 0),
+                 'expiry': row.get('expiry'), 'option_type': option_type, 'qty': sign * qty, 'symbol': tsym}]
+
+    def sync_portfolio(self, positions: Dict[str, Dict[str, Any]]) -> int:
+        """Snapshot held positions into the local engine; new spreads are then priced incrementally."""
+        engine = self.portfolio_margin
+        if engine is None:
+            return 0
+        legs = [leg for pos in positions.values() for leg in self.position_legs(pos)]
+        try:
+            engine.set_portfolio(legs)
+        except Exception as e:
+            import logging
+            logging.getLogger("ORBITER").warning(f"[MarginCalculator.sync_portfolio] - Held portfolio not priced: {e}")
+            engine.set_portfolio([])
+            return 0
+        return len(legs)
+
+    def local_span_for_spread(self, spread: Dict[str, Any], spot: float = None, haircut: float = 0.20) -> Dict[str, Any]:
+        """Spread margin from the local engine, in calculate_span_for_spread's shape.
+
+        total_margin is the spread on its own (what the broker's span_calculator
+        quotes); incremental_margin is what it adds to the portfolio last given
+        to sync_portfolio, which is the figure to size and gate on.
+        """
+        engine = self.portfolio_margin
+        if engine is None:
+            return {'ok': False, 'reason': 'no_risk_parameters'}
+        legs = self.spread_legs(spread, spot)
+        if not legs:
+            return {'ok': False, 'reason': 'spread_legs_incomplete'}
+        try:
+            res = engine.margin(legs)
+            inc = engine.incremental(legs)
+        except Exception as e: return {'ok': False, 'reason': f'local_margin_exception:{e}'}
+        total = res['total_margin']
+        return {'ok': True, 'span': res['span'], 'expo': res['expo'], 'total_margin': total, 'haircut': haircut,
+                'pledged_required': total / (1.0 - haircut), 'incremental_margin': inc['incremental_margin'],
+                'portfolio_margin_after': inc['portfolio_margin_after'], 'source': 'local'}
+
+    def check_spread(self, spread: Dict[str, Any], available: float, haircut: float = 0.20) -> Dict[str, Any]:
+        """Margin gate for a new spread: its incremental margin over the held portfolio vs `available`."""
+        local = self.local_span_for_spread(spread, haircut=haircut)
+        if not local.get('ok'):
+            return local
+        required = local['incremental_margin']
+        return {'ok': True, 'allowed': available >= required, 'required': required, 'available': available,
+                'source': 'local', 'margin': local}
+
+    def reconciliation_report(self, worst: int = 5) -> Dict[str, Any]:
+        """Local vs broker margin differences seen by calculate_span_for_spread."""
+        return self.reconciliation.report(worst)
+
     def calculate_future_margin(self, future_details: Dict[str, Any], api, actid, product_type: str = "I", haircut: float = 0.20) -> Dict[str, Any]:
         """Calculate margin for a single future contract"""
         import logging
@@ -104,7 +104,8 @@ class PaperTradeSimulator:
         return self.cash - self.used_margin
     
     def add_position(self, symbol: str, qty: int, entry_price: float, 
-                     trade_type: str, strike: int = None, expiry: str = None):
+                     trade_type: str, strike: int = None, expiry: str = None,
+                     margin_required: float = None):
         position = {
             'symbol': symbol,
             'qty': qty,
@@ -115,7 +116,8 @@ class PaperTradeSimulator:
             'timestamp': datetime.now().isoformat()
         }
         
-        margin_required = self._estimate_margin(position)
+        if margin_required is None:
+            margin_required = self._estimate_margin(position)
         position['margin_required'] = margin_required
         self.positions.append(position)
         self.config['used_margin'] += margin_required
@@ -290,13 +292,15 @@ class MarginChecker:
         
         return None
     
-    def check_margin_for_trade(self, symbol: str, qty: int, estimated_premium: float = 0) -> Dict:
+    def check_margin_for_trade(self, symbol: str, qty: int, estimated_premium: float = 0,
+                               margin_required: float = None) -> Dict:
         limits = self.get_limits()
         if not limits:
             return {'allowed': False, 'reason': 'Could not fetch limits'}
         
         available = limits['available_margin']
-        margin_required = self._estimate_margin_required(symbol, qty, estimated_premium)
+        if margin_required is None:
+            margin_required = self._estimate_margin_required(symbol, qty, estimated_premium)
         
         if available >= margin_required:
             return {
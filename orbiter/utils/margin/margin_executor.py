@@ -41,6 +41,8 @@ class MarginAwareExecutor(OrderExecutorInterface):
         self.project_root = project_root
         
         self.margin_manager = MarginManager(api=api, paper_trade=paper_trade, project_root=project_root)
+        self.chaser = None # LimitChaser handed to ExecutorBase for LMT orders
+        self.margin_calculator = None # MarginCalculator; spreads are gated on local incremental margin
         self.logger.info(f"[MARGIN] MarginAwareExecutor initialized (paper_trade={paper_trade})")
     
     def get_limits(self) -> Dict:
@@ -51,9 +53,9 @@ class MarginAwareExecutor(OrderExecutorInterface):
         """Check if margin is available for the trade."""
         return self.margin_manager.check_margin(symbol, qty, premium)
     
-    def _check_margin(self, symbol: str, qty: int, premium: float = 0) -> Dict[str, Any]:
+    def _check_margin(self, symbol: str, qty: int, premium: float = 0, required: float = None) -> Dict[str, Any]:
         """Check if margin is available for the trade."""
-        result = self.margin_manager.check_margin(symbol, qty, premium)
+        result = self.margin_manager.check_margin(symbol, qty, premium, required=required)
         
         if not result.get('allowed'):
             self.logger.warning(f"[MARGIN] ⛔ MARGIN BLOCK: {symbol} qty={qty} - need ₹{result.get('required', 0)} but only ₹{result.get('available', 0)} available")
@@ -64,9 +66,20 @@ class MarginAwareExecutor(OrderExecutorInterface):
         """Log margin check result."""
         self.logger.info(f"[MARGIN] Check: {symbol} qty={qty} allowed={result.get('allowed')} available={result.get('available')} required={result.get('required')}")
     
-    def _record_paper_trade(self, symbol: str, qty: int, price: float, trade_type: str):
+    def _record_paper_trade(self, symbol: str, qty: int, price: float, trade_type: str,
+                            margin_required: float = None):
         """Record a paper trade for margin tracking."""
-        self.margin_manager.record_trade(symbol, qty, price, trade_type)
+        self.margin_manager.record_trade(symbol, qty, price, trade_type, margin_required=margin_required)
+    
+    def _check_spread_margin(self, spread: Dict[str, Any]) -> Dict[str, Any]:
+        """Spread margin check: local incremental margin over the held portfolio when it can be priced."""
+        atm_sym = spread.get('atm_symbol')
+        lot = spread.get('lot_size', 1)
+        if self.margin_calculator is not None:
+            local = self.margin_calculator.local_span_for_spread(spread)
+            if local.get('ok'):
+                return {**self._check_margin(atm_sym, lot, required=local['incremental_margin']), 'source': 'local'}
+        return self._check_margin(atm_sym, lot)
     
     def _get_margin_status(self) -> Dict:
         """Get current margin status."""
@@ -87,7 +100,7 @@ class MarginAwareExecutor(OrderExecutorInterface):
         
         from orbiter.utils.margin.margin_executor_base import ExecutorBase
         
-        base = ExecutorBase(self.api, self.execution_policy)
+        base = ExecutorBase(self.api, self.execution_policy, chaser=self.chaser)
         result = base.place_future_order(future_details, side, execute, product_type, price_type)
         
         if execute and result.get('ok'):
@@ -111,7 +124,7 @@ class MarginAwareExecutor(OrderExecutorInterface):
         
         from orbiter.utils.margin.margin_executor_base import ExecutorBase
         
-        base = ExecutorBase(self.api, self.execution_policy)
+        base = ExecutorBase(self.api, self.execution_policy, chaser=self.chaser)
         result = base.place_option_order(option_details, side, execute, product_type, price_type)
         
         if execute and result.get('ok'):
@@ -126,8 +139,9 @@ class MarginAwareExecutor(OrderExecutorInterface):
         hedge_sym = spread.get('hedge_symbol')
         lot = spread.get('lot_size', 1)
         
+        margin_result = {}
         if execute:
-            margin_result = self._check_margin(atm_sym, lot)
+            margin_result = self._check_spread_margin(spread)
             
             if not margin_result['allowed']:
                 self.logger.warning(f"[MARGIN] ⛔ MARGIN BLOCK: spread {atm_sym}/{hedge_sym} qty={lot}")
@@ -135,11 +149,12 @@ class MarginAwareExecutor(OrderExecutorInterface):
         
         from orbiter.utils.margin.margin_executor_base import ExecutorBase
         
-        base = ExecutorBase(self.api, self.execution_policy)
+        base = ExecutorBase(self.api, self.execution_policy, chaser=self.chaser)
         result = base.place_spread(spread, execute, product_type, price_type)
         
         if execute and result.get('ok'):
-            self._record_paper_trade(atm_sym, lot, 0, "spread")
+            local_required = margin_result.get('required') if margin_result.get('source') == 'local' else None
+            self._record_paper_trade(atm_sym, lot, 0, "spread", margin_required=local_required)
         
         return result
     
@@ -10,9 +10,19 @@ from typing import Dict, Any
 class ExecutorBase:
     """Base executor with order placement logic."""
     
-    def __init__(self, api, execution_policy: Dict = None):
+    def __init__(self, api, execution_policy: Dict = None, chaser=None):
         self.api = api
         self.execution_policy = execution_policy or {}
+        self.chaser = chaser # LimitChaser: LMT legs priced from live depth and repriced until filled
+    
+    def _chase(self, order: Dict, token: str = None) -> Dict:
+        """Work one LMT order through the chaser; a Noren-style response for the callers below."""
+        chase = self.chaser.execute(order, token=token)
+        if not chase.get('ok'):
+            # Not COMPLETE: cancel the rest and reverse any partial fill before reporting failure
+            self.chaser.unwind(order, chase)
+            return {'stat': 'Not_Ok', 'emsg': chase.get('reason'), 'chase': chase}
+        return {**(chase.get('resp') or {}), 'chase': chase}
     
     def place_future_order(self, future_details: Dict, side: str, execute: bool, 
                           product_type: str, price_type: str) -> Dict:
@@ -26,6 +36,14 @@ class ExecutorBase:
         
         price_type, order_price = self._get_execution_params(tsym, price_type)
         
+        if price_type == 'LMT' and self.chaser is not None:
+            res = self._chase(dict(buy_or_sell=side, product_type=product_type, exchange=exch, tradingsymbol=tsym,
+                                   quantity=lot, discloseqty=0, price_type='LMT', price=0, trigger_price=None,
+                                   retention='DAY', remarks=f'orb_future_{side}'), token=future_details.get('token'))
+            if res.get('stat') != 'Ok':
+                return {'ok': False, 'reason': 'future_order_failed', 'resp': res}
+            return {**future_details, 'ok': True, 'resp': res, 'side': side}
+        
         if price_type == 'LMT':
             try:
                 q = self.api.get_quotes(exchange=exch, token=future_details.get('token'))
@@ -75,6 +93,14 @@ class ExecutorBase:
         
         price_type, order_price = self._get_execution_params(tsym, price_type)
         
+        if price_type == 'LMT' and self.chaser is not None:
+            res = self._chase(dict(buy_or_sell=side, product_type=product_type, exchange=exch, tradingsymbol=tsym,
+                                   quantity=lot, discloseqty=0, price_type='LMT', price=0, trigger_price=None,
+                                   retention='DAY', remarks=f'orb_option_{side}'), token=option_details.get('token'))
+            if res.get('stat') != 'Ok':
+                return {'ok': False, 'reason': 'option_order_failed', 'resp': res}
+            return {**option_details, 'ok': True, 'resp': res, 'side': side}
+        
         if price_type == 'LMT':
             try:
                 q = self.api.get_quotes(exchange=exch, token=option_details.get('token'))
@@ -126,7 +152,7 @@ class ExecutorBase:
         price_type, atm_price = self._get_execution_params(atm_sym, price_type)
         _, hedge_price = self._get_execution_params(hedge_sym, price_type)
         
-        if price_type == 'LMT':
+        if price_type == 'LMT' and self.chaser is None:
             try:
                 h_q = self.api.get_quotes(exchange=exch, token=spread.get('hedge_token'))
                 if not h_q or not h_q.get('lp'):
@@ -147,7 +173,8 @@ class ExecutorBase:
             except Exception as e:
                 return {'ok': False, 'reason': f"limit_price_error: {e}"}
         
-        h_res = self.api.place_order(
+        h_res = self._send(
+            spread.get('hedge_token'),
             buy_or_sell='B',
             product_type=product_type,
             exchange=exch,
@@ -164,7 +191,8 @@ class ExecutorBase:
         if not h_res or h_res.get('stat') != 'Ok':
             return {'ok': False, 'reason': f"hedge_leg_failed: {h_res.get('emsg') if h_res else 'No response'}", 'resp': h_res}
         
-        a_res = self.api.place_order(
+        a_res = self._send(
+            spread.get('atm_token'),
             buy_or_sell='S',
             product_type=product_type,
             exchange=exch,
@@ -183,6 +211,12 @@ class ExecutorBase:
         
         return {**spread, 'ok': True, 'atm_resp': a_res, 'hedge_resp': h_res}
     
+    def _send(self, token: str = None, **order) -> Dict:
+        """place_order, or a chased LMT when a LimitChaser is set."""
+        if self.chaser is not None and order.get('price_type') == 'LMT':
+            return self._chase(order, token)
+        return self.api.place_order(**order)
+    
     def _get_execution_params(self, tsym: str, requested_price_type: str) -> tuple:
         """Resolve price_type and initial order_price based on policy."""
         price_type = requested_price_type
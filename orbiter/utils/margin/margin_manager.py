@@ -70,13 +70,14 @@ class MarginManager:
             'payin': 0
         }
     
-    def check_margin(self, symbol: str, qty: int, premium: float = 0) -> Dict:
-        """Check if sufficient margin is available for a trade."""
+    def check_margin(self, symbol: str, qty: int, premium: float = 0, required: float = None) -> Dict:
+        """Check if sufficient margin is available for a trade (`required` overrides the estimate)."""
         if self._margin_checker:
-            return self._margin_checker.check_margin_for_trade(symbol, qty, premium)
+            return self._margin_checker.check_margin_for_trade(symbol, qty, premium, margin_required=required)
         
         limits = self.get_limits()
-        required = premium * qty
+        if required is None:
+            required = premium * qty
         
         return {
             'allowed': limits.get('available', 0) >= required,
@@ -85,12 +86,13 @@ class MarginManager:
             'limits': limits
         }
     
-    def record_trade(self, symbol: str, qty: int, price: float, trade_type: str) -> bool:
-        """Record a trade for margin tracking (paper trading)."""
+    def record_trade(self, symbol: str, qty: int, price: float, trade_type: str,
+                     margin_required: float = None) -> bool:
+        """Record a trade for margin tracking (paper trading); add_position persists the state."""
         if self._margin_checker and self.paper_trade:
             try:
-                self._margin_checker.simulator.record_trade(symbol, qty, price, trade_type)
-                self._margin_checker.simulator.save_state()
+                self._margin_checker.simulator.add_position(symbol, qty, price, trade_type,
+                                                            margin_required=margin_required)
                 return True
             except Exception as e:
                 self.logger.error(f"[MARGIN] Error recording trade: {e}")
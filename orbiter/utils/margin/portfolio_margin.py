@@ -0,0 +1,374 @@
+# orbiter/utils/margin/portfolio_margin.py
+"""
+Portfolio Margin - local SPAN-style margin from a daily risk-parameter file.
+
+Every leg is revalued (Black-Scholes, NumPy) under the 16 standard SPAN
+scenarios: price moves of 0, ±1/3, ±2/3 and ±1 price-scan range, each with
+volatility up and down, plus two extreme moves of ±2 ranges counted at 35%.
+Loss arrays of all legs on one underlying are summed, so hedges offset
+before the worst scenario is taken:
+
+    scan risk = max(0, worst scenario loss)
+    span      = max(scan risk, short-option minimum x spot x short qty)
+    exposure  = exposure % x spot x (short option qty + |future qty|)
+    total     = span + exposure
+
+Net option value and calendar-spread charges are not modelled; the
+reconciliation report shows how far this lands from the broker's numbers.
+
+Risk-parameter file (JSON, replaced daily):
+    {"date": "2026-10-19",
+     "defaults":    {"price_scan_pct": 0.10, "vol_scan_pct": 0.25, "volatility": 0.30,
+                     "short_option_min_pct": 0.03, "exposure_pct": 0.035, "rate": 0.065},
+     "underlyings": {"NIFTY": {"price_scan_pct": 0.06, "volatility": 0.14, "exposure_pct": 0.02}}}
+
+A leg is a dict: underlying, spot, strike, expiry (date / 'YYYY-MM-DD' /
+'27FEB26' / '27-FEB-2026'), option_type ('CE' | 'PE' | 'FUT') and qty in
+units, signed (+ long, - short).
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("ORBITER")
+
+# (price move in scan ranges, volatility direction, weight)
+SCENARIOS = [
+    (0.0, 1, 1.0), (0.0, -1, 1.0),
+    (1 / 3, 1, 1.0), (1 / 3, -1, 1.0), (-1 / 3, 1, 1.0), (-1 / 3, -1, 1.0),
+    (2 / 3, 1, 1.0), (2 / 3, -1, 1.0), (-2 / 3, 1, 1.0), (-2 / 3, -1, 1.0),
+    (1.0, 1, 1.0), (1.0, -1, 1.0), (-1.0, 1, 1.0), (-1.0, -1, 1.0),
+    (2.0, 0, 0.35), (-2.0, 0, 0.35),
+]
+PRICE_MOVES = np.array([s[0] for s in SCENARIOS])
+VOL_MOVES = np.array([s[1] for s in SCENARIOS], dtype=float)
+WEIGHTS = np.array([s[2] for s in SCENARIOS])
+N_SCENARIOS = len(SCENARIOS)
+
+_EXPIRY_FORMATS = ("%Y-%m-%d", "%d%b%y", "%d-%b-%Y", "%d%b%Y", "%d-%m-%Y")
+_MIN_T = 1.0 / (365 * 24) # an hour, so expiry-day legs still have a value curve
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26 erf, |error| < 1.5e-7) without scipy."""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def parse_expiry(raw) -> Optional[date]:
+    if isinstance(raw, datetime):
+        return raw.date()
+    if isinstance(raw, date):
+        return raw
+    text = str(raw or '').strip().upper()
+    for fmt in _EXPIRY_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class RiskParameters:
+    """Daily risk parameters, per underlying over file defaults. Re-read when the file changes."""
+
+    DEFAULTS = {
+        "price_scan_pct": 0.10,
+        "vol_scan_pct": 0.25,
+        "volatility": 0.30,
+        "short_option_min_pct": 0.03,
+        "exposure_pct": 0.035,
+        "rate": 0.065,
+    }
+
+    def __init__(self, data: Dict[str, Any] = None, path: str = None):
+        self.path = path
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._apply(data or {})
+
+    @classmethod
+    def load(cls, path: str) -> Optional['RiskParameters']:
+        if not path or not os.path.exists(path):
+            return None
+        params = cls(path=path)
+        params.reload_if_changed()
+        return params
+
+    def _apply(self, data: Dict[str, Any]):
+        self.date = data.get("date")
+        self.defaults = {**self.DEFAULTS, **(data.get("defaults") or {})}
+        self.underlyings = {k.upper(): v for k, v in (data.get("underlyings") or {}).items()}
+        self._resolved: Dict[str, Dict[str, float]] = {}
+
+    def reload_if_changed(self) -> bool:
+        if not self.path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        with self._lock:
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Risk parameters unreadable ({self.path}): {e}")
+                return False
+            self._apply(data)
+            self._mtime = mtime
+        logger.info(f"📐 Risk parameters loaded (date={self.date}, underlyings={len(self.underlyings)})")
+        return True
+
+    def for_underlying(self, symbol: str) -> Dict[str, float]:
+        key = (symbol or '').upper()
+        params = self._resolved.get(key)
+        if params is None:
+            params = self._resolved[key] = {**self.defaults, **self.underlyings.get(key, {})}
+        return params
+
+
+class PortfolioMarginEngine:
+    """
+    Vectorized scenario-array margins for whole portfolios.
+
+    `margin(legs)` prices a portfolio from scratch. For candidate sizing,
+    `set_portfolio(legs)` keeps per-underlying risk arrays of what is held,
+    after which `incremental(legs)` is a 16-element add and max, and
+    `rank(candidates)` prices every candidate's legs in one NumPy pass.
+    """
+
+    def __init__(self, params: RiskParameters, today: date = None):
+        self.params = params
+        self._today = today
+        self._base: Dict[str, Dict[str, Any]] = {}
+        self._base_total = 0.0
+        self._leg_cache: Dict[tuple, np.ndarray] = {}
+        self._leg_cache_day = None
+        self._queries = 0
+        self._ranked = 0
+
+    # ------------------------------------------------------------------ pricing
+    def _years_to_expiry(self, expiry) -> float:
+        exp = parse_expiry(expiry)
+        today = self._today or date.today()
+        if exp is None:
+            return 30 / 365
+        return max((exp - today).days + 0.5, 0) / 365 or _MIN_T
+
+    def risk_arrays(self, legs: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """(n_legs, 16) scenario losses (positive = loss), extreme scenarios already weighted."""
+        n = len(legs)
+        if not n:
+            return np.zeros((0, N_SCENARIOS))
+        spot = np.empty(n); strike = np.empty(n); years = np.empty(n); qty = np.empty(n)
+        scan = np.empty(n); vol = np.empty(n); vscan = np.empty(n); rate = np.empty(n)
+        is_fut = np.zeros(n, dtype=bool); is_call = np.zeros(n, dtype=bool)
+        for i, leg in enumerate(legs):
+            p = self.params.for_underlying(leg.get('underlying'))
+            spot[i] = float(leg['spot'])
+            strike[i] = float(leg.get('strike') or 0)
+            qty[i] = float(leg['qty'])
+            years[i] = self._years_to_expiry(leg.get('expiry'))
+            scan[i], vol[i], vscan[i], rate[i] = (p['price_scan_pct'], p.get('volatility', 0.3),
+                                                  p['vol_scan_pct'], p.get('rate', 0.0))
+            opt = str(leg.get('option_type') or 'FUT').upper()
+            is_fut[i] = opt not in ('CE', 'PE', 'C', 'P')
+            is_call[i] = opt in ('CE', 'C')
+
+        s_scn = spot[:, None] * (1.0 + PRICE_MOVES[None, :] * scan[:, None])
+        v_scn = vol[:, None] * (1.0 + VOL_MOVES[None, :] * vscan[:, None])
+        value_now = self._option_value(spot[:, None], strike[:, None], years[:, None], vol[:, None],
+                                       rate[:, None], is_call[:, None])
+        value_scn = self._option_value(s_scn, strike[:, None], years[:, None], v_scn, rate[:, None], is_call[:, None])
+        fut_pnl = s_scn - spot[:, None]
+        pnl = np.where(is_fut[:, None], fut_pnl, value_scn - value_now)
+        return -pnl * qty[:, None] * WEIGHTS[None, :]
+
+    @staticmethod
+    def _option_value(s, k, t, v, r, is_call):
+        k = np.where(k > 0, k, 1e-9)
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(s / k) + (r + 0.5 * v * v) * t) / (v * sqrt_t)
+        d2 = d1 - v * sqrt_t
+        disc = k * np.exp(-r * t)
+        call = s * norm_cdf(d1) - disc * norm_cdf(d2)
+        put = disc * norm_cdf(-d2) - s * norm_cdf(-d1)
+        return np.where(is_call, call, put)
+
+    # ------------------------------------------------------------------ margin
+    def _components(self, underlying: str, spot, arrays, short_qty, fut_qty) -> Dict[str, Any]:
+        """Margin components from summed arrays; works on (16,) or (n, 16) inputs."""
+        p = self.params.for_underlying(underlying)
+        scan_risk = np.maximum(arrays.max(axis=-1), 0.0)
+        short_min = p['short_option_min_pct'] * spot * short_qty
+        span = np.maximum(scan_risk, short_min)
+        expo = p['exposure_pct'] * spot * (short_qty + fut_qty)
+        return {'scan_risk': scan_risk, 'short_option_min': short_min, 'span': span, 'expo': expo,
+                'total_margin': span + expo}
+
+    @staticmethod
+    def _quantities(legs) -> tuple:
+        short_qty = sum(-float(l['qty']) for l in legs
+                        if str(l.get('option_type') or 'FUT').upper() in ('CE', 'PE', 'C', 'P') and float(l['qty']) < 0)
+        fut_qty = sum(abs(float(l['qty'])) for l in legs
+                      if str(l.get('option_type') or 'FUT').upper() not in ('CE', 'PE', 'C', 'P'))
+        return short_qty, fut_qty
+
+    def _group(self, legs) -> Dict[str, List[Dict[str, Any]]]:
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for leg in legs:
+            groups.setdefault(str(leg.get('underlying') or '').upper(), []).append(leg)
+        return groups
+
+    def _underlying_state(self, underlying: str, legs) -> Dict[str, Any]:
+        arrays = self.risk_arrays(legs).sum(axis=0)
+        short_qty, fut_qty = self._quantities(legs)
+        spot = float(legs[-1]['spot'])
+        comp = self._components(underlying, spot, arrays, short_qty, fut_qty)
+        return {'array': arrays, 'short_qty': short_qty, 'fut_qty': fut_qty, 'spot': spot,
+                **{k: float(v) for k, v in comp.items()}}
+
+    def margin(self, legs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        by_underlying = {u: self._underlying_state(u, g) for u, g in self._group(legs).items()}
+        totals = {k: round(sum(s[k] for s in by_underlying.values()), 2)
+                  for k in ('span', 'expo', 'total_margin')}
+        return {'ok': True, **totals,
+                'by_underlying': {u: {k: round(v, 2) for k, v in s.items() if k != 'array' and not isinstance(v, np.ndarray)}
+                                  for u, s in by_underlying.items()}}
+
+    # ------------------------------------------------------------- incremental
+    def set_portfolio(self, legs: Sequence[Dict[str, Any]]):
+        """Snapshot the held portfolio; incremental() and rank() price against it."""
+        self._base = {u: self._underlying_state(u, g) for u, g in self._group(legs).items()}
+        self._base_total = sum(s['total_margin'] for s in self._base.values())
+
+    @property
+    def portfolio_margin(self) -> float:
+        return round(self._base_total, 2)
+
+    def _leg_arrays_cached(self, legs) -> np.ndarray:
+        today = self._today or date.today()
+        if self._leg_cache_day != today:
+            self._leg_cache.clear()
+            self._leg_cache_day = today
+        key = tuple((l.get('underlying'), float(l['spot']), float(l.get('strike') or 0), str(l.get('expiry')),
+                     l.get('option_type'), float(l['qty'])) for l in legs)
+        arrays = self._leg_cache.get(key)
+        if arrays is None:
+            if len(self._leg_cache) > 20000:
+                self._leg_cache.clear()
+            arrays = self._leg_cache[key] = self.risk_arrays(legs).sum(axis=0)
+        return arrays
+
+    def incremental(self, legs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Margin change if `legs` are added to the snapshot portfolio."""
+        groups = self._group(legs)
+        if len(groups) > 1:
+            parts = [self.incremental(g) for g in groups.values()]
+            return {'ok': True, 'incremental_margin': round(sum(p['incremental_margin'] for p in parts), 2),
+                    'by_underlying': {p['underlying']: p for p in parts}}
+        self._queries += 1
+        underlying = next(iter(groups))
+        arrays = self._leg_arrays_cached(legs)
+        short_qty, fut_qty = self._quantities(legs)
+        base = self._base.get(underlying)
+        spot = float(legs[-1]['spot'])
+        if base:
+            arrays = arrays + base['array']
+            short_qty += base['short_qty']
+            fut_qty += base['fut_qty']
+        comp = self._components(underlying, spot, arrays, short_qty, fut_qty)
+        before = base['total_margin'] if base else 0.0
+        total = float(comp['total_margin'])
+        return {'ok': True, 'underlying': underlying, 'incremental_margin': round(total - before, 2),
+                'span': round(float(comp['span']), 2), 'expo': round(float(comp['expo']), 2),
+                'total_margin': round(total, 2), 'portfolio_margin_after': round(self._base_total - before + total, 2)}
+
+    def rank(self, candidates: Sequence[Sequence[Dict[str, Any]]]) -> np.ndarray:
+        """Incremental margin of each candidate structure (legs on one underlying), in one pass."""
+        n = len(candidates)
+        if not n:
+            return np.zeros(0)
+        self._ranked += n
+        flat = [leg for legs in candidates for leg in legs]
+        owner = np.repeat(np.arange(n), [len(legs) for legs in candidates])
+        arrays = np.zeros((n, N_SCENARIOS))
+        np.add.at(arrays, owner, self.risk_arrays(flat))
+
+        increments = np.empty(n)
+        by_underlying: Dict[str, List[int]] = {}
+        for i, legs in enumerate(candidates):
+            by_underlying.setdefault(str(legs[0].get('underlying') or '').upper(), []).append(i)
+        for underlying, idx in by_underlying.items():
+            idx = np.asarray(idx)
+            qty = np.array([self._quantities(candidates[i]) for i in idx])
+            spot = np.array([float(candidates[i][-1]['spot']) for i in idx])
+            base = self._base.get(underlying)
+            sub = arrays[idx]
+            short_qty, fut_qty = qty[:, 0], qty[:, 1]
+            before = 0.0
+            if base:
+                sub = sub + base['array']
+                short_qty = short_qty + base['short_qty']
+                fut_qty = fut_qty + base['fut_qty']
+                before = base['total_margin']
+            comp = self._components(underlying, spot, sub, short_qty, fut_qty)
+            increments[idx] = comp['total_margin'] - before
+        return np.round(increments, 2)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "params_date": self.params.date,
+            "portfolio_underlyings": len(self._base),
+            "portfolio_margin": self.portfolio_margin,
+            "incremental_queries": self._queries,
+            "ranked_candidates": self._ranked,
+            "leg_cache": len(self._leg_cache),
+        }
+
+
+class MarginReconciliation:
+    """Local vs broker margin for the same structure; a running report of the gap."""
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self._samples: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, key: str, local: float, broker: float):
+        if not broker:
+            return
+        diff = local - broker
+        sample = {'key': key, 'local': round(local, 2), 'broker': round(broker, 2),
+                  'diff': round(diff, 2), 'diff_pct': round(diff / broker * 100, 2)}
+        with self._lock:
+            self._samples.append(sample)
+            if len(self._samples) > self.max_samples:
+                del self._samples[:len(self._samples) - self.max_samples]
+
+    def report(self, worst: int = 5) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {'samples': 0}
+        pcts = np.array([s['diff_pct'] for s in samples])
+        return {
+            'samples': len(samples),
+            'mean_diff_pct': round(float(pcts.mean()), 2),
+            'mean_abs_diff_pct': round(float(np.abs(pcts).mean()), 2),
+            'p95_abs_diff_pct': round(float(np.percentile(np.abs(pcts), 95)), 2),
+            'under_margined': int((pcts < 0).sum()),
+            'worst': sorted(samples, key=lambda s: -abs(s['diff_pct']))[:worst],
+        }
@@ -0,0 +1,191 @@
+# orbiter/utils/pairs.py
+"""
+Pairs / ratio-spread kernel shared by the live PairsEngine and backtest_lab.
+
+Leg A is regressed on leg B over a rolling window of closes (OLS with intercept):
+    A ≈ alpha + hedge_ratio * B,   spread = A - alpha - hedge_ratio * B
+    zscore    = spread / std(residuals in the window)
+    half_life = -ln 2 / lambda, lambda from the rolling AR(1) fit  Δspread = c + lambda * spread[-1]
+
+- `PairState`: incremental, O(1) per bar (running sums over a fixed window).
+- `pair_series`: the same numbers for whole arrays with cumulative sums, so a
+  research script and the live engine agree bar for bar.
+
+Prices are anchored to the first bar before summing; MCX metal prices are large
+and the window variance is small, so raw sums of squares would cancel badly.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+LN2 = math.log(2.0)
+
+
+class _RollingOLS:
+    """Running sums for a rolling least-squares fit of v on u."""
+    __slots__ = ('window', 'pairs', 'su', 'sv', 'suu', 'suv', 'svv')
+
+    def __init__(self, window: int):
+        self.window = window
+        self.pairs = deque()
+        self.su = self.sv = self.suu = self.suv = self.svv = 0.0
+
+    def add(self, u: float, v: float):
+        self.pairs.append((u, v))
+        self.su += u
+        self.sv += v
+        self.suu += u * u
+        self.suv += u * v
+        self.svv += v * v
+        if len(self.pairs) > self.window:
+            ou, ov = self.pairs.popleft()
+            self.su -= ou
+            self.sv -= ov
+            self.suu -= ou * ou
+            self.suv -= ou * ov
+            self.svv -= ov * ov
+
+    def fit(self) -> Optional[Tuple[float, float, float]]:
+        """(slope, intercept, residual variance) or None when u has no variance."""
+        n = len(self.pairs)
+        if n < 2:
+            return None
+        suu_c = self.suu - self.su * self.su / n
+        if suu_c <= 1e-12:
+            return None
+        suv_c = self.suv - self.su * self.sv / n
+        svv_c = self.svv - self.sv * self.sv / n
+        slope = suv_c / suu_c
+        intercept = (self.sv - slope * self.su) / n
+        return slope, intercept, max(svv_c - slope * suv_c, 0.0) / n
+
+
+def _half_life(slope: float) -> float:
+    return -LN2 / slope if slope < 0 else math.inf
+
+
+class PairState:
+    """
+    Rolling hedge ratio, spread z-score and mean-reversion half-life for one pair.
+
+    `update(a, b)` takes the closes of both legs for the same bar. Values are None
+    until `min_bars` bars are in the window; `half_life` is inf while the spread
+    is not mean reverting.
+    """
+
+    def __init__(self, window: int = 60, min_bars: int = 20):
+        self.window = window
+        self.min_bars = min_bars
+        self.count = 0
+        self.zscore: Optional[float] = None
+        self.hedge_ratio: Optional[float] = None
+        self.half_life: Optional[float] = None
+        self.spread: Optional[float] = None
+
+        self._anchor = None
+        self._price = _RollingOLS(window)  # A on B
+        self._ar = _RollingOLS(window)     # Δspread on spread[-1]
+        self._prev_spread = None
+
+    @property
+    def ready(self) -> bool:
+        return self.zscore is not None
+
+    def update(self, a: float, b: float) -> Optional[float]:
+        """Commit one bar (closes of leg A and leg B). Returns the z-score or None."""
+        a, b = float(a), float(b)
+        if self._anchor is None:
+            self._anchor = (a, b)
+        y, x = a - self._anchor[0], b - self._anchor[1]
+        self.count += 1
+        self._price.add(x, y)
+
+        fit = self._price.fit() if len(self._price.pairs) >= self.min_bars else None
+        if fit is None:
+            self.zscore = self.hedge_ratio = self.spread = self.half_life = None
+            self._prev_spread = None
+            return None
+
+        beta, alpha, var = fit
+        spread = y - alpha - beta * x
+        self.hedge_ratio = beta
+        self.spread = spread
+        self.zscore = spread / math.sqrt(var) if var > 0 else 0.0
+
+        if self._prev_spread is not None:
+            self._ar.add(self._prev_spread, spread - self._prev_spread)
+            ar = self._ar.fit() if len(self._ar.pairs) >= self.min_bars else None
+            self.half_life = _half_life(ar[0]) if ar else None
+        else:
+            self.half_life = None
+        self._prev_spread = spread
+        return self.zscore
+
+    def facts(self, prefix: str = 'pair') -> Dict[str, object]:
+        """Rule facts; numeric facts read 0.0 until `{prefix}.ready`."""
+        return {
+            f"{prefix}.ready": self.ready,
+            f"{prefix}.zscore": round(self.zscore, 4) if self.zscore is not None else 0.0,
+            f"{prefix}.hedge_ratio": round(self.hedge_ratio, 6) if self.hedge_ratio is not None else 0.0,
+            f"{prefix}.half_life": self.half_life if self.half_life is not None else 0.0,
+        }
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cs = np.cumsum(values)
+    out = cs.copy()
+    out[window:] = cs[window:] - cs[:-window]
+    return out
+
+
+def _rolling_fit(u: np.ndarray, v: np.ndarray, n: np.ndarray, window: int):
+    su, sv = _rolling_sum(u, window), _rolling_sum(v, window)
+    suu, suv, svv = _rolling_sum(u * u, window), _rolling_sum(u * v, window), _rolling_sum(v * v, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        suu_c = suu - su * su / n
+        suv_c = suv - su * sv / n
+        svv_c = svv - sv * sv / n
+        slope = np.where(suu_c > 1e-12, suv_c / suu_c, np.nan)
+        intercept = (sv - slope * su) / n
+        var = np.maximum(svv_c - slope * suv_c, 0.0) / n
+    return slope, intercept, var
+
+
+def pair_series(a, b, window: int = 60, min_bars: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Vectorized PairState over aligned close arrays. Returns {'zscore', 'hedge_ratio',
+    'half_life', 'spread'}; element i equals PairState after bar i (NaN where it is None).
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    size = len(a)
+    nan = np.full(size, np.nan)
+    if size == 0:
+        return {'zscore': nan, 'hedge_ratio': nan, 'half_life': nan, 'spread': nan}
+
+    y, x = a - a[0], b - b[0]
+    n = np.minimum(np.arange(1, size + 1), window).astype(float)
+    beta, alpha, var = _rolling_fit(x, y, n, window)
+    ready = (n >= min_bars) & ~np.isnan(beta)
+    beta = np.where(ready, beta, np.nan)
+    spread = y - alpha - beta * x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscore = np.where(var > 0, spread / np.sqrt(var), 0.0)
+    zscore = np.where(ready, zscore, np.nan)
+
+    half_life = nan.copy()
+    idx = np.nonzero(ready[1:] & ready[:-1])[0] + 1
+    if len(idx):
+        # The AR(1) window holds the last `window` consecutive-bar spread pairs, as in PairState
+        u = spread[idx - 1]
+        v = spread[idx] - u
+        m = np.minimum(np.arange(1, len(idx) + 1), window).astype(float)
+        slope, _, _ = _rolling_fit(u, v, m, window)
+        with np.errstate(divide='ignore'):
+            hl = np.where(slope < 0, -LN2 / slope, np.inf)
+        half_life[idx] = np.where((m >= min_bars) & ~np.isnan(slope), hl, np.nan)
+
+    return {'zscore': zscore, 'hedge_ratio': beta, 'half_life': half_life, 'spread': np.where(ready, spread, np.nan)}
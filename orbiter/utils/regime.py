@@ -0,0 +1,259 @@
+# orbiter/utils/regime.py
+"""
+Intraday regime kernel: the sideways indicators of `analyze_sideways.py`, kept
+incrementally from 1-minute index bars, plus ADX and a hysteresis classifier.
+
+- `WilderADX`: O(1) per bar ADX, equal to talib.ADX on the same bars.
+- `RegimeState.update(ts, o, h, l, c, v)`: commit one closed 1-minute bar.
+  Day features (range, first hour, ORB, VWAP) reset at each new IST date; the
+  15-minute NR4 / Bollinger history and the ADX carry across days so they are
+  warm at the open.
+
+The composite score counts the sideways conditions that hold (0..7):
+    day range < 1%, first-hour range < 0.5%, |VWAP deviation| < 0.3%, inside
+    the 09:15-09:30 ORB, NR4 on the last 15-minute bar, price in the middle
+    half of the 20x15m Bollinger band, ADX < adx_sideways
+The state only flips to 'sideways' after `confirm_bars` bars at or above
+`enter_score`, and back to 'trending' after `confirm_bars` bars at or below
+`exit_score`; scores in between keep the current state.
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytz
+
+IST = pytz.timezone('Asia/Kolkata')
+
+SIDEWAYS = 'sideways'
+TRENDING = 'trending'
+UNKNOWN = 'unknown'
+
+
+class WilderADX:
+    """Incremental ADX(period) with talib's seeding (first value after 2 * period bars)."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.value: Optional[float] = None
+        self._prev = None
+        self._tr = self._plus = self._minus = 0.0
+        self._sum_dx = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        prev, self._prev = self._prev, (high, low, close)
+        if prev is None:
+            return None
+        ph, pl, pc = prev
+        self.count += 1
+        up, down = high - ph, pl - low
+        plus = up if up > 0 and up > down else 0.0
+        minus = down if down > 0 and up < down else 0.0
+        tr = max(high - low, abs(high - pc), abs(low - pc))
+
+        n = self.period
+        if self.count < n:
+            self._tr += tr
+            self._plus += plus
+            self._minus += minus
+            return None
+        self._tr += tr - self._tr / n
+        self._plus += plus - self._plus / n
+        self._minus += minus - self._minus / n
+
+        dx = None
+        if self._tr != 0:
+            plus_di, minus_di = 100 * self._plus / self._tr, 100 * self._minus / self._tr
+            if plus_di + minus_di != 0:
+                dx = 100 * abs(minus_di - plus_di) / (plus_di + minus_di)
+
+        if self.count < 2 * n - 1:
+            self._sum_dx += dx or 0.0
+        elif self.count == 2 * n - 1:
+            self.value = (self._sum_dx + (dx or 0.0)) / n
+        elif dx is not None:
+            self.value = (self.value * (n - 1) + dx) / n
+        return self.value
+
+
+class _Bucket:
+    """One higher-timeframe bar being built from 1-minute bars."""
+    __slots__ = ('start', 'high', 'low', 'close')
+
+    def __init__(self, start, high, low, close):
+        self.start, self.high, self.low, self.close = start, high, low, close
+
+
+class RegimeState:
+    """Regime features and classification for one index. See the module docstring."""
+
+    def __init__(self, enter_score: int = 4, exit_score: int = 2, confirm_bars: int = 3,
+                 adx_sideways: float = 25.0, adx_minutes: int = 5, adx_period: int = 14,
+                 bb_period: int = 20, min_bars: int = 15,
+                 session_start: str = "09:15", orb_end: str = "09:30", first_hour_end: str = "10:15"):
+        self.enter_score = enter_score
+        self.exit_score = exit_score
+        self.confirm_bars = confirm_bars
+        self.adx_sideways = adx_sideways
+        self.adx_minutes = adx_minutes
+        self.min_bars = min_bars
+        self._session_start = self._minute_of_day(session_start)
+        self._orb_end = self._minute_of_day(orb_end)
+        self._first_hour_end = self._minute_of_day(first_hour_end)
+
+        self.adx = WilderADX(adx_period)
+        self._adx_bucket: Optional[_Bucket] = None
+        self._q_bucket: Optional[_Bucket] = None
+        self._q_ranges = deque(maxlen=4)           # NR4 over 15-minute ranges
+        self._q_closes = deque(maxlen=bb_period)   # Bollinger(20, 2) over 15-minute closes
+        self.nr4 = False
+        self.bb_position = 0.5
+
+        self.state = UNKNOWN
+        self.score = 0
+        self.bars_in_state = 0
+        self.flips = 0
+        self._streak = 0
+        self.last_ts: Optional[float] = None
+        self._day = None
+        self._reset_day()
+
+    @staticmethod
+    def _minute_of_day(hhmm: str) -> int:
+        h, m = hhmm.split(':')[:2]
+        return int(h) * 60 + int(m)
+
+    def _reset_day(self):
+        self.day_bars = 0
+        self.day_open = self.day_high = self.day_low = self.close = None
+        self.orb_high = self.orb_low = None
+        self.fh_high = self.fh_low = None
+        self._pv = self._vol = self._tp = 0.0
+
+    # ---- bars
+    def update(self, ts: float, o: float, h: float, l: float, c: float, v: float = 0.0) -> str:
+        """Commit one closed 1-minute bar starting at epoch `ts`. Returns the regime state."""
+        if self.last_ts is not None and ts <= self.last_ts:
+            return self.state
+        self.last_ts = ts
+        local = datetime.fromtimestamp(ts, IST)
+        if local.date() != self._day:
+            self._day = local.date()
+            self._reset_day()
+        minute = local.hour * 60 + local.minute
+
+        self.day_bars += 1
+        if self.day_open is None:
+            self.day_open, self.day_high, self.day_low = o, h, l
+        self.day_high, self.day_low, self.close = max(self.day_high, h), min(self.day_low, l), c
+        if self._session_start <= minute <= self._orb_end:
+            self.orb_high = h if self.orb_high is None else max(self.orb_high, h)
+            self.orb_low = l if self.orb_low is None else min(self.orb_low, l)
+        if self._session_start <= minute <= self._first_hour_end:
+            self.fh_high = h if self.fh_high is None else max(self.fh_high, h)
+            self.fh_low = l if self.fh_low is None else min(self.fh_low, l)
+        tp = (h + l + c) / 3
+        self._pv += tp * v
+        self._vol += v
+        self._tp += tp
+
+        self._adx_bucket = self._roll(self._adx_bucket, ts, self.adx_minutes, h, l, c, self._close_adx_bar)
+        self._q_bucket = self._roll(self._q_bucket, ts, 15, h, l, c, self._close_quarter)
+        self._classify()
+        return self.state
+
+    @staticmethod
+    def _roll(bucket, ts, minutes, h, l, c, on_close):
+        start = ts - ts % (minutes * 60)
+        if bucket is not None and bucket.start != start:
+            on_close(bucket)
+            bucket = None
+        if bucket is None:
+            return _Bucket(start, h, l, c)
+        bucket.high, bucket.low, bucket.close = max(bucket.high, h), min(bucket.low, l), c
+        return bucket
+
+    def _close_adx_bar(self, bar: _Bucket):
+        self.adx.update(bar.high, bar.low, bar.close)
+
+    def _close_quarter(self, bar: _Bucket):
+        self._q_ranges.append(bar.high - bar.low)
+        self.nr4 = len(self._q_ranges) == self._q_ranges.maxlen and self._q_ranges[-1] <= min(self._q_ranges)
+        self._q_closes.append(bar.close)
+        if len(self._q_closes) == self._q_closes.maxlen:
+            n = len(self._q_closes)
+            mean = sum(self._q_closes) / n
+            std = math.sqrt(sum((x - mean) ** 2 for x in self._q_closes) / (n - 1))
+            self.bb_position = (bar.close - (mean - 2 * std)) / (4 * std) if std > 0 else 0.5
+
+    # ---- features
+    @property
+    def vwap(self) -> Optional[float]:
+        if not self.day_bars:
+            return None
+        # Index feeds carry no volume; fall back to the mean typical price
+        return self._pv / self._vol if self._vol > 0 else self._tp / self.day_bars
+
+    def features(self) -> Dict[str, Any]:
+        pct = lambda hi, lo: (hi - lo) / lo * 100 if lo else 0.0
+        vwap = self.vwap
+        within_orb = self.orb_high is not None and self.day_high <= self.orb_high and self.day_low >= self.orb_low
+        return {
+            'day_range_pct': pct(self.day_high, self.day_low) if self.day_bars else 0.0,
+            'first_hour_range_pct': pct(self.fh_high, self.fh_low) if self.fh_high is not None else 0.0,
+            'vwap_deviation_pct': (self.close - vwap) / vwap * 100 if vwap else 0.0,
+            'orb_range_pct': pct(self.orb_high, self.orb_low) if self.orb_high is not None else 0.0,
+            'within_orb': within_orb,
+            'nr4': self.nr4,
+            'bb_position': self.bb_position,
+            'adx': self.adx.value if self.adx.value is not None else 0.0,
+        }
+
+    def _score(self, f: Dict[str, Any]) -> int:
+        return sum((
+            f['day_range_pct'] < 1.0,
+            self.fh_high is not None and f['first_hour_range_pct'] < 0.5,
+            abs(f['vwap_deviation_pct']) < 0.3,
+            f['within_orb'],
+            f['nr4'],
+            len(self._q_closes) == self._q_closes.maxlen and 0.25 <= f['bb_position'] <= 0.75,
+            self.adx.value is not None and f['adx'] < self.adx_sideways,
+        ))
+
+    def _classify(self):
+        self.score = self._score(self.features())
+        self.bars_in_state += 1
+        if self.state == UNKNOWN:
+            if self.day_bars >= self.min_bars:
+                self._set(SIDEWAYS if self.score * 2 >= self.enter_score + self.exit_score else TRENDING)
+            return
+        if self.state == TRENDING and self.score >= self.enter_score:
+            self._streak += 1
+        elif self.state == SIDEWAYS and self.score <= self.exit_score:
+            self._streak += 1
+        else:
+            self._streak = 0
+        if self._streak >= self.confirm_bars:
+            self._set(SIDEWAYS if self.state == TRENDING else TRENDING)
+            self.flips += 1
+
+    def _set(self, state: str):
+        self.state = state
+        self.bars_in_state = 0
+        self._streak = 0
+
+    def facts(self, prefix: str = 'regime') -> Dict[str, Any]:
+        """Rule facts for the current state; cheap enough to publish every bar."""
+        facts = {f"{prefix}.{k}": (round(v, 4) if isinstance(v, float) else v) for k, v in self.features().items()}
+        facts.update({
+            f"{prefix}.state": self.state,
+            f"{prefix}.score": self.score,
+            f"{prefix}.is_sideways": self.state == SIDEWAYS,
+            f"{prefix}.is_trending": self.state == TRENDING,
+            f"{prefix}.bars_in_state": self.bars_in_state,
+            f"{prefix}.ready": self.state != UNKNOWN,
+        })
+        return facts
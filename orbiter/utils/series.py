@@ -0,0 +1,114 @@
+# orbiter/utils/series.py
+"""
+Helpers for the series (full-history) mode of the fact filters.
+
+Series functions return one value per bar, where value[i] equals what the
+last-bar API returns when called with the bars up to and including i
+(with LTP = close[i]). These helpers keep that contract vectorized.
+"""
+
+from contextlib import contextmanager
+import numpy as np
+import talib
+
+
+@contextmanager
+def talib_compatibility(mode: int):
+    """Temporarily switch TA-Lib compatibility (1 = Metastock), as the filters do."""
+    try:
+        talib.set_compatibility(mode)
+        yield
+    finally:
+        talib.set_compatibility(0)
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def round2(values) -> np.ndarray:
+    return np.round(as_float_array(values), 2)
+
+
+def nan_to(values, fill: float = 0.0) -> np.ndarray:
+    return np.nan_to_num(as_float_array(values), nan=fill, posinf=fill, neginf=fill)
+
+
+def bar_count(n: int) -> np.ndarray:
+    """Number of bars seen at each index (i + 1), used for the min-candle guards."""
+    return np.arange(1, n + 1)
+
+
+def lag(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    value[i - k], clamped to value[0] for the first k bars.
+    Mirrors `arr[-(k + 1)] if len(arr) >= k + 1 else arr[0]` on each prefix.
+    """
+    values = np.asarray(values)
+    idx = np.maximum(np.arange(len(values)) - k, 0)
+    return values[idx]
+
+
+def session_ids(timestamps, n: int) -> np.ndarray:
+    """Integer session (calendar day) id per bar. Without timestamps every bar is one session."""
+    if timestamps is None:
+        return np.zeros(n, dtype=np.int64)
+    days = np.asarray(timestamps, dtype='datetime64[m]').astype('datetime64[D]')
+    return np.concatenate(([0], np.cumsum(days[1:] != days[:-1]))).astype(np.int64)
+
+
+def minute_of_day(timestamps) -> np.ndarray:
+    """Minutes since midnight per bar, or None if timestamps are unavailable."""
+    if timestamps is None:
+        return None
+    ts = np.asarray(timestamps, dtype='datetime64[m]')
+    return (ts - ts.astype('datetime64[D]')).astype(np.int64)
+
+
+def session_bounds(sessions: np.ndarray):
+    """Yield (start, stop) slices for each contiguous session."""
+    if len(sessions) == 0:
+        return
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sessions)) + 1))
+    stops = np.concatenate((starts[1:], [len(sessions)]))
+    for start, stop in zip(starts, stops):
+        yield int(start), int(stop)
+
+
+def session_accumulate(values: np.ndarray, sessions: np.ndarray, ufunc) -> np.ndarray:
+    """Running ufunc (np.maximum / np.minimum) that restarts at every session."""
+    out = np.empty(len(values), dtype=float)
+    for start, stop in session_bounds(sessions):
+        out[start:stop] = ufunc.accumulate(values[start:stop])
+    return out
+
+
+def session_first(values: np.ndarray, sessions: np.ndarray) -> np.ndarray:
+    """First value of each bar's session, broadcast over the session."""
+    out = np.empty(len(values), dtype=float)
+    for start, stop in session_bounds(sessions):
+        out[start:stop] = values[start]
+    return out
+
+
+def session_position(sessions: np.ndarray) -> np.ndarray:
+    """Zero-based index of each bar within its session."""
+    pos = np.arange(len(sessions))
+    starts = np.zeros(len(sessions), dtype=np.int64)
+    for start, stop in session_bounds(sessions):
+        starts[start:stop] = start
+    return pos - starts
+
+
+def previous_session(values: np.ndarray, sessions: np.ndarray, reducer) -> np.ndarray:
+    """
+    Per bar, `reducer` applied over the whole previous session (e.g. yesterday's high).
+    Bars in the first session get 0.0, matching a missing 'ph'/'pl' quote field.
+    """
+    out = np.zeros(len(values), dtype=float)
+    prev = None
+    for start, stop in session_bounds(sessions):
+        if prev is not None:
+            out[start:stop] = reducer(values[prev[0]:prev[1]])
+        prev = (start, stop)
+    return out
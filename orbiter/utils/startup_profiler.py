@@ -0,0 +1,85 @@
+# orbiter/utils/startup_profiler.py
+"""
+Startup Profiler - import and initialization timings for `--profile-startup`.
+
+Installed before the first orbiter import in main.py: wraps `builtins.__import__`
+to time every first-time module import (cumulative and self time), and
+`phase(name)` times initialization steps. `report()` renders both, plus the
+deferred integrations that were actually loaded and the config bundle hit rate.
+"""
+
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: Dict[str, List[float]] = {} # module -> [cumulative, self]
+        self._stack: List[List[float]] = []
+        self._original_import = None
+        self._thread_id = threading.get_ident()
+
+    def install(self) -> 'StartupProfiler':
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+        return self
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Main thread only: background imports would interleave with the timing stack
+        if level or name in sys.modules or threading.get_ident() != self._thread_id:
+            return self._original_import(name, globals, locals, fromlist, level)
+        frame = [0.0] # time spent in nested first-time imports
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            self.imports[name] = [elapsed, elapsed - frame[0]]
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def report(self, top: int = 15) -> str:
+        from orbiter.utils.config_bundle import ConfigBundle
+        from orbiter.utils.lazy_import import RESOLVED
+
+        total = time.perf_counter() - self.started
+        lines = [f"⏱️ STARTUP PROFILE: {total * 1000:.0f}ms since interpreter handoff"]
+        lines.append("  Phases:")
+        for name, seconds in self.phases:
+            lines.append(f"    {seconds * 1000:8.1f}ms  {name}")
+        lines.append(f"  Slowest imports (self / cumulative, of {len(self.imports)} first-time imports):")
+        slowest = sorted(self.imports.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+        for module, (cumulative, own) in slowest:
+            lines.append(f"    {own * 1000:8.1f}ms / {cumulative * 1000:8.1f}ms  {module}")
+        if RESOLVED:
+            lines.append("  Deferred imports loaded: " + ", ".join(
+                f"{name} ({seconds * 1000:.0f}ms)" for name, seconds in RESOLVED.items()))
+        else:
+            lines.append("  Deferred imports loaded: none")
+        bundle = ConfigBundle.active()
+        if bundle is not None:
+            stats = bundle.get_stats()
+            lines.append(f"  Config bundle: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} files)")
+        return "\n".join(lines)
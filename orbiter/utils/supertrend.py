@@ -0,0 +1,250 @@
+# orbiter/utils/supertrend.py
+"""
+Canonical SuperTrend / ATR kernel shared by Orbiter filters, TechnicalAnalyzer,
+backtest_lab and varaha.
+
+- `wilder_atr` / `supertrend`: full-series API (vectorized TR + ATR, one band/trend pass).
+- `SuperTrendState`: stateful incremental API, O(1) per bar after warm-up.
+
+The band/trend pass is JIT-compiled with numba when it is installed (imported on
+the first full-series call, not at import) and falls back to a plain-Python loop
+over lists otherwise. Both produce identical output.
+"""
+
+import math
+import numpy as np
+import talib
+
+
+
+def _supertrend_loop(upper, lower, closes, st, direction):
+    """
+    Final-band ratchet and trend selection. Writes into `st` and `direction`
+    (1 = price above the line / bullish, -1 = bearish).
+    """
+    n = len(closes)
+    if n == 0:
+        return
+    fub = upper[0]
+    flb = lower[0]
+    st[0] = fub
+    direction[0] = -1
+    for i in range(1, n):
+        prev_fub = fub
+        prev_flb = flb
+        prev_close = closes[i - 1]
+
+        if upper[i] < prev_fub or prev_close > prev_fub:
+            fub = upper[i]
+        if lower[i] > prev_flb or prev_close < prev_flb:
+            flb = lower[i]
+
+        if st[i - 1] == prev_fub:
+            if closes[i] <= fub:
+                st[i] = fub
+                direction[i] = -1
+            else:
+                st[i] = flb
+                direction[i] = 1
+        else:
+            if closes[i] >= flb:
+                st[i] = flb
+                direction[i] = 1
+            else:
+                st[i] = fub
+                direction[i] = -1
+
+
+_JIT = {}
+
+
+def _jit_loop():
+    """numba-compiled `_supertrend_loop`, or None without numba. numba is imported on first use (~150ms)."""
+    if 'loop' not in _JIT:
+        try:
+            from numba import njit
+            _JIT['loop'] = njit(cache=True)(_supertrend_loop)
+        except ImportError:
+            _JIT['loop'] = None
+    return _JIT['loop']
+
+
+def true_range(highs, lows, closes) -> np.ndarray:
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    tr = np.empty_like(closes)
+    if len(closes) == 0:
+        return tr
+    prev_close = closes[:-1]
+    tr[1:] = np.maximum.reduce([highs[1:] - lows[1:], np.abs(highs[1:] - prev_close), np.abs(lows[1:] - prev_close)])
+    tr[0] = highs[0] - lows[0]
+    return tr
+
+
+def wilder_atr(highs, lows, closes, period: int) -> np.ndarray:
+    """
+    Wilder ATR as EMA(TR, 2 * period - 1), SMA-seeded. Leading warm-up bars are
+    back-filled with the first valid value (0 if the history is too short).
+    """
+    tr = true_range(highs, lows, closes)
+    if len(tr) == 0:
+        return tr
+    try:
+        talib.set_compatibility(1) # Metastock compatibility
+        atr = talib.EMA(tr, timeperiod=period * 2 - 1)
+    finally:
+        talib.set_compatibility(0)
+
+    first_valid = np.where(~np.isnan(atr))[0]
+    if len(first_valid) > 0:
+        atr = np.nan_to_num(atr, nan=atr[first_valid[0]])
+    else:
+        atr = np.nan_to_num(atr, nan=0)
+    return atr
+
+
+def supertrend(highs, lows, closes, period: int = 10, multiplier: float = 3.0, use_jit: bool = True):
+    """
+    Full-series SuperTrend. Returns (line, direction) arrays aligned with the input.
+    """
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    n = len(closes)
+    if n == 0:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    atr = wilder_atr(highs, lows, closes, period)
+    hl2 = (highs + lows) / 2.0
+    upper = hl2 + multiplier * atr
+    lower = hl2 - multiplier * atr
+
+    jit_loop = _jit_loop() if use_jit else None
+    if jit_loop is not None:
+        st = np.zeros(n)
+        direction = np.zeros(n, dtype=np.int64)
+        jit_loop(upper, lower, closes, st, direction)
+        return st, direction
+
+    st = [0.0] * n
+    direction = [0] * n
+    _supertrend_loop(upper.tolist(), lower.tolist(), closes.tolist(), st, direction)
+    return np.array(st, dtype=float), np.array(direction, dtype=np.int64)
+
+
+class SuperTrendState:
+    """
+    Incremental SuperTrend that reproduces `supertrend()` bar for bar.
+
+    The first `2 * period - 1` bars are buffered until the ATR seed exists (the
+    series API back-fills those bars with the first ATR value); `update` returns
+    (nan, 0) for them. After warm-up each `update` is O(1). `peek` evaluates a
+    still-forming bar without committing it, for per-tick use on a live candle.
+    """
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0):
+        self.period = period
+        self.multiplier = multiplier
+        self.atr_period = period * 2 - 1
+        self._k = 2.0 / (self.atr_period + 1)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.atr = None
+        self.value = math.nan
+        self.direction = 0
+        self._fub = None
+        self._flb = None
+        self._prev_close = None
+        self._warmup = []
+
+    @property
+    def ready(self) -> bool:
+        return self.atr is not None
+
+    def seed(self, highs, lows, closes):
+        """Warm the state from history (e.g. primed candles) in one pass."""
+        self.reset()
+        for h, l, c in zip(highs, lows, closes):
+            self.update(h, l, c)
+        return self.value, self.direction
+
+    def update(self, high: float, low: float, close: float):
+        """Commit a closed bar and return (line, direction)."""
+        high, low, close = float(high), float(low), float(close)
+        if not self.ready:
+            self._warmup.append((high, low, close))
+            self.count += 1
+            if len(self._warmup) < self.atr_period:
+                return math.nan, 0
+            self._finish_warmup()
+            return self.value, self.direction
+
+        tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        atr = ((tr - self.atr) * self._k) + self.atr
+        value, direction, fub, flb = self._step(high, low, close, atr)
+        self.atr, self.value, self.direction, self._fub, self._flb = atr, value, direction, fub, flb
+        self._prev_close = close
+        self.count += 1
+        return value, direction
+
+    def peek(self, high: float, low: float, close: float):
+        """(line, direction) if a bar with these values closed now; state is unchanged."""
+        if not self.ready:
+            return math.nan, 0
+        high, low, close = float(high), float(low), float(close)
+        tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        atr = ((tr - self.atr) * self._k) + self.atr
+        value, direction, _, _ = self._step(high, low, close, atr)
+        return value, direction
+
+    def _step(self, high, low, close, atr):
+        hl2 = (high + low) / 2.0
+        upper = hl2 + self.multiplier * atr
+        lower = hl2 - self.multiplier * atr
+        prev_fub, prev_flb = self._fub, self._flb
+
+        fub = upper if (upper < prev_fub or self._prev_close > prev_fub) else prev_fub
+        flb = lower if (lower > prev_flb or self._prev_close < prev_flb) else prev_flb
+
+        if self.value == prev_fub:
+            value, direction = (fub, -1) if close <= fub else (flb, 1)
+        else:
+            value, direction = (flb, 1) if close >= flb else (fub, -1)
+        return value, direction, fub, flb
+
+    def _finish_warmup(self):
+        bars = self._warmup
+        highs = np.array([b[0] for b in bars])
+        lows = np.array([b[1] for b in bars])
+        closes = np.array([b[2] for b in bars])
+
+        # SMA-seeded EMA of TR, summed in order like TA-Lib
+        tr = true_range(highs, lows, closes)
+        total = 0.0
+        for v in tr.tolist():
+            total += v
+        self.atr = total / self.atr_period
+
+        hl2 = (highs + lows) / 2.0
+        upper = (hl2 + self.multiplier * self.atr).tolist()
+        lower = (hl2 - self.multiplier * self.atr).tolist()
+        st = [0.0] * len(bars)
+        direction = [0] * len(bars)
+        _supertrend_loop(upper, lower, closes.tolist(), st, direction)
+
+        # Recover the ratcheted bands at the last warm-up bar
+        fub, flb = upper[0], lower[0]
+        for i in range(1, len(bars)):
+            prev_close = closes[i - 1]
+            if upper[i] < fub or prev_close > fub:
+                fub = upper[i]
+            if lower[i] > flb or prev_close < flb:
+                flb = lower[i]
+
+        self._fub, self._flb = fub, flb
+        self.value, self.direction = st[-1], direction[-1]
+        self._prev_close = float(closes[-1])
+        self._warmup = []
@@ -3,11 +3,14 @@
 Yahoo Finance adapter for getting market regime indicators.
 Used for dynamic strategy selection (not for trade scoring).
 """
-import yfinance as yf
 import talib
 import numpy as np
 import logging
 
+from orbiter.utils.lazy_import import lazy_import
+
+yf = lazy_import("yfinance") # imported on the first download
+
 logger = logging.getLogger("ORBITER")
 
 # Mapping of indices to yfinance symbols
@@ -18,6 +21,21 @@ INDEX_SYMBOLS = {
     'BANKEX': '^BSEBK',
 }
 
+# MCX to Yahoo Finance commodity futures mapping
+MCX_YF_SYMBOLS = {
+    'CRUDEOILM': 'CL=F',
+    'NATURALGAS': 'NG=F',
+    'NATGASMINI': 'NG=F',
+    'GOLDM': 'GC=F',
+    'GOLDTEN': 'GC=F',
+    'GOLDGUINEA': 'GC=F',
+    'SILVERM': 'SI=F',
+    'SILVERMIC': 'SI=F',
+    'ALUMINI': 'ALI=F',
+    'LEADMINI': 'PB=F',
+    'ZINCMINI': 'ZN=F',
+}
+
 def get_market_adx(index_name: str = 'SENSEX', interval: str = '5m') -> float:
     """
     Get current ADX for an index from Yahoo Finance.
@@ -79,64 +97,79 @@ def get_market_regime(index_name: str = 'SENSEX') -> str:
     return 'trending' if adx >= 25 else 'sideways'
 
 
-def get_all_indicators(index_name: str = 'SENSEX', interval: str = '5m') -> dict:
+def compute_indicators(df) -> dict:
     """
-    Get all technical indicators from Yahoo Finance for fallback.
-    
+    Fallback indicator set from an OHLC DataFrame (yfinance `history()` shape).
+
     Returns:
         dict with keys: adx, ema_fast, ema_slow, supertrend_dir, supertrend
     """
-    symbol = INDEX_SYMBOLS.get(index_name.upper(), '^BSESN')
-    
+    high = np.asarray(df['High'].values, dtype=float)
+    low = np.asarray(df['Low'].values, dtype=float)
+    close = np.asarray(df['Close'].values, dtype=float)
+
+    # Calculate all indicators
+    adx = talib.ADX(high, low, close, timeperiod=14)
+    ema_fast = talib.EMA(close, timeperiod=5)
+    ema_slow = talib.EMA(close, timeperiod=20)
+
+    # Handle NaN in ADX
+    adx_value = float(adx[-1])
+    if np.isnan(adx_value):
+        adx_value = 0.0  # Default to 0 if ADX is NaN
+
+    # SuperTrend calculation
+    atr = talib.ATR(high, low, close, timeperiod=10)
+    hl2 = (high + low) / 2
+    lower = hl2 - (3 * atr)
+
+    # Simple SuperTrend direction (1 = bull, -1 = bear)
+    st_dir = 1 if close[-1] > lower[-1] else -1
+
+    return {
+        'adx': round(adx_value, 2),
+        'ema_fast': round(float(ema_fast[-1]), 2),
+        'ema_slow': round(float(ema_slow[-1]), 2),
+        'supertrend_dir': st_dir,
+        'supertrend': round(float(atr[-1] * 3), 2),  # ATR-based value
+    }
+
+
+def fetch_indicators(symbol: str, interval: str = '5m') -> dict:
+    """
+    Download today's candles for a raw yfinance symbol ('^NSEI', 'CL=F') and
+    compute the fallback indicators. Blocking: call from a background thread.
+
+    Returns:
+        dict from compute_indicators, or {} when there is not enough data
+    """
     try:
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period='1d', interval=interval)
-        
+        df = yf.Ticker(symbol).history(period='1d', interval=interval)
+
         if df.empty or len(df) < 14:
             # Try smaller interval if 5m doesn't have enough data
             if interval == '5m':
-                logger.info(f"YF: Not enough 5m candles ({len(df)}), trying 1m interval")
-                ticker_1m = yf.Ticker(symbol)
-                df = ticker_1m.history(period='1d', interval='1m')
+                logger.info(f"YF: Not enough 5m candles ({len(df)}) for {symbol}, trying 1m interval")
+                df = yf.Ticker(symbol).history(period='1d', interval='1m')
                 if df.empty or len(df) < 14:
                     logger.warning(f"YF: No data for {symbol} (tried 1m, got {len(df)} rows)")
                     return {}
-                interval = '1m'
             else:
                 logger.warning(f"YF: No data for {symbol}")
                 return {}
-        
-        high = df['High'].values
-        low = df['Low'].values
-        close = df['Close'].values
-        
-        # Calculate all indicators
-        adx = talib.ADX(high, low, close, timeperiod=14)
-        ema_fast = talib.EMA(close, timeperiod=5)
-        ema_slow = talib.EMA(close, timeperiod=20)
-        
-        # Handle NaN in ADX
-        adx_value = float(adx[-1])
-        if np.isnan(adx_value):
-            adx_value = 0.0  # Default to 0 if ADX is NaN
-        
-        # SuperTrend calculation
-        atr = talib.ATR(high, low, close, timeperiod=10)
-        hl2 = (high + low) / 2
-        upper = hl2 + (3 * atr)
-        lower = hl2 - (3 * atr)
-        
-        # Simple SuperTrend direction (1 = bull, -1 = bear)
-        st_dir = 1 if close[-1] > lower[-1] else -1
-        
-        return {
-            'adx': round(adx_value, 2),
-            'ema_fast': round(float(ema_fast[-1]), 2),
-            'ema_slow': round(float(ema_slow[-1]), 2),
-            'supertrend_dir': st_dir,
-            'supertrend': round(float(atr[-1] * 3), 2),  # ATR-based value
-        }
-        
+
+        return compute_indicators(df)
+
     except Exception as e:
         logger.error(f"YF: Error getting indicators for {symbol}: {e}")
         return {}
+
+
+def get_all_indicators(index_name: str = 'SENSEX', interval: str = '5m') -> dict:
+    """
+    Get all technical indicators from Yahoo Finance for fallback.
+    
+    Returns:
+        dict with keys: adx, ema_fast, ema_slow, supertrend_dir, supertrend
+    """
+    return fetch_indicators(INDEX_SYMBOLS.get(index_name.upper(), '^BSESN'), interval)
@@ -89,11 +89,21 @@ class IndicatorBuffer:
         self.buf = deque(maxlen=maxlen)
         self._cum_vol = 0.0
         self._cum_vp = 0.0
+        self._st = None
+        try:
+            from orbiter.utils.supertrend import SuperTrendState
+
+            self._st = SuperTrendState(period=10, multiplier=3)
+        except ImportError:
+            pass
 
     def append(self, o: float, h: float, l: float, c: float, v: float = 0):
         self.buf.append({"open": o, "high": h, "low": l, "close": c, "volume": v})
         self._cum_vol += v
         self._cum_vp += (o + h + l + c) / 4 * v if v > 0 else 0
+        if self._st is not None:
+            # O(1) per bar; carries the line across the whole session, not just the buffer
+            self._st.update(h, l, c)
 
     def warmup_from_log(self, log_path: str, max_bars: int = 200):
         """Rebuild buffer from OHLCV log file after a restart, so ta-lib
@@ -190,12 +200,15 @@ class IndicatorBuffer:
                 pass
         if len(closes) >= 20:
             try:
-                from orbiter.filters.entry.f4_supertrend import calculate_st_values
+                if self._st is not None and self._st.ready:
+                    st_value = self._st.value
+                else:
+                    from orbiter.utils.supertrend import supertrend
 
-                st = calculate_st_values(highs, lows, closes, period=10, multiplier=3)
-                result["supertrend_value"] = float(st[-1])
+                    st_value = supertrend(highs, lows, closes, period=10, multiplier=3)[0][-1]
+                result["supertrend_value"] = float(st_value)
                 result["supertrend_direction"] = (
-                    "bullish" if closes[-1] > st[-1] else "bearish"
+                    "bullish" if closes[-1] > st_value else "bearish"
                 )
             except Exception:
                 pass
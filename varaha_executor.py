@@ -2,30 +2,67 @@
 🐗 Project Varaha: Phase 3 – Order Execution Engine
 Iron Butterfly Sequential Order Placement
 
-Phase 1: BUY Wings (OTM Call + OTM Put) → Margin unlock
-Phase 2: Wait 1.5s → SELL ATM Straddle (ATM Call + ATM Put)
+Phase 1: BUY Wings (OTM Call + OTM Put, sent together) → Margin unlock
+Phase 2: Wings filled (within fill_timeout) → SELL ATM Straddle (ATM Call + ATM Put, sent together)
+         Wings not filled in time → wings cancelled/reversed, no straddle (position rolled back)
 
 🛡️ SAFETY GATE: Duplicate Order Prevention System
-- Step 1: Orderbook Validator (is_already_traded)
+- Step 1: Orderbook Validator (is_already_traded, local OrderStore lookup)
 - Step 2: Pre-Placement Check
 - Step 3: Session Recovery on startup
 """
 
-import time
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, List
 
+try:
+    from orbiter.core.broker.order_store import OrderStore, FINAL_STATUSES
+except ImportError:
+    OrderStore = None
+    FINAL_STATUSES = frozenset()
+
+try:
+    from orbiter.core.broker.multi_leg import MultiLegDispatcher
+except ImportError:
+    MultiLegDispatcher = None
+
 # Get logger - will be set by main module
 logger = logging.getLogger("Varaha")
 
+# One order-book download serves every leg checked within this window
+ORDERBOOK_MAX_AGE_SECONDS = 2.0
+
+# Default wait for a phase to fill before the next phase goes out. A phase that is not filled by
+# then FAILS: an entry is rolled back (wings cancelled or reversed), an exit stage just moves on.
+PHASE_FILL_TIMEOUT_SECONDS = 5.0
+
+# No order-update websocket here: while a phase waits, placed legs are polled via single_order_history
+FILL_POLL_SECONDS = 0.25
+
+# place_varaha_order statuses that need no fill wait (simulated or already in the book)
+_NO_WAIT_STATUSES = ('SIMULATED', 'DUPLICATE_SKIPPED')
+
 
 class VarahaExecutor:
     """Handles sequential order execution for Iron Butterfly strategy"""
     
-    def __init__(self, api_instance):
+    def __init__(self, api_instance, order_store=None, fill_timeout: float = PHASE_FILL_TIMEOUT_SECONDS):
         self.api = api_instance
+        self.fill_timeout = fill_timeout
         self.order_log = []  # Track all orders for verification
+        if order_store is None and api_instance is not None and OrderStore is not None:
+            order_store = OrderStore(api_instance)
+        self.order_store = order_store
+        self._log_lock = threading.Lock()
+        self._awaiting_fill = set()  # placed order ids not yet final in the OrderStore
+        self.dispatcher = None
+        if MultiLegDispatcher is not None:
+            self.dispatcher = MultiLegDispatcher(
+                api_instance, order_store, place_fn=self._place_leg, reverse_fn=self._reverse_leg,
+                phase_timeout=fill_timeout
+            )
         
     # ============================================================
     # 🛡️ SAFETY GATE: Step 1 - Orderbook Validator
@@ -48,6 +85,18 @@ class VarahaExecutor:
             logger.warning("🛡️ No API instance - allowing order (dry-run mode)")
             return False
         
+        if self.order_store is not None:
+            try:
+                # Refreshed at most once per ORDERBOOK_MAX_AGE_SECONDS, then an O(1) index lookup
+                self.order_store.refresh(max_age=ORDERBOOK_MAX_AGE_SECONDS)
+                if self.order_store.has_order(token, side):
+                    logger.info(f"🛡️ DUPLICATE BLOCKED: {token} {side} already in orderbook")
+                    return True
+                return False
+            except Exception as e:
+                logger.warning(f"🛡️ Orderbook check failed: {e} - allowing order")
+                return False
+        
         try:
             # Query live orderbook
             book = self.api.get_order_book()
@@ -163,6 +212,9 @@ class VarahaExecutor:
         #     response = self.api.place_order(**order_payload)
         #     order_record['order_id'] = response.get('norenordno', 'UNKNOWN')
         #     order_record['status'] = 'PLACED'
+        #     if self.order_store is not None:
+        #         self.order_store.on_order_update({'norenordno': order_record['order_id'], 'token': token,
+        #                                           'trantype': transaction_type, 'status': 'PENDING'})
         #     logger.info(f"🐗 Order PLACED: {buy_or_sell} {symbol_info['tsym']} Qty:{quantity} @ ₹{limit_price}")
         # except Exception as e:
         #     order_record['status'] = 'FAILED'
@@ -170,13 +222,78 @@ class VarahaExecutor:
         #     logger.error(f"🐗 Order FAILED: {buy_or_sell} {symbol_info['tsym']} -> {e}")
         
         # SIMULATION - just log
-        order_record['order_id'] = f"SI{len(self.order_log)+1:04d}"
-        order_record['status'] = 'SIMULATED'
+        with self._log_lock:
+            order_record['order_id'] = f"SI{len(self.order_log)+1:04d}"
+            order_record['status'] = 'SIMULATED'
+            self.order_log.append(order_record)
         logger.info(f"🔒 [SIM] {timestamp} | {buy_or_sell} {symbol_info['tsym']} Qty:{quantity} @ ₹{limit_price}")
         
-        self.order_log.append(order_record)
         return order_record
     
+    # ============================================================
+    # Phased dispatch (legs of a phase go out together)
+    # ============================================================
+    
+    @staticmethod
+    def _leg(name: str, side: str, symbol_info: dict, quantity: int) -> dict:
+        return {'name': name, 'side': side, 'info': symbol_info,
+                'order': {'buy_or_sell': 'B' if side == 'BUY' else 'S', 'quantity': quantity}}
+    
+    def _place_leg(self, leg: dict) -> dict:
+        """MultiLegDispatcher place_fn: place_varaha_order in broker-response form."""
+        record = self.place_varaha_order(leg['side'], leg['info'], leg['order']['quantity'])
+        leg['record'] = record
+        ok = record.get('status') in _NO_WAIT_STATUSES + ('PLACED',)
+        if record.get('status') == 'PLACED':
+            with self._log_lock:
+                self._awaiting_fill.add(record['order_id'])
+        return {'stat': 'Ok' if ok else 'Not_Ok', 'norenordno': record.get('order_id'),
+                'filled': record.get('status') in _NO_WAIT_STATUSES, 'emsg': record.get('error')}
+    
+    def _reverse_leg(self, leg: dict, quantity: int) -> dict:
+        """MultiLegDispatcher reverse_fn: unwind a leg of a structure that failed to complete."""
+        side = 'SELL' if leg['side'] == 'BUY' else 'BUY'
+        return self._place_leg(self._leg(f"rollback_{leg['name']}", side, leg['info'], quantity))
+    
+    def _run_phases(self, phases: list, rollback: bool) -> dict:
+        """Dispatch phases through MultiLegDispatcher, or one leg at a time without it."""
+        if self.dispatcher is not None:
+            if self.order_store is None or not hasattr(self.api, 'single_order_history'):
+                return self.dispatcher.execute(phases, gate='fill', rollback=rollback)
+            stop = threading.Event()
+            poller = threading.Thread(target=self._poll_fills, args=(stop,), name="VarahaFills", daemon=True)
+            poller.start()
+            try:
+                return self.dispatcher.execute(phases, gate='fill', rollback=rollback)
+            finally:
+                stop.set()
+                poller.join()
+        for phase in phases:
+            for leg in phase:
+                self._place_leg(leg)
+        return {'ok': True, 'legs': [], 'failed_phase': None, 'reason': None, 'rolled_back': [], 'elapsed_ms': 0.0}
+    
+    def _poll_fills(self, stop: threading.Event):
+        """Feed the OrderStore (and so the dispatcher's fill gate) from single_order_history until `stop`."""
+        while True:
+            with self._log_lock:
+                pending = list(self._awaiting_fill)
+            for order_id in pending:
+                try:
+                    rows = self.api.single_order_history(orderno=order_id)
+                except Exception as e:
+                    logger.debug(f"order history failed for {order_id}: {e}")
+                    continue
+                if not isinstance(rows, list) or not rows:
+                    continue
+                row = dict(rows[0], norenordno=order_id)  # newest state first
+                self.order_store.on_order_update(row)
+                if str(row.get('status', '')).upper() in FINAL_STATUSES:
+                    with self._log_lock:
+                        self._awaiting_fill.discard(order_id)
+            if stop.wait(FILL_POLL_SECONDS):
+                return
+    
     def execute_iron_butterfly(self, legs: dict, lots: int) -> dict:
         """
         Execute Iron Butterfly in correct sequence
@@ -206,31 +323,27 @@ class VarahaExecutor:
         print(f"📍 PHASE 1: BUYING WINGS (Margin Unlock)")
         print("-" * 40)
         
-        # Buy OTM Call (Wing 1)
-        wing_ce = self.place_varaha_order('BUY', legs['buy_ce'], qty)
-        
-        # Buy OTM Put (Wing 2)  
-        wing_pe = self.place_varaha_order('BUY', legs['buy_pe'], qty)
-        
-        print(f"✅ Wings ordered. Waiting 1.5s for margin update...\n")
-        
-        # 1.5 SECOND SAFETY BUFFER
-        time.sleep(1.5)
+        # Both wings go out together; the straddle waits for their fills instead of a
+        # fixed 1.5s sleep. Wings not COMPLETE within self.fill_timeout roll the whole
+        # position back (working wings cancelled, filled ones reversed) and the
+        # straddle is never sent.
+        wings = [self._leg('buy_ce', 'BUY', legs['buy_ce'], qty),
+                 self._leg('buy_pe', 'BUY', legs['buy_pe'], qty)]
         
         # =====================================================
         # PHASE 2: SELL THE ATM STRADDLE
         # =====================================================
-        print(f"📍 PHASE 2: SELLING ATM STRADDLE")
-        print("-" * 40)
-        
-        # Sell ATM Call
-        short_ce = self.place_varaha_order('SELL', legs['sell_ce'], qty)
+        straddle = [self._leg('sell_ce', 'SELL', legs['sell_ce'], qty),
+                    self._leg('sell_pe', 'SELL', legs['sell_pe'], qty)]
         
-        # Sell ATM Put
-        short_pe = self.place_varaha_order('SELL', legs['sell_pe'], qty)
+        result = self._run_phases([wings, straddle], rollback=True)
         
         print(f"\n{'='*50}")
-        print(f"✅ IRON BUTTERFLY POSITION OPENED")
+        if result['ok']:
+            print(f"✅ IRON BUTTERFLY POSITION OPENED ({result['elapsed_ms']:.0f}ms)")
+        else:
+            print(f"❌ IRON BUTTERFLY FAILED in phase {result['failed_phase']}: {result['reason']}")
+            print(f"   ↩️ Rolled back {len(result['rolled_back'])} leg(s)")
         print(f"{'='*50}\n")
         
         # Summary
@@ -239,8 +352,12 @@ class VarahaExecutor:
             'quantity_per_leg': qty,
             'total_orders': len(self.order_log),
             'wings_ordered': 2,
-            'straddle_ordered': 2,
+            'straddle_ordered': 2 if result['ok'] or result['failed_phase'] == 2 else 0,
             'sequence_verified': self._verify_sequence(),
+            'success': result['ok'],
+            'rolled_back': result['rolled_back'],
+            'leg_latency_ms': {leg['name']: round(leg['ack_ms'], 1) for leg in result['legs']},
+            'execution_ms': round(result['elapsed_ms'], 1),
             'orders': self.order_log
         }
     
@@ -286,39 +403,14 @@ class VarahaExecutor:
         print(f"📍 STAGE 1: CLOSING SHORT POSITIONS")
         print("-" * 40)
         
-        for pos in sell_positions:
-            # Determine opposite action
-            close_side = 'BUY' if pos['side'] == 'SELL' else 'SELL'
-            
-            symbol_info = {
-                'exchange': pos.get('exchange', 'NFO'),
-                'tsym': pos['symbol'],
-                'ltp': pos.get('current_price', pos['entry_price'])
-            }
-            
-            result = self.place_varaha_order(close_side, symbol_info, pos['quantity'])
-            close_log.append(result)
-            print(f"   ✓ {close_side} {pos['symbol']} x{pos['quantity']}")
-        
-        print(f"   → Shorts closed. Waiting 1.5s for margin release...\n")
-        time.sleep(1.5)
+        self._close_stage(sell_positions, close_log)
+        print(f"   → Shorts closed (margin released)\n")
         
         # STAGE 2: Close BUY positions (wings)
         print(f"📍 STAGE 2: CLOSING LONG POSITIONS")
         print("-" * 40)
         
-        for pos in buy_positions:
-            close_side = 'BUY' if pos['side'] == 'SELL' else 'SELL'
-            
-            symbol_info = {
-                'exchange': pos.get('exchange', 'NFO'),
-                'tsym': pos['symbol'],
-                'ltp': pos.get('current_price', pos['entry_price'])
-            }
-            
-            result = self.place_varaha_order(close_side, symbol_info, pos['quantity'])
-            close_log.append(result)
-            print(f"   ✓ {close_side} {pos['symbol']} x{pos['quantity']}")
+        self._close_stage(buy_positions, close_log)
         
         print(f"\n{'='*60}")
         print(f"✅ ALL POSITIONS CLOSED")
@@ -333,6 +425,26 @@ class VarahaExecutor:
             'total_closed': len(close_log)
         }
     
+    def _close_stage(self, positions: list, close_log: list):
+        """Close one stage's positions together; returns once they fill (or the phase timeout passes)."""
+        stage = []
+        for pos in positions:
+            # Determine opposite action
+            close_side = 'BUY' if pos['side'] == 'SELL' else 'SELL'
+            
+            symbol_info = {
+                'exchange': pos.get('exchange', 'NFO'),
+                'tsym': pos['symbol'],
+                'ltp': pos.get('current_price', pos['entry_price'])
+            }
+            stage.append(self._leg(pos['symbol'], close_side, symbol_info, pos['quantity']))
+        
+        # Exits are never rolled back; a slow fill only delays the next stage
+        self._run_phases([stage], rollback=False)
+        for leg in stage:
+            close_log.append(leg.get('record'))
+            print(f"   ✓ {leg['side']} {leg['info']['tsym']} x{leg['order']['quantity']}")
+    
     def print_sequence_log(self):
         """Print detailed sequence for verification"""
         print(f"\n{'='*60}")
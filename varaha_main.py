@@ -56,6 +56,7 @@ class Config:
     LOTS = 4               # Default: 4 lots (₹4L margin)
     INDEX = 'NIFTY'         # Trade Nifty weekly options
     EXPIRY = 'WEEKLY'      # Current weekly expiry
+    FILL_TIMEOUT = 5.0     # Seconds for the wings to fill; past that the butterfly is rolled back
     
     # Logging
     # (varaha_system.log is now created by setup_logging())
@@ -370,7 +371,7 @@ def execute_position(engine, legs: dict, lots: int = 4) -> list:
     logging.info("-" * 40)
     
     try:
-        executor = VarahaExecutor(engine)
+        executor = VarahaExecutor(engine, fill_timeout=Config.FILL_TIMEOUT)
         
         logger.info(f"   Placing Iron Butterfly: {lots} lots")
         
@@ -675,7 +676,7 @@ def close_all_positions(engine, open_positions: list) -> bool:
     logging.info("-" * 40)
     
     try:
-        executor = VarahaExecutor(engine)
+        executor = VarahaExecutor(engine, fill_timeout=Config.FILL_TIMEOUT)
         
         # Close shorts first (to release margin faster)
         sell_positions = [p for p in open_positions if p.get('side') == 'SELL']
@@ -0,0 +1,122 @@
+"""
+Varaha Multi-Timeframe SuperTrend
+==================================
+
+SuperTrend on 1-min, 5-min and 15-min bars built from the 1-min IndicatorBuffer.
+
+Each timeframe keeps its own `SuperTrendState` (orbiter.utils.supertrend). Higher
+timeframe bars are aggregated from the 1-min bars as they arrive and the state
+advances only when that bar closes (every 5th / 15th minute since the session's
+first bar), so between closes the 5/15-min line holds its last closed value.
+Only bars appended since the previous call are processed: O(1) per minute.
+
+Usage:
+  In data_capture_v3.1_duckdb.py:
+
+  from varaha_multiframe_supertrend import compute_multiframe_supertrend
+
+  st_multi = compute_multiframe_supertrend(buf, period=10, multiplier=3.0)
+"""
+
+import math
+import weakref
+from typing import Dict, Optional
+
+from orbiter.utils.supertrend import SuperTrendState
+from varaha_smc_and_logger import unseen_bars
+
+TIMEFRAMES = (1, 5, 15)
+
+
+def _direction(direction: int) -> Optional[str]:
+    return {1: "bullish", -1: "bearish"}.get(direction)
+
+
+class TimeframeSuperTrend:
+    """SuperTrendState fed by `minutes`-minute bars aggregated from 1-min bars."""
+
+    def __init__(self, minutes: int, period: int = 10, multiplier: float = 3.0):
+        self.minutes = minutes
+        self.st = SuperTrendState(period=period, multiplier=multiplier)
+        self._minute = 0
+        self._high = None
+        self._low = None
+        self._close = None
+
+    def update(self, high: float, low: float, close: float) -> bool:
+        """Add a 1-min bar; returns True when it closed a `minutes` bar."""
+        self._high = high if self._high is None else max(self._high, high)
+        self._low = low if self._low is None else min(self._low, low)
+        self._close = close
+        self._minute += 1
+        if self._minute < self.minutes:
+            return False
+        self.st.update(self._high, self._low, self._close)
+        self._minute, self._high, self._low = 0, None, None
+        return True
+
+    def snapshot(self) -> Dict:
+        ready = self.st.ready and not math.isnan(self.st.value)
+        return {
+            "value": round(float(self.st.value), 2) if ready else None,
+            "direction": _direction(self.st.direction) if ready else None,
+        }
+
+
+class MultiframeSuperTrendState:
+    """One TimeframeSuperTrend per entry of TIMEFRAMES, fed from the same 1-min bars."""
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0):
+        self.period = period
+        self.multiplier = multiplier
+        self.frames = {m: TimeframeSuperTrend(m, period, multiplier) for m in TIMEFRAMES}
+        self.last_bar = None
+
+    def update(self, bar: Dict) -> None:
+        h, l, c = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        for frame in self.frames.values():
+            frame.update(h, l, c)
+        self.last_bar = bar
+
+    def snapshot(self) -> Dict:
+        result = {}
+        for minutes, frame in self.frames.items():
+            snap = frame.snapshot()
+            result[f"st_{minutes}min_direction"] = snap["direction"]
+            result[f"st_{minutes}min_value"] = snap["value"]
+        result["st_consensus"] = consensus(
+            [result[f"st_{m}min_direction"] for m in TIMEFRAMES]
+        )
+        return result
+
+
+def consensus(directions) -> Optional[str]:
+    """'bullish' / 'bearish' when every warmed-up timeframe agrees (at least two), else 'mixed'."""
+    known = [d for d in directions if d]
+    if len(known) < 2:
+        return None
+    if all(d == known[0] for d in known):
+        return known[0]
+    return "mixed"
+
+
+_STATES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def compute_multiframe_supertrend(
+    buf: "IndicatorBuffer", period: int = 10, multiplier: float = 3.0
+) -> Dict:
+    """
+    st_{1,5,15}min_direction / _value and st_consensus for the latest bar of `buf`.
+
+    Directions are 'bullish' / 'bearish' (None until that timeframe has warmed up:
+    2 * period - 1 closed bars). Returns {} before the first bar.
+    """
+    state = _STATES.get(buf)
+    if state is None or (state.period, state.multiplier) != (period, multiplier):
+        state = _STATES[buf] = MultiframeSuperTrendState(period, multiplier)
+    for bar in unseen_bars(buf.buf, state.last_bar):
+        state.update(bar)
+    if state.last_bar is None:
+        return {}
+    return state.snapshot()
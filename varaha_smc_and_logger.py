@@ -0,0 +1,336 @@
+"""
+Varaha SMC Indicators & CSV Logger
+===================================
+
+Smart-money-concept structure tracked incrementally from the 1-min IndicatorBuffer:
+1. Swing highs / lows (fractal pivots, confirmed `swing_length` bars later)
+2. Structure breaks (BOS with the trend, CHoCH against it) and liquidity sweeps
+3. Order blocks (last opposite candle before the break)
+4. Fair-value gaps (3-candle imbalances) and their mitigation
+
+State lives beside the buffer and only the bars appended since the previous call
+are processed, so the per-minute cost is O(1) however long the session runs.
+
+Usage:
+  In data_capture_v3.1_duckdb.py:
+
+  from varaha_smc_and_logger import compute_smc_indicators, CSVLogger, export_to_csv
+
+  smc = compute_smc_indicators(buf)                      # every minute
+  export_to_csv(csv_logger, db, timestamp, date_str, ds.index)
+"""
+
+import csv
+import gzip
+import logging
+import os
+import shutil
+import weakref
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+SMC_KEYS = (
+    "ob_zone_high",
+    "ob_zone_low",
+    "ob_strength",
+    "fvg_high",
+    "fvg_low",
+    "fvg_mitigated",
+    "swing_high",
+    "swing_low",
+    "liquidity_swept",
+    "structure_type",
+    "structure_confirmed",
+    "next_target",
+    "smc_strength",
+)
+
+
+def unseen_bars(bars, last) -> List[Dict]:
+    """
+    Bars appended to `bars` (a deque of OHLC dicts) after the bar object `last`.
+
+    Walks back from the newest bar, so a call per appended bar touches one or two
+    entries. If `last` has been evicted (or is None) every bar in the deque is new.
+    """
+    new = []
+    for i in range(len(bars) - 1, -1, -1):
+        bar = bars[i]
+        if bar is last:
+            break
+        new.append(bar)
+    new.reverse()
+    return new
+
+
+# ============================================================================
+# SECTION 1: INCREMENTAL SMC STATE
+# ============================================================================
+
+
+class SMCState:
+    """
+    Per-buffer SMC tracker. `update(bar)` is O(1): a fixed fractal window, the
+    current swing levels, one order block and at most `max_fvgs` open gaps.
+
+    Flow per closed bar:
+        FVG check (bar vs bar two back)  →  mitigate open gaps
+                         ↓
+        fractal window full → middle bar a pivot? → new swing high / low
+                         ↓
+        close beyond an unbroken swing → BOS / CHoCH, order block = last opposite candle
+        wick beyond it, close back inside → liquidity sweep
+    """
+
+    def __init__(self, swing_length: int = 2, max_fvgs: int = 10):
+        self.swing_length = swing_length
+        self.max_fvgs = max_fvgs
+        self.last_bar = None
+        self.count = 0
+
+        self._window = deque(maxlen=2 * swing_length + 1)
+        self.swing_high = None
+        self.swing_low = None
+        self._high_broken = False
+        self._low_broken = False
+
+        self.trend = None  # 'bullish' | 'bearish'
+        self.structure_type = None
+        self.structure_confirmed = None
+        self.liquidity_swept = False
+
+        self._last_down = None  # last bearish candle (bullish OB candidate)
+        self._last_up = None
+        self.ob = None  # {'high', 'low', 'side', 'strength'}
+
+        self.fvg = None  # most recent gap: {'high', 'low', 'side', 'mitigated'}
+        self._open_fvgs = deque(maxlen=max_fvgs)
+
+    def update(self, bar: Dict) -> None:
+        o, h, l, c = (float(bar[k]) for k in ("open", "high", "low", "close"))
+        self.count += 1
+        self.liquidity_swept = False
+
+        self._track_fvg(h, l)
+        self._window.append((h, l))
+        self._track_swings()
+        self._track_structure(o, h, l, c)
+        self._track_order_block(h, l, c)
+
+        if c < o:
+            self._last_down = (h, l)
+        elif c > o:
+            self._last_up = (h, l)
+        self.last_bar = bar
+
+    # ---- fair-value gaps
+    def _track_fvg(self, h: float, l: float) -> None:
+        for gap in list(self._open_fvgs):
+            if (gap["side"] == "bullish" and l <= gap["low"]) or (gap["side"] == "bearish" and h >= gap["high"]):
+                gap["mitigated"] = True
+                self._open_fvgs.remove(gap)
+
+        if len(self._window) < 2:
+            return
+        two_back_h, two_back_l = self._window[-2]
+        gap = None
+        if l > two_back_h:
+            gap = {"high": l, "low": two_back_h, "side": "bullish", "mitigated": False}
+        elif h < two_back_l:
+            gap = {"high": two_back_l, "low": h, "side": "bearish", "mitigated": False}
+        if gap:
+            self.fvg = gap
+            self._open_fvgs.append(gap)
+
+    # ---- swings
+    def _track_swings(self) -> None:
+        if len(self._window) < self._window.maxlen:
+            return
+        mid = self.swing_length
+        highs = [b[0] for b in self._window]
+        lows = [b[1] for b in self._window]
+        others_h = highs[:mid] + highs[mid + 1:]
+        others_l = lows[:mid] + lows[mid + 1:]
+        if highs[mid] > max(others_h):
+            self.swing_high, self._high_broken = highs[mid], False
+        if lows[mid] < min(others_l):
+            self.swing_low, self._low_broken = lows[mid], False
+
+    # ---- structure
+    def _track_structure(self, o: float, h: float, l: float, c: float) -> None:
+        if self.swing_high is not None and not self._high_broken and h > self.swing_high:
+            if c > self.swing_high:
+                self._break("bullish", self._last_down)
+                self._high_broken = True
+            else:
+                self.liquidity_swept = True
+        if self.swing_low is not None and not self._low_broken and l < self.swing_low:
+            if c < self.swing_low:
+                self._break("bearish", self._last_up)
+                self._low_broken = True
+            else:
+                self.liquidity_swept = True
+
+    def _break(self, side: str, ob_candle) -> None:
+        kind = "bos" if self.trend in (None, side) else "choch"
+        self.structure_type = f"{kind}_{side}"
+        # A break against the prior trend is only a change of character once it is followed through
+        self.structure_confirmed = kind == "bos"
+        self.trend = side
+        if ob_candle:
+            strength = 1 + (kind == "choch") + bool(self.fvg and self.fvg["side"] == side and not self.fvg["mitigated"])
+            self.ob = {"high": ob_candle[0], "low": ob_candle[1], "side": side, "strength": strength}
+
+    # ---- order block
+    def _track_order_block(self, h: float, l: float, c: float) -> None:
+        ob = self.ob
+        if not ob:
+            return
+        if (ob["side"] == "bullish" and c < ob["low"]) or (ob["side"] == "bearish" and c > ob["high"]):
+            self.ob = None  # closed through: invalidated
+            return
+        if self.structure_type and self.structure_type.startswith("choch") and not self.structure_confirmed:
+            # CHoCH confirmed when price holds the new order block on the retest
+            if (ob["side"] == "bullish" and l <= ob["high"]) or (ob["side"] == "bearish" and h >= ob["low"]):
+                self.structure_confirmed = True
+
+    # ---- snapshot
+    def _next_target(self, close: float) -> Optional[float]:
+        if self.trend == "bullish":
+            above = [g["low"] for g in self._open_fvgs if g["side"] == "bearish" and g["low"] > close]
+            if self.swing_high is not None and self.swing_high > close:
+                above.append(self.swing_high)
+            return min(above) if above else None
+        if self.trend == "bearish":
+            below = [g["high"] for g in self._open_fvgs if g["side"] == "bullish" and g["high"] < close]
+            if self.swing_low is not None and self.swing_low < close:
+                below.append(self.swing_low)
+            return max(below) if below else None
+        return None
+
+    def snapshot(self) -> Dict:
+        if self.last_bar is None:
+            return {}
+        close = float(self.last_bar["close"])
+        ob, fvg = self.ob, self.fvg
+        score = 0.0
+        if self.trend:
+            score += 0.4 if self.structure_confirmed else 0.2
+            if ob and ob["side"] == self.trend:
+                score += 0.1 * ob["strength"]
+            if fvg and fvg["side"] == self.trend and not fvg["mitigated"]:
+                score += 0.2
+            if self.liquidity_swept:
+                score += 0.1
+        return {
+            "ob_zone_high": ob["high"] if ob else None,
+            "ob_zone_low": ob["low"] if ob else None,
+            "ob_strength": ob["strength"] if ob else None,
+            "fvg_high": fvg["high"] if fvg else None,
+            "fvg_low": fvg["low"] if fvg else None,
+            "fvg_mitigated": fvg["mitigated"] if fvg else None,
+            "swing_high": self.swing_high,
+            "swing_low": self.swing_low,
+            "liquidity_swept": self.liquidity_swept,
+            "structure_type": self.structure_type,
+            "structure_confirmed": self.structure_confirmed,
+            "next_target": self._next_target(close),
+            "smc_strength": round(min(score, 1.0), 2),
+        }
+
+
+_STATES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def compute_smc_indicators(buf: "IndicatorBuffer", swing_length: int = 2) -> Dict:
+    """
+    SMC snapshot for the latest bar of `buf`.
+
+    Returns the SMC_KEYS dict (empty before the first bar). Only bars appended
+    since the previous call are fed to the buffer's SMCState.
+    """
+    state = _STATES.get(buf)
+    if state is None or state.swing_length != swing_length:
+        state = _STATES[buf] = SMCState(swing_length=swing_length)
+    for bar in unseen_bars(buf.buf, state.last_bar):
+        state.update(bar)
+    return state.snapshot()
+
+
+# ============================================================================
+# SECTION 2: DAILY CSV EXPORT
+# ============================================================================
+
+
+class CSVLogger:
+    """
+    Daily CSV mirror of market_data: one file per index per day,
+    `{data_dir}/{index}_{YYYY-MM-DD}.csv`. Older days are gzipped (compress_old)
+    and files past `retention_days` are removed, once per day.
+    """
+
+    def __init__(self, data_dir: str, retention_days: int = 14, compress_old: bool = True):
+        self.data_dir = Path(data_dir)
+        self.retention_days = retention_days
+        self.compress_old = compress_old
+        self._maintained_on = None
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"CSV dir unavailable ({self.data_dir}): {e}")
+
+    def path_for(self, index: str, date_str: str) -> Path:
+        return self.data_dir / f"{index}_{date_str}.csv"
+
+    def write_row(self, index: str, date_str: str, row: Dict) -> None:
+        path = self.path_for(index, date_str)
+        new_file = not path.exists()
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(row.keys()), extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+        if self._maintained_on != date_str:
+            self._maintained_on = date_str
+            self.maintain(date_str)
+
+    def maintain(self, date_str: str) -> None:
+        """Compress files from earlier days and drop those past retention."""
+        try:
+            today = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            return
+        cutoff = today - timedelta(days=self.retention_days)
+        for path in self.data_dir.glob("*_*.csv*"):
+            stem = path.name.split(".")[0]
+            try:
+                day = datetime.strptime(stem.rsplit("_", 1)[1], "%Y-%m-%d").date()
+            except (IndexError, ValueError):
+                continue
+            try:
+                if day < cutoff:
+                    path.unlink()
+                elif self.compress_old and day < today and path.suffix == ".csv":
+                    with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    os.remove(path)
+            except OSError as e:
+                logger.debug(f"CSV maintenance failed for {path}: {e}")
+
+
+def export_to_csv(csv_logger: CSVLogger, db, timestamp: str, date_str: str, index: str) -> None:
+    """Append the market_data row just written for (timestamp, index) to the day's CSV."""
+    cur = db.execute(
+        "SELECT * FROM market_data WHERE timestamp = ? AND index_name = ?",
+        [timestamp, index],
+    )
+    row = cur.fetchone()
+    if not row:
+        return
+    columns = [d[0] for d in cur.description]
+    csv_logger.write_row(index, date_str, dict(zip(columns, row)))